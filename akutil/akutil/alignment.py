@@ -20,9 +20,7 @@ def zero_up(vals):
     """
     g = ak.GroupBy(vals)
     uniqueInds = ak.arange(g.unique_keys.size)
-    idinds = ak.zeros_like(vals)
-    idinds[g.permutation] = g.broadcast(uniqueInds)
-    return idinds
+    return g.broadcast(uniqueInds, permute=True)
 
 def align(*args):
     """ Map multiple arrays of sparse identifiers to a common 0-up index.
@@ -104,11 +102,8 @@ def in1dmulti(a, b, assume_unique=False):
     c = [ak.concatenate(x) for x in zip(ua, ub)]
     g = ak.GroupBy(c)
     k, ct = g.count()
-    truth = ak.zeros(c[0].size, dtype=ak.bool)
-    truth[g.permutation] = (g.broadcast(1*(ct == 2)) == 1)
+    truth = (g.broadcast(1*(ct == 2), permute=True) == 1)
     if assume_unique:
         return truth[:a[0].size]
     else:
-        truth2 = ak.zeros(a[0].size, dtype=ak.bool)
-        truth2[ag.permutation] = (ag.broadcast(1*truth[:ua[0].size]) == 1)
-        return truth2
+        return (ag.broadcast(1*truth[:ua[0].size], permute=True) == 1)
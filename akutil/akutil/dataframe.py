@@ -725,7 +725,7 @@ class DataFrame(UserDict):
         else:
             return pd.DataFrame(data=pandas_data)
 
-    def argsort(self, key):
+    def argsort(self, key, ascending=True):
         """
         Return the permutation that sorts the dataframe by `key`.
 
@@ -733,6 +733,9 @@ class DataFrame(UserDict):
         ----------
         key : str
             The key to sort on.
+        ascending : bool
+            Whether to sort in ascending order (the default) or descending
+            order.
 
         Returns
         -------
@@ -742,9 +745,9 @@ class DataFrame(UserDict):
 
         if self._empty:
             return None
-        return ak.argsort(self[key])
+        return ak.argsort(self[key], ascending=ascending)
 
-    def coargsort(self, keys):
+    def coargsort(self, keys, ascending=True):
         """
         Return the permutation that sorts the dataframe by `keys`.
 
@@ -752,6 +755,9 @@ class DataFrame(UserDict):
         ----------
         keys : list
             The keys to sort on.
+        ascending : bool or list
+            Whether to sort in ascending order (the default) or descending
+            order, for all keys or for each key.
 
         Returns
         -------
@@ -765,10 +771,10 @@ class DataFrame(UserDict):
         for key in keys:
             arrays.append(self[key])
 
-        return ak.coargsort(arrays)
+        return ak.coargsort(arrays, ascending=ascending)
 
 
-    def sort(self, key=None):
+    def sort(self, key=None, ascending=True):
         """
         Sort the DataFrame by a single key.
 
@@ -779,6 +785,9 @@ class DataFrame(UserDict):
         ----------
         key : str
             The name of the column to sort by.
+        ascending : bool
+            Whether to sort in ascending order (the default) or descending
+            order.
 
         See Also
         --------
@@ -789,7 +798,7 @@ class DataFrame(UserDict):
             return None
         if key not in self.keys():
             key = list(self.keys())[1]
-        perm = ak.argsort(self[key])
+        perm = ak.argsort(self[key], ascending=ascending)
         # Note this operation permutes the index column
         for k, v in self.data.items():
             self[k] = v[perm]
@@ -857,9 +866,8 @@ class DataFrame(UserDict):
         else:
             positions = ak.where(((cts >= low) & (cts <= high)), 1, 0)
 
-        broadcast = gb.broadcast(positions)
-        broadcast = (broadcast == 1)
-        return broadcast[aku.invert_permutation(gb.permutation)]
+        broadcast = gb.broadcast(positions, permute=True)
+        return (broadcast == 1)
 
     def copy(self, deep=True):
         """
@@ -899,7 +907,7 @@ class DataFrame(UserDict):
         else:
             return aku.DataFrame(self.data)
 
-def sorted(df, column=False):
+def sorted(df, column=False, ascending=True):
     """
     Analogous to other python 'sorted(obj)' functions in that it returns
     a sorted copy of the DataFrame.
@@ -916,6 +924,9 @@ def sorted(df, column=False):
     column : str
         The name of the column to sort by.
 
+    ascending : bool
+        Whether to sort in ascending order (the default) or descending order.
+
     Returns
     -------
     akutil.dataframe.DataFrame
@@ -925,7 +936,7 @@ def sorted(df, column=False):
     if not isinstance(df, aku.DataFrame):
         raise TypeError("The sorted operation requires an DataFrame.")
     result = DataFrame(df.data)
-    result.sort(column)
+    result.sort(column, ascending=ascending)
     return result
 
 def intx(a, b):
@@ -1006,13 +1017,8 @@ def intersect(a, b, positions=True, unique=False):
             gb = ak.GroupBy([hash0, hash1])
             val, cnt = gb.count()
 
-            # Hash counts, in groupby order
-            counts = gb.broadcast(cnt)
-
-            # Same, in original order
-            tmp = counts[:]
-            counts[gb.permutation] = tmp
-            del tmp
+            # Hash counts, in original order
+            counts = gb.broadcast(cnt, permute=True)
 
             # Masks
             maska = (counts > 1)[:a.size]
@@ -1039,27 +1045,14 @@ def intersect(a, b, positions=True, unique=False):
             gb = ak.GroupBy([hash0, hash1])
             val, cnt = gb.count()
 
-            # Hash counts, in groupby order
-            counts = gb.broadcast(cnt)
-
-            # Restore the original order
-            tmp = counts[:]
-            counts[gb.permutation] = tmp
-            del tmp
+            # Hash counts, in original order
+            counts = gb.broadcast(cnt, permute=True)
 
-            # Broadcast back up one more level
+            # Broadcast back up one more level, in the original orders
             countsa = counts[:a0.size]
             countsb = counts[a0.size:]
-            counts2a = gba.broadcast(countsa)
-            counts2b = gbb.broadcast(countsb)
-
-            # Restore the original orders
-            tmp = counts2a[:]
-            counts2a[gba.permutation] = tmp
-            del tmp
-            tmp = counts2b[:]
-            counts2b[gbb.permutation] = tmp
-            del tmp
+            counts2a = gba.broadcast(countsa, permute=True)
+            counts2b = gbb.broadcast(countsb, permute=True)
 
             # Masks
             maska = (counts2a > 1)
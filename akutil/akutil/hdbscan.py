@@ -151,37 +151,36 @@ class Clusterer:
         # We don't start with the level 0, it gets passed through as is.
         for level in tqdm(self.level_data[1:]):
             bylevel = ak.GroupBy(level.cc)
-            perm = bylevel.permutation
             # Save for later analysis
             old_labels = labels[:]
             # Count number of nodes in each group
             _,c = bylevel.count()
+            clusters_and_zeros = ak.where(labels < 0, labels, 0)
+            _, aggs = bylevel.agg({
+                'labels': (labels, ['min', 'max']),
+                'sizes': (sizes, 'max'),
+                'stability': (stability, 'max'),
+                'clusters_and_zeros': (clusters_and_zeros, 'nunique'),
+            })
             # Find largest (negative) label value each group
-            _, max_group_labels = bylevel.aggregate(labels, 'min')
+            max_group_labels = aggs['labels']['min']
             # Find maximum of existing cluster sizes from last iteration.
-            _, max_group_size = bylevel.aggregate(sizes, 'max')
+            max_group_size = aggs['sizes']['max']
             # Find the maximum stability in each group
-            _, max_group_stability = bylevel.aggregate(stability, 'max')
+            max_group_stability = aggs['stability']['max']
             # Find the number of sub-clusters in each group for purposes of creating new cluster labels
-            clusters_and_zeros = ak.where(labels < 0, labels, 0)
-            _, num_unique_labels = bylevel.aggregate(clusters_and_zeros, 'nunique')
-            _, min_group_label = bylevel.aggregate(labels, 'max')
+            num_unique_labels = aggs['clusters_and_zeros']['nunique']
+            min_group_label = aggs['labels']['max']
             num_sub_clusters = num_unique_labels - ak.where(min_group_label >= 0, 1, 0)
 
             # Update sizes
-            count_bc = bylevel.broadcast(c)
-            sizes = ak.zeros(num_nodes, dtype=ak.int64)
-            sizes[perm] = count_bc
+            sizes = bylevel.broadcast(c, permute=True)
 
             # Update labels to max (negative) in group
-            labels_bc = bylevel.broadcast(max_group_labels)
-            labels = ak.zeros(num_nodes, dtype=ak.int64)
-            labels[perm] = labels_bc
+            labels = bylevel.broadcast(max_group_labels, permute=True)
 
             # Update stability
-            stability_bc = bylevel.broadcast(max_group_stability)
-            stability = ak.zeros(num_nodes, dtype=ak.float64)
-            stability[perm] = stability_bc
+            stability = bylevel.broadcast(max_group_stability, permute=True)
 
             # Create and update labels as needed, baseline size is 1
             # Only need to test if there are at least two cluster labels in a group.
@@ -206,9 +205,7 @@ class Clusterer:
                 selection_data.append(update_df)
 
                 # Update the labels
-                labels_bc = bylevel.broadcast(new_labels_positioned)
-                new_labels = ak.zeros(num_nodes, dtype=ak.int64)
-                new_labels[perm] = labels_bc
+                new_labels = bylevel.broadcast(new_labels_positioned, permute=True)
                 tmp = ak.where(new_labels < 0, new_labels, labels)
                 labels = tmp
 
@@ -225,9 +222,7 @@ class Clusterer:
                     selection_data['parent'][-1 * old] = -1 * new
 
             # Set new cluster stability to 0
-            new_label_bc = bylevel.broadcast(new_labels_positioned)
-            tmp = ak.zeros(labels.size, dtype=np.int64)
-            tmp[perm] = new_label_bc
+            tmp = bylevel.broadcast(new_labels_positioned, permute=True)
             stability[tmp < 0] = 0
 
             # Update stability
@@ -12,3 +12,4 @@ from arkouda.strings import *
 from arkouda.join import *
 from arkouda.categorical import *
 from arkouda.logger import *
+from arkouda import aio
@@ -0,0 +1,62 @@
+"""
+Coroutine versions of the arkouda functions, for use with asyncio. Each 
+function of the arkouda package is available here as a coroutine function
+that runs the call on a background thread with ak.submit() and awaits its
+result, so that other coroutines run while the server works.
+
+Examples
+--------
+>>> async def upload_and_sort(a, chunk):
+...     # upload the next chunk while the server sorts the previous one
+...     return await asyncio.gather(ak.aio.argsort(a), ak.aio.array(chunk))
+>>> a = ak.randint(0, 100, 10**6)
+>>> perm = asyncio.run(ak.aio.argsort(a))
+>>> a[perm].is_sorted()
+True
+"""
+import asyncio, functools
+from typing import Any, Callable
+from arkouda.client import submit
+
+__all__ = ["run"]
+
+async def run(func : Callable, *args : Any, **kwargs : Any) -> Any:
+    """
+    Call a function on a background thread with ak.submit() and await its 
+    result. Use this for pdarray methods and user functions that call 
+    arkouda functions.
+
+    Parameters
+    ----------
+    func : Callable
+        The function to call
+    args, kwargs
+        The arguments of the call
+
+    Returns
+    -------
+    Any
+        The return value of the call
+
+    Examples
+    --------
+    >>> a = ak.arange(0, 10, 1)
+    >>> asyncio.run(ak.aio.run(a.sum))
+    45
+    """
+    return await asyncio.wrap_future(submit(func, *args, **kwargs))
+
+def __getattr__(name : str) -> Callable:
+    """
+    Returns the coroutine function that calls the arkouda function of the 
+    given name with run()
+    """
+    import arkouda
+    func = getattr(arkouda, name)
+    if not callable(func):
+        raise AttributeError("arkouda.{} is not callable".format(name))
+
+    @functools.wraps(func)
+    async def coroutine(*args : Any, **kwargs : Any) -> Any:
+        return await run(func, *args, **kwargs)
+    return coroutine
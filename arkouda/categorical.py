@@ -67,9 +67,7 @@ class Categorical:
                                  "Strings not yet supported"))
             g = GroupBy(values)
             self.categories = g.unique_keys
-            self.codes = zeros(values.size, dtype=np.int64)
-            self.codes[cast(pdarray, g.permutation)] = \
-                                g.broadcast(arange(self.categories.size))
+            self.codes = g.broadcast(arange(self.categories.size), permute=True)
             self.permutation = cast(pdarray, g.permutation)
             self.segments = g.segments
         # Always set these values
@@ -265,8 +263,7 @@ class Categorical:
         """
         g = GroupBy(self.codes)
         idx = self.categories[g.unique_keys]
-        newvals = zeros(self.codes.size, akint64)
-        newvals[g.permutation] = g.broadcast(arange(idx.size))
+        newvals = g.broadcast(arange(idx.size), permute=True)
         return Categorical.from_codes(newvals, idx, permutation=g.permutation, 
                                       segments=g.segments)
 
@@ -409,17 +406,19 @@ class Categorical:
         else:
             return self.permutation
 
-    def argsort(self):
+    def argsort(self, ascending=True):
         #__doc__ = argsort.__doc__
+        # the categories are few, so only their codes are sorted in the
+        # direction asked for
         idxperm = argsort(self.categories)
         inverse = zeros_like(idxperm)
         inverse[idxperm] = arange(idxperm.size)
         newvals = inverse[self.codes]
-        return argsort(newvals)
+        return argsort(newvals, ascending=ascending)
 
-    def sort(self):
+    def sort(self, ascending=True):
         #__doc__ = sort.__doc__
-        idxperm = argsort(self.categories)
+        idxperm = argsort(self.categories, ascending=ascending)
         inverse = zeros_like(idxperm)
         inverse[idxperm] = arange(idxperm.size)
         newvals = inverse[self.codes]
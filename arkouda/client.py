@@ -1,12 +1,15 @@
-import json, os
-from typing import cast, Mapping, Optional, Tuple, Union
+import json, os, threading, uuid, weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, cast, Dict, Iterator, List, Mapping, Optional, \
+     Sequence, Tuple, Union
 import warnings, pkg_resources
 import zmq # type: ignore
 from arkouda import security, io_util
 from arkouda.logger import getArkoudaLogger
 
 __all__ = ["AllSymbols", "connect", "disconnect", "shutdown", "get_config", 
-           "get_mem_used", "__version__", "ruok"]
+           "get_mem_used", "__version__", "ruok", "batch", "flush_batch", "submit"]
 
 # Try to read the version from the file located at ../VERSION
 VERSIONFILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "VERSION")
@@ -35,25 +38,73 @@ pdarrayIterThreshDefVal = 100
 pdarrayIterThresh  = pdarrayIterThreshDefVal
 maxTransferBytesDefVal = 2**30
 maxTransferBytes = maxTransferBytesDefVal
+# size of each message when streaming arrays to the client in chunks
+chunkTransferBytesDefVal = 2**26
+chunkTransferBytes = chunkTransferBytesDefVal
+# maximum number of operations in an expression fused by lazy()
+maxFusedNodesDefVal = 32
+maxFusedNodes = maxFusedNodesDefVal
+# maximum number of commands queued by batch() before they are sent
+maxBatchCommandsDefVal = 1024
+maxBatchCommands = maxBatchCommandsDefVal
+# maximum number of pdarray deletions, and of bytes they free, deferred 
+# before they are sent to the server
+maxPendingDeletesDefVal = 256
+maxPendingDeletes = maxPendingDeletesDefVal
+maxPendingDeleteBytesDefVal = 2**30
+maxPendingDeleteBytes = maxPendingDeleteBytesDefVal
+# maximum number of submitted calls that run at the same time
+maxSubmittedCallsDefVal = 4
+maxSubmittedCalls = maxSubmittedCallsDefVal
 AllSymbols = "__AllSymbols__"
 
+# commands that may be queued by batch(), split into those that create a 
+# single pdarray and those whose reply is not used by the client
+BatchCreateCommands = frozenset(["binopvv", "binopvs", "binopsv", "efunc", 
+                                 "efunc3vv", "efunc3vs", "efunc3sv", "efunc3ss",
+                                 "create", "arange", "linspace", "randint", 
+                                 "randomNormal", "histogram", "[slice]", 
+                                 "[pdarray]", "fused"])
+BatchNoReplyCommands = frozenset(["delete", "deleteMany", "set", "opeqvv", "opeqvs", 
+                                  "[int]=val", "[pdarray]=val", 
+                                  "[pdarray]=pdarray", "[slice]=val", 
+                                  "[slice]=pdarray"])
+# placeholder dtype in the reply to a queued create command
+PendingDtype = "__pending__"
+# commands whose results depend on which arrays the server holds, which 
+# send the deferred deletions first
+DeleteFlushCommands = frozenset(["info", "getmemused", "register", "attach", 
+                                 "unregister", "clear"])
+# text of the server error for a command that would exceed its memory limit
+MemoryLimitError = "would exceed memory limit"
+
 logger = getArkoudaLogger(name='Arkouda Client') 
 clientLogger = getArkoudaLogger(name='Arkouda User Logger', logFormat='%(message)s')   
 
 # reset settings to default values
 def set_defaults() -> None:
     """
-    Sets client variables including verbose, maxTransferBytes and 
-    pdarrayIterThresh to default values.
+    Sets client variables including verbose, maxTransferBytes, 
+    chunkTransferBytes, maxBatchCommands, maxFusedNodes, maxPendingDeletes,
+    maxPendingDeleteBytes, maxSubmittedCalls and pdarrayIterThresh to 
+    default values.
     
     Returns
     -------
     None
     """
-    global verbose, maxTransferBytes, pdarrayIterThresh
+    global verbose, maxTransferBytes, chunkTransferBytes, pdarrayIterThresh, \
+           maxBatchCommands, maxFusedNodes, maxPendingDeletes, maxPendingDeleteBytes, \
+           maxSubmittedCalls
     verbose = verboseDefVal
     pdarrayIterThresh  = pdarrayIterThreshDefVal
     maxTransferBytes = maxTransferBytesDefVal
+    chunkTransferBytes = chunkTransferBytesDefVal
+    maxBatchCommands = maxBatchCommandsDefVal
+    maxFusedNodes = maxFusedNodesDefVal
+    maxPendingDeletes = maxPendingDeletesDefVal
+    maxPendingDeleteBytes = maxPendingDeleteBytesDefVal
+    maxSubmittedCalls = maxSubmittedCallsDefVal
 
 # create context, request end of socket, and connect to it
 def connect(server : str="localhost", port : int=5555, timeout : int=0, 
@@ -300,91 +351,161 @@ def _start_tunnel(addr : str, tunnel_server : str) -> Tuple[str,object]:
     except Exception as e:
         raise ConnectionError(e)
 
-def _send_string_message(message : str, 
-                         recv_bytes : bool=False) -> Union[str, bytes]:
+def _recv_binary_message(recv_socket : Optional[zmq.Socket]=None) -> memoryview:
+    """
+    Receives a binary reply from the Arkouda server without copying it
+    out of the zmq frame.
+
+    Parameters
+    ----------
+    recv_socket : zmq.Socket, optional
+        The socket to receive on, defaults to the client's socket
+
+    Returns
+    -------
+    memoryview
+        A view of the received frame's data; the frame stays alive for
+        as long as the view (or any numpy array built on it) is referenced
+
+    Raises
+    ------
+    RuntimeError
+        Raised if the return message starts with "Error:", indicating 
+        a server-side error was thrown
+    """
+    frame = (recv_socket or _thread_socket()).recv(copy=False)
+    return_message = frame.buffer
+    # raise errors or warnings sent back from the server
+    if return_message[:6] == b"Error:":
+        raise RuntimeError(bytes(return_message).decode())
+    elif return_message[:8] == b"Warning:":
+        warnings.warn(bytes(return_message).decode())
+    return return_message
+
+def _open_transfer_socket() -> zmq.Socket:
+    """
+    Opens an additional request socket to the connected Arkouda server, so 
+    that bulk transfers can run on a background thread without interleaving
+    with the requests sent on the client's socket.
+
+    Returns
+    -------
+    zmq.Socket
+        A connected REQ socket, which the caller must close
+
+    Raises
+    ------
+    RuntimeError
+        Raised if the client is not connected to the server
     """
-    Prepends the message string with Arkouda infrastructure elements 
-    including username and authentication token and then sends the 
-    resulting, composite string to the Arkouda server.
+    if not connected:
+        raise RuntimeError("client is not connected to a server")
+    transfer_socket = context.socket(zmq.REQ)
+    # do not block on close if a transfer is abandoned
+    transfer_socket.setsockopt(zmq.LINGER, 0)
+    transfer_socket.connect(pspStr)
+    return transfer_socket
+
+def _send_transfer_message(transfer_socket : zmq.Socket, message : str) -> memoryview:
+    """
+    Sends the message on a socket opened with _open_transfer_socket and 
+    returns the binary response.
 
     Parameters
     ----------
+    transfer_socket : zmq.Socket
+        The socket to send and receive on
     message : str
         The message including command to be sent to the Arkouda server
-    recv_bytes : bool, defaults to False
-        A boolean indicating whether the return message will be in bytes
-        as opposed to a string
 
     Returns
     -------
-    Union[str,bytes]
-        The response string or byte array sent back from the Arkouda server
-        
+    memoryview
+        A zero-copy view of the binary response
+
     Raises
     ------
     RuntimeError
-        Raised if the return message contains the word "Error", indicating 
+        Raised if the return message starts with "Error:", indicating 
         a server-side error was thrown
     """
-    message = '{}:{}:{}'.format(username, token, message)
+    logger.debug("[Python] Sending transfer request: {}".format(message))
+    transfer_socket.send_string('{}:{}:{}'.format(username, token, message))
+    return _recv_binary_message(transfer_socket)
 
-    socket.send_string(message)
+class Reply(str):
+    """
+    The message of a reply from the Arkouda server, along with the objects 
+    the server describes in it. The user should not call this class 
+    directly.
 
-    if recv_bytes:
-        return_message = socket.recv()
-        # raise errors or warnings sent back from the server
-        if return_message.startswith(b"Error:"): \
-                                   raise RuntimeError(return_message.decode())
-        elif return_message.startswith(b"Warning:"): warnings.warn(return_message)
-    else:
-        return_message = socket.recv_string()
-        # raise errors or warnings sent back from the server
-        if return_message.startswith("Error:"): raise RuntimeError(return_message)
-        elif return_message.startswith("Warning:"): warnings.warn(return_message)
-    return return_message
+    Attributes
+    ----------
+    objects : List[Union[Dict, List[Dict]]]
+        The arrays created by the command, in order. Each is a dict with 
+        the objType, name, dtype, size, ndim, shape and itemsize of a 
+        pdarray, or a list of those dicts for the arrays that make up a 
+        single object such as Strings.
+    """
+    objects : List[Union[Dict, List[Dict]]]
+
+    def __new__(cls, msg : str) -> Reply:
+        reply = super().__new__(cls, msg)
+        reply.objects = []
+        return reply
 
-def _send_binary_message(message : bytes, 
-                         recv_bytes : bool=False) -> Union[str, bytes]:
+def _send_string_message(message : str, recv_bytes : bool=False, 
+                         frames : Sequence[Union[bytes,memoryview]]=()) \
+                                                    -> Union[str, memoryview]:
     """
-    Prepends the binary message with Arkouda infrastructure elements
-    including username and authentication token and then sends the
-    resulting, composite byte array to the Arkouda server.
+    Sends the message to the Arkouda server as a structured request, whose
+    JSON header holds the username, authentication token, command and 
+    arguments, followed by the binary payload frames.
 
     Parameters
     ----------
-    message : bytes
+    message : str
         The message including command to be sent to the Arkouda server
     recv_bytes : bool, defaults to False
-        A boolean indicating whether the return message will be in bytes
+        A boolean indicating whether the return message will be binary
         as opposed to a string
+    frames : Sequence[Union[bytes,memoryview]]
+        Binary payloads sent, without copying, after the arguments of the
+        command
 
     Returns
     -------
-    Union[str,bytes]
-        The response string or byte array sent back from the Arkouda server
-
+    Union[Reply,memoryview]
+        The response message, with the objects it describes, or a zero-copy
+        view of the binary response sent back from the Arkouda server
+        
     Raises
     ------
     RuntimeError
-        Raised if the return message contains the word "Error", indicating 
-        a server-side error was thrown
+        Raised if the reply is an error, indicating a server-side error 
+        was thrown
     """
-    socket.send('{}:{}:'.format(username,token,).encode() + message)
+    cmd, _, args = message.partition(' ')
+    header = json.dumps({"user": username, "token": str(token), "cmd": cmd, 
+                         "args": args, "frames": len(frames)}, ensure_ascii=False)
+    request_socket = _thread_socket()
+    request_socket.send_multipart([header.encode()] + list(frames), copy=False)
 
+    parts = request_socket.recv_multipart(copy=False)
+    reply = json.loads(parts[0].bytes)
+    # raise errors or warnings sent back from the server, including errors
+    # of commands with binary replies, which are sent without a binary frame
+    if reply["msgType"] == "ERROR": raise RuntimeError(reply["msg"])
+    elif reply["msgType"] == "WARNING": warnings.warn(reply["msg"])
     if recv_bytes:
-        binary_return_message = cast(bytes, socket.recv())
-        # raise errors or warnings sent back from the server
-        if binary_return_message.startswith(b"Error:"): \
-                                   raise RuntimeError(binary_return_message.decode())
-        elif binary_return_message.startswith(b"Warning:"): \
-                                        warnings.warn(binary_return_message.decode())
-    else:
-        return_message = cast(str, socket.recv_string())
-        # raise errors or warnings sent back from the server
-        if return_message.startswith("Error:"): raise RuntimeError(return_message)
-        elif return_message.startswith("Warning:"): warnings.warn(return_message)
+        if len(parts) < 2:
+            raise RuntimeError("reply to {} has no binary frame: {}".\
+                               format(cmd, reply["msg"]))
+        return parts[1].buffer
+    return_message = Reply(reply["msg"])
+    return_message.objects = reply["objects"]
     return return_message
-    
+
 # message arkouda server the client is disconnecting from the server
 def disconnect() -> None:
     """
@@ -402,6 +523,11 @@ def disconnect() -> None:
     global socket, pspStr, connected, verbose, token
 
     if connected:
+        # finish submitted calls, then send any commands still queued by 
+        # batch() and deferred deletions
+        _shutdown_submit()
+        flush_batch()
+        _flush_deletes()
         # send disconnect message to server
         message = "disconnect"
         logger.debug("[Python] Sending request: {}".format(message))
@@ -436,10 +562,17 @@ def shutdown() -> None:
         Raised if the client is not connected to the Arkouda server or
         there is an error in disconnecting from the server
     """
-    global socket, pspStr, connected, verbose
+    global socket, pspStr, connected, verbose, _pendingDeleteBytes
 
     if not connected:
         raise RuntimeError('not connected, cannot shutdown server')
+    _shutdown_submit()
+    # the server deletes all objects, so drop commands still queued by batch()
+    # and deferred deletions
+    if _batch is not None:
+        _batch.clear()
+    _pendingDeletes.clear()
+    _pendingDeleteBytes = 0
     # send shutdown message to server
     message = "shutdown"
 
@@ -453,26 +586,26 @@ def shutdown() -> None:
         raise RuntimeError(e)
     connected = False
 
-def generic_msg(message : Union[str,bytes], send_bytes : bool=False, 
-                recv_bytes : bool=False) -> Union[str, bytes]:
+def generic_msg(message : str, recv_bytes : bool=False, 
+                frames : Sequence[Union[bytes,memoryview]]=()) -> Union[str, memoryview]:
     """
-    Sends the binary or string message to the arkouda_server and returns 
-    the response sent by the server which is either a success confirmation
-    or error message
+    Sends the message to the arkouda_server and returns the response sent 
+    by the server which is either a success confirmation or error message
 
     Parameters
     ----------
-    message : Union[str, bytes]
-        The message to be sent in the form of a string or bytes array
-    send_bytes : bool
-        Indicates if the message to be sent is binary, defaults to False
+    message : str
+        The message to be sent, the command followed by its arguments
     recv_bypes : bool
         Indicates if the return message will be binary, default to False
+    frames : Sequence[Union[bytes,memoryview]]
+        Binary payloads sent, without copying, after the string message
 
     Returns
     -------
-    Union[str, bytes]
-        The string or binary return message
+    Union[str, memoryview]
+        The string return message, with the objects it describes in its
+        objects attribute, or a zero-copy view of the binary return message
     
     Raises
     ------
@@ -487,23 +620,47 @@ def generic_msg(message : Union[str,bytes], send_bytes : bool=False,
     if not connected:
         raise RuntimeError("client is not connected to a server")
 
+    if _pendingDeletes and (len(_pendingDeletes) >= maxPendingDeletes or 
+                            _pendingDeleteBytes >= maxPendingDeleteBytes or 
+                            message.split(maxsplit=1)[0] in DeleteFlushCommands):
+        _flush_deletes()
+
+    # calls run by submit() are not queued by a batch() on the calling thread
+    if _batch is not None and not _on_submit_thread():
+        if not recv_bytes and not frames:
+            queued = _batch.add(message)
+            if queued is not None:
+                return queued
+        # commands that cannot be queued see the effects of those that were
+        flush_batch()
+
+    try:
+        return _send_message(message, recv_bytes, frames)
+    except RuntimeError as e:
+        # free the arrays awaiting deletion and retry a command that would 
+        # exceed the server's memory limit without them
+        if not _pendingDeletes or MemoryLimitError not in str(e):
+            raise
+        _flush_deletes()
+        return _send_message(message, recv_bytes, frames)
+
+def _send_message(message : str, recv_bytes : bool,
+                  frames : Sequence[Union[bytes,memoryview]]) -> Union[str, memoryview]:
+    """
+    Sends the message to the arkouda_server and returns the response. The 
+    user should not call this function directly.
+    """
+    global socket
+
     try:
-        if send_bytes:
-            if recv_bytes:
-                return cast(bytes, _send_binary_message(message=cast(bytes,message), 
-                                            recv_bytes=recv_bytes))
-            else: 
-                return cast(str, _send_binary_message(message=cast(bytes,message), 
-                                            recv_bytes=recv_bytes))                
+        logger.debug("[Python] Sending request: {}".format(message))
+        if recv_bytes:
+            return cast(memoryview, _send_string_message(message=message, 
+                                        recv_bytes=recv_bytes, frames=frames))
         else:
-            logger.debug("[Python] Sending request: {}".format(cast(str,message)))
-            if recv_bytes:
-                return cast(bytes, _send_string_message(message=cast(str,message), 
-                                            recv_bytes=recv_bytes))
-            else:
-                return cast(str, _send_string_message(message=cast(str,message), 
-                                            recv_bytes=recv_bytes))
-                
+            return cast(str, _send_string_message(message=message, 
+                                        recv_bytes=recv_bytes, frames=frames))
+
     except KeyboardInterrupt as e:
         # if the user interrupts during command execution, the socket gets out 
         # of sync reset the socket before raising the interrupt exception
@@ -511,6 +668,273 @@ def generic_msg(message : Union[str,bytes], send_bytes : bool=False,
         socket.connect(pspStr)
         raise e
 
+# sockets of the threads that run calls submitted with submit(), which each
+# send their requests on a socket of their own
+_submitLocal = threading.local()
+_submitSockets : List[zmq.Socket] = []
+_submitExecutor : Optional[ThreadPoolExecutor] = None
+
+def _thread_socket() -> zmq.Socket:
+    """
+    Returns the socket requests are sent on from the calling thread, which 
+    is its own socket on the threads that run submitted calls and the 
+    client's socket otherwise. The user should not call this function 
+    directly.
+    """
+    return getattr(_submitLocal, 'socket', None) or socket
+
+def _on_submit_thread() -> bool:
+    """
+    Returns True if the calling thread runs calls submitted with submit()
+    """
+    return getattr(_submitLocal, 'socket', None) is not None
+
+def _init_submit_thread() -> None:
+    """
+    Opens the socket of a thread that runs submitted calls
+    """
+    _submitLocal.socket = _open_transfer_socket()
+    _submitSockets.append(_submitLocal.socket)
+
+def _shutdown_submit() -> None:
+    """
+    Waits for the submitted calls to finish, then closes the sockets of the
+    threads that ran them
+    """
+    global _submitExecutor
+    if _submitExecutor is not None:
+        _submitExecutor.shutdown(wait=True)
+        _submitExecutor = None
+    while _submitSockets:
+        _submitSockets.pop().close()
+
+def submit(func : Callable, *args : Any, **kwargs : Any) -> Future:
+    """
+    Call an arkouda function on a background thread, which sends its 
+    requests to the server on a socket of its own, and return a future for 
+    its result. This keeps several requests in flight, so that the client 
+    can prepare, upload or post-process data while the server runs a long 
+    operation, and the server can run independent requests concurrently.
+
+    Parameters
+    ----------
+    func : Callable
+        The function to call, such as ak.argsort or a user function that 
+        calls arkouda functions
+    args, kwargs
+        The arguments of the call
+
+    Returns
+    -------
+    concurrent.futures.Future
+        A future whose result is the return value of the call, or which 
+        raises the exception raised by the call
+
+    Raises
+    ------
+    RuntimeError
+        Raised if the client is not connected to a server
+
+    See Also
+    --------
+    arkouda.aio
+
+    Notes
+    -----
+    At most client.maxSubmittedCalls calls run at the same time, and the 
+    rest wait for a free thread. Submitted calls are not queued by a batch()
+    on the calling thread, and run concurrently with the calling thread, so
+    the caller must not modify arrays a running call uses. disconnect() and
+    shutdown() wait for the submitted calls to finish.
+
+    Examples
+    --------
+    >>> a = ak.randint(0, 2**32, 10**8)
+    >>> perm = ak.submit(ak.argsort, a)
+    >>> b = ak.array(np.arange(10**6))   # sent while the server sorts a
+    >>> a[perm.result()].is_sorted()
+    True
+    """
+    global _submitExecutor
+    if not connected:
+        raise RuntimeError("client is not connected to a server")
+    if _submitExecutor is None:
+        _submitExecutor = ThreadPoolExecutor(max_workers=maxSubmittedCalls,
+                                             initializer=_init_submit_thread)
+    return _submitExecutor.submit(func, *args, **kwargs)
+
+# names of the pdarrays whose deletion is deferred, and the bytes they hold
+_pendingDeletes : List[str] = []
+_pendingDeleteBytes = 0
+
+def _defer_delete(name : str, nbytes : int) -> None:
+    """
+    Queues the named array for deletion with the next command sent once 
+    client.maxPendingDeletes arrays or client.maxPendingDeleteBytes bytes 
+    are queued. The user should not call this function directly.
+    """
+    global _pendingDeleteBytes
+    _pendingDeletes.append(name)
+    _pendingDeleteBytes += nbytes
+
+def _flush_deletes() -> None:
+    """
+    Deletes the arrays queued by _defer_delete from the server in a single 
+    message. The user should not call this function directly.
+    """
+    global _pendingDeletes, _pendingDeleteBytes
+    if not _pendingDeletes or not connected:
+        return
+    # swap the queue first, since deleting pdarrays may queue more names
+    names, _pendingDeletes = _pendingDeletes, []
+    _pendingDeleteBytes = 0
+    generic_msg("deleteMany {}".format(" ".join(names)))
+
+class _CommandBatch:
+    """
+    The commands queued by batch(), along with the names the client assigned
+    to the arrays they create. The user should not call this class directly.
+    """
+    def __init__(self) -> None:
+        self.depth = 0
+        self.prefix = "b{}_".format(uuid.uuid4().hex[:12])
+        self.count = 0
+        self.clear()
+
+    def clear(self) -> None:
+        self.messages : List[str] = []
+        self.names : List[str] = []
+        # pdarrays awaiting the attributes of the arrays they name
+        self.pending : weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+    def add(self, message : str) -> Optional[str]:
+        """
+        Queues the message if its command can be batched and returns the 
+        reply to hand to the caller, or None if the message must be sent.
+        """
+        cmd = message.split(maxsplit=1)[0]
+        if cmd in BatchCreateCommands:
+            self.count += 1
+            name = "{}{}".format(self.prefix, self.count)
+            reply = "created {} {}".format(name, PendingDtype)
+        elif cmd in BatchNoReplyCommands:
+            name = ""
+            reply = "queued {}".format(cmd)
+        else:
+            return None
+        # send a full batch before queueing, so the caller can register the 
+        # pdarray named in the reply with the batch that creates it
+        if len(self.messages) >= maxBatchCommands:
+            flush_batch()
+        self.messages.append(message)
+        self.names.append(name)
+        return reply
+
+# the active batch, if any
+_batch : Optional[_CommandBatch] = None
+
+@contextmanager
+def batch() -> Iterator[None]:
+    """
+    Queue the commands issued within the context and send them to the 
+    server together, in as few round trips as possible.
+
+    Commands that create a pdarray, such as arithmetic, where and 
+    elementwise functions, return a pdarray immediately whose name is 
+    assigned by the client. Its dtype, size, and other attributes are 
+    fetched by sending the queued commands as soon as one of them is 
+    accessed. Commands whose results the client needs, such as reductions 
+    and transfers, send the queued commands before they run.
+
+    Returns
+    -------
+    Iterator[None]
+
+    Raises
+    ------
+    RuntimeError
+        Raised, on exit from the context or when the queued commands are 
+        sent, if one of them results in a server-side error. Commands 
+        queued after the failing one are not executed.
+
+    See Also
+    --------
+    flush_batch
+
+    Notes
+    -----
+    Batches may be nested, in which case the inner batch joins the outer 
+    one. At most client.maxBatchCommands commands are queued at a time.
+    If the body of the context raises an exception, the commands still 
+    queued are discarded rather than sent, and the exception propagates.
+
+    Examples
+    --------
+    >>> a = ak.arange(0, 10, 1)
+    >>> with ak.batch():
+    ...     b = (a * 2 + 1) / 3
+    ...     c = ak.where(b > 2, b, 0)
+    >>> c.sum()
+    30.0
+    """
+    global _batch
+    if _batch is None:
+        _batch = _CommandBatch()
+    _batch.depth += 1
+    try:
+        yield
+    except BaseException:
+        # Do not send the queue, whose error would hide this one
+        _batch.depth -= 1
+        if _batch.depth == 0:
+            _batch = None
+        raise
+    _batch.depth -= 1
+    if _batch.depth == 0:
+        try:
+            flush_batch()
+        finally:
+            _batch = None
+
+def flush_batch() -> None:
+    """
+    Send the commands queued by batch() to the server in a single message.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeError
+        Raised if one of the commands results in a server-side error
+    """
+    if _batch is None or not _batch.messages:
+        return
+    messages, names, pending = _batch.messages, _batch.names, _batch.pending
+    _batch.clear()
+    message = "batch {} {} {}".format(len(messages), 
+                                      json.dumps(names, separators=(',', ':')),
+                                      json.dumps(messages, ensure_ascii=False))
+    replies = json.loads(cast(str,generic_msg(message)))
+    for name, reply in zip(names, replies):
+        if reply.startswith("Error:"):
+            raise RuntimeError(reply)
+        elif reply.startswith("Warning:"):
+            warnings.warn(reply)
+        pda = pending.get(name) if name else None
+        if pda is not None:
+            pda._resolve(reply)
+
+def _register_pending(pda) -> None:
+    """
+    Registers a pdarray created with a reply from batch() to receive its 
+    attributes when the queued commands are sent. The user should not call
+    this function directly.
+    """
+    if _batch is not None:
+        _batch.pending[pda.name] = pda
+
 def get_config() -> Mapping[str, Union[str, int, float]]:
     """
     Get runtime information about the server.
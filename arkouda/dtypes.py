@@ -11,9 +11,11 @@ structDtypeCodes = {'int64': 'q',
                     'float64': 'd',
                     'bool': '?',
                     'uint8': 'B'}
+# floats are sent with 17 significant digits, which the server reads back
+# exactly, however large or small they are
 NUMBER_FORMAT_STRINGS = {'bool': '{}',
                          'int64': '{:n}',
-                         'float64': '{:.17f}',
+                         'float64': '{:.17g}',
                          'uint8': '{:n}'}
 
 dtype = np.dtype
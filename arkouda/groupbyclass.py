@@ -1,19 +1,19 @@
 from __future__ import annotations
-from typing import cast, List, Sequence, Tuple, Union, TYPE_CHECKING
+from typing import cast, Dict, List, Mapping, Optional, Sequence, Tuple, Union, TYPE_CHECKING
 if TYPE_CHECKING:
     from arkouda.categorical import Categorical
 import numpy as np # type: ignore
 from typeguard import typechecked
 from arkouda.client import generic_msg
-from arkouda.pdarrayclass import pdarray, create_pdarray
+from arkouda.pdarrayclass import pdarray, create_pdarray, _pdarray_from_object
 from arkouda.sorting import argsort, coargsort
 from arkouda.strings import Strings
-from arkouda.pdarraycreation import array, zeros, arange
+from arkouda.pdarraycreation import array, arange, zeros
 from arkouda.pdarraysetops import concatenate
-from arkouda.numeric import cumsum
+from arkouda.numeric import where, cast as akcast
 from arkouda.logger import getArkoudaLogger
 
-__all__ = ["GroupBy"]
+__all__ = ["GroupBy", "IncrementalGroupBy", "HLLSketch", "SpaceSavingSketch"]
 
 class GroupBy:
     """
@@ -26,6 +26,11 @@ class GroupBy:
         The array to group by value, or if list, the column arrays to group by row
     assume_sorted : bool
         If True, assume keys is already sorted (Default: False)
+    method : str
+        How to bring equal keys together: 'sort' sorts the keys, while 
+        'hash' sends each key to an owner locale by its hash and groups 
+        the keys there with a hash table, which is faster but leaves the 
+        groups in no particular order (Default: 'sort')
     logger : ArkoudaLogger
         Used for all logging operations
 
@@ -44,21 +49,38 @@ class GroupBy:
     unique_key_indices : pdarray
         The first index in the raw (ungrouped) keys array(s) where each 
         unique value (row) occurs
+    registered_name : str or None
+        The name the GroupBy is registered under in the arkouda server, if
+        it was registered or attached
 
     Notes
     -----
     Only accepts pdarrays of int64 dtype or Strings.
 
+    With method='hash', unique_keys are not sorted. Strings keys, and rows
+    of more than two key arrays, are grouped by a 128-bit hash, so distinct
+    keys are merged with negligible probability. A single Categorical key 
+    is always grouped by its own codes.
+
     """
     Reductions = frozenset(['sum', 'prod', 'mean',
                             'min', 'max', 'argmin', 'argmax',
-                            'nunique', 'any', 'all'])
+                            'nunique', 'any', 'all',
+                            'var', 'std', 'first', 'last',
+                            'mode', 'median', 'quantile'])
+    Methods = frozenset(['sort', 'hash'])
+    RankMethods = frozenset(['first', 'min', 'dense'])
     def __init__(self, keys : Union[pdarray,Strings,'Categorical',List[Union[pdarray,np.int64,Strings]]], 
-                assume_sorted : bool=False, hash_strings : bool=True) -> None:
+                assume_sorted : bool=False, hash_strings : bool=True, 
+                method : str='sort') -> None:
         from arkouda.categorical import Categorical
+        if method not in self.Methods:
+            raise ValueError("Unsupported method: {}\nMust be one of {}"\
+                             .format(method, self.Methods))
         self.logger = getArkoudaLogger(name=self.__class__.__name__)
         self.assume_sorted = assume_sorted
         self.hash_strings = hash_strings
+        self.registered_name : Optional[str] = None
         self.keys : Union[pdarray,Strings,Categorical]
 
         if isinstance(keys, pdarray):
@@ -67,6 +89,8 @@ class GroupBy:
             self.size = cast(int, keys.size)
             if assume_sorted:
                 self.permutation = cast(pdarray, arange(self.size))
+            elif method == 'hash':
+                self.permutation = self._hash_group([keys])
             else:
                 self.permutation = cast(pdarray, argsort(keys))
         elif hasattr(keys, "group"): # for Strings or Categorical
@@ -75,6 +99,8 @@ class GroupBy:
             self.size = cast(int, self.keys.size) # type: ignore
             if assume_sorted:
                 self.permutation = cast(pdarray,arange(self.size))
+            elif method == 'hash' and isinstance(keys, Strings):
+                self.permutation = self._hash_group([keys])
             else:
                 self.permutation = cast(Union[Strings, Categorical],keys).group()
         else:
@@ -86,12 +112,37 @@ class GroupBy:
                     raise ValueError("Key arrays must all be same size")
             if assume_sorted:
                 self.permutation = cast(pdarray, arange(self.size))
+            elif method == 'hash':
+                self.permutation = self._hash_group(keys)
             else:
                 self.permutation = cast(pdarray, coargsort(cast(Sequence[pdarray],keys)))
             
         # self.permuted_keys = self.keys[self.permutation]
         self.find_segments()       
             
+    def _hash_group(self, keys : Sequence[Union[pdarray,np.int64,Strings,'Categorical']]) \
+                    -> pdarray:
+        """
+        Return the permutation that groups the keys by hash partitioning on 
+        the server. Strings keys are sent as their two hash arrays, and 
+        Categorical keys as their codes.
+        """
+        from arkouda.categorical import Categorical
+        keyobjs : List[pdarray] = []
+        for k in keys:
+            if isinstance(k, Strings):
+                keyobjs.extend(k.hash())
+            elif isinstance(k, Categorical):
+                keyobjs.append(k.codes)
+            else:
+                keyobjs.append(cast(pdarray, k))
+        reqMsg = "{} {:n} {} {}".format("hashGroup",
+                                        len(keyobjs),
+                                        ' '.join(k.name for k in keyobjs),
+                                        ' '.join(k.objtype for k in keyobjs))
+        repMsg = generic_msg(reqMsg)
+        return create_pdarray(cast(str, repMsg))
+
     def find_segments(self) -> None:
         from arkouda.categorical import Categorical
         cmd = "findSegments"
@@ -183,7 +234,8 @@ class GroupBy:
         return self.unique_keys, create_pdarray(repMsg)
     
     @typechecked
-    def aggregate(self, values : pdarray, operator : str, skipna : bool=True) \
+    def aggregate(self, values : pdarray, operator : str, skipna : bool=True,
+                  cache_values : bool=False) \
                     -> Tuple[Union[pdarray,List[Union[pdarray,Strings]]],pdarray]:
         '''
         Using the permutation stored in the GroupBy instance, group another 
@@ -194,7 +246,14 @@ class GroupBy:
         values : pdarray
             The values to group and reduce
         operator: str
-            The name of the reduction operator to use
+            The name of the reduction operator to use, followed by its
+            parameter after a colon for operators that take one, such as
+            'var:1' or 'quantile:0.9'
+        skipna : bool
+            Whether to ignore NaN values in floating point reductions
+        cache_values : bool
+            If True, reuse or keep the values permuted into grouped order on
+            the server, as in GroupBy.agg (Default: False)
 
         Returns
         -------
@@ -215,9 +274,13 @@ class GroupBy:
         if values.size != self.size:
             raise ValueError(("Attempt to group array using key array of " +
                              "different length"))
-        if operator not in self.Reductions:
+        if operator.partition(':')[0] not in self.Reductions:
             raise ValueError(("Unsupported reduction: {}\nMust be one of {}")\
                                   .format(operator, self.Reductions))
+        if cache_values:
+            keys, aggregates = self.agg({values.name: (values, operator)}, 
+                                        skipna=skipna, cache_values=True)
+            return keys, aggregates[values.name][operator]
         if self.assume_sorted:
             permuted_values = values
         else:
@@ -566,7 +629,501 @@ class GroupBy:
         return self.aggregate(values, "all")
 
     @typechecked
-    def broadcast(self, values : pdarray) -> pdarray:
+    def var(self, values : pdarray, ddof : int=0, skipna : bool=True) \
+                    -> Tuple[Union[pdarray,List[Union[pdarray,Strings]]],pdarray]:
+        """
+        Using the permutation stored in the GroupBy instance, group
+        another array of values and compute the variance of each group's
+        values.
+
+        Parameters
+        ----------
+        values : pdarray
+            The values to group and compute the variance of
+        ddof : int
+            "Delta Degrees of Freedom": the divisor used in the calculation
+            is N - ddof, where N is the number of values in the group
+            (Default: 0, as in pdarray.var)
+        skipna : bool
+            Whether to ignore NaN values in floating point reductions
+
+        Returns
+        -------
+        unique_keys : (list of) pdarray or Strings
+            The unique keys, in grouped order
+        group_variances : pdarray, float64
+            One variance per unique key in the GroupBy instance
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size,
+            or if ddof is negative
+
+        Notes
+        -----
+        The return dtype is always float64. Groups with no more than ddof
+        values have a variance of NaN.
+        """
+        if ddof < 0:
+            raise ValueError("ddof must be a non-negative integer")
+        return self.aggregate(values, "var:{}".format(ddof), skipna)
+
+    @typechecked
+    def std(self, values : pdarray, ddof : int=0, skipna : bool=True) \
+                    -> Tuple[Union[pdarray,List[Union[pdarray,Strings]]],pdarray]:
+        """
+        Using the permutation stored in the GroupBy instance, group
+        another array of values and compute the standard deviation of
+        each group's values.
+
+        Parameters
+        ----------
+        values : pdarray
+            The values to group and compute the standard deviation of
+        ddof : int
+            "Delta Degrees of Freedom": the divisor used in the calculation
+            is N - ddof, where N is the number of values in the group
+            (Default: 0, as in pdarray.std)
+        skipna : bool
+            Whether to ignore NaN values in floating point reductions
+
+        Returns
+        -------
+        unique_keys : (list of) pdarray or Strings
+            The unique keys, in grouped order
+        group_stds : pdarray, float64
+            One standard deviation per unique key in the GroupBy instance
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size,
+            or if ddof is negative
+
+        Notes
+        -----
+        The return dtype is always float64.
+        """
+        if ddof < 0:
+            raise ValueError("ddof must be a non-negative integer")
+        return self.aggregate(values, "std:{}".format(ddof), skipna)
+
+    def first(self, values : pdarray) \
+                    -> Tuple[Union[pdarray,List[Union[pdarray,Strings]]],pdarray]:
+        """
+        Using the permutation stored in the GroupBy instance, group
+        another array of values and return the first value of each group,
+        in the original order of the values.
+
+        Parameters
+        ----------
+        values : pdarray
+            The values to group and take the first value of
+
+        Returns
+        -------
+        unique_keys : (list of) pdarray or Strings
+            The unique keys, in grouped order
+        group_first : pdarray
+            One value per unique key in the GroupBy instance
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size
+        """
+        return self.aggregate(values, "first")
+
+    def last(self, values : pdarray) \
+                    -> Tuple[Union[pdarray,List[Union[pdarray,Strings]]],pdarray]:
+        """
+        Using the permutation stored in the GroupBy instance, group
+        another array of values and return the last value of each group,
+        in the original order of the values.
+
+        Parameters
+        ----------
+        values : pdarray
+            The values to group and take the last value of
+
+        Returns
+        -------
+        unique_keys : (list of) pdarray or Strings
+            The unique keys, in grouped order
+        group_last : pdarray
+            One value per unique key in the GroupBy instance
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size
+        """
+        return self.aggregate(values, "last")
+
+    def mode(self, values : pdarray) \
+                    -> Tuple[Union[pdarray,List[Union[pdarray,Strings]]],pdarray]:
+        """
+        Using the permutation stored in the GroupBy instance, group
+        another array of values and return the most frequent value of
+        each group. 
+
+        Parameters
+        ----------
+        values : pdarray, int64 or float64
+            The values to group and find the most frequent value of
+
+        Returns
+        -------
+        unique_keys : (list of) pdarray or Strings
+            The unique keys, in grouped order
+        group_modes : pdarray
+            One value per unique key in the GroupBy instance
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size
+
+        Notes
+        -----
+        If several values are equally frequent, the smallest is returned.
+        """
+        return self.aggregate(values, "mode")
+
+    def median(self, values : pdarray, skipna : bool=True) \
+                    -> Tuple[Union[pdarray,List[Union[pdarray,Strings]]],pdarray]:
+        """
+        Using the permutation stored in the GroupBy instance, group
+        another array of values and compute the median of each group's
+        values.
+
+        Parameters
+        ----------
+        values : pdarray, int64 or float64
+            The values to group and compute the median of
+        skipna : bool
+            Whether to ignore NaN values in floating point reductions
+
+        Returns
+        -------
+        unique_keys : (list of) pdarray or Strings
+            The unique keys, in grouped order
+        group_medians : pdarray, float64
+            One median per unique key in the GroupBy instance
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size
+
+        Notes
+        -----
+        The return dtype is always float64. The median of a group with an
+        even number of values is the mean of the two middle values.
+        """
+        return self.aggregate(values, "median", skipna)
+
+    @typechecked
+    def quantile(self, values : pdarray, q : Union[float,int], skipna : bool=True) \
+                    -> Tuple[Union[pdarray,List[Union[pdarray,Strings]]],pdarray]:
+        """
+        Using the permutation stored in the GroupBy instance, group
+        another array of values and compute the q'th quantile of each
+        group's values.
+
+        Parameters
+        ----------
+        values : pdarray, int64 or float64
+            The values to group and compute the quantile of
+        q : float
+            The quantile to compute, between 0 and 1 inclusive
+        skipna : bool
+            Whether to ignore NaN values in floating point reductions
+
+        Returns
+        -------
+        unique_keys : (list of) pdarray or Strings
+            The unique keys, in grouped order
+        group_quantiles : pdarray, float64
+            One quantile per unique key in the GroupBy instance
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size,
+            or if q is not between 0 and 1
+
+        Notes
+        -----
+        The return dtype is always float64. Like numpy.quantile, the 
+        quantile is interpolated linearly between the two nearest values
+        of the group.
+
+        Examples
+        --------
+        >>> g = ak.GroupBy(ak.array([0, 1, 0, 1, 0]))
+        >>> g.quantile(ak.array([1, 2, 3, 4, 5]), 0.25)
+        (array([0, 1]), array([2, 2.5]))
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        return self.aggregate(values, "quantile:{!r}".format(float(q)), skipna)
+
+    @typechecked
+    def agg(self, aggregations : Mapping[str,Tuple[pdarray,Union[str,Sequence[str]]]],
+            skipna : bool=True, cache_values : bool=False) \
+            -> Tuple[Union[pdarray,List[Union[pdarray,Strings]]],Dict[str,Dict[str,pdarray]]]:
+        """
+        Group several arrays of values and apply several reductions to each,
+        in a single request to the server. Each values array is permuted
+        into grouped order only once, no matter how many reductions are
+        applied to it.
+
+        Parameters
+        ----------
+        aggregations : Mapping[str,Tuple[pdarray,Union[str,Sequence[str]]]]
+            Maps a column name to the values to group and the name(s) of
+            the reduction operator(s) to apply to them
+        skipna : bool
+            Whether to ignore NaN values in floating point reductions
+        cache_values : bool
+            If True, the server keeps the values permuted into grouped order
+            and reuses them for later requests that also set cache_values,
+            until either the values or this GroupBy's permutation change or
+            are deleted (Default: False)
+
+        Returns
+        -------
+        unique_keys : [Union[pdarray,List[Union[pdarray,Strings]]]
+            The unique keys, in grouped order
+        aggregates : Dict[str,Dict[str,pdarray]]
+            For each column name, maps each operator name to an array with
+            one aggregate value per unique key in the GroupBy instance
+
+        Raises
+        ------
+        TypeError
+            Raised if a values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match a values size, if
+            an operator is not in the GroupBy.Reductions array, or if no
+            aggregations are requested
+
+        Examples
+        --------
+        >>> g = ak.GroupBy(ak.array([0, 1, 0, 1, 0]))
+        >>> keys, aggs = g.agg({'v': (ak.array([1, 2, 3, 4, 5]), ['sum', 'max'])})
+        >>> aggs['v']['sum']
+        array([9, 6])
+        >>> aggs['v']['max']
+        array([5, 4])
+        """
+        pairs : List[Tuple[str,pdarray,str]] = []
+        for col, (values, operators) in aggregations.items():
+            if values.size != self.size:
+                raise ValueError(("Attempt to group array using key array of " +
+                                 "different length"))
+            if isinstance(operators, str):
+                operators = [operators]
+            for operator in operators:
+                if operator.partition(':')[0] not in self.Reductions:
+                    raise ValueError(("Unsupported reduction: {}\nMust be one of {}")\
+                                      .format(operator, self.Reductions))
+                pairs.append((col, values, operator))
+        if len(pairs) == 0:
+            raise ValueError("No aggregations requested")
+        # Sorted keys need no permutation, so the server reduces the values as is
+        if self.assume_sorted:
+            permName = 'None'
+        else:
+            permName = cast(pdarray, self.permutation).name
+        reqMsg = "segmentedMultiReduction {} {} {} {} {} {}".format(permName,
+                                         cast(pdarray, self.segments).name,
+                                         skipna,
+                                         cache_values,
+                                         len(pairs),
+                                         ' '.join("{} {}".format(values.name, operator)
+                                                  for _, values, operator in pairs))
+        repMsg = generic_msg(reqMsg)
+        self.logger.debug(repMsg)
+        objects = getattr(repMsg, 'objects', None)
+        if objects:
+            results = [_pdarray_from_object(obj) for obj in objects]
+        else:
+            results = [create_pdarray(msg) for msg in cast(str, repMsg).split(' , ')]
+        aggregates : Dict[str,Dict[str,pdarray]] = {}
+        for (col, _, operator), result in zip(pairs, results):
+            aggregates.setdefault(col, {})[operator] = result
+        return self.unique_keys, aggregates
+
+    @typechecked
+    def register(self, user_defined_name : str) -> GroupBy:
+        """
+        Register the permutation, segments and unique keys of this GroupBy 
+        with user defined names in the arkouda server, so that the grouping 
+        can be attached to later using GroupBy.attach() instead of being
+        recomputed
+
+        Parameters
+        ----------
+        user_defined_name : str
+            user defined name the GroupBy is to be registered under
+
+        Returns
+        -------
+        GroupBy
+            GroupBy which points to the registered arrays
+
+        Raises
+        ------
+        TypeError
+            Raised if user_defined_name is not a str, or if the unique keys
+            are neither pdarrays nor Strings
+
+        See also
+        --------
+        attach, unregister
+
+        Notes
+        -----
+        The arrays are registered as "<user_defined_name>_permutation",
+        "<user_defined_name>_segments" and "<user_defined_name>_unique_keys_<i>",
+        along with a small array describing the grouping. The key arrays 
+        themselves are not registered.
+
+        Examples
+        --------
+        >>> g = ak.GroupBy(ak.array([0, 1, 0, 1, 0]))
+        >>> r = g.register("my_grouping")
+        >>> # potentially disconnect from server and reconnect to server
+        >>> h = ak.GroupBy.attach("my_grouping")
+        >>> h.count()
+        (array([0, 1]), array([3, 2]))
+        >>> h.unregister()
+        """
+        uniques = self.unique_keys if self.nkeys > 1 else [self.unique_keys]
+        for k in uniques:
+            if not isinstance(k, (pdarray, Strings)):
+                raise TypeError("Only GroupBy objects with pdarray or Strings keys " +
+                                "can be registered, not {}".format(type(k).__name__))
+        kinds = [1 if isinstance(k, Strings) else 0 for k in uniques]
+        array([self.size, self.nkeys, int(self.assume_sorted)] + kinds)\
+                    .register('{}_groupby'.format(user_defined_name))
+        unique_keys = [k.register('{}_unique_keys_{}'.format(user_defined_name, i))
+                       for i, k in enumerate(uniques)]
+        g = GroupBy._from_arrays(self.permutation.register('{}_permutation'.\
+                                                           format(user_defined_name)),
+                                 self.segments.register('{}_segments'.\
+                                                        format(user_defined_name)),
+                                 unique_keys, self.size, self.nkeys, self.assume_sorted)
+        g.keys = self.keys
+        g.hash_strings = self.hash_strings
+        g.registered_name = user_defined_name
+        return g
+
+    def unregister(self) -> None:
+        """
+        Unregister the arrays of a GroupBy in the arkouda server which was 
+        previously registered using register() and/or attached to using 
+        attach()
+
+        Raises
+        ------
+        RuntimeError
+            Raised if the GroupBy was not registered or attached
+
+        See also
+        --------
+        register, attach
+        """
+        if self.registered_name is None:
+            raise RuntimeError("GroupBy is not registered")
+        pdarray.attach('{}_groupby'.format(self.registered_name)).unregister()
+        uniques = self.unique_keys if self.nkeys > 1 else [self.unique_keys]
+        for k in uniques:
+            k.unregister()
+        self.permutation.unregister()
+        self.segments.unregister()
+        self.registered_name = None
+
+    @staticmethod
+    def attach(user_defined_name : str) -> GroupBy:
+        """
+        Return a GroupBy attached to the arrays registered in the arkouda
+        server using register()
+
+        Parameters
+        ----------
+        user_defined_name : str
+            user defined name which the GroupBy was registered under
+
+        Returns
+        -------
+        GroupBy
+            GroupBy which points to the registered arrays. Its keys 
+            attribute is None, since the key arrays are not registered.
+
+        Raises
+        ------
+        TypeError
+            Raised if user_defined_name is not a str
+        RuntimeError
+            Raised if no GroupBy is registered under user_defined_name
+
+        See also
+        --------
+        register, unregister
+        """
+        meta = pdarray.attach('{}_groupby'.format(user_defined_name)).to_ndarray()
+        size, nkeys, assume_sorted = (int(x) for x in meta[:3])
+        unique_keys = [Strings.attach('{}_unique_keys_{}'.format(user_defined_name, i))
+                       if kind == 1 else
+                       pdarray.attach('{}_unique_keys_{}'.format(user_defined_name, i))
+                       for i, kind in enumerate(meta[3:])]
+        g = GroupBy._from_arrays(pdarray.attach('{}_permutation'.format(user_defined_name)),
+                                 pdarray.attach('{}_segments'.format(user_defined_name)),
+                                 unique_keys, size, nkeys, bool(assume_sorted))
+        g.registered_name = user_defined_name
+        return g
+
+    @classmethod
+    def _from_arrays(cls, permutation : pdarray, segments : pdarray, 
+                     unique_keys : List[Union[pdarray,Strings]], size : int, 
+                     nkeys : int, assume_sorted : bool) -> GroupBy:
+        """
+        Return a GroupBy made of already computed arrays, without keys. 
+        The user should not call this function directly.
+        """
+        g = cls.__new__(cls)
+        g.logger = getArkoudaLogger(name=cls.__name__)
+        g.assume_sorted = assume_sorted
+        g.hash_strings = True
+        g.keys = None # type: ignore
+        g.nkeys = nkeys
+        g.size = size
+        g.permutation = permutation
+        g.segments = segments
+        g.unique_keys = unique_keys if nkeys > 1 else unique_keys[0] # type: ignore
+        g.registered_name = None
+        return g
+
+    @typechecked
+    def broadcast(self, values : pdarray, permute : bool=False) -> pdarray:
         """
         Fill each group's segment with a constant value.
 
@@ -574,6 +1131,10 @@ class GroupBy:
         ----------
         values : pdarray
             The values to put in each group's segment
+        permute : bool
+            If True, return the values in the original order of the array 
+            on which GroupBy was called instead of in grouped order 
+            (Default: False)
 
         Returns
         -------
@@ -595,9 +1156,9 @@ class GroupBy:
         this function takes a (dense) column vector and replicates
         each value to the non-zero elements in the corresponding row.
 
-        The returned array is in permuted (grouped) order. To get
-        back to the order of the array on which GroupBy was called,
-        the user must invert the permutation (see below).
+        The returned array is in permuted (grouped) order, unless
+        permute is True, in which case the server writes each value
+        straight to the original positions of its group's elements.
 
         Examples
         --------
@@ -608,10 +1169,8 @@ class GroupBy:
         >>> g.broadcast(values)
         array([3, 3, 3, 5, 5]
 
-        >>> b = ak.zeros_like(a)
         # Result is in original order
-        >>> b[g.permutation] = g.broadcast(values)
-        >>> b
+        >>> g.broadcast(values, permute=True)
         array([3, 5, 3, 5, 3])
         
         >>> a = ak.randint(1,5,10)
@@ -633,9 +1192,1304 @@ class GroupBy:
             values = 1*values
         if values.size != self.segments.size:
             raise ValueError("Must have one value per segment")
-        temp = zeros(self.size, values.dtype)
-        if values.size == 0:
-            return temp
-        diffs = concatenate((array([values[0]]), values[1:] - values[:-1]))
-        temp[self.segments] = diffs
-        return cumsum(temp)
+        if permute and not self.assume_sorted:
+            permName = cast(pdarray, self.permutation).name
+        else:
+            permName = 'None'
+        reqMsg = "{} {} {} {} {}".format("broadcast",
+                                         permName,
+                                         cast(pdarray, self.segments).name,
+                                         values.name,
+                                         self.size)
+        repMsg = generic_msg(reqMsg)
+        self.logger.debug(repMsg)
+        return create_pdarray(cast(str, repMsg))
+
+    @typechecked
+    def transform(self, values : pdarray, operator : str, skipna : bool=True) -> pdarray:
+        """
+        Reduce each group's values and fill the group's elements with the
+        result, in the original order of the values. This is the same as
+        ``g.broadcast(g.aggregate(values, operator)[1], permute=True)``, 
+        done by the server in one request.
+
+        Parameters
+        ----------
+        values : pdarray
+            The values to group and reduce
+        operator: str
+            The name of the reduction operator to use
+        skipna : bool
+            Whether to ignore NaN values in floating point reductions
+
+        Returns
+        -------
+        pdarray
+            The reduced value of each element's group, in the original 
+            order of the values
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size or
+            if the operator is not in the GroupBy.Reductions array
+
+        Examples
+        --------
+        >>> g = ak.GroupBy(ak.array([0, 1, 0, 1, 0]))
+        >>> g.transform(ak.array([1, 2, 3, 4, 5]), 'sum')
+        array([9, 6, 9, 6, 9])
+        """
+        if values.size != self.size:
+            raise ValueError(("Attempt to group array using key array of " +
+                             "different length"))
+        if operator.partition(':')[0] not in self.Reductions:
+            raise ValueError(("Unsupported reduction: {}\nMust be one of {}")\
+                                  .format(operator, self.Reductions))
+        if self.assume_sorted:
+            permName = 'None'
+        else:
+            permName = cast(pdarray, self.permutation).name
+        reqMsg = "{} {} {} {} {} {}".format("segmentedTransform",
+                                            permName,
+                                            cast(pdarray, self.segments).name,
+                                            values.name,
+                                            operator,
+                                            skipna)
+        repMsg = generic_msg(reqMsg)
+        self.logger.debug(repMsg)
+        return create_pdarray(cast(str, repMsg))
+
+    def _scan(self, values : Optional[pdarray], operator : str, 
+              skipna : bool=True) -> pdarray:
+        """
+        Send a segmentedScan request for the values and return the result,
+        in the original order of the values.
+        """
+        if values is not None and values.size != self.size:
+            raise ValueError(("Attempt to group array using key array of " +
+                             "different length"))
+        if self.assume_sorted:
+            permName = 'None'
+        else:
+            permName = cast(pdarray, self.permutation).name
+        reqMsg = "{} {} {} {} {} {} {}".format("segmentedScan",
+                                               permName,
+                                               cast(pdarray, self.segments).name,
+                                               'None' if values is None else values.name,
+                                               operator,
+                                               skipna,
+                                               self.size)
+        repMsg = generic_msg(reqMsg)
+        self.logger.debug(repMsg)
+        return create_pdarray(cast(str, repMsg))
+
+    @typechecked
+    def cumsum(self, values : pdarray, skipna : bool=True) -> pdarray:
+        """
+        Compute the cumulative sum of each group's values, in the order
+        of the values within the group.
+
+        Parameters
+        ----------
+        values : pdarray
+            The values to group and sum
+        skipna : bool
+            Whether to skip NaN values, which are then NaN in the result
+            without interrupting the sum
+
+        Returns
+        -------
+        pdarray
+            The sum of each value and the values before it in its group,
+            in the original order of the values
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size
+
+        Notes
+        -----
+        Bool values are summed as int64.
+
+        Examples
+        --------
+        >>> g = ak.GroupBy(ak.array([0, 1, 0, 1, 0]))
+        >>> g.cumsum(ak.array([1, 2, 3, 4, 5]))
+        array([1, 2, 4, 6, 9])
+        """
+        return self._scan(values, "cumsum", skipna)
+
+    @typechecked
+    def cumprod(self, values : pdarray, skipna : bool=True) -> pdarray:
+        """
+        Compute the cumulative product of each group's values, in the
+        order of the values within the group.
+
+        Parameters
+        ----------
+        values : pdarray
+            The values to group and multiply
+        skipna : bool
+            Whether to skip NaN values, which are then NaN in the result
+            without interrupting the product
+
+        Returns
+        -------
+        pdarray
+            The product of each value and the values before it in its
+            group, in the original order of the values
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size
+        """
+        return self._scan(values, "cumprod", skipna)
+
+    @typechecked
+    def cummin(self, values : pdarray, skipna : bool=True) -> pdarray:
+        """
+        Compute the cumulative minimum of each group's values, in the
+        order of the values within the group.
+
+        Parameters
+        ----------
+        values : pdarray
+            The values to group and compare
+        skipna : bool
+            Whether to skip NaN values, which are then NaN in the result
+
+        Returns
+        -------
+        pdarray
+            The minimum of each value and the values before it in its
+            group, in the original order of the values
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size
+        """
+        return self._scan(values, "cummin", skipna)
+
+    @typechecked
+    def cummax(self, values : pdarray, skipna : bool=True) -> pdarray:
+        """
+        Compute the cumulative maximum of each group's values, in the
+        order of the values within the group.
+
+        Parameters
+        ----------
+        values : pdarray
+            The values to group and compare
+        skipna : bool
+            Whether to skip NaN values, which are then NaN in the result
+
+        Returns
+        -------
+        pdarray
+            The maximum of each value and the values before it in its
+            group, in the original order of the values
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size
+        """
+        return self._scan(values, "cummax", skipna)
+
+    def cumcount(self) -> pdarray:
+        """
+        Number each element within its group, from 0 to the group size - 1.
+
+        Returns
+        -------
+        pdarray, int64
+            The position of each element within its group, in the original
+            order of the elements
+
+        Examples
+        --------
+        >>> g = ak.GroupBy(ak.array([0, 1, 0, 1, 0]))
+        >>> g.cumcount()
+        array([0, 0, 1, 1, 2])
+        """
+        return self._scan(None, "cumcount")
+
+    @typechecked
+    def rank(self, values : pdarray, method : str='first') -> pdarray:
+        """
+        Rank each value within its group, from 1 for the smallest.
+
+        Parameters
+        ----------
+        values : pdarray
+            The values to group and rank
+        method : str
+            How to rank equal values: 'first' ranks them in the order they
+            appear, 'min' gives them all the lowest of their ranks, and
+            'dense' does the same, but ranks distinct values consecutively
+            (Default: 'first')
+
+        Returns
+        -------
+        pdarray, int64
+            The rank of each value within its group, in the original order
+            of the values
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size,
+            or if the method is not supported
+
+        Examples
+        --------
+        >>> g = ak.GroupBy(ak.array([0, 0, 0, 1, 1]))
+        >>> g.rank(ak.array([5, 3, 5, 2, 1]), method='min')
+        array([2, 1, 2, 2, 1])
+        """
+        if method not in self.RankMethods:
+            raise ValueError("Unsupported rank method: {}\nMust be one of {}"\
+                             .format(method, self.RankMethods))
+        return self._scan(values, "rank:{}".format(method))
+
+    @typechecked
+    def shift(self, values : pdarray, periods : int=1, 
+              fill_value : Optional[Union[int,float,bool]]=None) -> pdarray:
+        """
+        Shift each group's values by a number of positions within the group.
+
+        Parameters
+        ----------
+        values : pdarray
+            The values to group and shift
+        periods : int
+            The number of positions to shift by: each element gets the
+            value that many positions before it in its group, or after it
+            if periods is negative (Default: 1)
+        fill_value : int, float or bool
+            The value of the elements with no value to shift in (Default:
+            NaN for float64 values, 0 otherwise)
+
+        Returns
+        -------
+        pdarray
+            The shifted values, in the original order of the values, with
+            the dtype of the values, or int64 for bool values
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size
+
+        Examples
+        --------
+        >>> g = ak.GroupBy(ak.array([0, 1, 0, 1, 0]))
+        >>> g.shift(ak.array([1, 2, 3, 4, 5]))
+        array([0, 0, 1, 2, 3])
+        """
+        operator = "shift:{}".format(periods)
+        if fill_value is not None and not (isinstance(fill_value, float) and 
+                                           np.isnan(fill_value)):
+            operator += ":{}".format(int(fill_value) if isinstance(fill_value, bool)
+                                     else fill_value)
+        return self._scan(values, operator)
+
+    @typechecked
+    def diff(self, values : pdarray, periods : int=1) -> pdarray:
+        """
+        Compute the difference of each value and the value a number of
+        positions before it in its group.
+
+        Parameters
+        ----------
+        values : pdarray
+            The values to group and difference
+        periods : int
+            The number of positions back to take the difference with, or
+            forward if negative (Default: 1)
+
+        Returns
+        -------
+        pdarray, float64
+            The differences, in the original order of the values, NaN for
+            the elements with no value that many positions away in the group
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size
+
+        Examples
+        --------
+        >>> g = ak.GroupBy(ak.array([0, 1, 0, 1, 0]))
+        >>> g.diff(ak.array([1, 2, 4, 8, 16]))
+        array([nan, nan, 3, 6, 12])
+        """
+        return self._scan(values, "diff:{}".format(periods))
+
+    @typechecked
+    def rolling_sum(self, values : pdarray, window : int, skipna : bool=True) -> pdarray:
+        """
+        Sum each value and the window - 1 values before it in its group.
+
+        Parameters
+        ----------
+        values : pdarray
+            The values to group and sum
+        window : int
+            The number of values in each window; the first elements of a
+            group sum the fewer values there are
+        skipna : bool
+            Whether to leave NaN values out of the sums
+
+        Returns
+        -------
+        pdarray
+            The sum of each element's window, in the original order of the
+            values
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size,
+            or if window is not positive
+
+        Examples
+        --------
+        >>> g = ak.GroupBy(ak.array([0, 0, 0, 0, 1]))
+        >>> g.rolling_sum(ak.array([1, 2, 3, 4, 5]), 2)
+        array([1, 3, 5, 7, 5])
+        """
+        if window < 1:
+            raise ValueError("window must be positive")
+        return self._scan(values, "rolling_sum:{}".format(window), skipna)
+
+    @typechecked
+    def rolling_mean(self, values : pdarray, window : int, skipna : bool=True) -> pdarray:
+        """
+        Average each value and the window - 1 values before it in its group.
+
+        Parameters
+        ----------
+        values : pdarray
+            The values to group and average
+        window : int
+            The number of values in each window; the first elements of a
+            group average the fewer values there are
+        skipna : bool
+            Whether to leave NaN values out of the means
+
+        Returns
+        -------
+        pdarray, float64
+            The mean of each element's window, in the original order of the
+            values
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size,
+            or if window is not positive
+        """
+        if window < 1:
+            raise ValueError("window must be positive")
+        return self._scan(values, "rolling_mean:{}".format(window), skipna)
+
+    @typechecked
+    def topk(self, values : pdarray, k : int,
+             largest : bool=True) -> Tuple[pdarray,pdarray]:
+        """
+        Find the indices of the k largest (or smallest) values of each group.
+
+        Parameters
+        ----------
+        values : pdarray
+            The values to group and select from (int64 or float64)
+        k : int
+            The number of values to select from each group; groups with
+            fewer values give all of them
+        largest : bool
+            Whether to select the largest values instead of the smallest
+
+        Returns
+        -------
+        segments : pdarray, int64
+            The start of the indices of each group, in the order of
+            unique_keys
+        indices : pdarray, int64
+            The indices of the selected values, in ascending order of the
+            values within each group, and equal values in order of their
+            index
+
+        Raises
+        ------
+        TypeError
+            Raised if the values array is not a pdarray object
+        ValueError
+            Raised if the key array size does not match the values size,
+            or if k < 1
+
+        Examples
+        --------
+        >>> g = ak.GroupBy(ak.array([0, 1, 0, 1, 0]))
+        >>> segments, indices = g.topk(ak.array([5, 2, 9, 7, 1]), 2)
+        >>> segments
+        array([0, 2])
+        >>> indices
+        array([0, 2, 1, 3])
+        """
+        if values.size != self.size:
+            raise ValueError(("Attempt to group array using key array of " +
+                             "different length"))
+        if k < 1:
+            raise ValueError('k must be 1 or greater')
+        if self.assume_sorted:
+            permName = 'None'
+        else:
+            permName = cast(pdarray, self.permutation).name
+        reqMsg = "{} {} {} {} {} {} {}".format("segmentedTopK",
+                                               permName,
+                                               cast(pdarray, self.segments).name,
+                                               values.name,
+                                               k,
+                                               largest,
+                                               self.size)
+        repMsg = generic_msg(reqMsg)
+        self.logger.debug(repMsg)
+        segAttr, idxAttr = cast(str, repMsg).split("+")
+        return create_pdarray(segAttr), create_pdarray(idxAttr)
+
+    def _grouped_int_values(self, values : pdarray) -> pdarray:
+        """
+        Return int64 values permuted into grouped order, for the sketches.
+        """
+        if values.size != self.size:
+            raise ValueError(("Attempt to group array using key array of " +
+                             "different length"))
+        if values.dtype != np.int64:
+            raise TypeError("Sketches only support int64 values, not {}".format(values.dtype))
+        if self.assume_sorted:
+            return values
+        return cast(pdarray, values[cast(pdarray, self.permutation)])
+
+    @typechecked
+    def hll(self, values : pdarray, precision : int=12) -> HLLSketch:
+        """
+        Build a HyperLogLog sketch of each group's values, from which the
+        number of distinct values of each group can be estimated, and which
+        can be merged with sketches of other values.
+
+        Parameters
+        ----------
+        values : pdarray, int64
+            The values to group and sketch
+        precision : int
+            Each sketch has 2**precision registers, between 2**4 and 2**16,
+            and estimates have a relative standard error of about 
+            1.04/sqrt(2**precision) (Default: 12)
+
+        Returns
+        -------
+        HLLSketch
+            The sketches of the groups, one per unique key
+
+        Raises
+        ------
+        TypeError
+            Raised if the values are not an int64 pdarray
+        ValueError
+            Raised if the key array size does not match the values size, or
+            if precision is out of range
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        reqMsg = "segmentedHLL {} {} {}".format(self._grouped_int_values(values).name,
+                                                cast(pdarray, self.segments).name,
+                                                precision)
+        repMsg = generic_msg(reqMsg)
+        self.logger.debug(repMsg)
+        return HLLSketch(self.unique_keys, self.nkeys, precision, 
+                         [create_pdarray(cast(str, repMsg))])
+
+    @typechecked
+    def nunique_approx(self, values : pdarray, precision : int=12) \
+                    -> Tuple[Union[pdarray,List[Union[pdarray,Strings]]],pdarray]:
+        """
+        Using the permutation stored in the GroupBy instance, group another
+        array of values and estimate the number of unique values in each 
+        group with HyperLogLog sketches, which is much faster than nunique 
+        for groups with many values.
+
+        Parameters
+        ----------
+        values : pdarray, int64
+            The values to group and count unique values of
+        precision : int
+            Each sketch has 2**precision registers, between 2**4 and 2**16
+            (Default: 12)
+
+        Returns
+        -------
+        unique_keys : (list of) pdarray or Strings
+            The unique keys, in grouped order
+        group_nunique : pdarray, int64
+            Estimated number of unique values per unique key
+
+        Raises
+        ------
+        TypeError
+            Raised if the values are not an int64 pdarray
+        ValueError
+            Raised if the key array size does not match the values size, or
+            if precision is out of range
+
+        See Also
+        --------
+        nunique, hll
+
+        Notes
+        -----
+        The estimates have a relative standard error of about 
+        1.04/sqrt(2**precision), or 1.6% with the default precision, and 
+        small counts are nearly exact.
+        """
+        return self.hll(values, precision).estimate()
+
+    @typechecked
+    def spacesaving(self, values : pdarray, sketch_size : int) -> SpaceSavingSketch:
+        """
+        Build a SpaceSaving sketch of each group's values, which counts the 
+        sketch_size most frequent values of the group, and can be merged 
+        with sketches of other values.
+
+        Parameters
+        ----------
+        values : pdarray, int64
+            The values to group and sketch
+        sketch_size : int
+            The number of values counted per group
+
+        Returns
+        -------
+        SpaceSavingSketch
+            The sketches of the groups, one per unique key
+
+        Raises
+        ------
+        TypeError
+            Raised if the values are not an int64 pdarray
+        ValueError
+            Raised if the key array size does not match the values size, or
+            if sketch_size is not positive
+        """
+        if sketch_size < 1:
+            raise ValueError("sketch_size must be positive")
+        reqMsg = "segmentedSpaceSaving {} {} {}".format(self._grouped_int_values(values).name,
+                                                        cast(pdarray, self.segments).name,
+                                                        sketch_size)
+        repMsg = generic_msg(reqMsg)
+        self.logger.debug(repMsg)
+        items, counts = (create_pdarray(msg) for msg in cast(str, repMsg).split(' , '))
+        return SpaceSavingSketch(self.unique_keys, self.nkeys, sketch_size, [items, counts])
+
+    @typechecked
+    def topk_approx(self, values : pdarray, k : int, sketch_size : Optional[int]=None) \
+                    -> Tuple[Union[pdarray,List[Union[pdarray,Strings]]],pdarray,pdarray]:
+        """
+        Using the permutation stored in the GroupBy instance, group another
+        array of values and find the k most frequent values of each group,
+        approximately, with SpaceSaving sketches.
+
+        Parameters
+        ----------
+        values : pdarray, int64
+            The values to group and find the most frequent values of
+        k : int
+            The number of values to return per group
+        sketch_size : int
+            The number of values counted per group, at least k. Larger 
+            sketches are more accurate (Default: 4*k)
+
+        Returns
+        -------
+        unique_keys : (list of) pdarray or Strings
+            The unique keys, in grouped order
+        top_values : pdarray, int64
+            k values per unique key, one key after another, most frequent
+            first
+        top_counts : pdarray, int64
+            The (over)estimated count of each of top_values. Groups with
+            fewer than k distinct values are padded with counts of zero.
+
+        Raises
+        ------
+        TypeError
+            Raised if the values are not an int64 pdarray
+        ValueError
+            Raised if the key array size does not match the values size, or
+            if k is not positive or larger than sketch_size
+
+        See Also
+        --------
+        spacesaving
+
+        Notes
+        -----
+        Groups with no more than sketch_size distinct values are counted 
+        exactly. Otherwise each count is overestimated by at most the 
+        group's size divided by sketch_size.
+
+        Examples
+        --------
+        >>> g = ak.GroupBy(ak.array([0, 0, 0, 1, 1]))
+        >>> g.topk_approx(ak.array([7, 8, 7, 9, 9]), 1)
+        (array([0, 1]), array([7, 9]), array([2, 2]))
+        """
+        if sketch_size is None:
+            sketch_size = 4*k
+        if not 0 < k <= sketch_size:
+            raise ValueError("k must be positive and no larger than sketch_size")
+        return self.spacesaving(values, sketch_size).topk(k)
+
+class IncrementalGroupBy:
+    """
+    Aggregate values by key over batches of rows that arrive over time,
+    keeping one partial aggregate per unique key on the arkouda server. 
+    Each update merges a batch into the partial aggregates, so its cost
+    depends on the size of the batch and the number of unique keys, but 
+    not on the number of rows aggregated so far.
+
+    Parameters
+    ----------
+    aggregations : Mapping[str,Union[str,Sequence[str]]]
+        Maps the name of each values column to the name(s) of the 
+        aggregations to keep for it, from IncrementalGroupBy.Aggregations
+    sketch_size : int
+        Number of smallest value hashes kept per key to estimate nunique
+        (Default: 256)
+
+    Attributes
+    ----------
+    nkeys : int
+        The number of key arrays (columns), once a batch has been added
+    size : int
+        The total number of rows added
+    unique_keys : (list of) pdarray or Strings
+        The unique keys seen so far, in grouped order
+    counts : pdarray
+        The number of rows added for each unique key
+
+    Notes
+    -----
+    count, sum, min and max are exact, and mean is derived from sum and 
+    count. nunique keeps the sketch_size smallest distinct 64-bit hashes of
+    the values of each key (a k-minimum-values sketch). It is exact for keys
+    with fewer distinct values than that, and otherwise has a relative
+    standard error of about 1/sqrt(sketch_size - 2). nunique only supports
+    int64 values.
+
+    Examples
+    --------
+    >>> ig = ak.IncrementalGroupBy({'bytes': ['sum', 'max'], 'dst': 'nunique'})
+    >>> ig.update(ak.array([0, 1, 0]), {'bytes': ak.array([10, 20, 30]),
+    ...                                 'dst': ak.array([5, 5, 6])})
+    >>> ig.update(ak.array([1, 2]), {'bytes': ak.array([40, 50]),
+    ...                              'dst': ak.array([7, 8])})
+    >>> ig.count()
+    (array([0, 1, 2]), array([2, 2, 1]))
+    >>> ig.aggregate('bytes', 'sum')
+    (array([0, 1, 2]), array([40, 60, 50]))
+    >>> ig.aggregate('dst', 'nunique')
+    (array([0, 1, 2]), array([2, 2, 1]))
+    """
+    Aggregations = frozenset(['count', 'sum', 'min', 'max', 'mean', 'nunique'])
+
+    @typechecked
+    def __init__(self, aggregations : Mapping[str,Union[str,Sequence[str]]],
+                 sketch_size : int=256) -> None:
+        if sketch_size < 2:
+            raise ValueError("sketch_size must be at least 2")
+        self.logger = getArkoudaLogger(name=self.__class__.__name__)
+        self.sketch_size = sketch_size
+        self.aggregations : Dict[str,List[str]] = {}
+        for col, operators in aggregations.items():
+            if isinstance(operators, str):
+                operators = [operators]
+            for operator in operators:
+                if operator not in self.Aggregations:
+                    raise ValueError(("Unsupported aggregation: {}\nMust be one of {}")\
+                                     .format(operator, self.Aggregations))
+            self.aggregations[col] = list(operators)
+        self.nkeys = 0
+        self.size = 0
+        self.unique_keys : Optional[Union[pdarray,Strings,List[Union[pdarray,Strings]]]] = None
+        self.counts : Optional[pdarray] = None
+        # partial sums, minima and maxima of each column, one per unique key
+        self._partials : Dict[str,Dict[str,pdarray]] = {}
+        # (unique key index, value hash) rows of the nunique sketch of each column
+        self._sketches : Dict[str,Tuple[pdarray,pdarray]] = {}
+
+    def _partial_ops(self, col : str) -> List[str]:
+        """
+        Return the mergeable partial aggregates kept for a column.
+        """
+        ops = set()
+        for operator in self.aggregations[col]:
+            if operator in ('sum', 'mean'):
+                ops.add('sum')
+            elif operator in ('min', 'max'):
+                ops.add(operator)
+        return sorted(ops)
+
+    @staticmethod
+    def _group_ids(g : GroupBy) -> pdarray:
+        """
+        Return the index of the group of each row, in the original order of
+        the rows.
+        """
+        return g.broadcast(arange(g.segments.size), permute=True)
+
+    def _trim_sketch(self, ids : pdarray, hashes : pdarray) -> Tuple[pdarray,pdarray]:
+        """
+        Return the sketch_size smallest distinct hashes of each key index.
+        """
+        # Sorting by key index and then by hash drops duplicates and puts
+        # the smallest hashes of each key first
+        ids, hashes = cast(List[pdarray], GroupBy([ids, hashes]).unique_keys)
+        g = GroupBy(ids, assume_sorted=True)
+        rank = arange(ids.size) - g.broadcast(g.segments)
+        keep = rank < self.sketch_size
+        return ids[keep], hashes[keep]
+
+    @typechecked
+    def update(self, keys : Union[pdarray,Strings,List[Union[pdarray,Strings]]],
+               values : Mapping[str,pdarray]) -> None:
+        """
+        Merge a batch of rows into the aggregates.
+
+        Parameters
+        ----------
+        keys : (list of) pdarray or Strings
+            The keys of the rows, with the same number of key arrays for 
+            every batch
+        values : Mapping[str,pdarray]
+            The values of the rows of each aggregated column
+
+        Raises
+        ------
+        TypeError
+            Raised if keys or values are not pdarrays or Strings
+        ValueError
+            Raised if a column is missing from values, if the values and keys
+            differ in size, or if the number of key arrays differs from that
+            of earlier batches
+        """
+        missing = set(self.aggregations) - set(values)
+        if missing:
+            raise ValueError("Missing values for columns: {}".format(sorted(missing)))
+        nkeys = len(keys) if isinstance(keys, list) else 1
+        if self.unique_keys is not None and nkeys != self.nkeys:
+            raise ValueError("Expected {} key arrays, got {}".format(self.nkeys, nkeys))
+        g = GroupBy(keys)
+        for col in self.aggregations:
+            if values[col].size != g.size:
+                raise ValueError("Values of column {} do not match the size of the keys"\
+                                 .format(col))
+        if g.size == 0:
+            return
+
+        # Aggregate the batch, naming each partial aggregate "<column> <op>"
+        _, counts = g.count()
+        partials = {'{} {}'.format(col, op): (col, op) for col in self.aggregations
+                    for op in self._partial_ops(col)}
+        aggs : Dict[str,Dict[str,pdarray]] = {}
+        if partials:
+            _, aggs = g.agg({name: (values[col], op) for name, (col, op) in partials.items()})
+        batch_ids = self._group_ids(g)
+
+        if self.unique_keys is None:
+            self.nkeys = nkeys
+            self.unique_keys = g.unique_keys
+            self.counts = counts
+            row_ids = batch_ids
+            old_ids = None
+        else:
+            # Merge the partial aggregates of the old and new unique keys
+            nold = cast(pdarray, self.counts).size
+            if nkeys == 1:
+                merged = GroupBy(concatenate([cast(Union[pdarray,Strings], self.unique_keys),
+                                              cast(Union[pdarray,Strings], g.unique_keys)]))
+            else:
+                merged = GroupBy([concatenate([old, new]) for old, new in 
+                                  zip(cast(List[Union[pdarray,Strings]], self.unique_keys),
+                                      cast(List[Union[pdarray,Strings]], g.unique_keys))])
+            merged_ids = self._group_ids(merged)
+            old_ids = merged_ids[:nold]
+            row_ids = merged_ids[nold:][batch_ids]
+            _, self.counts = merged.sum(concatenate([cast(pdarray, self.counts), counts]))
+            if partials:
+                _, aggs = merged.agg({name: (concatenate([self._partials[col][op], 
+                                                          aggs[name][op]]), op)
+                                      for name, (col, op) in partials.items()})
+            self.unique_keys = merged.unique_keys
+        self._partials = {col: {} for col in self.aggregations}
+        for name, (col, op) in partials.items():
+            self._partials[col][op] = aggs[name][op]
+
+        # Merge the hashes of the new values into the nunique sketches
+        for col, ops in self.aggregations.items():
+            if 'nunique' not in ops:
+                continue
+            ids = row_ids
+            hashes = create_pdarray(cast(str, 
+                                    generic_msg("efunc hash64 {}".format(values[col].name))))
+            if old_ids is not None:
+                old_sketch_ids, old_hashes = self._sketches[col]
+                ids = concatenate([old_ids[old_sketch_ids], ids])
+                hashes = concatenate([old_hashes, hashes])
+            self._sketches[col] = self._trim_sketch(ids, hashes)
+        self.size += g.size
+
+    def count(self) -> Tuple[Union[pdarray,Strings,List[Union[pdarray,Strings]]],pdarray]:
+        """
+        Return the number of rows added for each unique key.
+
+        Returns
+        -------
+        unique_keys : (list of) pdarray or Strings
+            The unique keys, in grouped order
+        counts : pdarray, int64
+            The number of rows of each unique key
+
+        Raises
+        ------
+        RuntimeError
+            Raised if no batch has been added
+        """
+        if self.unique_keys is None:
+            raise RuntimeError("No batches have been added")
+        return self.unique_keys, cast(pdarray, self.counts)
+
+    @typechecked
+    def aggregate(self, column : str, operator : str) \
+                    -> Tuple[Union[pdarray,Strings,List[Union[pdarray,Strings]]],pdarray]:
+        """
+        Return an aggregate of a column for each unique key.
+
+        Parameters
+        ----------
+        column : str
+            The name of the values column
+        operator : str
+            The name of one of the aggregations kept for the column
+
+        Returns
+        -------
+        unique_keys : (list of) pdarray or Strings
+            The unique keys, in grouped order
+        aggregates : pdarray
+            One aggregate value per unique key
+
+        Raises
+        ------
+        RuntimeError
+            Raised if no batch has been added
+        ValueError
+            Raised if the aggregation is not kept for the column
+        """
+        keys, counts = self.count()
+        if operator not in self.aggregations.get(column, []):
+            raise ValueError("Aggregation {} is not kept for column {}"\
+                             .format(operator, column))
+        if operator == 'count':
+            return keys, counts
+        if operator == 'mean':
+            return keys, self._partials[column]['sum'] / counts
+        if operator == 'nunique':
+            ids, hashes = self._sketches[column]
+            g = GroupBy(ids, assume_sorted=True)
+            _, n = g.count()
+            _, kth = g.max(hashes)
+            # With k distinct hashes kept, the k'th smallest of 2**64 possible
+            # hashes estimates (k-1)/nunique of the range
+            estimate = (self.sketch_size - 1) * 2.0**64 / (kth + 2.0**63)
+            estimate = where(n < self.sketch_size, 1.0 * n, estimate)
+            return keys, akcast(estimate + 0.5, np.int64)
+        return keys, self._partials[column][operator]
+
+    def agg(self) -> Tuple[Union[pdarray,Strings,List[Union[pdarray,Strings]]],
+                           Dict[str,Dict[str,pdarray]]]:
+        """
+        Return all kept aggregates of all columns for each unique key.
+
+        Returns
+        -------
+        unique_keys : (list of) pdarray or Strings
+            The unique keys, in grouped order
+        aggregates : Dict[str,Dict[str,pdarray]]
+            For each column name, maps each aggregation name to an array 
+            with one aggregate value per unique key
+
+        Raises
+        ------
+        RuntimeError
+            Raised if no batch has been added
+        """
+        keys, _ = self.count()
+        return keys, {col: {op: self.aggregate(col, op)[1] for op in ops}
+                      for col, ops in self.aggregations.items()}
+
+class GroupedSketch:
+    """
+    Fixed-size sketches of the values of each unique key, kept as pdarrays 
+    on the arkouda server, one row of each array per unique key. Sketches 
+    of different values with the same parameter can be merged, matching 
+    their rows by key, and sketches can be registered and attached to 
+    later, so that for example daily sketches can be merged over a month.
+    The user should not create sketches directly, but with GroupBy.hll or 
+    GroupBy.spacesaving.
+
+    Attributes
+    ----------
+    unique_keys : (list of) pdarray or Strings
+        The unique keys, one per sketch
+    nkeys : int
+        The number of key arrays
+    param : int
+        The parameter that sets the size of each sketch
+    arrays : List[pdarray]
+        The arrays holding the sketches
+    registered_name : str or None
+        The name the sketches are registered under, if any
+    """
+    # Code of the kind of sketch, kept with registered sketches
+    kind = -1
+
+    def __init__(self, unique_keys : Union[pdarray,Strings,List[Union[pdarray,Strings]]],
+                 nkeys : int, param : int, arrays : List[pdarray]) -> None:
+        self.unique_keys = unique_keys
+        self.nkeys = nkeys
+        self.param = param
+        self.arrays = arrays
+        self.registered_name : Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        """
+        The number of sketches, one per unique key.
+        """
+        return (self.unique_keys[0] if self.nkeys > 1 else self.unique_keys).size # type: ignore
+
+    def _merged_rows(self, other : GroupedSketch) \
+                    -> Tuple[Union[pdarray,Strings,List[Union[pdarray,Strings]]],pdarray,pdarray]:
+        """
+        Return the unique keys of two sets of sketches, and the rows of each
+        set to merge for each key, which are -1 where a set lacks the key.
+        """
+        if type(self) is not type(other):
+            raise TypeError("Cannot merge {} with {}".format(type(self).__name__,
+                                                              type(other).__name__))
+        if self.nkeys != other.nkeys or self.param != other.param:
+            raise ValueError("Sketches must have the same number of keys and parameter")
+        if self.nkeys == 1:
+            merged = GroupBy(concatenate([cast(Union[pdarray,Strings], self.unique_keys),
+                                          cast(Union[pdarray,Strings], other.unique_keys)]))
+        else:
+            merged = GroupBy([concatenate([a, b]) for a, b in 
+                              zip(cast(List[Union[pdarray,Strings]], self.unique_keys),
+                                  cast(List[Union[pdarray,Strings]], other.unique_keys))])
+        ids = merged.broadcast(arange(merged.segments.size), permute=True)
+        rows = []
+        for start, n in ((0, self.size), (self.size, other.size)):
+            r = zeros(merged.segments.size, dtype=np.int64) - 1
+            r[ids[start:start+n]] = arange(n)
+            rows.append(r)
+        return merged.unique_keys, rows[0], rows[1]
+
+    @typechecked
+    def register(self, user_defined_name : str) -> GroupedSketch:
+        """
+        Register the arrays and unique keys of the sketches with user 
+        defined names in the arkouda server, so that they can be attached 
+        to later with attach()
+
+        Parameters
+        ----------
+        user_defined_name : str
+            user defined name the sketches are to be registered under
+
+        Returns
+        -------
+        GroupedSketch
+            Sketches which point to the registered arrays
+
+        Raises
+        ------
+        TypeError
+            Raised if user_defined_name is not a str, or if the unique keys
+            are neither pdarrays nor Strings
+
+        See also
+        --------
+        attach, unregister
+
+        Notes
+        -----
+        The arrays are registered as "<user_defined_name>_sketch_<i>" and
+        "<user_defined_name>_unique_keys_<i>", along with a small array 
+        describing the sketches.
+        """
+        uniques = self.unique_keys if self.nkeys > 1 else [self.unique_keys]
+        for k in cast(List[Union[pdarray,Strings]], uniques):
+            if not isinstance(k, (pdarray, Strings)):
+                raise TypeError("Only sketches with pdarray or Strings keys " +
+                                "can be registered, not {}".format(type(k).__name__))
+        kinds = [1 if isinstance(k, Strings) else 0 
+                 for k in cast(List[Union[pdarray,Strings]], uniques)]
+        array([self.kind, self.nkeys, self.param, len(self.arrays)] + kinds)\
+                    .register('{}_sketch'.format(user_defined_name))
+        unique_keys = [k.register('{}_unique_keys_{}'.format(user_defined_name, i))
+                       for i, k in enumerate(cast(List[Union[pdarray,Strings]], uniques))]
+        arrays = [a.register('{}_sketch_{}'.format(user_defined_name, i))
+                  for i, a in enumerate(self.arrays)]
+        sketch = type(self)(unique_keys if self.nkeys > 1 else unique_keys[0],
+                            self.nkeys, self.param, arrays)
+        sketch.registered_name = user_defined_name
+        return sketch
+
+    def unregister(self) -> None:
+        """
+        Unregister the arrays of sketches in the arkouda server which were
+        previously registered using register() and/or attached to using 
+        attach()
+
+        Raises
+        ------
+        RuntimeError
+            Raised if the sketches were not registered or attached
+
+        See also
+        --------
+        register, attach
+        """
+        if self.registered_name is None:
+            raise RuntimeError("Sketches are not registered")
+        pdarray.attach('{}_sketch'.format(self.registered_name)).unregister()
+        uniques = self.unique_keys if self.nkeys > 1 else [self.unique_keys]
+        for k in cast(List[Union[pdarray,Strings]], uniques):
+            k.unregister()
+        for a in self.arrays:
+            a.unregister()
+        self.registered_name = None
+
+    @classmethod
+    def attach(cls, user_defined_name : str) -> GroupedSketch:
+        """
+        Return sketches attached to the arrays registered in the arkouda
+        server using register()
+
+        Parameters
+        ----------
+        user_defined_name : str
+            user defined name which the sketches were registered under
+
+        Returns
+        -------
+        GroupedSketch
+            Sketches which point to the registered arrays
+
+        Raises
+        ------
+        TypeError
+            Raised if the registered sketches are of another kind
+        RuntimeError
+            Raised if no sketches are registered under user_defined_name
+
+        See also
+        --------
+        register, unregister
+        """
+        meta = pdarray.attach('{}_sketch'.format(user_defined_name)).to_ndarray()
+        kind, nkeys, param, narrays = (int(x) for x in meta[:4])
+        if kind != cls.kind:
+            raise TypeError("{} are not registered as {}".format(user_defined_name,
+                                                                  cls.__name__))
+        unique_keys = [Strings.attach('{}_unique_keys_{}'.format(user_defined_name, i))
+                       if k == 1 else
+                       pdarray.attach('{}_unique_keys_{}'.format(user_defined_name, i))
+                       for i, k in enumerate(meta[4:])]
+        arrays = [pdarray.attach('{}_sketch_{}'.format(user_defined_name, i))
+                  for i in range(narrays)]
+        sketch = cls(unique_keys if nkeys > 1 else unique_keys[0], nkeys, param, arrays)
+        sketch.registered_name = user_defined_name
+        return sketch
+
+class HLLSketch(GroupedSketch):
+    """
+    HyperLogLog sketches of the values of each unique key, which estimate
+    the number of distinct values of each key. Each sketch has 2**param 
+    registers, where param is the precision of the sketches, kept in one
+    int64 array. Merging sketches gives the sketches of the union of their
+    values, so distinct counts can be estimated over any set of batches.
+
+    Examples
+    --------
+    >>> day1 = ak.GroupBy(ak.array([0, 0, 1])).hll(ak.array([5, 6, 5]))
+    >>> day2 = ak.GroupBy(ak.array([0, 2])).hll(ak.array([7, 8]))
+    >>> day1.merge(day2).estimate()
+    (array([0, 1, 2]), array([3, 1, 1]))
+    """
+    kind = 0
+
+    def estimate(self) -> Tuple[Union[pdarray,Strings,List[Union[pdarray,Strings]]],pdarray]:
+        """
+        Estimate the number of distinct values of each unique key.
+
+        Returns
+        -------
+        unique_keys : (list of) pdarray or Strings
+            The unique keys
+        nunique : pdarray, int64
+            The estimated number of distinct values of each key
+        """
+        repMsg = generic_msg("hllEstimate {} {}".format(self.arrays[0].name, self.param))
+        estimate = create_pdarray(cast(str, repMsg))
+        return self.unique_keys, akcast(estimate + 0.5, np.int64)
+
+    def merge(self, other : GroupedSketch) -> HLLSketch:
+        """
+        Return the sketches of the union of the values of both sketches, 
+        per unique key of either, keeping the larger of each register.
+
+        Parameters
+        ----------
+        other : GroupedSketch
+            HyperLogLog sketches of the same precision and number of keys
+
+        Returns
+        -------
+        HLLSketch
+            The merged sketches
+
+        Raises
+        ------
+        TypeError
+            Raised if other is not an HLLSketch
+        ValueError
+            Raised if other has a different precision or number of keys
+        """
+        unique_keys, rows, other_rows = self._merged_rows(other)
+        repMsg = generic_msg("hllMerge {} {} {} {} {}".format(self.param, rows.name, 
+                                                              self.arrays[0].name,
+                                                              other_rows.name,
+                                                              other.arrays[0].name))
+        return HLLSketch(unique_keys, self.nkeys, self.param, 
+                         [create_pdarray(cast(str, repMsg))])
+
+class SpaceSavingSketch(GroupedSketch):
+    """
+    SpaceSaving sketches of the values of each unique key, which count the
+    most frequent values of each key. Each sketch counts param values, kept
+    in an int64 array of values and one of their counts, most frequent 
+    first. Merging sketches adds the counts of each value and keeps the
+    param most frequent.
+
+    Examples
+    --------
+    >>> day1 = ak.GroupBy(ak.array([0, 0, 1])).spacesaving(ak.array([5, 6, 5]), 4)
+    >>> day2 = ak.GroupBy(ak.array([0, 0])).spacesaving(ak.array([6, 7]), 4)
+    >>> day1.merge(day2).topk(1)
+    (array([0, 1]), array([6, 5]), array([2, 1]))
+    """
+    kind = 1
+
+    @typechecked
+    def topk(self, k : int) \
+            -> Tuple[Union[pdarray,Strings,List[Union[pdarray,Strings]]],pdarray,pdarray]:
+        """
+        Return the k most frequent values of each unique key.
+
+        Parameters
+        ----------
+        k : int
+            The number of values per key, at most the sketch size
+
+        Returns
+        -------
+        unique_keys : (list of) pdarray or Strings
+            The unique keys
+        top_values : pdarray, int64
+            k values per unique key, one key after another, most frequent
+            first
+        top_counts : pdarray, int64
+            The (over)estimated count of each of top_values, zero where a 
+            key has fewer than k distinct values
+
+        Raises
+        ------
+        ValueError
+            Raised if k is not positive or larger than the sketch size
+        """
+        if not 0 < k <= self.param:
+            raise ValueError("k must be positive and no larger than the sketch size")
+        items, counts = self.arrays
+        if k == self.param:
+            return self.unique_keys, items, counts
+        i = arange(self.size * k)
+        idx = (i // k) * self.param + i % k
+        return self.unique_keys, items[idx], counts[idx]
+
+    def merge(self, other : GroupedSketch) -> SpaceSavingSketch:
+        """
+        Return the sketches of the values of both sketches, per unique key
+        of either, adding the counts of each value and keeping the most
+        frequent.
+
+        Parameters
+        ----------
+        other : GroupedSketch
+            SpaceSaving sketches of the same size and number of keys
+
+        Returns
+        -------
+        SpaceSavingSketch
+            The merged sketches
+
+        Raises
+        ------
+        TypeError
+            Raised if other is not a SpaceSavingSketch
+        ValueError
+            Raised if other has a different size or number of keys
+        """
+        unique_keys, rows, other_rows = self._merged_rows(other)
+        repMsg = generic_msg("spaceSavingMerge {} {} {} {} {} {} {}".format(self.param, 
+                                          rows.name, self.arrays[0].name, self.arrays[1].name,
+                                          other_rows.name, other.arrays[0].name, 
+                                          other.arrays[1].name))
+        items, counts = (create_pdarray(msg) for msg in cast(str, repMsg).split(' , '))
+        return SpaceSavingSketch(unique_keys, self.nkeys, self.param, [items, counts])
@@ -7,7 +7,7 @@ from arkouda.dtypes import resolve_scalar_dtype, NUMBER_FORMAT_STRINGS
 from arkouda.pdarrayclass import pdarray, create_pdarray
 from arkouda.groupbyclass import GroupBy
 
-__all__ = ["join_on_eq_with_dt"]
+__all__ = ["join_on_eq_with_dt", "merge_join"]
 
 predicates = {"true_dt":0, "abs_dt":1, "pos_dt":2}
 
@@ -94,3 +94,58 @@ def join_on_eq_with_dt(a1 : pdarray, a2 : pdarray, t1 : pdarray,
     resI = create_pdarray(resIAttr)
     resJ = create_pdarray(resJAttr)
     return (resI, resJ)
+
+@typechecked
+def merge_join(left_sorted : pdarray, 
+               right_sorted : pdarray) -> Tuple[pdarray,pdarray]:
+    """
+    Performs an inner-join on equality between two sorted arrays by 
+    merging them
+
+    Parameters
+    ----------
+    left_sorted : pdarray
+        sorted pdarray to be joined (int64 or float64)
+    right_sorted : pdarray
+        sorted pdarray to be joined, of the same dtype as left_sorted
+
+    Returns
+    -------
+    result_array_one : pdarray, int64
+        left_sorted indices of each pair of equal elements, in 
+        ascending order
+    result_array_two : pdarray, int64
+        right_sorted indices of each pair of equal elements
+
+    Raises
+    ------
+    TypeError
+        Raised if left_sorted or right_sorted is not a pdarray
+    RuntimeError
+        Raised if either array is not sorted, or if they have different
+        or unsupported dtypes
+
+    See Also
+    --------
+    searchsorted, join_on_eq_with_dt
+
+    Notes
+    -----
+    The elements of right_sorted equal to each element of left_sorted 
+    are found by searching for the first and last of them, which takes
+    no hashing or grouping of either array.
+
+    Examples
+    --------
+    >>> i, j = ak.merge_join(ak.array([1, 2, 2, 4]), ak.array([2, 2, 3, 4]))
+    >>> i
+    array([1, 1, 2, 2, 3])
+    >>> j
+    array([0, 1, 0, 1, 3])
+    """
+    repMsg = generic_msg("mergeJoin {} {}".format(left_sorted.name, 
+                                                  right_sorted.name))
+    resIAttr, resJAttr = cast(str,repMsg).split("+")
+    resI = create_pdarray(resIAttr)
+    resJ = create_pdarray(resJAttr)
+    return (resI, resJ)
@@ -5,7 +5,7 @@ from typing import Optional, Tuple, Union, ForwardRef
 from arkouda.client import generic_msg
 from arkouda.dtypes import *
 from arkouda.dtypes import _as_dtype
-from arkouda.pdarrayclass import pdarray, create_pdarray
+from arkouda.pdarrayclass import pdarray, create_pdarray, _fuse_efunc, _fuse_where
 from arkouda.pdarraysetops import unique
 from arkouda.strings import Strings
 
@@ -74,6 +74,9 @@ def abs(pda : pdarray) -> pdarray:
     TypeError
         Raised if the parameter is not a pdarray
     """
+    fused = _fuse_efunc("abs", pda)
+    if fused is not None:
+        return fused
     repMsg = generic_msg("efunc {} {}".format("abs", pda.name))
     return create_pdarray(type_cast(str,repMsg))
 
@@ -112,6 +115,9 @@ def log(pda : pdarray) -> pdarray:
     >>> ak.log(A) / np.log(2)
     array([0, 3.3219280948873626, 6.6438561897747253])
     """
+    fused = _fuse_efunc("log", pda)
+    if fused is not None:
+        return fused
     repMsg = generic_msg("efunc {} {}".format("log", pda.name))
     return create_pdarray(type_cast(str,repMsg))
 
@@ -135,6 +141,9 @@ def exp(pda : pdarray) -> pdarray:
     TypeError
         Raised if the parameter is not a pdarray
     """
+    fused = _fuse_efunc("exp", pda)
+    if fused is not None:
+        return fused
     repMsg = generic_msg("efunc {} {}".format("exp", pda.name))
     return create_pdarray(type_cast(str,repMsg))
 
@@ -210,6 +219,9 @@ def sin(pda : pdarray) -> pdarray:
     TypeError
         Raised if the parameter is not a pdarray
     """
+    fused = _fuse_efunc("sin", pda)
+    if fused is not None:
+        return fused
     repMsg = generic_msg("efunc {} {}".format("sin",pda.name))
     return create_pdarray(type_cast(str,repMsg))
 
@@ -233,6 +245,9 @@ def cos(pda : pdarray) -> pdarray:
     TypeError
         Raised if the parameter is not a pdarray
     """
+    fused = _fuse_efunc("cos", pda)
+    if fused is not None:
+        return fused
     repMsg = type_cast(str, generic_msg("efunc {} {}".format("cos",pda.name)))
     return create_pdarray(type_cast(str,repMsg))
 
@@ -290,6 +305,9 @@ def where(condition : pdarray, A : Union[Union[int,float], pdarray],
     is supported e.g., n < 5, n > 1, which is supported in numpy
     is not currently supported in Arkouda
     """
+    fused = _fuse_where(condition, A, B)
+    if fused is not None:
+        return fused
     if isinstance(A, pdarray) and isinstance(B, pdarray):
         repMsg = generic_msg("efunc3vv {} {} {} {}".\
                              format("where",
@@ -2,7 +2,7 @@ from typeguard import typechecked
 import json, os
 from typing import cast, Dict, List, Mapping, Optional, Union
 from arkouda.client import generic_msg
-from arkouda.pdarrayclass import pdarray, create_pdarray
+from arkouda.pdarrayclass import pdarray, create_pdarray, _pdarray_from_object
 from arkouda.strings import Strings
 
 __all__ = ["ls_hdf", "read_hdf", "read_all", "load", "get_datasets",
@@ -158,6 +158,16 @@ def read_all(filenames : Union[str,List[str]],
         rep_msg = generic_msg("readAllHdf {} {:n} {:n} {} | {}".\
                 format(strictTypes, len(datasets), len(filenames), json.dumps(datasets), 
                        json.dumps(filenames)))
+        objects = getattr(rep_msg, 'objects', None)
+        if objects:
+            # The server describes each dataset as a pdarray, or as the 
+            # list of the two arrays that make up a Strings
+            arrays = [Strings(*(_pdarray_from_object(o) for o in obj)) 
+                      if isinstance(obj, list) else _pdarray_from_object(obj) 
+                      for obj in objects]
+            if len(arrays) == 1:
+                return arrays[0]
+            return dict(zip(datasets, arrays))
         if ',' in rep_msg:
             rep_msgs = cast(str,rep_msg).split(' , ')
             d : Dict[str,Union[pdarray,Strings]] = dict()
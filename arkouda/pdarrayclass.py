@@ -1,10 +1,12 @@
 from __future__ import annotations
-from typing import cast, Sequence, Tuple, Union
+from typing import cast, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from typeguard import typechecked
-import json, struct
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import json, sys, weakref
 import numpy as np # type: ignore
-from arkouda.client import generic_msg
-from arkouda.dtypes import dtype, DTypes, resolve_scalar_dtype, structDtypeCodes, \
+from arkouda.client import generic_msg, _defer_delete
+from arkouda.dtypes import dtype, DTypes, resolve_scalar_dtype, \
      translate_np_dtype, NUMBER_FORMAT_STRINGS
 from arkouda.dtypes import int64 as akint64
 from arkouda.dtypes import str_ as akstr_
@@ -15,7 +17,7 @@ import builtins
 __all__ = ["pdarray", "info", "clear", "any", "all", "is_sorted", "sum", "prod", 
            "min", "max", "argmin", "argmax", "mean", "var", "std", "mink", 
            "maxk", "argmink", "argmaxk", "register_pdarray", "attach_pdarray", 
-           "unregister_pdarray"]
+           "unregister_pdarray", "lazy"]
 
 logger = getArkoudaLogger(name='pdarray')    
 
@@ -105,6 +107,128 @@ def _parse_single_int_array_value(msg : str) -> object:
                               format(mydtype.name, value)))
 
 
+# Width of the header that precedes the array data in a tondarray reply
+BYTE_ORDER_HEADER_SIZE = 8
+
+def _unpack_ndarray_reply(rep_msg : memoryview, mydtype : np.dtype, 
+                          size : int, writeable : bool=False) -> np.ndarray:
+    """
+    Interpret the binary reply to a tondarray request as a numpy array without
+    copying the array data out of the received message, unless a writeable
+    array is asked for. The user should not call this function directly.
+
+    Parameters
+    ----------
+    rep_msg : memoryview
+        The reply, consisting of a fixed-width header naming the byte order 
+        ("little" or "big") followed by the raw array data
+    mydtype : np.dtype
+        The element type of the array
+    size : int
+        The number of elements in the array
+    writeable : bool
+        Whether the array must be writeable. A view of the reply is read-only,
+        so it is copied, once, unless a byteswap has already copied it.
+
+    Returns
+    -------
+    np.ndarray
+        A numpy array backed by the reply buffer, or a copy if the server's
+        byte order differs from the client's or a writeable array is asked for
+
+    Raises
+    ------
+    RuntimeError
+        Raised if the byte order is not recognized or if the bytes received 
+        do not match the expected number of bytes
+    """
+    byteorder = bytes(rep_msg[:BYTE_ORDER_HEADER_SIZE]).decode().strip()
+    if byteorder not in ('little', 'big'):
+        raise RuntimeError("Unrecognized byte order {}".format(byteorder))
+    data = rep_msg[BYTE_ORDER_HEADER_SIZE:]
+    # Make sure the received data has the expected length
+    if len(data) != size*mydtype.itemsize:
+        raise RuntimeError("Expected {} bytes but received {}".\
+                           format(size*mydtype.itemsize, len(data)))
+    if size == 0:
+        return np.empty(0, dtype=mydtype)
+    arr = np.frombuffer(data, dtype=mydtype.newbyteorder(
+                                  '<' if byteorder == 'little' else '>'), count=size)
+    # Only pay for a byteswap if the server's byte order differs from ours
+    if byteorder != sys.byteorder:
+        arr = arr.astype(mydtype)
+    elif writeable:
+        arr = arr.copy()
+    return arr
+
+def _iter_ndarray_chunks(name : str, mydtype : np.dtype, start : int, stop : int,
+                         chunk_bytes : Optional[int]=None) -> Iterator[np.ndarray]:
+    """
+    Generate elements start through stop-1 of the named server array as a 
+    sequence of numpy arrays of at most chunk_bytes each. The user should 
+    not call this function directly.
+
+    Parameters
+    ----------
+    name : str
+        The server name of the array
+    mydtype : np.dtype
+        The element type of the array
+    start : int
+        The index of the first element to transfer
+    stop : int
+        One past the index of the last element to transfer
+    chunk_bytes : int, optional
+        The number of bytes per chunk, defaults to client.chunkTransferBytes
+
+    Returns
+    -------
+    Iterator[np.ndarray]
+        The consecutive chunks of the requested range
+
+    Raises
+    ------
+    ValueError
+        Raised if chunk_bytes is not positive
+    RuntimeError
+        Raised if there is a server-side error thrown
+
+    Notes
+    -----
+    The chunks are requested on a dedicated connection by a background 
+    thread, which fetches the next chunk while the caller consumes the 
+    current one.
+    """
+    from arkouda.client import chunkTransferBytes, _open_transfer_socket, \
+         _send_transfer_message
+    if chunk_bytes is None:
+        chunk_bytes = chunkTransferBytes
+    if chunk_bytes <= 0:
+        raise ValueError("chunk_bytes must be positive")
+    if stop <= start:
+        return
+    step = builtins.max(chunk_bytes // mydtype.itemsize, 1)
+    bounds = ((lo, builtins.min(lo + step, stop)) for lo in range(start, stop, step))
+    transfer_socket = _open_transfer_socket()
+
+    def fetch(lo : int, hi : int) -> np.ndarray:
+        rep_msg = _send_transfer_message(transfer_socket, 
+                            "tondarraySlice {} {} {} native".format(name, lo, hi))
+        return _unpack_ndarray_reply(rep_msg, mydtype, hi - lo)
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        future = executor.submit(fetch, *next(bounds))
+        for lo, hi in bounds:
+            chunk = future.result()
+            future = executor.submit(fetch, lo, hi)
+            yield chunk
+        yield future.result()
+    finally:
+        # An in-flight request must complete before its socket is closed
+        executor.shutdown(wait=True)
+        transfer_socket.close()
+
 # class for the pdarray
 class pdarray:
     """
@@ -148,9 +272,62 @@ class pdarray:
         self.shape = shape
         self.itemsize = itemsize
 
+    def __getattr__(self, attr : str):
+        # Only called for attributes that are not set, which are the name of
+        # an array whose expression is deferred by lazy() and the attributes 
+        # of an array whose creating command is still queued by batch()
+        if attr == 'name' and '_expr' in self.__dict__:
+            self._materialize()
+            return self.__dict__['name']
+        if attr in ('dtype', 'size', 'ndim', 'shape', 'itemsize'):
+            from arkouda.client import flush_batch
+            flush_batch()
+            if attr in self.__dict__:
+                return self.__dict__[attr]
+            raise RuntimeError("{} was not created because an earlier batched command failed".\
+                               format(self.__dict__.get('name')))
+        raise AttributeError("'pdarray' object has no attribute '{}'".format(attr))
+
+    def _is_pending(self) -> builtins.bool:
+        """
+        Return True if the array's creating command is still queued by batch()
+        """
+        return 'size' not in self.__dict__
+
+    def _resolve(self, repMsg : str) -> None:
+        """
+        Set the attributes of an array created by a batched command from its 
+        reply. The user should not call this method directly.
+        """
+        name, mydtype, size, ndim, shape, itemsize = _parse_created(repMsg)
+        self.__init__(name, mydtype, size, ndim, shape, itemsize) # type: ignore
+
+    def _is_fused(self) -> builtins.bool:
+        """
+        Return True if the array's values are deferred by lazy()
+        """
+        return '_expr' in self.__dict__
+
+    def _materialize(self) -> None:
+        """
+        Compute the expression deferred by lazy() on the server, naming the 
+        array. The user should not call this method directly.
+        """
+        repMsg = generic_msg(_fused_msg(self.__dict__['_expr']))
+        self.name = cast(str,repMsg).split()[1]
+        del self.__dict__['_expr']
+        del self.__dict__['_leaves']
+        _lazyPending.pop(id(self), None)
+
     def __del__(self):
+        # Arrays deferred by lazy() have nothing on the server to delete
+        if 'name' not in self.__dict__:
+            return
+        # The deletion is sent with a later command, and the attributes of 
+        # an array still queued by batch() are not fetched to size it
         try:
-            generic_msg("delete {}".format(self.name))
+            _defer_delete(self.name, self.__dict__.get('size', 0) * 
+                                     self.__dict__.get('itemsize', 0))
         except:
             pass
 
@@ -234,8 +411,12 @@ class pdarray:
             raise ValueError("bad operator {}".format(op))
         # pdarray binop pdarray
         if isinstance(other, pdarray):
-            if self.size != other.size:
+            # The server checks the sizes of arrays that batch() has not created yet
+            if not (self._is_pending() or other._is_pending()) and self.size != other.size:
                 raise ValueError("size mismatch {} {}".format(self.size,other.size))
+            fused = _fuse_binop(op, self, other)
+            if fused is not None:
+                return fused
             msg = "binopvv {} {} {}".format(op, self.name, other.name)
             repMsg = generic_msg(msg)
             return create_pdarray(cast(str,repMsg))
@@ -244,6 +425,9 @@ class pdarray:
         if dt not in DTypes:
             raise TypeError("Unhandled scalar type: {} ({})".format(other, 
                                                                     type(other)))
+        fused = _fuse_binop(op, self, other)
+        if fused is not None:
+            return fused
         msg = "binopvs {} {} {} {}".\
                   format(op, self.name, dt, NUMBER_FORMAT_STRINGS[dt].format(other))
         repMsg = generic_msg(msg)
@@ -283,6 +467,9 @@ class pdarray:
         if dt not in DTypes:
             raise TypeError("Unhandled scalar type: {} ({})".format(other, 
                                                                     type(other)))
+        fused = _fuse_binop(op, other, self)
+        if fused is not None:
+            return fused
         msg = "binopsv {} {} {} {}".\
                       format(op, dt, NUMBER_FORMAT_STRINGS[dt].format(other), 
                                                                     self.name)
@@ -412,9 +599,11 @@ class pdarray:
     def opeq(self, other, op):
         if op not in self.OpEqOps:
             raise ValueError("bad operator {}".format(op))
+        _compute_deferred(self)
         # pdarray op= pdarray
         if isinstance(other, pdarray):
-            if self.size != other.size:
+            # The server checks the sizes of arrays that batch() has not created yet
+            if not (self._is_pending() or other._is_pending()) and self.size != other.size:
                 raise ValueError("size mismatch {} {}".format(self.size,other.size))
             generic_msg("opeqvv {} {} {}".format(op, self.name, other.name))
             return self
@@ -506,6 +695,7 @@ class pdarray:
             raise TypeError("Unhandled key type: {} ({})".format(key, type(key)))
 
     def __setitem__(self, key, value):
+        _compute_deferred(self)
         if np.isscalar(key) and resolve_scalar_dtype(key) == 'int64':
             orig_key = key
             if key < 0:
@@ -554,6 +744,7 @@ class pdarray:
         TypeError
             Raised if value is not an int, float, or str         
         """
+        _compute_deferred(self)
         generic_msg("set {} {} {}".format(self.name, 
                                         self.dtype.name, self.format_other(value)))
 
@@ -769,16 +960,25 @@ class pdarray:
         return argmaxk(self,k)
 
     
-    def to_ndarray(self) -> np.ndarray:
+    def to_ndarray(self, out : Optional[np.ndarray]=None) -> np.ndarray:
         """
         Convert the array to a np.ndarray, transferring array data from the
         Arkouda server to client-side Python. Note: if the pdarray size exceeds 
         client.maxTransferBytes, a RuntimeError is raised.
 
+        Parameters
+        ----------
+        out : np.ndarray, optional
+            A preallocated destination, such as a np.memmap, with the same 
+            size and dtype as the pdarray. If supplied, the data is streamed 
+            into it in chunks of client.chunkTransferBytes and the 
+            client.maxTransferBytes limit does not apply.
+
         Returns
         -------
         np.ndarray
-            A numpy ndarray with the same attributes and data as the pdarray
+            A numpy ndarray with the same attributes and data as the pdarray,
+            or out if it was supplied
 
         Raises
         ------
@@ -786,6 +986,8 @@ class pdarray:
             Raised if there is a server-side error thrown, if the pdarray size
             exceeds the built-in client.maxTransferBytes size limit, or if the bytes
             received does not match expected number of bytes
+        ValueError
+            Raised if out does not match the size and dtype of the pdarray
         Notes
         -----
         The number of bytes in the array cannot exceed ``client.maxTransferBytes``,
@@ -794,11 +996,15 @@ class pdarray:
         is running, under the assumption that the server is running on a
         distributed system with much more memory than the client. The user
         may override this limit by setting client.maxTransferBytes to a larger
-        value, but proceed with caution.
+        value, but proceed with caution. Arrays larger than the limit can be 
+        transferred into a supplied out array or with to_ndarray_chunks.
+
+        The received message is read-only, so the array data is copied out of
+        it once to return a writeable array.
 
         See Also
         --------
-        array
+        array, to_ndarray_chunks
 
         Examples
         --------
@@ -808,7 +1014,21 @@ class pdarray:
 
         >>> type(a.to_ndarray())
         numpy.ndarray
+
+        >>> out = np.lib.format.open_memmap('a.npy', mode='w+', dtype=a.dtype, 
+        ...                                 shape=(a.size,))
+        >>> a.to_ndarray(out=out)
+        memmap([0, 1, 2, 3, 4])
         """
+        if out is not None:
+            if out.shape != (self.size,) or out.dtype != self.dtype:
+                raise ValueError(("out must be a 1-D array of size {} and dtype {}").\
+                                 format(self.size, self.dtype.name))
+            pos = 0
+            for chunk in self.to_ndarray_chunks():
+                out[pos:pos + chunk.size] = chunk
+                pos += chunk.size
+            return out
         from arkouda.client import maxTransferBytes
         # Total number of bytes in the array data
         arraybytes = self.size * self.dtype.itemsize
@@ -816,16 +1036,52 @@ class pdarray:
         if arraybytes > maxTransferBytes:
             raise RuntimeError(('Array exceeds allowed size for transfer. Increase ' +
                                'client.maxTransferBytes to allow'))
-        # The reply from the server will be a bytes object
-        rep_msg = generic_msg("tondarray {}".format(self.name), recv_bytes=True)
-        # Make sure the received data has the expected length
-        if len(rep_msg) != self.size*self.dtype.itemsize:
-            raise RuntimeError("Expected {} bytes but received {}".\
-                               format(self.size*self.dtype.itemsize, len(rep_msg)))
-        # Use struct to interpret bytes as a big-endian numeric array
-        fmt = '>{:n}{}'.format(self.size, structDtypeCodes[self.dtype.name])
-        # Return a numpy ndarray
-        return np.array(struct.unpack(fmt, rep_msg)) # type: ignore
+        # The reply from the server will be a view of the received bytes,
+        # with the array data in the server's native byte order
+        rep_msg = generic_msg("tondarray {} native".format(self.name), recv_bytes=True)
+        return _unpack_ndarray_reply(cast(memoryview, rep_msg), self.dtype, self.size,
+                                     writeable=True)
+
+    def to_ndarray_chunks(self, chunk_bytes : Optional[int]=None) -> Iterator[np.ndarray]:
+        """
+        Transfer the array to client-side Python as a sequence of np.ndarray 
+        chunks, so that arrays larger than client.maxTransferBytes can be 
+        processed or written out without holding all of them in memory.
+
+        Parameters
+        ----------
+        chunk_bytes : int, optional
+            The number of bytes per chunk, defaults to client.chunkTransferBytes
+
+        Returns
+        -------
+        Iterator[np.ndarray]
+            Consecutive chunks that concatenate to self.to_ndarray()
+
+        Raises
+        ------
+        ValueError
+            Raised if chunk_bytes is not positive
+        RuntimeError
+            Raised if there is a server-side error thrown
+
+        Notes
+        -----
+        The next chunk is fetched over a separate connection while the current
+        one is being consumed. Chunks may be views of the received messages, 
+        so copy them if they are modified.
+
+        See Also
+        --------
+        to_ndarray
+
+        Examples
+        --------
+        >>> a = ak.arange(0, 5, 1)
+        >>> list(a.to_ndarray_chunks(chunk_bytes=16))
+        [array([0, 1]), array([2, 3]), array([4])]
+        """
+        return _iter_ndarray_chunks(self.name, self.dtype, 0, self.size, chunk_bytes)
 
     def to_cuda(self):
         """
@@ -888,16 +1144,12 @@ class pdarray:
         if arraybytes > maxTransferBytes:
             raise RuntimeError(("Array exceeds allowed size for transfer. " +
                                "Increase client.maxTransferBytes to allow"))
-        # The reply from the server will be a bytes object
-        rep_msg = generic_msg("tondarray {}".format(self.name), recv_bytes=True)
-        # Make sure the received data has the expected length
-        if len(rep_msg) != self.size*self.dtype.itemsize:
-            raise RuntimeError("Expected {} bytes but received {}".\
-                               format(self.size*self.dtype.itemsize, len(rep_msg)))
-        # Use struct to interpret bytes as a big-endian numeric array
-        fmt = '>{:n}{}'.format(self.size, structDtypeCodes[self.dtype.name])
+        # The reply from the server will be a view of the received bytes,
+        # with the array data in the server's native byte order
+        rep_msg = generic_msg("tondarray {} native".format(self.name), recv_bytes=True)
         # Return a numba devicendarray
-        return cuda.to_device(struct.unpack(fmt, rep_msg))
+        return cuda.to_device(_unpack_ndarray_reply(cast(memoryview, rep_msg), 
+                                                    self.dtype, self.size))
 
     @typechecked
     def save(self, prefix_path : str, dataset : str='array', mode : str='truncate') -> str:
@@ -1112,6 +1364,212 @@ class pdarray:
 #       all values have been checked by python module and...
 #       server has created pdarray already before this is called
 #       server has created pdarray already befroe this is called
+# nesting depth of lazy() contexts
+_lazyDepth = 0
+# arrays deferred by lazy() whose values are not computed yet, by id
+_lazyPending : weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+@contextmanager
+def lazy() -> Iterator[None]:
+    """
+    Defer the elementwise operations issued within the context, so that 
+    each expression is computed by the server in a single pass over its 
+    operands.
+
+    Within the context, arithmetic, comparison and bitwise operators, where,
+    abs, log, exp, sin and cos return a pdarray whose dtype and size are 
+    known but whose values are not computed yet. Operations on such arrays 
+    extend its expression instead of computing it. The expression is sent to
+    the server as one fused command when the array's values are first 
+    needed, e.g. by a reduction, indexing or to_ndarray, and no temporary 
+    arrays are created for its intermediate results.
+
+    Returns
+    -------
+    Iterator[None]
+
+    See Also
+    --------
+    batch
+
+    Notes
+    -----
+    Operations that cannot be fused, such as int64 ** int64, compute their 
+    operands and run as usual. An expression is computed once it has more 
+    than client.maxFusedNodes operations and operands. Arrays created in the
+    context stay deferred after it exits, until their values are needed or 
+    one of the arrays in their expression is modified in place.
+
+    Examples
+    --------
+    >>> a = ak.arange(0, 10, 1)
+    >>> b = ak.linspace(0, 1, 10)
+    >>> with ak.lazy():
+    ...     c = (a * 2 + b) / 3 > 0.5
+    >>> c.sum()
+    9
+    """
+    global _lazyDepth
+    _lazyDepth += 1
+    try:
+        yield
+    finally:
+        _lazyDepth -= 1
+
+def _fused_binop_dtype(op : str, ldt : str, rdt : str) -> Optional[str]:
+    """
+    Return the name of the dtype of the binop applied to operands of dtypes
+    ldt and rdt if the server can fuse it, otherwise None. This follows 
+    fusedBinopDType in FusedMsg.chpl.
+    """
+    numeric = ('int64', 'float64')
+    if ldt not in numeric + ('bool',) or rdt not in numeric + ('bool',):
+        return None
+    both_numeric = ldt in numeric and rdt in numeric
+    any_real = 'float64' in (ldt, rdt)
+    if op in ('+', '-', '*'):
+        if ldt == rdt == 'bool':
+            return None
+        return 'float64' if any_real else 'int64'
+    elif op == '/':
+        return 'float64' if both_numeric else None
+    elif op == '//':
+        if both_numeric:
+            return 'float64' if any_real else 'int64'
+    elif op in ('%', '<<', '>>'):
+        return 'int64' if ldt == rdt == 'int64' else None
+    elif op in ('<', '>', '<=', '>='):
+        return 'bool' if both_numeric else None
+    elif op in ('==', '!='):
+        return 'bool' if both_numeric or ldt == rdt == 'bool' else None
+    elif op in ('&', '|', '^'):
+        return ldt if ldt == rdt != 'float64' else None
+    elif op == '**':
+        # int64 ** int64 is checked for negative exponents by binopvv
+        return 'float64' if both_numeric and any_real else None
+    return None
+
+def _fused_operand(x : object) -> Tuple[object, int]:
+    """
+    Return the expression node for an operand of a fused operation, which is
+    the operand itself for a computed pdarray, and its number of nodes.
+    """
+    if isinstance(x, pdarray):
+        if x._is_fused():
+            return x._expr, x._nodes
+        return x, 1
+    return ('scalar', resolve_scalar_dtype(x), x), 1
+
+def _make_fused(kind : str, op : Optional[str], operands : Sequence[object], 
+                size : int, mydtype : str) -> pdarray:
+    """
+    Return a pdarray whose values are deferred by lazy(), applying the 
+    operation to the operands. The user should not call this function 
+    directly.
+    """
+    from arkouda.client import maxFusedNodes
+    nodes = [_fused_operand(x) for x in operands]
+    count = 1 + builtins.sum(n for _, n in nodes)
+    if count > maxFusedNodes:
+        # Compute the deferred operands, which become leaves of a new expression
+        nodes = [(x, 1) if isinstance(x, pdarray) else (node, n) 
+                 for x, (node, n) in zip(operands, nodes)]
+        count = 1 + len(nodes)
+    # The computed arrays the expression reads, keyed by id
+    leaves : Dict[int, pdarray] = {}
+    for x, (node, _) in zip(operands, nodes):
+        if isinstance(x, pdarray):
+            leaves.update(x._leaves if node is x.__dict__.get('_expr') else {id(x): x})
+    pda = pdarray.__new__(pdarray)
+    pdadtype = dtype(mydtype)
+    pda.__dict__.update(dtype=pdadtype, size=size, ndim=1, shape=[size], 
+                        itemsize=pdadtype.itemsize, 
+                        _expr=(kind, op) + tuple(node for node, _ in nodes),
+                        _nodes=count, _leaves=leaves)
+    _lazyPending[id(pda)] = pda
+    return pda
+
+def _compute_deferred(pda : pdarray) -> None:
+    """
+    Compute the arrays deferred by lazy() whose expressions read pda, before
+    pda is modified in place. The user should not call this function 
+    directly.
+    """
+    for x in list(_lazyPending.values()):
+        if x._is_fused() and id(pda) in x._leaves:
+            x._materialize()
+
+def _fuse_binop(op : str, left : object, right : object) -> Optional[pdarray]:
+    """
+    Return the deferred result of the binop within lazy(), or None if the 
+    binop should run now. The user should not call this function directly.
+    """
+    if _lazyDepth == 0:
+        return None
+    ldt = left.dtype.name if isinstance(left, pdarray) else resolve_scalar_dtype(left)
+    rdt = right.dtype.name if isinstance(right, pdarray) else resolve_scalar_dtype(right)
+    mydtype = _fused_binop_dtype(op, ldt, rdt)
+    if mydtype is None:
+        return None
+    size = left.size if isinstance(left, pdarray) else cast(pdarray, right).size
+    return _make_fused('binop', op, (left, right), size, mydtype)
+
+def _fuse_efunc(efunc : str, pda : pdarray) -> Optional[pdarray]:
+    """
+    Return the deferred result of the efunc within lazy(), or None if the 
+    efunc should run now. The user should not call this function directly.
+    """
+    if _lazyDepth == 0 or pda.dtype.name not in ('int64', 'float64'):
+        return None
+    mydtype = pda.dtype.name if efunc == 'abs' else 'float64'
+    return _make_fused('efunc', efunc, (pda,), pda.size, mydtype)
+
+def _fuse_where(condition : pdarray, A : object, B : object) -> Optional[pdarray]:
+    """
+    Return the deferred result of where within lazy(), or None if it should 
+    run now. The user should not call this function directly.
+    """
+    if _lazyDepth == 0 or condition.dtype != akbool:
+        return None
+    arrays = [x for x in (A, B) if isinstance(x, pdarray)]
+    if not arrays or builtins.any(x.size != condition.size for x in arrays) or \
+                     arrays[0].dtype != arrays[-1].dtype or \
+                     arrays[0].dtype.name not in ('int64', 'float64', 'bool'):
+        return None
+    # Scalars take the dtype of the array, as in efunc3vs and efunc3sv
+    mydtype = arrays[0].dtype
+    operands = [x if isinstance(x, pdarray) else mydtype.type(x) for x in (A, B)]
+    return _make_fused('where', None, [condition] + operands, condition.size, 
+                       mydtype.name)
+
+def _fused_msg(expr : tuple) -> str:
+    """
+    Return the fused command that computes the expression, listing its nodes
+    so that each follows its operands. The user should not call this 
+    function directly.
+    """
+    nodes : List[str] = []
+    index : Dict[int, int] = {}
+
+    def visit(node : object) -> int:
+        if id(node) not in index:
+            if isinstance(node, pdarray):
+                nodestr = "array {}".format(node.name)
+            else:
+                node = cast(tuple, node)
+                if node[0] == 'scalar':
+                    nodestr = "scalar {} {}".format(node[1], 
+                                        NUMBER_FORMAT_STRINGS[node[1]].format(node[2]))
+                else:
+                    fields = [node[0]] if node[1] is None else [node[0], node[1]]
+                    nodestr = " ".join(fields + [str(visit(x)) for x in node[2:]])
+            index[id(node)] = len(nodes)
+            nodes.append(nodestr)
+        return index[id(node)]
+
+    visit(expr)
+    return "fused {} {}".format(len(nodes), json.dumps(nodes))
+
 @typechecked
 def create_pdarray(repMsg : str) -> pdarray:
     """
@@ -1138,6 +1596,39 @@ def create_pdarray(repMsg : str) -> pdarray:
         Raised if a server-side error is thrown in the process of creating
         the pdarray instance
     """
+    from arkouda.client import PendingDtype, _register_pending
+    fields = repMsg.split()
+    if len(fields) == 3 and fields[2] == PendingDtype:
+        # The array is created by a command queued by batch(), which sets 
+        # the remaining attributes once the command is sent
+        pda = pdarray.__new__(pdarray)
+        pda.name = fields[1]
+        _register_pending(pda)
+        return pda
+    objects = getattr(repMsg, 'objects', None)
+    if objects and len(objects) == 1 and isinstance(objects[0], dict):
+        # The server describes the array, so the reply need not be parsed
+        return _pdarray_from_object(objects[0])
+    name, mydtype, size, ndim, shape, itemsize = _parse_created(repMsg)
+    logger.debug("{} {} {} {} {} {}".format(name, mydtype, size, 
+                                    ndim, shape, itemsize))
+    return pdarray(name, mydtype, size, ndim, shape, itemsize)
+
+def _pdarray_from_object(obj : Dict) -> pdarray:
+    """
+    Return a pdarray instance for an array described by the objects of a 
+    structured reply. The user should not call this function directly.
+    """
+    if obj.get('objType') != 'pdarray':
+        raise ValueError("reply object is not a pdarray: {}".format(obj))
+    return pdarray(obj['name'], obj['dtype'], obj['size'], obj['ndim'], 
+                   obj['shape'], obj['itemsize'])
+
+def _parse_created(repMsg : str) -> Tuple[str, str, int, int, List[int], int]:
+    """
+    Parse the name, datatype, size, dimension, shape, and itemsize from a 
+    "created" reply. The user should not call this function directly.
+    """
     try:
         fields = repMsg.split()
         name = fields[1]
@@ -1148,9 +1639,7 @@ def create_pdarray(repMsg : str) -> pdarray:
         itemsize = int(fields[6])
     except Exception as e:
         raise ValueError(e)
-    logger.debug("{} {} {} {} {} {}".format(name, mydtype, size, 
-                                    ndim, shape, itemsize))
-    return pdarray(name, mydtype, size, ndim, shape, itemsize)
+    return name, mydtype, size, ndim, shape, itemsize
 
 @typechecked
 def info(pda : Union[pdarray, str]) -> str:
@@ -1579,9 +2068,10 @@ def mink(pda : pdarray, k : int) -> pdarray:
     
     and generally outperforms this operation.
 
-    This reduction will see a significant drop in performance as `k` grows
-    beyond a certain value. This value is system dependent, but generally
-    about a `k` of 5 million is where performance degredation has been observed.
+    For `k` up to a few thousand, the values come from merging a heap of
+    the `k` extreme values of each task. For larger `k`, the server
+    samples the array for a threshold near the `k`-th value and sorts only
+    the values beyond it, which scales to `k` in the millions.
     
     Examples
     --------
@@ -1627,13 +2117,14 @@ def maxk(pda : pdarray, k : int) -> pdarray:
     -----
     This call is equivalent in value to:
     
-        a[ak.argsort(a)[k:]]
+        a[ak.argsort(a)[-k:]]
     
     and generally outperforms this operation.
 
-    This reduction will see a significant drop in performance as `k` grows
-    beyond a certain value. This value is system dependent, but generally
-    about a `k` of 5 million is where performance degredation has been observed.
+    For `k` up to a few thousand, the values come from merging a heap of
+    the `k` extreme values of each task. For larger `k`, the server
+    samples the array for a threshold near the `k`-th value and sorts only
+    the values beyond it, which scales to `k` in the millions.
 
 
     Examples
@@ -1684,9 +2175,10 @@ def argmink(pda : pdarray, k : int) -> pdarray:
     
     and generally outperforms this operation.
 
-    This reduction will see a significant drop in performance as `k` grows
-    beyond a certain value. This value is system dependent, but generally
-    about a `k` of 5 million is where performance degredation has been observed.
+    The server samples the array for a threshold near the `k`-th value and
+    sorts only the values beyond it, which scales to `k` in the millions.
+    Equal values are returned in order of their index, exactly as the
+    slice of the argsort gives them.
 
     Examples
     --------
@@ -1729,13 +2221,14 @@ def argmaxk(pda : pdarray, k : int) -> pdarray:
     -----
     This call is equivalent in value to:
     
-        ak.argsort(a)[k:]
+        ak.argsort(a)[-k:]
     
     and generally outperforms this operation.
 
-    This reduction will see a significant drop in performance as `k` grows
-    beyond a certain value. This value is system dependent, but generally
-    about a `k` of 5 million is where performance degradation has been observed.
+    The server samples the array for a threshold near the `k`-th value and
+    sorts only the values beyond it, which scales to `k` in the millions.
+    Equal values are returned in order of their index, exactly as the
+    slice of the argsort gives them.
 
 
     Examples
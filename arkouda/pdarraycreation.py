@@ -1,11 +1,11 @@
 import numpy as np # type: ignore
 import pandas as pd # type: ignore
-import struct
-from typing import cast, Iterable, Optional, Union
+import sys
+from typing import cast, Iterable, Optional, Tuple, Union
 from typeguard import typechecked
 from arkouda.client import generic_msg
 from arkouda.dtypes import *
-from arkouda.dtypes import structDtypeCodes, NUMBER_FORMAT_STRINGS
+from arkouda.dtypes import NUMBER_FORMAT_STRINGS
 from arkouda.dtypes import dtype as akdtype
 from arkouda.pdarrayclass import pdarray, create_pdarray
 from arkouda.strings import Strings, SArrays
@@ -96,7 +96,8 @@ def from_series(series : pd.Series, dtype : Optional[type]=None) -> Union[pdarra
                           'float64, int64, string, and datetime64[ns]').format(dt))
     return array(n_array)
 
-def array(a : Union[pdarray,np.ndarray, Iterable]) -> Union[pdarray, Strings]:
+def array(a : Union[pdarray,np.ndarray, Iterable], 
+          chunked : bool=False) -> Union[pdarray, Strings]:
     """
     Convert an iterable to a pdarray or Strings object, sending the corresponding
     data to the arkouda server. 
@@ -105,6 +106,11 @@ def array(a : Union[pdarray,np.ndarray, Iterable]) -> Union[pdarray, Strings]:
     ----------
     a : Union[pdarray, np.ndarray]
         Rank-1 array of a supported dtype
+    chunked : bool
+        If True, send the data in chunks of client.chunkTransferBytes into an
+        array created beforehand, so that arrays larger than 
+        client.maxTransferBytes, such as a np.memmap of a local .npy file,
+        can be uploaded without one giant message or a second full copy
 
     Returns
     -------
@@ -118,9 +124,9 @@ def array(a : Union[pdarray,np.ndarray, Iterable]) -> Union[pdarray, Strings]:
         Raised if a is not a pdarray, np.ndarray, or Python Iterable such as a
         list, array, tuple, or deque
     RuntimeError
-        If a is not one-dimensional, nbytes > maxTransferBytes, a.dtype is
-        not supported (not in DTypes), or if the product of a size and
-        a.itemsize > maxTransferBytes
+        If a is not one-dimensional, nbytes > maxTransferBytes and chunked
+        is False, a.dtype is not supported (not in DTypes), or if the product
+        of a size and a.itemsize > maxTransferBytes and chunked is False
 
     See Also
     --------
@@ -133,7 +139,8 @@ def array(a : Union[pdarray,np.ndarray, Iterable]) -> Union[pdarray, Strings]:
     from overwhelming the connection between the Python client and the arkouda
     server, under the assumption that it is a low-bandwidth connection. The user
     may override this limit by setting ak.maxTransferBytes to a larger value, 
-    but should proceed with caution.
+    but should proceed with caution, or upload the array with chunked=True,
+    to which the limit does not apply.
     
     If the pdrray or ndarray is of type U, this method is called twice recursively 
     to create the Strings object and the two corresponding pdarrays for string 
@@ -165,39 +172,100 @@ def array(a : Union[pdarray,np.ndarray, Iterable]) -> Union[pdarray, Strings]:
         raise RuntimeError("Only rank-1 pdarrays or ndarrays supported")
     # Check if array of strings
     if a.dtype.kind == 'U' or  'U' in a.dtype.kind:
-        encoded = np.array([elem.encode() for elem in a])
-        # Length of each string, plus null byte terminator
-        lengths = np.array([len(elem) for elem in encoded]) + 1
-        # Compute zero-up segment offsets
-        offsets = np.cumsum(lengths) - lengths
-        # Allocate and fill bytes array with string segments
-        nbytes = offsets[-1] + lengths[-1]
-        if nbytes > maxTransferBytes:
+        offsets, values = _encode_strings(a)
+        if values.size > maxTransferBytes and not chunked:
             raise RuntimeError(("Creating pdarray would require transferring {} bytes," +
                                 " which exceeds allowed transfer size. Increase " +
-                                "ak.maxTransferBytes to force.").format(nbytes))
-        values = np.zeros(nbytes, dtype=np.uint8)
-        for s, o in zip(encoded, offsets):
-            for i, b in enumerate(s):
-                values[o+i] = b
+                                "ak.maxTransferBytes to force.").format(values.size))
         # Recurse to create pdarrays for offsets and values, then return Strings object
-        return Strings(array(offsets), array(values))
+        return Strings(array(offsets, chunked), array(values, chunked))
     # If not strings, then check that dtype is supported in arkouda
     if a.dtype.name not in DTypes:
         raise RuntimeError("Unhandled dtype {}".format(a.dtype))
-    # Do not allow arrays that are too large
     size = a.size
+    if chunked:
+        return _array_chunks(a)
+    # Do not allow arrays that are too large
     if (size * a.itemsize) > maxTransferBytes:
         raise RuntimeError(("Array exceeds allowed transfer size. Increase " +
                             "ak.maxTransferBytes to allow"))
-    # Pack binary array data into a bytes object with a command header
-    # including the dtype and size
-    fmt = ">{:n}{}".format(size, structDtypeCodes[a.dtype.name])
-    req_msg = "array {} {:n} ".\
-                    format(a.dtype.name, size).encode() + struct.pack(fmt, *a)
-    repMsg = generic_msg(req_msg, send_bytes=True)
+    # Send the raw array data, in native byte order, as a frame following a 
+    # command including the dtype, size, and byte order
+    a = np.ascontiguousarray(a, dtype=a.dtype.newbyteorder('='))
+    repMsg = generic_msg("array {} {:n} {}".format(a.dtype.name, size, sys.byteorder),
+                         frames=[memoryview(a).cast('B')])
     return create_pdarray(cast(str,repMsg))
 
+def _array_chunks(a : np.ndarray) -> pdarray:
+    """
+    Create a pdarray on the arkouda server and send the data of a into it 
+    in slices of client.chunkTransferBytes, each as a frame following a 
+    command naming the array, the index of its first element, and the byte
+    order. Only one slice at a time is converted to native byte order. The
+    user should not call this function directly.
+
+    Parameters
+    ----------
+    a : np.ndarray
+        Rank-1 array of a supported dtype
+
+    Returns
+    -------
+    pdarray
+        The array created on the arkouda server
+
+    Raises
+    ------
+    RuntimeError
+        Raised if there is a server-side error thrown
+    """
+    from arkouda.client import chunkTransferBytes
+    pda = create_pdarray(generic_msg("create {} {:n}".format(a.dtype.name, a.size)))
+    step = max(chunkTransferBytes // a.itemsize, 1)
+    for lo in range(0, a.size, step):
+        chunk = np.ascontiguousarray(a[lo:lo + step], dtype=a.dtype.newbyteorder('='))
+        generic_msg("arraySlice {} {:n} {}".format(pda.name, lo, sys.byteorder),
+                    frames=[memoryview(chunk).cast('B')])
+    return pda
+
+def _encode_strings(a : np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode a numpy array of strings into the segmented representation used
+    by Strings, using bulk operations rather than per-string loops. The 
+    strings are joined and encoded in one piece, so memory is proportional
+    to their total length rather than to the length of the longest one.
+    The user should not call this function directly.
+
+    Parameters
+    ----------
+    a : np.ndarray
+        Rank-1 array of dtype U
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The int64 start offset of each string, and the uint8 UTF-8 bytes of 
+        all strings, each followed by a null byte terminator
+
+    Raises
+    ------
+    ValueError
+        Raised if a string contains a null character, which would be read 
+        as the end of the string
+    """
+    if a.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint8)
+    # UTF-8 bytes of all strings, each followed by a null byte terminator
+    values = np.frombuffer(('\x00'.join(a.tolist()) + '\x00').encode('utf-8'), 
+                           dtype=np.uint8)
+    # Each string starts after the terminator of the one before it
+    ends = np.flatnonzero(values == 0)
+    if ends.size != a.size:
+        raise ValueError("Strings cannot contain null characters")
+    offsets = np.zeros(a.size, dtype=np.int64)
+    offsets[1:] = ends[:-1] + 1
+    return offsets, values
+
 def zeros(size : int, dtype : type=np.float64) -> pdarray:
     """
     Create a pdarray filled with zeros.
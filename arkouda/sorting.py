@@ -7,9 +7,12 @@ from arkouda.pdarraycreation import zeros
 from arkouda.strings import Strings
 from arkouda.dtypes import *
 
-__all__ = ["argsort", "coargsort", "sort"]
+__all__ = ["argsort", "coargsort", "sort", "searchsorted"]
 
-def argsort(pda : Union[pdarray,Strings,'Categorical']) -> pdarray: # type: ignore
+SORT_ALGORITHMS = ('auto', 'radix', 'sample')
+
+def argsort(pda : Union[pdarray,Strings,'Categorical'], # type: ignore
+            algorithm : str='auto', ascending : bool=True) -> pdarray:
     """
     Return the permutation that sorts the array.
     
@@ -17,16 +20,26 @@ def argsort(pda : Union[pdarray,Strings,'Categorical']) -> pdarray: # type: igno
     ----------
     pda : pdarray or Strings or Categorical
         The array to sort (int64 or float64)
+    algorithm : str
+        'radix' for the least-significant-digit radix sort, 'sample' for
+        the sample sort, or 'auto' to let the server choose. Ignored for
+        Strings and Categorical.
+    ascending : bool
+        Whether to sort in ascending order (the default) or descending order
 
     Returns
     -------
     pdarray, int64
-        The indices such that ``pda[indices]`` is sorted
+        The indices such that ``pda[indices]`` is sorted. Equal numeric
+        values keep their original order in either direction; equal 
+        strings are not guaranteed to.
         
     Raises
     ------
     TypeError
         Raised if the parameter is other than a pdarray or Strings
+    ValueError
+        Raised if algorithm is not 'auto', 'radix' or 'sample'
 
     See Also
     --------
@@ -34,8 +47,20 @@ def argsort(pda : Union[pdarray,Strings,'Categorical']) -> pdarray: # type: igno
 
     Notes
     -----
-    Uses a least-significant-digit radix sort, which is stable and
-    resilinent to non-uniformity in data but communication intensive.
+    The radix sort is stable and resilinent to non-uniformity in data but
+    communication intensive, making one pass over the data for every 16
+    bits of the range of values. The sample sort splits the values among
+    the locales by splitters chosen from a random sample, moves them in a
+    single exchange and sorts them locally, so its communication does not
+    grow with the width of the values; it is also stable. With 'auto',
+    integers of a small range are counting sorted, and the server uses
+    the sample sort only for values wider than it is configured for
+    (``SS_minDigits`` 16-bit digits).
+
+    A descending sort inverts the digits of the keys as it sorts, so it
+    costs the same as an ascending one and, unlike negating the array or
+    reversing an ascending permutation, needs no extra pass or temporary
+    and keeps equal values in their original order.
 
     Examples
     --------
@@ -43,23 +68,30 @@ def argsort(pda : Union[pdarray,Strings,'Categorical']) -> pdarray: # type: igno
     >>> perm = ak.argsort(a)
     >>> a[perm]
     array([0, 1, 1, 3, 4, 5, 7, 8, 8, 9])
+    >>> a[ak.argsort(a, ascending=False)]
+    array([9, 8, 8, 7, 5, 4, 3, 1, 1, 0])
     """
     from arkouda.categorical import Categorical
     check_type(argname='argsort', value=pda, 
                       expected_type=Union[pdarray,Strings,Categorical])
+    if algorithm not in SORT_ALGORITHMS:
+        raise ValueError("algorithm must be one of {}".format(SORT_ALGORITHMS))
     if hasattr(pda, "argsort"):
-        return cast(Categorical,pda).argsort()
+        return cast(Categorical,pda).argsort(ascending=ascending)
     if pda.size == 0:
         return zeros(0, dtype=int64)
     if isinstance(pda, Strings):
         name = '{}+{}'.format(pda.offsets.name, pda.bytes.name)
     else:
         name = pda.name
-    repMsg = generic_msg("argsort {} {}".format(pda.objtype, name))
+    repMsg = generic_msg("argsort {} {} {} {}".format(pda.objtype, name, algorithm,
+                                                      bool(ascending)))
     return create_pdarray(cast(str,repMsg))
 
 @typechecked
-def coargsort(arrays : Sequence[Union[Strings,pdarray]]) -> pdarray:
+def coargsort(arrays : Sequence[Union[Strings,pdarray]],
+              algorithm : str='auto',
+              ascending : Union[bool,Sequence[bool]]=True) -> pdarray:
     """
     Return the permutation that groups the rows (left-to-right), if the
     input arrays are treated as columns. The permutation sorts numeric
@@ -69,6 +101,14 @@ def coargsort(arrays : Sequence[Union[Strings,pdarray]]) -> pdarray:
     ----------
     arrays : Sequence[Union[Strings,pdarray]]
         The columns (int64, float64, or Strings) to sort by row
+    algorithm : str
+        'radix' for the least-significant-digit radix sort, 'sample' for
+        the sample sort, or 'auto' to let the server choose. Ignored if
+        any of the columns are Strings, or if the combined key of the
+        columns is wider than 16 digits (see Notes).
+    ascending : bool or Sequence[bool]
+        Whether to sort in ascending order (the default) or descending
+        order, for all columns or for each column. Ignored for Strings.
 
     Returns
     -------
@@ -78,8 +118,10 @@ def coargsort(arrays : Sequence[Union[Strings,pdarray]]) -> pdarray:
     Raises
     ------
     ValueError
-        Raised if the pdarrays are not of the same size or if the parameter
-        is not an Iterable containing pdarrays or Strings
+        Raised if the pdarrays are not of the same size, if the parameter
+        is not an Iterable containing pdarrays or Strings, if algorithm
+        is not 'auto', 'radix' or 'sample', or if ascending does not have
+        one flag per column
 
     See Also
     --------
@@ -93,6 +135,15 @@ def coargsort(arrays : Sequence[Union[Strings,pdarray]]) -> pdarray:
     but for Strings, it operates on a hash. Thus, while grouping of equivalent
     strings is guaranteed, lexicographic ordering of the groups is not.
 
+    Numeric columns are combined into a single key, which the sample sort
+    (see argsort) sorts in one exchange however many columns there are.
+    With 'auto', the server uses it for keys of at least ``SS_minDigits``
+    16-bit digits. Descending columns have their digits inverted as they
+    are combined or sorted, so mixing directions costs nothing extra.
+    Columns whose combined key is wider than 16 digits (256 bits), or that
+    include Strings, are instead radix sorted one at a time, last first,
+    whatever the algorithm.
+
     Examples
     --------
     >>> a = ak.array([0, 1, 0, 1])
@@ -104,7 +155,15 @@ def coargsort(arrays : Sequence[Union[Strings,pdarray]]) -> pdarray:
     array([0, 0, 1, 1])
     >>> b[perm]
     array([0, 1, 0, 1])
+    >>> ak.coargsort([a, b], ascending=[True, False])
+    array([0, 2, 1, 3])
     """
+    if algorithm not in SORT_ALGORITHMS:
+        raise ValueError("algorithm must be one of {}".format(SORT_ALGORITHMS))
+    if isinstance(ascending, bool):
+        ascending = [ascending] * len(arrays)
+    elif len(ascending) != len(arrays):
+        raise ValueError("ascending must be a bool or have one bool per array")
     size = -1
     anames = []
     atypes = []
@@ -124,15 +183,17 @@ def coargsort(arrays : Sequence[Union[Strings,pdarray]]) -> pdarray:
     if size == 0:
         return zeros(0, dtype=int64)
     cmd = "coargsort"
-    reqMsg = "{} {:n} {} {}".format(cmd,
+    reqMsg = "{} {} {:n} {} {} {}".format(cmd,
+                                    algorithm,
                                     len(arrays),
                                     ' '.join(anames),
-                                    ' '.join(atypes))
+                                    ' '.join(atypes),
+                                    ' '.join(str(bool(asc)) for asc in ascending))
     repMsg = generic_msg(reqMsg)
     return create_pdarray(cast(str,repMsg))
 
 @typechecked
-def sort(pda : pdarray) -> pdarray:
+def sort(pda : pdarray, ascending : bool=True) -> pdarray:
     """
     Return a sorted copy of the array. Only sorts numeric arrays; 
     for Strings, use argsort.
@@ -141,6 +202,8 @@ def sort(pda : pdarray) -> pdarray:
     ----------
     pda : pdarray or Categorical
         The array to sort (int64 or float64)
+    ascending : bool
+        Whether to sort in ascending order (the default) or descending order
 
     Returns
     -------
@@ -169,8 +232,68 @@ def sort(pda : pdarray) -> pdarray:
     >>> sorted = ak.sort(a)
     >>> a
     array([0, 1, 1, 3, 4, 5, 7, 8, 8, 9])
+    >>> ak.sort(a, ascending=False)
+    array([9, 8, 8, 7, 5, 4, 3, 1, 1, 0])
     """
     if pda.size == 0:
         return zeros(0, dtype=int64)
-    repMsg = generic_msg("sort {}".format(pda.name))
+    repMsg = generic_msg("sort {} {}".format(pda.name, bool(ascending)))
+    return create_pdarray(cast(str,repMsg))
+
+@typechecked
+def searchsorted(a : pdarray, v : pdarray, side : str='left') -> pdarray:
+    """
+    Find the indices at which the values would be inserted into a sorted
+    array to keep it sorted.
+
+    Parameters
+    ----------
+    a : pdarray
+        The sorted array to search (int64 or float64)
+    v : pdarray
+        The values to find the positions of, of the same dtype as a
+    side : str
+        'left' for the index of the first element equal to each value,
+        or 'right' for the index after the last one
+
+    Returns
+    -------
+    pdarray, int64
+        The indices such that inserting each value of v before the element
+        of a at its index keeps a sorted
+
+    Raises
+    ------
+    TypeError
+        Raised if a or v is not a pdarray
+    ValueError
+        Raised if side is not 'left' or 'right'
+    RuntimeError
+        Raised if a is not sorted, or if a and v have different or
+        unsupported dtypes
+
+    See Also
+    --------
+    sort, merge_join
+
+    Notes
+    -----
+    The values are searched for in sorted order, so each locale only
+    searches its own block of a. The server remembers that a is sorted
+    and the permutation that sorts v until either is modified, so
+    searching the same arrays again is cheaper.
+
+    Examples
+    --------
+    >>> a = ak.array([1, 3, 3, 5])
+    >>> ak.searchsorted(a, ak.array([3, 0, 6]))
+    array([1, 0, 4])
+    >>> ak.searchsorted(a, ak.array([3, 0, 6]), side='right')
+    array([3, 0, 4])
+    """
+    if side not in ('left', 'right'):
+        raise ValueError("side must be 'left' or 'right'")
+    if v.size == 0:
+        return zeros(0, dtype=int64)
+    repMsg = generic_msg("searchsorted {} {} {}".format(a.name, v.name, side))
     return create_pdarray(cast(str,repMsg))
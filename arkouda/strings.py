@@ -1,8 +1,9 @@
 from __future__ import annotations
-from typing import cast, Tuple, Union
+from typing import cast, Iterator, Optional, Tuple, Union
 from typeguard import typechecked
 from arkouda.client import generic_msg
-from arkouda.pdarrayclass import pdarray, create_pdarray, parse_single_value,_parse_single_int_array_value
+from arkouda.pdarrayclass import pdarray, create_pdarray, parse_single_value,_parse_single_int_array_value, \
+     _iter_ndarray_chunks
 from arkouda.logger import getArkoudaLogger
 import numpy as np # type: ignore
 from arkouda.dtypes import str as akstr
@@ -13,6 +14,98 @@ import json
 
 __all__ = ['Strings','SArrays']
 
+def _decode_block(data : np.ndarray, lengths : np.ndarray, width : int) -> np.ndarray:
+    """
+    Decode consecutive UTF-8 strings into a numpy string array using bulk 
+    operations. The user should not call this function directly.
+
+    Parameters
+    ----------
+    data : np.ndarray, uint8
+        The bytes of the strings, concatenated without terminators
+    lengths : np.ndarray, int64
+        The length in bytes of each string
+    width : int
+        The row width, at least the maximum of lengths
+
+    Returns
+    -------
+    np.ndarray
+        The decoded strings, with dtype U
+    """
+    # Scatter the bytes into fixed-width, null-padded rows in row-major order
+    rows = np.zeros((lengths.size, width), dtype=np.uint8)
+    rows[np.arange(width) < lengths[:, np.newaxis]] = data
+    return np.char.decode(rows.view('S{}'.format(width)).reshape(lengths.size), 'utf-8')
+
+def _strip_terminators(npoffsets : np.ndarray, 
+                       npvalues : np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert null-terminated string bytes and their start offsets to the 
+    layout used by Apache Arrow. The user should not call this function directly.
+
+    Parameters
+    ----------
+    npoffsets : np.ndarray, int64
+        The start of each string in npvalues, followed by len(npvalues)
+    npvalues : np.ndarray, uint8
+        The bytes of the strings, each followed by a null terminator
+
+    Returns
+    -------
+    offsets : np.ndarray, int64
+        The offsets of the strings in data, followed by len(data)
+    data : np.ndarray, uint8
+        The bytes of the strings without terminators
+    """
+    keep = np.ones(npvalues.size, dtype=np.bool)
+    keep[npoffsets[1:] - 1] = False
+    return npoffsets - np.arange(npoffsets.size), npvalues[keep]
+
+def _decode_buffers(offsets : np.ndarray, data : np.ndarray, dtype : str,
+                    block_bytes : int) -> np.ndarray:
+    """
+    Decode strings in the layout returned by Strings.to_buffers into a numpy
+    array, in blocks of rows whose fixed-width layout fits in block_bytes. 
+    The user should not call this function directly.
+
+    Parameters
+    ----------
+    offsets : np.ndarray, int64
+        The offsets of the strings in data, followed by len(data)
+    data : np.ndarray, uint8
+        The bytes of the strings without terminators
+    dtype : str {'U' | 'O'}
+        The dtype of the result
+    block_bytes : int
+        The approximate number of bytes to decode at a time
+
+    Returns
+    -------
+    np.ndarray
+        The decoded strings
+    """
+    size = offsets.size - 1
+    if size == 0:
+        return np.empty(0, dtype='<U1' if dtype == 'U' else object)
+    lengths = np.diff(offsets)
+    width = max(int(lengths.max()), 1)
+    rows_per_block = max(block_bytes // width, 1)
+    if dtype == 'O':
+        res = np.empty(size, dtype=object)
+    blocks = []
+    for start in range(0, size, rows_per_block):
+        stop = min(start + rows_per_block, size)
+        block = _decode_block(data[offsets[start]:offsets[stop]], 
+                              lengths[start:stop], width)
+        if dtype == 'O':
+            res[start:stop] = block
+        else:
+            blocks.append(block)
+    if dtype == 'O':
+        return res
+    return blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+
 class Strings:
     """
     Represents an array of strings whose data resides on the
@@ -47,6 +140,8 @@ class Strings:
 
     BinOps = frozenset(["==", "!="])
     objtype = "str"
+    # Budget for the fixed-width byte layout used when decoding in to_ndarray
+    DecodeBlockBytes = 2**26
 
     def __init__(self, offset_attrib : Union[pdarray,np.ndarray], 
                  bytes_attrib : Union[pdarray,np.ndarray]) -> None:
@@ -659,17 +754,33 @@ class Strings:
         repMsg = generic_msg(msg)
         return create_pdarray(cast(str,repMsg))
 
-    def to_ndarray(self) -> np.ndarray:
+    @typechecked
+    def to_ndarray(self, dtype : str='U') -> np.ndarray:
         """
         Convert the array to a np.ndarray, transferring array data from the
         arkouda server to Python. If the array exceeds a built-in size limit,
         a RuntimeError is raised.
 
+        Parameters
+        ----------
+        dtype : str {'U' | 'O'}
+            'U' (default) returns a fixed-width numpy string array, while 
+            'O' returns an array of Python str objects, which is smaller 
+            when string lengths vary widely
+
         Returns
         -------
         np.ndarray
             A numpy ndarray with the same strings as this array
 
+        Raises
+        ------
+        ValueError
+            Raised if dtype is neither 'U' nor 'O'
+        RuntimeError
+            Raised if there is a server-side error thrown or if the transfer 
+            exceeds client.maxTransferBytes
+
         Notes
         -----
         The number of bytes in the array cannot exceed ``arkouda.maxTransferBytes``,
@@ -680,9 +791,13 @@ class Strings:
         may override this limit by setting ak.maxTransferBytes to a larger
         value, but proceed with caution.
 
+        The strings are decoded from UTF-8 in blocks of rows, so the temporary
+        memory used beyond the downloaded bytes and the result is proportional
+        to ``Strings.DecodeBlockBytes``.
+
         See Also
         --------
-        array
+        array, to_buffers
 
         Examples
         --------
@@ -692,20 +807,116 @@ class Strings:
 
         >>> type(a.to_ndarray())
         numpy.ndarray
+
+        >>> a.to_ndarray(dtype='O')
+        array(['hello', 'my', 'world'], dtype=object)
+        """
+        if dtype not in ('U', 'O'):
+            raise ValueError("dtype must be 'U' or 'O', not {}".format(dtype))
+        offsets, data = self.to_buffers()
+        return _decode_buffers(offsets, data, dtype, self.DecodeBlockBytes)
+
+    @typechecked
+    def to_ndarray_chunks(self, chunk_bytes : Optional[int]=None, 
+                          dtype : str='U') -> Iterator[np.ndarray]:
+        """
+        Transfer the array to Python as a sequence of decoded np.ndarray 
+        chunks, so that arrays larger than client.maxTransferBytes can be 
+        processed or written out without holding all of them in memory.
+
+        Parameters
+        ----------
+        chunk_bytes : int, optional
+            The number of bytes per transfer, defaults to 
+            client.chunkTransferBytes. Each chunk holds the strings whose 
+            offsets fit in one transfer.
+        dtype : str {'U' | 'O'}
+            The dtype of each chunk, as in to_ndarray
+
+        Returns
+        -------
+        Iterator[np.ndarray]
+            Consecutive chunks that concatenate to self.to_ndarray(dtype)
+
+        Raises
+        ------
+        ValueError
+            Raised if dtype is neither 'U' nor 'O' or if chunk_bytes is 
+            not positive
+        RuntimeError
+            Raised if there is a server-side error thrown
+
+        See Also
+        --------
+        to_ndarray, pdarray.to_ndarray_chunks
+
+        Examples
+        --------
+        >>> a = ak.array(["hello", "my", "world"])
+        >>> list(a.to_ndarray_chunks(chunk_bytes=16))
+        [array(['hello', 'my'], dtype='<U5'), array(['world'], dtype='<U5')]
+        """
+        if dtype not in ('U', 'O'):
+            raise ValueError("dtype must be 'U' or 'O', not {}".format(dtype))
+        offset_chunks = _iter_ndarray_chunks(self.offsets.name, self.offsets.dtype,
+                                             0, self.size, chunk_bytes)
+        # The bytes of a chunk end where the strings of the next chunk begin
+        prev = None
+        for npoffsets in offset_chunks:
+            if prev is not None:
+                yield self._decode_chunk(prev, int(npoffsets[0]), chunk_bytes, dtype)
+            prev = npoffsets
+        if prev is not None:
+            yield self._decode_chunk(prev, self.nbytes, chunk_bytes, dtype)
+
+    def _decode_chunk(self, npoffsets : np.ndarray, end : int, 
+                      chunk_bytes : Optional[int], dtype : str) -> np.ndarray:
+        """
+        Fetch and decode the strings starting at npoffsets, whose bytes end 
+        at end. The user should not call this function directly.
+        """
+        start = int(npoffsets[0])
+        npvalues = list(_iter_ndarray_chunks(self.bytes.name, self.bytes.dtype, 
+                                             start, end, chunk_bytes))
+        offsets, data = _strip_terminators(np.hstack((npoffsets, [end])) - start,
+                              npvalues[0] if len(npvalues) == 1 else np.concatenate(npvalues))
+        return _decode_buffers(offsets, data, dtype, self.DecodeBlockBytes)
+
+    def to_buffers(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Transfer the array data from the arkouda server to Python as an
+        offsets array and a bytes array, in the layout used by Apache Arrow
+        for variable-length strings, without decoding individual strings.
+
+        Returns
+        -------
+        offsets : np.ndarray, int64
+            size + 1 offsets, where string i occupies data[offsets[i]:offsets[i+1]]
+        data : np.ndarray, uint8
+            The UTF-8 bytes of all strings, without null terminators
+
+        Raises
+        ------
+        RuntimeError
+            Raised if there is a server-side error thrown or if the transfer 
+            exceeds client.maxTransferBytes
+
+        See Also
+        --------
+        to_ndarray
+
+        Notes
+        -----
+        The returned buffers can be wrapped without copying, e.g. with
+        ``pyarrow.LargeStringArray.from_buffers(len(offsets) - 1,
+        pyarrow.py_buffer(offsets), pyarrow.py_buffer(data))``.
         """
         # Get offsets and append total bytes for length calculation
         npoffsets = np.hstack((self.offsets.to_ndarray(), np.array([self.nbytes])))
         # Get contents of strings (will error if too large)
         npvalues = self.bytes.to_ndarray()
-        # Compute lengths, discounting null terminators
-        lengths = np.diff(npoffsets) - 1
-        # Numpy dtype is based on max string length
-        dt = '<U{}'.format(lengths.max())
-        res = np.empty(self.size, dtype=dt)
-        # Form a string from each segment and store in numpy array
-        for i, (o, l) in enumerate(zip(npoffsets, lengths)):
-            res[i] = np.str_(''.join(chr(b) for b in npvalues[o:o+l]))
-        return res
+        # Drop the null terminator that ends each string and shift offsets to match
+        return _strip_terminators(npoffsets, npvalues)
 
     @typechecked
     def save(self, prefix_path : str, dataset : str='strings_array', 
@@ -5,6 +5,15 @@ import numpy as np
 import arkouda as ak
 
 TYPES = ('int64', 'float64')
+ALGORITHMS = ('radix', 'sample')
+
+def skewed(N, dtype):
+    # 62-bit values shifted right by a random amount, so that most are
+    # small but the largest need all 62 bits
+    a = ak.randint(0, 2**62, N) >> ak.randint(0, 62, N)
+    if dtype == 'float64':
+        a = ak.cast(a, ak.float64)
+    return a
 
 def time_ak_argsort(N_per_locale, trials, dtype):
     print(">>> arkouda argsort")
@@ -18,8 +27,10 @@ def time_ak_argsort(N_per_locale, trials, dtype):
      
     timings = []
     for i in range(trials):
+        # a fresh copy, so the server has no sort of it to reuse
+        b = a + 0
         start = time.time()
-        perm = ak.argsort(a)
+        perm = ak.argsort(b)
         end = time.time()
         timings.append(end - start)
     tavg = sum(timings) / trials
@@ -29,6 +40,22 @@ def time_ak_argsort(N_per_locale, trials, dtype):
     bytes_per_sec = (a.size * a.itemsize) / tavg
     print("Average rate = {:.4f} GiB/sec".format(bytes_per_sec/2**30))
 
+    a = skewed(N, dtype)
+    for algorithm in ALGORITHMS:
+        timings = []
+        for i in range(trials):
+            b = a + 0
+            start = time.time()
+            perm = ak.argsort(b, algorithm=algorithm)
+            end = time.time()
+            timings.append(end - start)
+        tavg = sum(timings) / trials
+
+        assert ak.is_sorted(a[perm])
+        print("skewed {} Average time = {:.4f} sec".format(algorithm, tavg))
+        bytes_per_sec = (a.size * a.itemsize) / tavg
+        print("skewed {} Average rate = {:.4f} GiB/sec".format(algorithm, bytes_per_sec/2**30))
+
 def time_np_argsort(N, trials, dtype):
     print(">>> numpy argsort")
     print("N = {:,}".format(N))
@@ -59,8 +86,13 @@ def check_correctness(dtype):
     perm = ak.argsort(a)
     assert ak.is_sorted(a[perm])
 
+    a = skewed(N, dtype)
+    for algorithm in ALGORITHMS:
+        perm = ak.argsort(a + 0, algorithm=algorithm)
+        assert ak.is_sorted(a[perm])
+
 def create_parser():
-    parser = argparse.ArgumentParser(description="Measure performance of sorting an array of random values.")
+    parser = argparse.ArgumentParser(description="Measure performance of sorting an array of random values, and of skewed values by each algorithm.")
     parser.add_argument('hostname', help='Hostname of arkouda server')
     parser.add_argument('port', type=int, help='Port of arkouda server')
     parser.add_argument('-n', '--size', type=int, default=10**8, help='Problem size: length of array to argsort')
@@ -5,6 +5,15 @@ import numpy as np
 import arkouda as ak
 
 TYPES = ('int64', 'float64')
+ALGORITHMS = ('radix', 'sample')
+
+def skewed(N, dtype):
+    # 62-bit values shifted right by a random amount, so that most are
+    # small but the largest need all 62 bits
+    a = ak.randint(0, 2**62, N) >> ak.randint(0, 62, N)
+    if dtype == 'float64':
+        a = ak.cast(a, ak.float64)
+    return a
 
 def time_ak_coargsort(N_per_locale, trials, dtype):
     print(">>> arkouda coargsort")
@@ -31,6 +40,25 @@ def time_ak_coargsort(N_per_locale, trials, dtype):
         bytes_per_sec = sum(a.size * a.itemsize for a in arrs) / tavg
         print("{}-array Average rate = {:.4f} GiB/sec".format(numArrays, bytes_per_sec/2**30))
 
+    # skewed keys, which fill all digits of the combined key, for as many
+    # arrays as are combined into one key of at most 16 digits
+    for numArrays in (1, 2, 4):
+        arrs = [skewed(N//numArrays, dtype) for _ in range(numArrays)]
+        for algorithm in ALGORITHMS:
+            timings = []
+            for i in range(trials):
+                start = time.time()
+                perm = ak.coargsort(arrs, algorithm=algorithm)
+                end = time.time()
+                timings.append(end - start)
+            tavg = sum(timings) / trials
+
+            a = arrs[0][perm]
+            assert ak.is_sorted(a)
+            print("skewed {}-array {} Average time = {:.4f} sec".format(numArrays, algorithm, tavg))
+            bytes_per_sec = sum(a.size * a.itemsize for a in arrs) / tavg
+            print("skewed {}-array {} Average rate = {:.4f} GiB/sec".format(numArrays, algorithm, bytes_per_sec/2**30))
+
 def time_np_coargsort(N, trials, dtype):
     print(">>> numpy coargsort") # technically lexsort
     print("N = {:,}".format(N))
@@ -70,9 +98,14 @@ def check_correctness(dtype):
     perm = ak.coargsort([z, a])
     assert ak.is_sorted(a[perm])
 
+    s = skewed(N, dtype)
+    for algorithm in ALGORITHMS:
+        perm = ak.coargsort([s, a], algorithm=algorithm)
+        assert ak.is_sorted(s[perm])
+
 
 def create_parser():
-    parser = argparse.ArgumentParser(description="Measure performance of sorting arrays of random values.")
+    parser = argparse.ArgumentParser(description="Measure performance of sorting arrays of random values, and of skewed values by each algorithm.")
     parser.add_argument('hostname', help='Hostname of arkouda server')
     parser.add_argument('port', type=int, help='Port of arkouda server')
     parser.add_argument('-n', '--size', type=int, default=10**8, help='Problem size: total length of all arrays to coargsort')
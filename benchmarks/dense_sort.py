@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import time, argparse
+import numpy as np
+import arkouda as ak
+
+OPS = ('argsort', 'unique', 'groupby')
+# log2 of the ranges of keys; the server counting sorts ranges of up to
+# 2**16 values (--CS_maxBins) and radix sorts wider ones
+RANGES = (4, 8, 12, 16, 17, 20, 24, 32)
+
+def run_op(op, keys):
+    if op == 'argsort':
+        return ak.argsort(keys)
+    elif op == 'unique':
+        return ak.unique(keys, return_counts=True)
+    elif op == 'groupby':
+        return ak.GroupBy(keys)
+
+def time_ak_dense_sort(N_per_locale, trials, seed):
+    print(">>> arkouda dense key sort")
+    cfg = ak.get_config()
+    N = N_per_locale * cfg["numLocales"]
+    print("numLocales = {}, N = {:,}".format(cfg["numLocales"], N))
+    for lgRange in RANGES:
+        keys = ak.randint(0, 2**lgRange, N, seed=seed)
+        for op in OPS:
+            timings = []
+            for i in range(trials):
+                # a fresh copy, so the server has no sort of it to reuse
+                k = keys + 0
+                start = time.time()
+                run_op(op, k)
+                end = time.time()
+                timings.append(end - start)
+            tavg = sum(timings) / trials
+
+            print("{} 2**{} Average time = {:.4f} sec".format(op, lgRange, tavg))
+            bytes_per_sec = (keys.size * keys.itemsize) / tavg
+            print("{} 2**{} Average rate = {:.4f} GiB/sec".format(op, lgRange, bytes_per_sec/2**30))
+
+def check_correctness(seed):
+    N = 10**4
+    for low, high in ((0, 2**4), (-2**10, 2**10), (2**40, 2**40 + 2**16), (0, 2**32)):
+        keys = ak.randint(low, high, N, seed=seed)
+        perm = ak.argsort(keys)
+        assert ak.is_sorted(keys[perm])
+        order = ak.arange(N)[perm]
+        g = ak.GroupBy(keys)
+        assert (g.permutation == perm).all()
+        u, c = ak.unique(keys, return_counts=True)
+        npu, npc = np.unique(keys.to_ndarray(), return_counts=True)
+        assert np.all(u.to_ndarray() == npu)
+        assert np.all(c.to_ndarray() == npc)
+        # ties are kept in their original order
+        assert (ak.GroupBy([keys[perm], order]).permutation == ak.arange(N)).all()
+
+def create_parser():
+    parser = argparse.ArgumentParser(description="Measure the performance of argsort, unique and GroupBy on integer keys of increasing range, across the switch from counting sort to radix sort.")
+    parser.add_argument('hostname', help='Hostname of arkouda server')
+    parser.add_argument('port', type=int, help='Port of arkouda server')
+    parser.add_argument('-n', '--size', type=int, default=10**8, help='Problem size: length of array of keys')
+    parser.add_argument('-t', '--trials', type=int, default=3, help='Number of times to run the benchmark')
+    parser.add_argument('--seed', default=None, type=int, help='Value to initialize random number generator')
+    parser.add_argument('--correctness-only', default=False, action='store_true', help='Only check correctness, not performance.')
+    return parser
+
+if __name__ == "__main__":
+    import sys
+    parser = create_parser()
+    args = parser.parse_args()
+    ak.verbose = False
+    ak.connect(args.hostname, args.port)
+
+    if args.correctness_only:
+        check_correctness(args.seed)
+        sys.exit(0)
+
+    print("array size = {:,}".format(args.size))
+    print("number of trials = ", args.trials)
+    time_ak_dense_sort(args.size, args.trials, args.seed)
+    sys.exit(0)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import time, argparse
+import numpy as np
+import arkouda as ak
+
+METHODS = ('sort', 'hash')
+CARDINALITIES = {'low': 2**10, 'high': 2**62}
+
+def time_ak_groupby(N_per_locale, trials, seed):
+    print(">>> arkouda groupby")
+    cfg = ak.get_config()
+    N = N_per_locale * cfg["numLocales"]
+    print("numLocales = {}, N = {:,}".format(cfg["numLocales"], N))
+    for card, high in CARDINALITIES.items():
+        keys = ak.randint(0, high, N, seed=seed)
+        for method in METHODS:
+            timings = []
+            for i in range(trials):
+                start = time.time()
+                g = ak.GroupBy(keys, method=method)
+                end = time.time()
+                timings.append(end - start)
+            tavg = sum(timings) / trials
+
+            print("{}-cardinality {} groups = {:,}".format(card, method, g.segments.size))
+            print("{}-cardinality {} Average time = {:.4f} sec".format(card, method, tavg))
+            bytes_per_sec = (keys.size * keys.itemsize) / tavg
+            print("{}-cardinality {} Average rate = {:.4f} GiB/sec".format(card, method,
+                                                                           bytes_per_sec/2**30))
+
+def check_correctness(seed):
+    N = 10**4
+    for high in (2**4, 2**62):
+        keys = ak.randint(0, high, N, seed=seed)
+        values = ak.randint(0, 2**16, N, seed=seed)
+        skeys, ssums = ak.GroupBy(keys).sum(values)
+        hkeys, hsums = ak.GroupBy(keys, method='hash').sum(values)
+        order = ak.argsort(hkeys)
+        assert (skeys == hkeys[order]).all()
+        assert (ssums == hsums[order]).all()
+
+def create_parser():
+    parser = argparse.ArgumentParser(description="Measure the performance of grouping keys by sorting or by hashing: ak.GroupBy(keys, method=...)")
+    parser.add_argument('hostname', help='Hostname of arkouda server')
+    parser.add_argument('port', type=int, help='Port of arkouda server')
+    parser.add_argument('-n', '--size', type=int, default=10**8, help='Problem size: length of array of keys')
+    parser.add_argument('-t', '--trials', type=int, default=3, help='Number of times to run the benchmark')
+    parser.add_argument('--seed', default=None, type=int, help='Value to initialize random number generator')
+    parser.add_argument('--correctness-only', default=False, action='store_true', help='Only check correctness, not performance.')
+    return parser
+
+if __name__ == "__main__":
+    import sys
+    parser = create_parser()
+    args = parser.parse_args()
+    ak.verbose = False
+    ak.connect(args.hostname, args.port)
+
+    if args.correctness_only:
+        check_correctness(args.seed)
+        sys.exit(0)
+
+    print("array size = {:,}".format(args.size))
+    print("number of trials = ", args.trials)
+    time_ak_groupby(args.size, args.trials, args.seed)
+    sys.exit(0)
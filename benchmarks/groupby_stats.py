@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+import time, argparse
+import numpy as np
+import arkouda as ak
+
+OPS = ('var', 'std', 'first', 'last', 'mode', 'median', 'quantile')
+QUANTILE = 0.99
+
+def skewed_keys(N, seed):
+    # key k has probability about 1/k**2, so a few groups hold most of the
+    # values and most groups are tiny
+    return 2**20 // ak.randint(1, 2**20, N, seed=seed)
+
+def reduce(g, op, values):
+    if op == 'quantile':
+        return g.quantile(values, QUANTILE)
+    return getattr(g, op)(values)
+
+def time_ak_groupby_stats(N_per_locale, trials, seed):
+    print(">>> arkouda groupby statistics")
+    cfg = ak.get_config()
+    N = N_per_locale * cfg["numLocales"]
+    print("numLocales = {}, N = {:,}".format(cfg["numLocales"], N))
+    g = ak.GroupBy(skewed_keys(N, seed))
+    _, counts = g.count()
+    print("groups = {:,}, largest group = {:,}".format(g.segments.size, counts.max()))
+    values = ak.randint(0, 2**32, N, seed=seed)
+
+    timings = {op: [] for op in OPS}
+    for i in range(trials):
+        for op in OPS:
+            start = time.time()
+            reduce(g, op, values)
+            end = time.time()
+            timings[op].append(end - start)
+    tavg = {op: sum(t) / trials for op, t in timings.items()}
+
+    for op, t in tavg.items():
+        print("{} Average time = {:.4f} sec".format(op, t))
+        bytes_per_sec = (values.size * values.itemsize) / t
+        print("{} Average rate = {:.4f} GiB/sec".format(op, bytes_per_sec/2**30))
+
+def check_correctness(seed):
+    N = 10**4
+    keys = skewed_keys(N, seed)
+    values = ak.randint(0, 2**10, N, seed=seed)
+    g = ak.GroupBy(keys)
+    npkeys = keys.to_ndarray()
+    npvalues = values.to_ndarray()
+    groups = [npvalues[npkeys == k] for k in g.unique_keys.to_ndarray()]
+    expected = {'var': [np.var(v) for v in groups],
+                'std': [np.std(v) for v in groups],
+                'first': [v[0] for v in groups],
+                'last': [v[-1] for v in groups],
+                'median': [np.median(v) for v in groups],
+                'quantile': [np.quantile(v, QUANTILE) for v in groups]}
+    for op, ex in expected.items():
+        _, res = reduce(g, op, values)
+        assert np.allclose(ex, res.to_ndarray())
+    _, modes = g.mode(values)
+    for v, m in zip(groups, modes.to_ndarray()):
+        uniques, counts = np.unique(v, return_counts=True)
+        assert m == uniques[np.argmax(counts)]
+
+def create_parser():
+    parser = argparse.ArgumentParser(description="Measure the performance of grouped statistics over groups of very different sizes: ak.GroupBy.var(), .median(), .quantile(), ...")
+    parser.add_argument('hostname', help='Hostname of arkouda server')
+    parser.add_argument('port', type=int, help='Port of arkouda server')
+    parser.add_argument('-n', '--size', type=int, default=10**8, help='Problem size: length of arrays to group and reduce')
+    parser.add_argument('-t', '--trials', type=int, default=3, help='Number of times to run the benchmark')
+    parser.add_argument('--seed', default=None, type=int, help='Value to initialize random number generator')
+    parser.add_argument('--correctness-only', default=False, action='store_true', help='Only check correctness, not performance.')
+    return parser
+
+if __name__ == "__main__":
+    import sys
+    parser = create_parser()
+    args = parser.parse_args()
+    ak.verbose = False
+    ak.connect(args.hostname, args.port)
+
+    if args.correctness_only:
+        check_correctness(args.seed)
+        sys.exit(0)
+
+    print("array size = {:,}".format(args.size))
+    print("number of trials = ", args.trials)
+    time_ak_groupby_stats(args.size, args.trials, args.seed)
+    sys.exit(0)
@@ -2,6 +2,14 @@
 
 echo ---- argsort ----
 ./argsort.py -n 10000000 localhost 5555
+echo ---- groupby ----
+./groupby.py localhost 5555
+echo ---- groupby_stats ----
+./groupby_stats.py localhost 5555
+echo ---- dense_sort ----
+./dense_sort.py localhost 5555
+echo ---- topk ----
+./topk.py localhost 5555
 echo ---- gather ----
 ./gather.py localhost 5555
 echo ---- reduce ----
@@ -12,4 +20,5 @@ echo ---- scatter ----
 ./scatter.py localhost 5555
 echo ---- stream ----
 ./stream.py localhost 5555
-
+echo ---- transfer ----
+./transfer.py localhost 5555
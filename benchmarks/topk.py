@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+import time, argparse
+import numpy as np
+import arkouda as ak
+
+# fractions of the array to select
+FRACTIONS = (0.0001, 0.01, 0.1)
+# number of groups for the per-group top k
+NGROUPS = 2**10
+
+def run_op(op, keys, values, k):
+    if op == 'argmaxk':
+        return ak.argmaxk(values, k)
+    elif op == 'argsort':
+        return ak.argsort(values)[-k:]
+    elif op == 'groupby_topk':
+        return ak.GroupBy(keys).topk(values, max(k // NGROUPS, 1))
+
+def time_ak_topk(N_per_locale, trials, seed):
+    print(">>> arkouda top k")
+    cfg = ak.get_config()
+    N = N_per_locale * cfg["numLocales"]
+    print("numLocales = {}, N = {:,}".format(cfg["numLocales"], N))
+    keys = ak.randint(0, NGROUPS, N, seed=seed)
+    values = ak.randint(0, 2**32, N, seed=seed)
+    for frac in FRACTIONS:
+        k = int(frac * N)
+        for op in ('argmaxk', 'argsort', 'groupby_topk'):
+            timings = []
+            for i in range(trials):
+                # a fresh copy, so the server has no sort of it to reuse
+                v = values + 0
+                start = time.time()
+                run_op(op, keys, v, k)
+                end = time.time()
+                timings.append(end - start)
+            tavg = sum(timings) / trials
+
+            print("{} k={} Average time = {:.4f} sec".format(op, frac, tavg))
+            bytes_per_sec = (values.size * values.itemsize) / tavg
+            print("{} k={} Average rate = {:.4f} GiB/sec".format(op, frac, bytes_per_sec/2**30))
+
+def check_correctness(seed):
+    N = 10**4
+    keys = ak.randint(0, 10, N, seed=seed)
+    values = ak.randint(0, 100, N, seed=seed)
+    order = np.argsort(values.to_ndarray(), kind='stable')
+    for k in (1, 100, 5000, N):
+        assert np.all(ak.argmaxk(values, k).to_ndarray() == order[-k:])
+        assert np.all(ak.argmink(values, k).to_ndarray() == order[:k])
+        assert np.all(ak.maxk(values, k).to_ndarray() == values.to_ndarray()[order[-k:]])
+    segments, indices = ak.GroupBy(keys).topk(values, 5)
+    assert segments.size == 10
+    assert indices.size == 50
+    npkeys = keys.to_ndarray()
+    idx = indices.to_ndarray()
+    for key, start in enumerate(segments.to_ndarray()):
+        members = np.flatnonzero(npkeys == key)
+        expected = members[np.argsort(values.to_ndarray()[members], kind='stable')][-5:]
+        assert np.all(idx[start:start+5] == expected)
+
+def create_parser():
+    parser = argparse.ArgumentParser(description="Measure the performance of selecting the k largest values of an array, and of each group, against a full argsort followed by a slice.")
+    parser.add_argument('hostname', help='Hostname of arkouda server')
+    parser.add_argument('port', type=int, help='Port of arkouda server')
+    parser.add_argument('-n', '--size', type=int, default=10**8, help='Problem size: length of array of values')
+    parser.add_argument('-t', '--trials', type=int, default=3, help='Number of times to run the benchmark')
+    parser.add_argument('--seed', default=None, type=int, help='Value to initialize random number generator')
+    parser.add_argument('--correctness-only', default=False, action='store_true', help='Only check correctness, not performance.')
+    return parser
+
+if __name__ == "__main__":
+    import sys
+    parser = create_parser()
+    args = parser.parse_args()
+    ak.verbose = False
+    ak.connect(args.hostname, args.port)
+
+    if args.correctness_only:
+        check_correctness(args.seed)
+        sys.exit(0)
+
+    print("array size = {:,}".format(args.size))
+    print("number of trials = ", args.trials)
+    time_ak_topk(args.size, args.trials, args.seed)
+    sys.exit(0)
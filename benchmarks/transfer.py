@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import time, argparse
+import numpy as np
+import arkouda as ak
+
+TYPES = ('int64', 'float64', 'bool')
+
+def time_ak_to_ndarray(N, trials, dtype, random):
+    print(">>> arkouda to_ndarray")
+    cfg = ak.get_config()
+    print("numLocales = {}, N = {:,}".format(cfg["numLocales"], N))
+    if random:
+        if dtype == 'int64':
+            a = ak.randint(0, 2**32, N)
+        elif dtype == 'float64':
+            a = ak.randint(0, 1, N, dtype=ak.float64)
+        elif dtype == 'bool':
+            a = ak.randint(0, 1, N, dtype=ak.bool)
+    else:
+        a = ak.ones(N, dtype=dtype)
+
+    timings = []
+    for i in range(trials):
+        start = time.time()
+        npa = a.to_ndarray()
+        end = time.time()
+        timings.append(end - start)
+    tavg = sum(timings) / trials
+
+    print("to_ndarray Average time = {:.4f} sec".format(tavg))
+    bytes_per_sec = (a.size * a.itemsize) / tavg
+    print("to_ndarray Average rate = {:.2f} GiB/sec".format(bytes_per_sec/2**30))
+
+def check_correctness(dtype, random):
+    N = 10**4
+    if random:
+        if dtype == 'int64':
+            a = np.random.randint(0, 2**32, N)
+        elif dtype == 'float64':
+            a = np.random.random(N)
+        elif dtype == 'bool':
+            a = np.random.randint(0, 2, N, dtype=np.bool)
+    else:
+        a = np.ones(N, dtype=dtype)
+    b = ak.array(a).to_ndarray()
+    assert b.dtype == a.dtype
+    assert np.array_equal(a, b)
+
+def create_parser():
+    parser = argparse.ArgumentParser(description="Measure the performance of transferring a pdarray to the client: a.to_ndarray()")
+    parser.add_argument('hostname', help='Hostname of arkouda server')
+    parser.add_argument('port', type=int, help='Port of arkouda server')
+    parser.add_argument('-n', '--size', type=int, default=10**8, help='Problem size: length of array to transfer')
+    parser.add_argument('-t', '--trials', type=int, default=6, help='Number of times to run the benchmark')
+    parser.add_argument('-d', '--dtype', default='int64', help='Dtype of array ({})'.format(', '.join(TYPES)))
+    parser.add_argument('-r', '--randomize', default=False, action='store_true', help='Fill array with random values instead of ones')
+    parser.add_argument('--correctness-only', default=False, action='store_true', help='Only check correctness, not performance.')
+    return parser
+
+if __name__ == "__main__":
+    import sys
+    parser = create_parser()
+    args = parser.parse_args()
+    if args.dtype not in TYPES:
+        raise ValueError("Dtype must be {}, not {}".format('/'.join(TYPES), args.dtype))
+    ak.verbose = False
+    ak.connect(server=args.hostname, port=args.port)
+
+    if args.correctness_only:
+        for dtype in TYPES:
+            check_correctness(dtype, args.randomize)
+        sys.exit(0)
+
+    # The whole array is pulled into client memory in one transfer
+    ak.client.maxTransferBytes = max(ak.client.maxTransferBytes,
+                                     args.size * np.dtype(args.dtype).itemsize)
+    print("array size = {:,}".format(args.size))
+    print("number of trials = ", args.trials)
+    time_ak_to_ndarray(args.size, args.trials, args.dtype, args.randomize)
+    sys.exit(0)
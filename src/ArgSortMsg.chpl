@@ -24,6 +24,8 @@ module ArgSortMsg
     use ServerErrorStrings;
 
     use RadixSortLSD;
+    use CountingSort;
+    use SampleSort;
     use SegmentedArray;
     use Reflection;
     use Errors;
@@ -383,9 +385,9 @@ module ArgSortMsg
 
     /* Perform one step in a multi-step argsort, starting with an initial 
        permutation vector and further permuting it in the manner required
-       to sort an array of keys.
+       to sort an array of keys in ascending or descending order.
      */
-    proc incrementalArgSort(g: GenSymEntry, iv: [?aD] int): [] int throws {
+    proc incrementalArgSort(g: GenSymEntry, iv: [?aD] int, ascending: bool = true): [] int throws {
       // Store the incremental permutation to be applied on top of the initial perm
       var deltaIV: [aD] int;
       // Discover the dtype of the entry holding the keys array
@@ -400,7 +402,7 @@ module ArgSortMsg
                   agg.copy(newai, olda[idx]);
               }
               // Generate the next incremental permutation
-              deltaIV = radixSortLSD_ranks(newa);
+              deltaIV = sortRanks(newa, ascending=ascending);
           }
           when DType.Float64 {
               var e = toSymEntry(g, real);
@@ -409,7 +411,7 @@ module ArgSortMsg
               forall (newai, idx) in zip(newa, iv) with (var agg = newSrcAggregator(real)) {
                   agg.copy(newai, olda[idx]);
               }
-              deltaIV = radixSortLSD_ranks(newa);
+              deltaIV = radixSortLSD_ranks(newa, ascending=ascending);
           }
           otherwise { throw getErrorWithContext(
                                 msg="Unsupported DataType: %t".format(dtype2str(g.dtype)),
@@ -459,27 +461,41 @@ module ArgSortMsg
     /*   return cumulativeIV; */
     /* } */
 
+    /* Whether the algorithm asked of argsort or coargsort is one of "auto",
+       "radix" or "sample" */
+    proc isSortAlgorithm(algorithm: string): bool {
+      return algorithm == "auto" || algorithm == "radix" || algorithm == "sample";
+    }
+
     /* Find the permutation that sorts multiple arrays, treating each array as a
-       new level of the sorting key.
+       new level of the sorting key, in ascending or descending order of each.
+       Strings are grouped by their hashes, so their order is ignored.
      */
     proc coargsortMsg(cmd: string, payload: bytes, st: borrowed SymTab) throws {
       param pn = Reflection.getRoutineName();
       var repMsg: string;
-      var (nstr, rest) = payload.decode().splitMsgToTuple(2);
+      var (algorithm, nstr, rest) = payload.decode().splitMsgToTuple(3);
       var n = nstr:int; // number of arrays to sort
       var fields = rest.split();
       asLogger.debug(getModuleName(),getRoutineName(),getLineNumber(), 
-                                  "number of arrays: %i fields: %t".format(n,fields));
+                     "algorithm: %s number of arrays: %i fields: %t".format(algorithm,n,fields));
+      if !isSortAlgorithm(algorithm) {
+          var errorMsg = incompatibleArgumentsError(pn,
+                        "algorithm must be auto, radix or sample, not %s".format(algorithm));
+          asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+          return errorMsg;
+      }
       // Check that fields contains the stated number of arrays
-      if (fields.size != 2*n) { 
+      if (fields.size != 3*n) { 
           var errorMsg = incompatibleArgumentsError(pn, 
-                        "Expected %i arrays but got %i".format(n, fields.size/2 - 1));
+                        "Expected %i arrays but got %i".format(n, fields.size/3));
           asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
           return errorMsg;
       }
       const low = fields.domain.low;
       var names = fields[low..#n];
       var types = fields[low+n..#n];
+      var ascendings: [names.domain] bool = [f in fields[low+2*n..#n]] f == "True";
       /* var arrays: [0..#n] borrowed GenSymEntry; */
       var size: int;
       // Check that all arrays exist in the symbol table and have the same size
@@ -523,12 +539,61 @@ module ArgSortMsg
       // and increases the size of the comm we have to do since the KEY is larger). We
       // merge the elements into a `uint(RSLSD_bitsPerDigit)` tuple. This wastes space
       // (e.g. when merging 2 arrays that use 7 and 9 bits), but it allows us to use
-      // `getDigit`, which changes the bit patterns to correctly sort negatives. We
-      // consider tuple[1] to be the most significant digit.
+      // `getDigit`, which changes the bit patterns to correctly sort negatives and
+      // inverts them for descending arrays. We consider tuple[1] to be the most
+      // significant digit.
       //
       // TODO support string? This further increases size (128-bits for each hash), so we
       // need to be OK with memory overhead and comm from the KEY)
       if !hasStr {
+        // If the arrays are all int64 and the combinations of their values
+        // are few enough to count, counting sort the combined key, with the
+        // first array as the most significant, unless sample sort is asked for
+        var isDense = algorithm != "sample";
+        var nCombined = 1;
+        var mins: [names.domain] int;
+        var maxs: [names.domain] int;
+        var spans: [names.domain] int;
+        for (name, aMin, aMax, span) in zip(names, mins, maxs, spans) {
+          if !isDense {
+            break;
+          }
+          var g: borrowed GenSymEntry = st.lookup(name);
+          if g.dtype != DType.Int64 {
+            isDense = false;
+            break;
+          }
+          const (lo, hi) = toSymEntry(g, int).keyRange();
+          if !isDenseRange(lo, hi) {
+            isDense = false;
+            break;
+          }
+          aMin = lo;
+          aMax = hi;
+          span = hi - lo + 1;
+          nCombined *= span;
+          if nCombined > maxBins {
+            isDense = false;
+            break;
+          }
+        }
+        if isDense {
+          overMemLimit((3 * size * numBytes(int))
+                       + (here.maxTaskPar * numLocales * nCombined * 8));
+          var combined = makeDistArray(size, int);
+          for (name, aMin, aMax, span, ascending) in zip(names, mins, maxs, spans, ascendings) {
+            var e = toSymEntry(st.lookup(name), int);
+            if ascending {
+              combined = combined * span + (e.a - aMin);
+            } else {
+              combined = combined * span + (aMax - e.a);
+            }
+          }
+          var ivname = st.nextName();
+          st.addEntry(ivname, new shared SymEntry(countingSortRanks(combined, 0, nCombined-1)));
+          return try! "created " + st.attrib(ivname);
+        }
+
         param bitsPerDigit = RSLSD_bitsPerDigit;
         var bitWidths: [names.domain] int;
         var negs: [names.domain] bool;
@@ -538,7 +603,7 @@ module ArgSortMsg
           // TODO checkSorted and exclude array if already sorted?
           var g: borrowed GenSymEntry = st.lookup(name);
           select g.dtype {
-              when DType.Int64   { (bitWidth, neg) = getBitWidth(toSymEntry(g, int ).a); }
+              when DType.Int64   { (bitWidth, neg) = bitWidthOfRange((...toSymEntry(g, int).keyRange())); }
               when DType.Float64 { (bitWidth, neg) = getBitWidth(toSymEntry(g, real).a); }
               otherwise          { 
                                      throw getErrorWithContext(
@@ -562,7 +627,7 @@ module ArgSortMsg
           var ivname = st.nextName();
           var merged = makeDistArray(size, numDigits*uint(bitsPerDigit));
           var curDigit = RSLSD_tupleLow + numDigits - totalDigits;
-          for (name, nBits, neg) in zip(names, bitWidths, negs) {
+          for (name, nBits, neg, ascending) in zip(names, bitWidths, negs, ascendings) {
               var g: borrowed GenSymEntry = st.lookup(name);
               proc mergeArray(type t) {
                 var e = toSymEntry(g, t);
@@ -573,7 +638,7 @@ module ArgSortMsg
                   const myDigit = (r.high - rshift) / bitsPerDigit;
                   const last = myDigit == 0;
                   forall (m, a) in zip(merged, A) {
-                    m[curDigit+myDigit] =  getDigit(a, rshift, last, neg):uint(bitsPerDigit);
+                    m[curDigit+myDigit] =  getDigit(a, rshift, last, neg, ascending):uint(bitsPerDigit);
                   }
                 }
                 curDigit += r.size;
@@ -594,7 +659,12 @@ module ArgSortMsg
               }
           }
 
-          var iv = argsortDefault(merged);
+          var iv: [merged.domain] int;
+          if useSampleSort(algorithm, totalDigits * bitsPerDigit) {
+            iv = sampleSortRanks(merged);
+          } else {
+            iv = argsortDefault(merged);
+          }
           st.addEntry(ivname, new shared SymEntry(iv));
           return try! "created " + st.attrib(ivname);
         }
@@ -606,6 +676,13 @@ module ArgSortMsg
         if totalDigits <= 16 { return mergedArgsort(16); }
       }
 
+      // Strings, and keys wider than 16 digits, are radix sorted one array
+      // at a time whatever the algorithm asked for
+      if algorithm != "auto" {
+          asLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                         "sorting each array in turn, ignoring algorithm %s".format(algorithm));
+      }
+
       // check and throw if over memory limit
       overMemLimit(((4 + 3) * size * numBytes(int))
                    + (2 * here.maxTaskPar * numLocales * 2**16 * 8));
@@ -625,7 +702,7 @@ module ArgSortMsg
         } else {
           var g: borrowed GenSymEntry = st.lookup(names[i]);
           // Perform the coArgSort and store in the new SymEntry
-          iv.a = incrementalArgSort(g, iv.a);
+          iv.a = incrementalArgSort(g, iv.a, ascendings[i]);
         }
       }
       return try! "created " + st.attrib(rname);
@@ -636,23 +713,81 @@ module ArgSortMsg
       //var AI = [(a, i) in zip(A, D)] (a, i);
       //Sort.TwoArrayRadixSort.twoArrayRadixSort(AI);
       //var iv = [(a, i) in AI] i;
-      var iv = radixSortLSD_ranks(A);
+      var iv = sortRanks(A);
       try! asLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
                              "argsort time = %i".format(Time.getCurrentTime() - t1));
       return iv;
     }
     
+    /*
+    Returns the permutation that sorts the array of an entry, from what
+    the entry knows of itself: a copy of the permutation it keeps, the
+    identity if it is sorted, or else a counting, radix or sample sort of
+    its known range of values, which it then keeps. The algorithm is
+    "radix", "sample", or "auto" for useSampleSort to choose by the width
+    of the values; counting sort is used for a small range unless sample
+    sort is asked for. Only the ascending permutation is kept, so a
+    descending sort always sorts
+    */
+    proc argsortEntry(e: borrowed SymEntry(?t), algorithm: string = "auto",
+                      ascending: bool = true): [e.aD] int throws {
+      var t1 = Time.getCurrentTime();
+      if ascending {
+        var cached = e.cachedSortPerm();
+        if cached != nil {
+          asLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                         "using kept sort permutation");
+          var iv: [e.aD] int = toSymEntry(cached!, int).a;
+          return iv;
+        }
+        if e.isSorted() {
+          var iv: [e.aD] int = [i in e.aD] i;
+          return iv;
+        }
+      }
+      var iv: [e.aD] int;
+      if t == int {
+        const (aMin, aMax) = e.keyRange();
+        const (nBits, negs) = bitWidthOfRange(aMin, aMax);
+        if algorithm != "sample" && isDenseRange(aMin, aMax) {
+          iv = countingSortRanks(e.a, aMin, aMax, ascending);
+        } else if useSampleSort(algorithm, nBits) {
+          iv = sampleSortRanks(e.a, ascending);
+        } else {
+          iv = radixSortLSD_ranks(e.a, nBits, negs, ascending);
+        }
+      } else if useSampleSort(algorithm, numBits(t)) {
+        iv = sampleSortRanks(e.a, ascending);
+      } else {
+        iv = radixSortLSD_ranks(e.a, checkSorted=false, ascending=ascending);
+      }
+      if ascending {
+        e.cacheSortPerm(iv);
+      }
+      asLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                     "argsort time = %i".format(Time.getCurrentTime() - t1));
+      return iv;
+    }
+
     /* argsort takes pdarray and returns an index vector iv which sorts the array */
     proc argsortMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
         param pn = Reflection.getRoutineName();
         var repMsg: string; // response message
         // split request into fields
-        var (objtype, name) = payload.decode().splitMsgToTuple(2);
+        var (objtype, name, algorithm, ascStr) = payload.decode().splitMsgToTuple(4);
+        const ascending = ascStr == "True";
 
         // get next symbol name
         var ivname = st.nextName();
         asLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
-                              "cmd: %s name: %s ivname: %s".format(cmd, name, ivname));
+                       "cmd: %s name: %s algorithm: %s ascending: %t ivname: %s".format(
+                                                  cmd, name, algorithm, ascending, ivname));
+        if !isSortAlgorithm(algorithm) {
+            var errorMsg = incompatibleArgumentsError(pn,
+                          "algorithm must be auto, radix or sample, not %s".format(algorithm));
+            asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
 
         select objtype {
           when "pdarray" {
@@ -664,12 +799,12 @@ module ArgSortMsg
             select (gEnt.dtype) {
                 when (DType.Int64) {
                     var e = toSymEntry(gEnt,int);
-                    var iv = argsortDefault(e.a);
+                    var iv = argsortEntry(e, algorithm, ascending);
                     st.addEntry(ivname, new shared SymEntry(iv));
                 }
                 when (DType.Float64) {
                     var e = toSymEntry(gEnt, real);
-                    var iv = argsortDefault(e.a);
+                    var iv = argsortEntry(e, algorithm, ascending);
                     st.addEntry(ivname, new shared SymEntry(iv));
                 }
                 otherwise {
@@ -685,7 +820,7 @@ module ArgSortMsg
             // check and throw if over memory limit
             overMemLimit((8 * strings.size * 8)
                          + (2 * here.maxTaskPar * numLocales * 2**16 * 8));
-            var iv = strings.argsort();
+            var iv = strings.argsort(ascending=ascending);
             st.addEntry(ivname, new shared SymEntry(iv));
           }
           otherwise {
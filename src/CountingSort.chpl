@@ -0,0 +1,196 @@
+/* Counting sort of integer keys with a small range of values
+
+ when all keys fall in a range of at most CS_maxBins values, one
+ counting pass with a bucket per value replaces the passes of the radix
+ sort over 16-bit digits, and only the indices have to move. The counts
+ of the values also give the unique values of the keys without sorting
+ them at all.
+
+ */
+module CountingSort
+{
+    use ServerConfig;
+
+    use BlockDist;
+    use SymArrayDmap;
+    use CommAggregation;
+    use AryUtil;
+    use RadixSortLSD only numTasks, Tasks, calcBlock, calcGlobalIndex, radixSortLSD_ranks;
+    use Reflection;
+    use Logging;
+
+    // largest number of distinct key values sorted by counting
+    config const CS_maxBins = 2**16;
+    const maxBins = CS_maxBins;
+
+    const csLogger = new Logger();
+    if v {
+        csLogger.level = LogLevel.DEBUG;
+    } else {
+        csLogger.level = LogLevel.INFO;
+    }
+
+    /* Returns the min and max of a, in one pass over the array */
+    proc keyRange(a: [?aD] int): (int, int) {
+        var aMin = max(int);
+        var aMax = min(int);
+        forall x in a with (min reduce aMin, max reduce aMax) {
+            aMin reduce= x;
+            aMax reduce= x;
+        }
+        return (aMin, aMax);
+    }
+
+    /* Whether the keys between aMin and aMax take few enough values to count */
+    inline proc isDenseRange(aMin: int, aMax: int): bool {
+        return aMin <= aMax && (aMax:uint - aMin:uint) < maxBins:uint;
+    }
+
+    /* Bin of a key between aMin and aMax, counting down from aMax for a
+       descending order */
+    inline proc binOf(x: int, aMin: int, aMax: int, ascending: bool): int {
+        return if ascending then x - aMin else aMax - x;
+    }
+
+    /*
+    Counts the keys of each task's part of the array in each bin, in the
+    transposed (bin, locale, task) order of calcGlobalIndex
+    */
+    private proc countBins(a: [?aD] int, aMin: int, aMax: int, ascending: bool = true) {
+        const bins = aMax - aMin + 1;
+        var gD = newBlockDom({0..#(numLocales * numTasks * bins)});
+        var globalCounts: [gD] int;
+        coforall loc in Locales {
+            on loc {
+                coforall task in Tasks {
+                    var taskBinCounts: [0..#bins] int;
+                    var lD = a.localSubdomain();
+                    var tD = calcBlock(task, lD.low, lD.high);
+                    for i in tD {
+                        taskBinCounts[binOf(a[i], aMin, aMax, ascending)] += 1;
+                    }
+                    // write counts in to global counts in transposed order
+                    var aggregator = newDstAggregator(int);
+                    for bin in 0..#bins {
+                        aggregator.copy(globalCounts[calcGlobalIndex(bin, loc.id, task)],
+                                        taskBinCounts[bin]);
+                    }
+                    aggregator.flush();
+                }
+            }
+        }
+        return globalCounts;
+    }
+
+    /*
+    Counting sort of a block distributed array whose keys are between aMin
+    and aMax, in ascending or descending order, returning the stable
+    sorting permutation as a block distributed array
+
+    :arg a: keys to sort
+    :type a: [] int
+
+    :arg aMin: smallest key
+    :type aMin: int
+
+    :arg aMax: largest key
+    :type aMax: int
+
+    :arg ascending: whether to sort in ascending order
+    :type ascending: bool
+
+    :returns: [] int
+    */
+    proc countingSortRanks(a: [?aD] int, aMin: int, aMax: int,
+                           ascending: bool = true): [aD] int {
+        const bins = aMax - aMin + 1;
+        var globalCounts = countBins(a, aMin, aMax, ascending);
+
+        // scan globalCounts to get the start of each locale/task in each bin
+        var globalStarts = + scan globalCounts;
+        globalStarts -= globalCounts;
+
+        // send each index to its position, keeping the original order of
+        // equal keys
+        var ranks: [aD] int;
+        coforall loc in Locales {
+            on loc {
+                coforall task in Tasks {
+                    var taskBinPos: [0..#bins] int;
+                    var lD = a.localSubdomain();
+                    var tD = calcBlock(task, lD.low, lD.high);
+                    {
+                        var aggregator = newSrcAggregator(int);
+                        for bin in 0..#bins {
+                            aggregator.copy(taskBinPos[bin],
+                                            globalStarts[calcGlobalIndex(bin, loc.id, task)]);
+                        }
+                        aggregator.flush();
+                    }
+                    {
+                        var aggregator = newDstAggregator(int);
+                        for i in tD {
+                            const bin = binOf(a[i], aMin, aMax, ascending);
+                            aggregator.copy(ranks[taskBinPos[bin]], i);
+                            taskBinPos[bin] += 1;
+                        }
+                        aggregator.flush();
+                    }
+                }
+            }
+        }
+        return ranks;
+    }
+
+    /*
+    Returns the number of keys of a equal to each value from aMin to aMax,
+    as a block distributed array
+
+    :arg a: keys to count
+    :type a: [] int
+
+    :arg aMin: smallest key
+    :type aMin: int
+
+    :arg aMax: largest key
+    :type aMax: int
+
+    :returns: [] int
+    */
+    proc countingHist(a: [?aD] int, aMin: int, aMax: int) {
+        const bins = aMax - aMin + 1;
+        const globalCounts = countBins(a, aMin, aMax);
+        // the counts of a bin are contiguous in globalCounts
+        const width = numLocales * numTasks;
+        var hist = makeDistArray(bins, int);
+        forall (bin, h) in zip(hist.domain, hist) {
+            for j in bin*width..#width {
+                h += globalCounts[j];
+            }
+        }
+        return hist;
+    }
+
+    /*
+    Returns the permutation that stably sorts a, in ascending or descending
+    order, by counting sort when the keys take at most CS_maxBins values
+    and by radix sort otherwise
+    */
+    proc sortRanks(a: [?aD] int, checkSorted: bool = true, ascending: bool = true): [aD] int {
+        if checkSorted && ascending && isSorted(a) {
+            var ranks: [aD] int = [i in aD] i;
+            return ranks;
+        }
+        const (aMin, aMax) = keyRange(a);
+        if isDenseRange(aMin, aMax) {
+            try! csLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                                "counting sort of %i bins".format(aMax - aMin + 1));
+            return countingSortRanks(a, aMin, aMax, ascending);
+        }
+        return radixSortLSD_ranks(a, checkSorted=false, ascending=ascending);
+    }
+
+    proc sortRanks(a: [?aD] ?t, checkSorted: bool = true, ascending: bool = true): [aD] int {
+        return radixSortLSD_ranks(a, checkSorted, ascending);
+    }
+}
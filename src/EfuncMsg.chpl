@@ -14,6 +14,7 @@ module EfuncMsg
     use ServerErrorStrings;
     
     use AryUtil;
+    use HashGroup only mix64;
     
     const eLogger = new Logger();
 
@@ -84,6 +85,11 @@ module EfuncMsg
                         var a = st.addEntry(rname, e.size, real);
                         a.a = Math.cos(e.a);
                     }
+                    when "hash64" {
+                        // well mixed 64 bits of each value, for sketches
+                        var a = st.addEntry(rname, e.size, int);
+                        a.a = [x in e.a] mix64(x:uint):int;
+                    }
                     otherwise {
                         var errorMsg = notImplementedError(pn,efunc,gEnt.dtype);
                         eLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);                                               
@@ -0,0 +1,447 @@
+module FusedMsg
+{
+    use ServerConfig;
+
+    use Reflection;
+    use Errors;
+    use Logging;
+    use Math;
+
+    use MultiTypeSymbolTable;
+    use MultiTypeSymEntry;
+    use ServerErrorStrings;
+    use GenSymIO;
+
+    const fmLogger = new Logger();
+
+    if v {
+        fmLogger.level = LogLevel.DEBUG;
+    } else {
+        fmLogger.level = LogLevel.INFO;
+    }
+
+    /*
+    Number of elements each task evaluates at a time. The temporaries of a
+    fused expression hold this many elements per node, so that they stay in
+    cache instead of being written to memory.
+    */
+    config const fusedBlockSize = 1024;
+
+    /*
+    One operation of a fused expression. Operands refer to earlier nodes by
+    their index, so the nodes of an expression are in evaluation order.
+    Int64 and Bool values are both held as ints, with bools as 0 or 1.
+    */
+    record FusedNode {
+        /* "array", "scalar", "binop", "efunc" or "where" */
+        var kind: string;
+        /* operator or function name */
+        var op: string;
+        /* element type of the node's values */
+        var dtype: DType;
+        /* indices of the operand nodes */
+        var args: 3*int;
+        /* value of an int or bool scalar */
+        var ival: int;
+        /* value of a real scalar */
+        var rval: real;
+        /* symbol table name of an array */
+        var name: string;
+    }
+
+    /*
+    Returns the element type of the binop applied to operands of types l and r,
+    following binopvvMsg, or throws if the binop cannot be fused.
+    */
+    proc fusedBinopDType(op: string, l: DType, r: DType): DType throws {
+        const lNum = l == DType.Int64 || l == DType.Float64;
+        const rNum = r == DType.Int64 || r == DType.Float64;
+        const bothInt = l == DType.Int64 && r == DType.Int64;
+        const bothBool = l == DType.Bool && r == DType.Bool;
+        const anyReal = l == DType.Float64 || r == DType.Float64;
+        select op {
+            when "+", "-", "*" {
+                if !bothBool { return if anyReal then DType.Float64 else DType.Int64; }
+            }
+            when "/" {
+                if lNum && rNum { return DType.Float64; }
+            }
+            when "//" {
+                if lNum && rNum { return if anyReal then DType.Float64 else DType.Int64; }
+            }
+            when "%", "<<", ">>" {
+                if bothInt { return DType.Int64; }
+            }
+            when "<", ">", "<=", ">=" {
+                if lNum && rNum { return DType.Bool; }
+            }
+            when "==", "!=" {
+                if (lNum && rNum) || bothBool { return DType.Bool; }
+            }
+            when "&", "|", "^" {
+                if bothInt || bothBool { return l; }
+            }
+            when "**" {
+                // int ** int needs a check for negative exponents first
+                if lNum && rNum && anyReal { return DType.Float64; }
+            }
+        }
+        throw getErrorWithContext(
+                           msg="fused %s %s %s not implemented".format(dtype2str(l), op, dtype2str(r)),
+                           lineNumber=getLineNumber(),
+                           routineName=getRoutineName(),
+                           moduleName=getModuleName(),
+                           errorClass="ErrorWithContext");
+    }
+
+    /*
+    Returns the element type of the efunc applied to an operand of type a,
+    following efuncMsg, or throws if the efunc cannot be fused.
+    */
+    proc fusedEfuncDType(efunc: string, a: DType): DType throws {
+        if a == DType.Int64 || a == DType.Float64 {
+            select efunc {
+                when "abs" { return a; }
+                when "log", "exp", "sin", "cos" { return DType.Float64; }
+            }
+        }
+        throw getErrorWithContext(
+                           msg="fused %s %s not implemented".format(efunc, dtype2str(a)),
+                           lineNumber=getLineNumber(),
+                           routineName=getRoutineName(),
+                           moduleName=getModuleName(),
+                           errorClass="ErrorWithContext");
+    }
+
+    /*
+    Parses the index of an operand of node i, which must refer to an earlier node
+    */
+    proc operandIndex(indexStr: string, i: int): int throws {
+        var k = indexStr:int;
+        if k < 0 || k >= i {
+            throw getErrorWithContext(
+                           msg="operand %i of fused node %i is not an earlier node".format(k, i),
+                           lineNumber=getLineNumber(),
+                           routineName=getRoutineName(),
+                           moduleName=getModuleName(),
+                           errorClass="ErrorWithContext");
+        }
+        return k;
+    }
+
+    /*
+    Parses node i of a fused expression from its string form, which is one of
+        array <name>
+        scalar <dtype> <value>
+        binop <op> <left> <right>
+        efunc <efunc> <operand>
+        where <condition> <a> <b>
+    where operands are indices of earlier nodes. The dtype of an array node
+    is set by the caller.
+    */
+    proc parseFusedNode(nodeStr: string, i: int, const ref nodes: [] FusedNode): FusedNode throws {
+        var node: FusedNode;
+        var (kind, rest) = nodeStr.splitMsgToTuple(2);
+        node.kind = kind;
+        select kind {
+            when "array" {
+                node.name = rest;
+            }
+            when "scalar" {
+                var (dtypeStr, value) = rest.splitMsgToTuple(2);
+                node.dtype = str2dtype(dtypeStr);
+                select node.dtype {
+                    when DType.Int64 { node.ival = value:int; }
+                    when DType.Float64 { node.rval = value:real; }
+                    when DType.Bool { node.ival = (value.toLower():bool):int; }
+                    otherwise {
+                        throw getErrorWithContext(
+                           msg="fused scalar %s not implemented".format(dtypeStr),
+                           lineNumber=getLineNumber(),
+                           routineName=getRoutineName(),
+                           moduleName=getModuleName(),
+                           errorClass="ErrorWithContext");
+                    }
+                }
+            }
+            when "binop" {
+                var (op, aStr, bStr) = rest.splitMsgToTuple(3);
+                node.op = op;
+                node.args = (operandIndex(aStr, i), operandIndex(bStr, i), 0);
+                node.dtype = fusedBinopDType(op, nodes[node.args[0]].dtype,
+                                                 nodes[node.args[1]].dtype);
+            }
+            when "efunc" {
+                var (efunc, aStr) = rest.splitMsgToTuple(2);
+                node.op = efunc;
+                node.args = (operandIndex(aStr, i), 0, 0);
+                node.dtype = fusedEfuncDType(efunc, nodes[node.args[0]].dtype);
+            }
+            when "where" {
+                var (cStr, aStr, bStr) = rest.splitMsgToTuple(3);
+                node.args = (operandIndex(cStr, i), operandIndex(aStr, i), operandIndex(bStr, i));
+                const (c, a, b) = node.args;
+                if nodes[c].dtype != DType.Bool || nodes[a].dtype != nodes[b].dtype {
+                    throw getErrorWithContext(
+                           msg="fused where %s %s %s not implemented".format(
+                                   dtype2str(nodes[c].dtype), dtype2str(nodes[a].dtype), 
+                                   dtype2str(nodes[b].dtype)),
+                           lineNumber=getLineNumber(),
+                           routineName=getRoutineName(),
+                           moduleName=getModuleName(),
+                           errorClass="ErrorWithContext");
+                }
+                node.dtype = nodes[a].dtype;
+            }
+            otherwise {
+                throw getErrorWithContext(
+                           msg="unrecognized fused node: %s".format(nodeStr),
+                           lineNumber=getLineNumber(),
+                           routineName=getRoutineName(),
+                           moduleName=getModuleName(),
+                           errorClass="ErrorWithContext");
+            }
+        }
+        return node;
+    }
+
+    /*
+    Fills row k of rvals with the values of node k as reals, so that it can
+    be an operand of a real operation. The rvals row of an int or bool node
+    is otherwise unused.
+    */
+    inline proc promoteToReal(const ref nodes: [] FusedNode, const ref ivals: [] int,
+                              ref rvals: [] real, k: int, len: int) {
+        if nodes[k].dtype != DType.Float64 {
+            for j in 0..#len { rvals[k, j] = ivals[k, j]:real; }
+        }
+    }
+
+    /*
+    Evaluates every node of the expression for the len elements starting at
+    index lo, leaving the values of node k in row k of ivals or rvals
+    */
+    proc evalBlock(const ref nodes: [] FusedNode, const ref leaves: [] borrowed GenSymEntry?,
+                   lo: int, len: int, ref ivals: [] int, ref rvals: [] real) throws {
+        for k in nodes.domain {
+            const ref node = nodes[k];
+            const (a, b, c) = node.args;
+            select node.kind {
+                when "array" {
+                    select node.dtype {
+                        when DType.Int64 {
+                            const ref A = toSymEntry(leaves[k]!, int).a;
+                            for j in 0..#len { ivals[k, j] = A[lo+j]; }
+                        }
+                        when DType.Float64 {
+                            const ref A = toSymEntry(leaves[k]!, real).a;
+                            for j in 0..#len { rvals[k, j] = A[lo+j]; }
+                        }
+                        when DType.Bool {
+                            const ref A = toSymEntry(leaves[k]!, bool).a;
+                            for j in 0..#len { ivals[k, j] = A[lo+j]:int; }
+                        }
+                    }
+                }
+                when "scalar" {
+                    for j in 0..#len { ivals[k, j] = node.ival; rvals[k, j] = node.rval; }
+                }
+                when "binop" {
+                    const anyReal = nodes[a].dtype == DType.Float64 || nodes[b].dtype == DType.Float64;
+                    if anyReal || node.dtype == DType.Float64 {
+                        promoteToReal(nodes, ivals, rvals, a, len);
+                        promoteToReal(nodes, ivals, rvals, b, len);
+                    }
+                    if node.dtype == DType.Float64 {
+                        select node.op {
+                            when "+" { for j in 0..#len { rvals[k, j] = rvals[a, j] + rvals[b, j]; } }
+                            when "-" { for j in 0..#len { rvals[k, j] = rvals[a, j] - rvals[b, j]; } }
+                            when "*" { for j in 0..#len { rvals[k, j] = rvals[a, j] * rvals[b, j]; } }
+                            when "/" { for j in 0..#len { rvals[k, j] = rvals[a, j] / rvals[b, j]; } }
+                            when "**" { for j in 0..#len { rvals[k, j] = rvals[a, j] ** rvals[b, j]; } }
+                            when "//" {
+                                for j in 0..#len {
+                                    rvals[k, j] = if rvals[b, j] != 0 then floor(rvals[a, j]/rvals[b, j]) 
+                                                                      else NAN;
+                                }
+                            }
+                        }
+                    } else if anyReal {
+                        // comparisons of reals
+                        select node.op {
+                            when "<" { for j in 0..#len { ivals[k, j] = (rvals[a, j] < rvals[b, j]):int; } }
+                            when ">" { for j in 0..#len { ivals[k, j] = (rvals[a, j] > rvals[b, j]):int; } }
+                            when "<=" { for j in 0..#len { ivals[k, j] = (rvals[a, j] <= rvals[b, j]):int; } }
+                            when ">=" { for j in 0..#len { ivals[k, j] = (rvals[a, j] >= rvals[b, j]):int; } }
+                            when "==" { for j in 0..#len { ivals[k, j] = (rvals[a, j] == rvals[b, j]):int; } }
+                            when "!=" { for j in 0..#len { ivals[k, j] = (rvals[a, j] != rvals[b, j]):int; } }
+                        }
+                    } else {
+                        // ints, and bools held as 0 or 1
+                        select node.op {
+                            when "+" { for j in 0..#len { ivals[k, j] = ivals[a, j] + ivals[b, j]; } }
+                            when "-" { for j in 0..#len { ivals[k, j] = ivals[a, j] - ivals[b, j]; } }
+                            when "*" { for j in 0..#len { ivals[k, j] = ivals[a, j] * ivals[b, j]; } }
+                            when "<<" { for j in 0..#len { ivals[k, j] = ivals[a, j] << ivals[b, j]; } }
+                            when ">>" { for j in 0..#len { ivals[k, j] = ivals[a, j] >> ivals[b, j]; } }
+                            when "&" { for j in 0..#len { ivals[k, j] = ivals[a, j] & ivals[b, j]; } }
+                            when "|" { for j in 0..#len { ivals[k, j] = ivals[a, j] | ivals[b, j]; } }
+                            when "^" { for j in 0..#len { ivals[k, j] = ivals[a, j] ^ ivals[b, j]; } }
+                            when "<" { for j in 0..#len { ivals[k, j] = (ivals[a, j] < ivals[b, j]):int; } }
+                            when ">" { for j in 0..#len { ivals[k, j] = (ivals[a, j] > ivals[b, j]):int; } }
+                            when "<=" { for j in 0..#len { ivals[k, j] = (ivals[a, j] <= ivals[b, j]):int; } }
+                            when ">=" { for j in 0..#len { ivals[k, j] = (ivals[a, j] >= ivals[b, j]):int; } }
+                            when "==" { for j in 0..#len { ivals[k, j] = (ivals[a, j] == ivals[b, j]):int; } }
+                            when "!=" { for j in 0..#len { ivals[k, j] = (ivals[a, j] != ivals[b, j]):int; } }
+                            when "//" {
+                                for j in 0..#len {
+                                    ivals[k, j] = if ivals[b, j] != 0 then ivals[a, j]/ivals[b, j] else 0;
+                                }
+                            }
+                            when "%" {
+                                for j in 0..#len {
+                                    ivals[k, j] = if ivals[b, j] != 0 then ivals[a, j]%ivals[b, j] else 0;
+                                }
+                            }
+                        }
+                    }
+                }
+                when "efunc" {
+                    if node.dtype == DType.Int64 {
+                        // abs of ints
+                        for j in 0..#len { ivals[k, j] = abs(ivals[a, j]); }
+                    } else {
+                        promoteToReal(nodes, ivals, rvals, a, len);
+                        select node.op {
+                            when "abs" { for j in 0..#len { rvals[k, j] = abs(rvals[a, j]); } }
+                            when "log" { for j in 0..#len { rvals[k, j] = log(rvals[a, j]); } }
+                            when "exp" { for j in 0..#len { rvals[k, j] = exp(rvals[a, j]); } }
+                            when "sin" { for j in 0..#len { rvals[k, j] = sin(rvals[a, j]); } }
+                            when "cos" { for j in 0..#len { rvals[k, j] = cos(rvals[a, j]); } }
+                        }
+                    }
+                }
+                when "where" {
+                    for j in 0..#len {
+                        const src = if ivals[a, j] != 0 then b else c;
+                        ivals[k, j] = ivals[src, j];
+                        rvals[k, j] = rvals[src, j];
+                    }
+                }
+            }
+        }
+    }
+
+    /*
+    Evaluates the expression into R in a single pass. Each task evaluates
+    blocks of fusedBlockSize elements of its locale's part of R, holding
+    the values of intermediate nodes in task-private buffers.
+    */
+    proc evalFused(const ref nodes: [] FusedNode, const ref leaves: [] borrowed GenSymEntry?,
+                   ref R: [?D] ?t) throws {
+        const n = nodes.size;
+        const blk = max(fusedBlockSize, 1);
+        coforall loc in Locales do on loc {
+            const locNodes = nodes;
+            const locLeaves = leaves;
+            const locDom = R.localSubdomain();
+            const nBlocks = (locDom.size + blk - 1) / blk;
+            forall blockIdx in 0..#nBlocks with (var ivals: [0..#n, 0..#blk] int,
+                                                  var rvals: [0..#n, 0..#blk] real) {
+                const lo = locDom.low + blockIdx*blk;
+                const len = min(blk, locDom.high + 1 - lo);
+                evalBlock(locNodes, locLeaves, lo, len, ivals, rvals);
+                for j in 0..#len {
+                    if t == real {
+                        R[lo+j] = rvals[n-1, j];
+                    } else if t == bool {
+                        R[lo+j] = ivals[n-1, j] != 0;
+                    } else {
+                        R[lo+j] = ivals[n-1, j];
+                    }
+                }
+            }
+        }
+    }
+
+    /*
+    Evaluates an expression of elementwise operations on pdarrays of the same
+    size in a single pass over their elements, without creating temporary
+    pdarrays for intermediate results.
+
+    :arg reqMsg: request containing (cmd,numNodes,nodes), where nodes is a JSON
+                 list of the expression's nodes in evaluation order, as described
+                 for parseFusedNode. The last node is the result.
+    :type reqMsg: string
+
+    :arg st: SymTab to act on
+    :type st: borrowed SymTab
+
+    :returns: (string)
+    */
+    proc fusedMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
+        param pn = Reflection.getRoutineName();
+        var (numNodesStr, json) = payload.decode().splitMsgToTuple(2);
+        var n = try! numNodesStr:int;
+        if n < 1 {
+            var errorMsg = "Error: %s: a fused expression needs at least one node".format(pn);
+            fmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+
+        var nodes: [0..#n] FusedNode;
+        var leaves: [0..#n] borrowed GenSymEntry?;
+        var size = -1;
+        try {
+            var nodeStrs = jsonToPdArray(json, n);
+            for i in 0..#n {
+                nodes[i] = parseFusedNode(nodeStrs[i], i, nodes);
+                if nodes[i].kind == "array" {
+                    var entry = st.lookup(nodes[i].name);
+                    if entry.dtype != DType.Int64 && entry.dtype != DType.Float64 &&
+                                                      entry.dtype != DType.Bool {
+                        var errorMsg = notImplementedError(pn, entry.dtype);
+                        fmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                        return errorMsg;
+                    }
+                    if size >= 0 && entry.size != size {
+                        var errorMsg = "Error: %s: size mismatch %i %i".format(pn, size, entry.size);
+                        fmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                        return errorMsg;
+                    }
+                    size = entry.size;
+                    nodes[i].dtype = entry.dtype;
+                    leaves[i] = entry;
+                }
+            }
+        } catch e: ErrorWithContext {
+            fmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),e.message());
+            return e.publish();
+        }
+        if size < 0 {
+            var errorMsg = "Error: %s: a fused expression needs an array operand".format(pn);
+            fmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+
+        fmLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                           "cmd: %s nodes: %t".format(cmd, nodes));
+
+        var rname = st.nextName();
+        select nodes[n-1].dtype {
+            when DType.Int64 {
+                var e = st.addEntry(rname, size, int);
+                evalFused(nodes, leaves, e.a);
+            }
+            when DType.Float64 {
+                var e = st.addEntry(rname, size, real);
+                evalFused(nodes, leaves, e.a);
+            }
+            when DType.Bool {
+                var e = st.addEntry(rname, size, bool);
+                evalFused(nodes, leaves, e.a);
+            }
+        }
+        return "created " + st.attrib(rname);
+    }
+}
@@ -35,21 +35,34 @@ module GenSymIO {
 
     /*
      * Creates a pdarray server-side and returns the SymTab name used to
-     * retrieve the pdarray from the SymTab.
+     * retrieve the pdarray from the SymTab. The data payload is the raw 
+     * array data in the byte order ("big" or "little") given in the request,
+     * sent as the first binary frame of a structured request or following 
+     * the arguments of a string request.
      */
-    proc arrayMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
+    proc arrayMsg(cmd: string, payload: bytes, st: borrowed SymTab,
+                  const frames: list(bytes) = new list(bytes)): string throws {
         var repMsg: string;
-        var (dtypeBytes, sizeBytes, data) = payload.splitMsgToTuple(b" ", 3);
+        var (dtypeBytes, sizeBytes, byteOrderBytes, data) = payload.splitMsgToTuple(b" ", 4);
         var dtype = str2dtype(try! dtypeBytes.decode());
         var size = try! sizeBytes:int;
+        var byteOrder = try! byteOrderBytes.decode();
         var tmpf:file;
         overMemLimit(2*8*size);
 
+        if byteOrder != "big" && byteOrder != "little" {
+            return try! "Error: Unrecognized byte order %s".format(byteOrder);
+        }
+
         // Write the data payload composing the pdarray to a memory buffer
         try {
             tmpf = openmem();
             var tmpw = tmpf.writer(kind=iobig);
-            tmpw.write(data);
+            if frames.size > 0 {
+                tmpw.write(frames[0]);
+            } else {
+                tmpw.write(data);
+            }
             try! tmpw.close();
         } catch {
             return "Error: Could not write to memory buffer";
@@ -63,34 +76,19 @@ module GenSymIO {
          * within a SymEntry, and write to the SymTab cache  
          */
         try {
-            var tmpr = tmpf.reader(kind=iobig, start=0);
-            if dtype == DType.Int64 {
-                var entryInt = new shared SymEntry(size, int);
-                tmpr.read(entryInt.a);
-                tmpr.close(); tmpf.close();
-                st.addEntry(rname, entryInt);
-            } else if dtype == DType.Float64 {
-                var entryReal = new shared SymEntry(size, real);
-                tmpr.read(entryReal.a);
-                tmpr.close(); tmpf.close();
-                st.addEntry(rname, entryReal);
-            } else if dtype == DType.Bool {
-                var entryBool = new shared SymEntry(size, bool);
-                tmpr.read(entryBool.a);
-                tmpr.close(); tmpf.close();
-                st.addEntry(rname, entryBool);
-            } else if dtype == DType.UInt8 {
-                var entryUInt = new shared SymEntry(size, uint(8));
-                tmpr.read(entryUInt.a);
-                tmpr.close(); tmpf.close();
-                st.addEntry(rname, entryUInt);
+            if byteOrder == "little" {
+                var tmpr = tmpf.reader(kind=iolittle, start=0);
+                readEntryData(tmpr, dtype, size, rname, st);
+                tmpr.close();
             } else {
+                var tmpr = tmpf.reader(kind=iobig, start=0);
+                readEntryData(tmpr, dtype, size, rname, st);
                 tmpr.close();
-                tmpf.close();
-                return try! "Error: Unhandled data type %s".format(dtypeBytes);
             }
-            tmpr.close();
             tmpf.close();
+        } catch e: ErrorWithContext {
+            try! tmpf.close();
+            return e.publish();
         } catch {
             return "Error: Could not read from memory buffer into SymEntry";
         }
@@ -102,31 +100,204 @@ module GenSymIO {
     }
 
     /*
-     * Outputs the pdarray as a Numpy ndarray in the form of a 
-     * Chapel Bytes object
+     * Reads size elements of the given dtype from the channel into a new
+     * SymEntry added to the SymTab under rname, using the byte order set
+     * by the channel's kind
      */
-    proc tondarrayMsg(cmd: string, payload: bytes, st: 
-                                          borrowed SymTab): bytes throws {
-        var arrayBytes: bytes;
-        var entryStr = payload.decode();
+    private proc readEntryData(tmpr, dtype: DType, size: int, rname: string,
+                                                      st: borrowed SymTab) throws {
+        if dtype == DType.Int64 {
+            var entryInt = new shared SymEntry(size, int);
+            tmpr.read(entryInt.a);
+            st.addEntry(rname, entryInt);
+        } else if dtype == DType.Float64 {
+            var entryReal = new shared SymEntry(size, real);
+            tmpr.read(entryReal.a);
+            st.addEntry(rname, entryReal);
+        } else if dtype == DType.Bool {
+            var entryBool = new shared SymEntry(size, bool);
+            tmpr.read(entryBool.a);
+            st.addEntry(rname, entryBool);
+        } else if dtype == DType.UInt8 {
+            var entryUInt = new shared SymEntry(size, uint(8));
+            tmpr.read(entryUInt.a);
+            st.addEntry(rname, entryUInt);
+        } else {
+            throw getErrorWithContext(
+                           msg="Unhandled data type %s".format(dtype2str(dtype)),
+                           lineNumber=getLineNumber(),
+                           routineName=getRoutineName(),
+                           moduleName=getModuleName(),
+                           errorClass="ErrorWithContext");
+        }
+    }
+
+    /*
+     * Reads the elements of the entry in the index range r from the channel
+     * using the byte order set by the channel's kind
+     */
+    private proc readEntrySlice(tmpr, entry: borrowed GenSymEntry, r: range) throws {
+        if entry.dtype == DType.Int64 {
+            ref a = toSymEntry(entry, int).a[r];
+            tmpr.read(a);
+        } else if entry.dtype == DType.Float64 {
+            ref a = toSymEntry(entry, real).a[r];
+            tmpr.read(a);
+        } else if entry.dtype == DType.Bool {
+            ref a = toSymEntry(entry, bool).a[r];
+            tmpr.read(a);
+        } else if entry.dtype == DType.UInt8 {
+            ref a = toSymEntry(entry, uint(8)).a[r];
+            tmpr.read(a);
+        } else {
+            throw getErrorWithContext(
+                           msg="Unhandled dtype %s".format(dtype2str(entry.dtype)),
+                           lineNumber=getLineNumber(),
+                           routineName=getRoutineName(),
+                           moduleName=getModuleName(),
+                           errorClass="ErrorWithContext");
+        }
+    }
+
+    /*
+     * Writes the raw array data of the first binary frame, in the byte order
+     * ("big" or "little") given in the request, into the elements of an 
+     * existing pdarray starting at the given index, so that arrays larger 
+     * than a single message can be uploaded in a sequence of fixed-size 
+     * chunks into an array created beforehand.
+     */
+    proc arraySliceMsg(cmd: string, payload: bytes, st: borrowed SymTab,
+                       const frames: list(bytes)): string throws {
+        param pn = Reflection.getRoutineName();
+        var (entryStr, startStr, byteOrder) = payload.decode().splitMsgToTuple(3);
         var entry = st.lookup(entryStr);
-        overMemLimit(2*entry.size*entry.itemsize);
+        var start = try! startStr:int;
+        if byteOrder != "big" && byteOrder != "little" {
+            return try! "Error: Unrecognized byte order %s".format(byteOrder);
+        }
+        if frames.size != 1 || frames[0].size % entry.itemsize != 0 {
+            var errorMsg = incompatibleArgumentsError(pn,
+                           "expected one frame of whole %s elements".format(
+                                                                 dtype2str(entry.dtype)));
+            gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+        const r = start..#(frames[0].size / entry.itemsize);
+        if r.low < 0 || r.high >= entry.size {
+            var errorMsg = incompatibleArgumentsError(pn,
+                           "slice %i:%i is out of bounds for %s with size %i".format(
+                                                r.low, r.high+1, entryStr, entry.size));
+            gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+        overMemLimit(frames[0].size);
+
         var tmpf: file;
         try {
             tmpf = openmem();
             var tmpw = tmpf.writer(kind=iobig);
-            if entry.dtype == DType.Int64 {
-                tmpw.write(toSymEntry(entry, int).a);
-            } else if entry.dtype == DType.Float64 {
-                tmpw.write(toSymEntry(entry, real).a);
-            } else if entry.dtype == DType.Bool {
-                tmpw.write(toSymEntry(entry, bool).a);
-            } else if entry.dtype == DType.UInt8 {
-                tmpw.write(toSymEntry(entry, uint(8)).a);
+            tmpw.write(frames[0]);
+            tmpw.close();
+            if byteOrder == "little" {
+                var tmpr = tmpf.reader(kind=iolittle, start=0);
+                readEntrySlice(tmpr, entry, r);
+                tmpr.close();
             } else {
-                return try! b"Error: Unhandled dtype %s".format(entry.dtype);
+                var tmpr = tmpf.reader(kind=iobig, start=0);
+                readEntrySlice(tmpr, entry, r);
+                tmpr.close();
             }
-            tmpw.close();
+            tmpf.close();
+        } catch e: ErrorWithContext {
+            try! tmpf.close();
+            return e.publish();
+        } catch {
+            return "Error: Could not read from memory buffer into SymEntry";
+        }
+        return "set %s[%i:%i]".format(entryStr, r.low, r.high+1);
+    }
+
+    /*
+     * Width of the header naming the byte order of the array data in a
+     * tondarray reply. Eight bytes keeps the 8-byte elements that follow
+     * aligned in the client's receive buffer.
+     */
+    param BYTE_ORDER_HEADER_SIZE = 8;
+
+    /*
+     * Returns the byte order of this locale, either "little" or "big"
+     */
+    proc nativeByteOrder(): string {
+        var one: uint(16) = 1;
+        return if (c_ptrTo(one):c_ptr(uint(8)))[0] == 1 then "little" else "big";
+    }
+
+    /*
+     * Writes the elements of the entry in the index range r to the channel
+     * using the byte order set by the channel's kind
+     */
+    private proc writeEntryData(tmpw, entry: borrowed GenSymEntry, r: range) throws {
+        if entry.dtype == DType.Int64 {
+            tmpw.write(toSymEntry(entry, int).a[r]);
+        } else if entry.dtype == DType.Float64 {
+            tmpw.write(toSymEntry(entry, real).a[r]);
+        } else if entry.dtype == DType.Bool {
+            tmpw.write(toSymEntry(entry, bool).a[r]);
+        } else if entry.dtype == DType.UInt8 {
+            tmpw.write(toSymEntry(entry, uint(8)).a[r]);
+        } else {
+            throw getErrorWithContext(
+                           msg="Unhandled dtype %s".format(dtype2str(entry.dtype)),
+                           lineNumber=getLineNumber(),
+                           routineName=getRoutineName(),
+                           moduleName=getModuleName(),
+                           errorClass="ErrorWithContext");
+        }
+    }
+
+    /*
+     * Returns the elements of the entry in the index range r as bytes,
+     * preceded by a header of BYTE_ORDER_HEADER_SIZE bytes naming their
+     * byte order ("little" or "big", space padded). The requested byte
+     * order may be "big", "little", or "native"; "native" sends the data
+     * as it is laid out in server memory, avoiding a byteswap on the
+     * server. An empty byte order defaults to "big".
+     */
+    proc entryToBytes(entry: borrowed GenSymEntry, r: range, 
+                                                   in byteOrder: string): bytes throws {
+        var arrayBytes: bytes;
+        if byteOrder.isEmpty() {
+            byteOrder = "big";
+        } else if byteOrder == "native" {
+            byteOrder = nativeByteOrder();
+        }
+        if byteOrder != "big" && byteOrder != "little" {
+            return try! b"Error: Unrecognized byte order %s".format(byteOrder);
+        }
+        overMemLimit(2*r.size*entry.itemsize);
+        var header = byteOrder:bytes;
+        while header.size < BYTE_ORDER_HEADER_SIZE {
+            header += b" ";
+        }
+        var tmpf: file;
+        try {
+            tmpf = openmem();
+            // the header goes in the buffer ahead of the data, so that the
+            // reply is read out of it in one piece without another copy
+            if byteOrder == "little" {
+                var tmpw = tmpf.writer(kind=iolittle);
+                for b in header do tmpw.write(b);
+                writeEntryData(tmpw, entry, r);
+                tmpw.close();
+            } else {
+                var tmpw = tmpf.writer(kind=iobig);
+                for b in header do tmpw.write(b);
+                writeEntryData(tmpw, entry, r);
+                tmpw.close();
+            }
+        } catch e: ErrorWithContext {
+            try! tmpf.close();
+            return e.publish():bytes;
         } catch {
             try! tmpf.close();
             return b"Error: Unable to write SymEntry to memory buffer";
@@ -140,15 +311,37 @@ module GenSymIO {
         } catch {
             return b"Error: Unable to copy array from memory buffer to string";
         }
-        //var repMsg = try! "Array: %i".format(arraystr.length) + arraystr;
-        /*
-         Engin: fwiw, if you want to achieve the above, you can:
+        return arrayBytes;
+    }
 
-         return b"Array: %i %|t".format(arrayBytes.length, arrayBytes);
+    /*
+     * Outputs the pdarray as a Numpy ndarray in the form of a 
+     * Chapel Bytes object, preceded by a byte order header as described
+     * for entryToBytes. 
+     */
+    proc tondarrayMsg(cmd: string, payload: bytes, st: 
+                                          borrowed SymTab): bytes throws {
+        var (entryStr, byteOrder) = payload.decode().splitMsgToTuple(2);
+        var entry = st.lookup(entryStr);
+        return entryToBytes(entry, 0..#entry.size, byteOrder);
+    }
 
-         But I think the main problem is how to separate the length from the data
-         */
-       return arrayBytes;
+    /*
+     * Outputs elements start..stop-1 of the pdarray in the same format
+     * as tondarrayMsg, so that arrays larger than a single message can be
+     * transferred to the client in a sequence of fixed-size chunks.
+     */
+    proc tondarraySliceMsg(cmd: string, payload: bytes, st: 
+                                          borrowed SymTab): bytes throws {
+        var (entryStr, startStr, stopStr, byteOrder) = payload.decode().splitMsgToTuple(4);
+        var entry = st.lookup(entryStr);
+        var start = try! startStr:int;
+        var stop = try! stopStr:int;
+        if start < 0 || stop > entry.size || start > stop {
+            return try! b"Error: slice %i:%i is out of bounds for %s with size %i".format(
+                                                      start, stop, entryStr, entry.size);
+        }
+        return entryToBytes(entry, start..<stop, byteOrder);
     }
 
     /*
@@ -0,0 +1,205 @@
+/* Grouping by distributed hash partitioning
+
+ an alternative to sorting the keys when only the groups are needed
+ and not the order of the keys. Each key is sent to a bucket owned by
+ a task on one locale, chosen by the key's hash, and each task then
+ groups the keys of its bucket with a hash table.
+
+ */
+module HashGroup
+{
+    use ServerConfig;
+
+    use BlockDist;
+    use CommAggregation;
+    use RadixSortLSD only numTasks, Tasks, calcBlock, calcGlobalIndex;
+    use Map;
+    use List;
+    use Reflection;
+    use Logging;
+
+    const hgLogger = new Logger();
+    if v {
+        hgLogger.level = LogLevel.DEBUG;
+    } else {
+        hgLogger.level = LogLevel.INFO;
+    }
+
+    /*
+    Mixes the bits of a 64-bit value (the splitmix64 finalizer), so that
+    nearby keys are spread over unrelated buckets
+    */
+    inline proc mix64(x: uint): uint {
+        var z = x + 0x9e3779b97f4a7c15:uint;
+        z = (z ^ (z >> 30)) * 0xbf58476d1ce4e5b9:uint;
+        z = (z ^ (z >> 27)) * 0x94d049bb133111eb:uint;
+        return z ^ (z >> 31);
+    }
+
+    /* Bucket of a 128-bit key */
+    inline proc bucketOf(key: 2*uint, nBuckets: int): int {
+        const (k0, k1) = key;
+        return (mix64(k0 ^ mix64(k1)) % nBuckets:uint):int;
+    }
+
+    /*
+    Adds the i'th of nkeys key arrays to the 128-bit keys of the rows. One
+    or two int64 keys are kept exactly; with more keys the rows are hashed,
+    so that distinct rows share a key with negligible probability, as when
+    grouping by the 128-bit hashes of Strings.
+
+    :arg hk: 128-bit keys of the rows, all zero before the first key array
+    :arg k: the key array
+    :arg i: index of the key array
+    :arg nkeys: number of key arrays
+    */
+    proc addKey(ref hk: [?aD] 2*uint, const ref k: [aD] int, i: int, nkeys: int) {
+        if nkeys == 1 {
+            forall (h, ki) in zip(hk, k) {
+                h = (0:uint, ki:uint);
+            }
+        } else if nkeys == 2 {
+            if i == 0 {
+                forall (h, ki) in zip(hk, k) {
+                    h = (ki:uint, 0:uint);
+                }
+            } else {
+                forall (h, ki) in zip(hk, k) {
+                    const (h0, _) = h;
+                    h = (h0, ki:uint);
+                }
+            }
+        } else {
+            forall (h, ki) in zip(hk, k) {
+                const (h0, h1) = h;
+                h = (mix64(h0 ^ ki:uint), mix64(h1 + ki:uint + 0x632be59bd9b4e019:uint));
+            }
+        }
+    }
+
+    /*
+    Returns a permutation that brings rows with equal keys together. The
+    rows of each group keep their original order, but the groups are in no
+    particular order, so the permuted keys are grouped but not sorted.
+
+    :arg hk: 128-bit keys of the rows
+    :type hk: [] 2*uint
+
+    :returns: [] int
+    */
+    proc hashGroup(hk: [?aD] 2*uint): [aD] int throws {
+        // one bucket per task, so bucket b falls on about the b'th block of
+        // the array, which is owned by task b % numTasks of locale b / numTasks
+        const nBuckets = numLocales * numTasks;
+        var kr: [aD] (2*uint, int);
+
+        // create a global count array to scan
+        var gD = newBlockDom({0..#(numLocales * numTasks * nBuckets)});
+        var globalCounts: [gD] int;
+        var globalStarts: [gD] int;
+
+        // count the keys of each task's part of the array in each bucket
+        coforall loc in Locales {
+            on loc {
+                coforall task in Tasks {
+                    var taskBucketCounts: [0..#nBuckets] int;
+                    var lD = hk.localSubdomain();
+                    var tD = calcBlock(task, lD.low, lD.high);
+                    for i in tD {
+                        taskBucketCounts[bucketOf(hk[i], nBuckets)] += 1;
+                    }
+                    // write counts in to global counts in transposed order
+                    var aggregator = newDstAggregator(int);
+                    for bucket in 0..#nBuckets {
+                        aggregator.copy(globalCounts[calcGlobalIndex(bucket, loc.id, task)],
+                                        taskBucketCounts[bucket]);
+                    }
+                    aggregator.flush();
+                }
+            }
+        }
+
+        // scan globalCounts to get the start of each locale/task in each bucket
+        globalStarts = + scan globalCounts;
+        globalStarts = globalStarts - globalCounts;
+
+        // send each (key,index) pair to its bucket, keeping the original
+        // order within the bucket
+        coforall loc in Locales {
+            on loc {
+                coforall task in Tasks {
+                    var taskBucketPos: [0..#nBuckets] int;
+                    var lD = hk.localSubdomain();
+                    var tD = calcBlock(task, lD.low, lD.high);
+                    {
+                        var aggregator = newSrcAggregator(int);
+                        for bucket in 0..#nBuckets {
+                            aggregator.copy(taskBucketPos[bucket],
+                                            globalStarts[calcGlobalIndex(bucket, loc.id, task)]);
+                        }
+                        aggregator.flush();
+                    }
+                    {
+                        var aggregator = newDstAggregator((2*uint, int));
+                        for i in tD {
+                            const bucket = bucketOf(hk[i], nBuckets);
+                            aggregator.copy(kr[taskBucketPos[bucket]], (hk[i], i));
+                            taskBucketPos[bucket] += 1;
+                        }
+                        aggregator.flush();
+                    }
+                }
+            }
+        }
+
+        var bucketStarts: [0..nBuckets] int;
+        for bucket in 0..#nBuckets {
+            bucketStarts[bucket] = globalStarts[calcGlobalIndex(bucket, 0, 0)];
+        }
+        bucketStarts[nBuckets] = aD.size;
+
+        // group the keys of each bucket in the order they first appear
+        var perm: [aD] int;
+        coforall loc in Locales {
+            on loc {
+                const myBucketStarts = bucketStarts;
+                coforall task in Tasks {
+                    const bucket = loc.id * numTasks + task;
+                    const lo = myBucketStarts[bucket];
+                    const n = myBucketStarts[bucket+1] - lo;
+                    if n > 0 {
+                        var bucketKr: [0..#n] (2*uint, int) = kr[lo..#n];
+                        var groupIds: map(2*uint, int);
+                        var groupCounts: list(int);
+                        var gids: [0..#n] int;
+                        for (gid, (key, _)) in zip(gids, bucketKr) {
+                            if groupIds.contains(key) {
+                                gid = groupIds.getValue(key);
+                                groupCounts[gid] += 1;
+                            } else {
+                                gid = groupCounts.size;
+                                groupIds.add(key, gid);
+                                groupCounts.append(1);
+                            }
+                        }
+                        var groupPos: [0..#groupCounts.size] int;
+                        var pos = 0;
+                        for (p, c) in zip(groupPos, groupCounts) {
+                            p = pos;
+                            pos += c;
+                        }
+                        var bucketPerm: [0..#n] int;
+                        for (gid, (_, i)) in zip(gids, bucketKr) {
+                            bucketPerm[groupPos[gid]] = i;
+                            groupPos[gid] += 1;
+                        }
+                        perm[lo..#n] = bucketPerm;
+                    }
+                }
+            }
+        }
+        hgLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                       "grouped %i keys in %i buckets".format(aD.size, nBuckets));
+        return perm;
+    }
+}
@@ -0,0 +1,90 @@
+module HashGroupMsg
+{
+    use ServerConfig;
+
+    use Reflection;
+    use Errors;
+    use Logging;
+
+    use MultiTypeSymbolTable;
+    use MultiTypeSymEntry;
+    use ServerErrorStrings;
+
+    use HashGroup;
+
+    const hgmLogger = new Logger();
+    if v {
+        hgmLogger.level = LogLevel.DEBUG;
+    } else {
+        hgmLogger.level = LogLevel.INFO;
+    }
+
+    /*
+    Returns a permutation that groups rows of equal keys together, by hash
+    partitioning instead of sorting. The groups are in no particular order.
+    Strings keys are grouped by their hashes, which the client sends as two
+    int64 arrays.
+
+    reqMsg: hashGroup <n> <name_1> ... <name_n> <objtype_1> ... <objtype_n>
+
+    :arg st: SymTab to act on
+    :type st: borrowed SymTab
+
+    :returns: (string) the "created" message of the permutation
+    */
+    proc hashGroupMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
+        param pn = Reflection.getRoutineName();
+        var (nstr, rest) = payload.decode().splitMsgToTuple(2);
+        var n = nstr:int; // number of key arrays
+        var fields = rest.split();
+        hgmLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                        "number of arrays: %i fields: %t".format(n,fields));
+        if (fields.size != 2*n) {
+            var errorMsg = incompatibleArgumentsError(pn,
+                          "Expected %i arrays but got %i".format(n, fields.size/2));
+            hgmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+        const low = fields.domain.low;
+        var names = fields[low..#n];
+        var types = fields[low+n..#n];
+        var size: int;
+        // Check that all arrays exist, are int64 and have the same size
+        for (name, objtype, i) in zip(names, types, 1..) {
+            if objtype != "pdarray" {
+                var errorMsg = unrecognizedTypeError(pn, objtype);
+                hgmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return errorMsg;
+            }
+            var g = st.lookup(name);
+            if g.dtype != DType.Int64 {
+                var errorMsg = notImplementedError(pn,"(key array dtype "+dtype2str(g.dtype)+")");
+                hgmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return errorMsg;
+            }
+            if i == 1 {
+                size = g.size;
+            } else if g.size != size {
+                var errorMsg = incompatibleArgumentsError(pn,
+                                                   "Arrays must all be same size");
+                hgmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return errorMsg;
+            }
+        }
+
+        var rname = st.nextName();
+        if size == 0 {
+            st.addEntry(rname, 0, int);
+            return try! "created " + st.attrib(rname);
+        }
+        var first = toSymEntry(st.lookup(names[low]), int);
+        var hk: [first.aD] 2*uint;
+        for (name, i) in zip(names, 0..) {
+            var e = toSymEntry(st.lookup(name), int);
+            addKey(hk, e.a, i, n);
+        }
+        var perm = hashGroup(hk);
+        st.addEntry(rname, new shared SymEntry(perm));
+        return try! "created " + st.attrib(rname);
+    }
+}
@@ -5,6 +5,7 @@ module In1d
     use Unique;
     use CommAggregation;
     use RadixSortLSD;
+    use CountingSort only countingHist;
     use Reflection;
 
     use Time only;
@@ -123,6 +124,40 @@ module In1d
         return truth;
     }
 
+    /* For each value in the first array, check membership in the second array, whose
+       values are between aMin and aMax. Every locale gets a table of which values of
+       that range are present, so this is best when the range is small.
+
+       :arg ar1: array to look up in the table
+       :type ar1: [] int
+
+       :arg ar2: array to make the table of
+       :type ar2: [] int
+
+       :arg aMin: smallest value of ar2
+       :type aMin: int
+
+       :arg aMax: largest value of ar2
+       :type aMax: int
+
+       :returns truth: the distributed boolean array containing the result of ar1 being looked up in ar2
+       :type truth: [] bool
+     */
+    proc in1dDense(ar1: [?aD1] int, ar2: [?aD2] int, aMin: int, aMax: int) {
+        const hist = countingHist(ar2, aMin, aMax);
+        var truth: [aD1] bool;
+        coforall loc in Locales {
+            on loc {
+                const present: [0..#hist.size] bool = hist != 0;
+                forall i in truth.localSubdomain() {
+                    const x = ar1[i];
+                    truth[i] = x >= aMin && x <= aMax && present[x - aMin];
+                }
+            }
+        }
+        return truth;
+    }
+
     /* For each value in the first array, check membership in the second array. This 
        implementation uses a sort, which is best when the second array is large because 
        it scales well in both time and memory.
@@ -12,6 +12,7 @@ module In1dMsg
     use ServerErrorStrings;
 
     use In1d;
+    use CountingSort only isDenseRange;
 
     var iLogger = new Logger();
     if v {
@@ -79,6 +80,16 @@ module In1dMsg
                     
                     st.addEntry(rname, new shared SymEntry(truth));
                 }
+                // table of the values present if ar2 has a small range of values
+                else if isDenseRange((...ar2.keyRange())) {
+                    const (aMin, aMax) = ar2.keyRange();
+                    iLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                                           "%t values, using Dense".format(aMax - aMin + 1));
+                    var truth = in1dDense(ar1.a, ar2.a, aMin, aMax);
+                    if (invert) {truth = !truth;}
+
+                    st.addEntry(rname, new shared SymEntry(truth));
+                }
                 // per locale assoc domain if below medium bound
                 else if (ar2.size <= mBound) {
                     iLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
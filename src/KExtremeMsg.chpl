@@ -16,11 +16,15 @@ module KExtremeMsg
     use MultiTypeSymEntry;
     use SegmentedArray;
     use ServerErrorStrings;
+    use CommAggregation;
 
     use KReduce;
+    use TopK;
     use Indexing;
     use RadixSortLSD;
     use ArraySetopsMsg;
+    use ReductionMsg only lookupGrouping;
+    use SegmentedScanMsg only groupedValues;
 
     const keLogger = new Logger();
   
@@ -30,6 +34,40 @@ module KExtremeMsg
         keLogger.level = LogLevel.INFO;
     }
 
+    /*
+    Largest number of values that mink and maxk find by merging a heap of
+    the k extreme values of each task, instead of by selection
+    */
+    private config const heapMaxK = 2**12;
+
+    /*
+    Adds the k smallest or largest values of an array, or their indices,
+    in ascending order of the values, to the symbol table. Indices come from
+    selection, which gives equal values in order of their index as argsort
+    does, and so do the values when k is larger than heapMaxK.
+
+    :returns: (string) the "created" message of the result
+    */
+    proc addExtrema(st: borrowed SymTab, e: borrowed SymEntry(?t), kval: int,
+                    returnIndices: bool, param isMin: bool): string throws {
+        const k = min(kval, e.size);
+        var vname = st.nextName();
+        if returnIndices {
+            st.addEntry(vname, new shared SymEntry(topKIndices(e.a, k, isMin)));
+        } else if k <= heapMaxK {
+            st.addEntry(vname, new shared SymEntry(computeExtremaValues(e.a, k, isMin)));
+        } else {
+            const idx = topKIndices(e.a, k, isMin);
+            var vals: [idx.domain] t;
+            ref ea = e.a;
+            forall (x, i) in zip(vals, idx) with (var agg = newSrcAggregator(t)) {
+                agg.copy(x, ea[i]);
+            }
+            st.addEntry(vname, new shared SymEntry(vals));
+        }
+        return "created " + st.attrib(vname);
+    }
+
     /*
     Parse, execute, and respond to a mink message
     :arg reqMsg: request containing (name,k,returnIndices)
@@ -44,53 +82,22 @@ module KExtremeMsg
         // split request into fields
         var (name, k, returnIndices) = payload.decode().splitMsgToTuple(3);
 
-        var vname = st.nextName();
-
         var gEnt: borrowed GenSymEntry = st.lookup(name);
 
         select(gEnt.dtype) {
           when (DType.Int64) {
              var e = toSymEntry(gEnt,int);
-
-             var aV;
-
-             if !stringtobool(returnIndices) {
-               aV = computeExtremaValues(e.a, k:int);
-             } else {
-               aV = computeExtremaIndices(e.a, k:int);
-             }
-
-             st.addEntry(vname, new shared SymEntry(aV));
-
-             var s = try! "created " + st.attrib(vname);
-             return s;
+             return addExtrema(st, e, k:int, stringtobool(returnIndices), true);
           }
           when (DType.Float64) {
-            if !stringtobool(returnIndices) {
-             var e = toSymEntry(gEnt,real);
-
-             var aV = computeExtremaValues(e.a, k:int);
-
-             st.addEntry(vname, new shared SymEntry(aV));
-
-             var s = try! "created " + st.attrib(vname);
-             return s;
-            } else {
              var e = toSymEntry(gEnt,real);
-
-             var aV = computeExtremaIndices(e.a, k:int);
-
-             st.addEntry(vname, new shared SymEntry(aV));
-
-             var s = try! "created " + st.attrib(vname);
-             return s;
-            }
-           }
-           otherwise {
-               var errorMsg = notImplementedError("mink",gEnt.dtype);
-               keLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
-               return errorMsg;               
-           }
+             return addExtrema(st, e, k:int, stringtobool(returnIndices), true);
+          }
+          otherwise {
+             var errorMsg = notImplementedError("mink",gEnt.dtype);
+             keLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+             return errorMsg;               
+          }
         }
     }
     
@@ -108,55 +115,95 @@ module KExtremeMsg
         // split request into fields
         var (name, k, returnIndices) = payload.decode().splitMsgToTuple(3);
 
-        var vname = st.nextName();
-
         var gEnt: borrowed GenSymEntry = st.lookup(name);
 
         select(gEnt.dtype) {
           when (DType.Int64) {
              var e = toSymEntry(gEnt,int);
+             return addExtrema(st, e, k:int, stringtobool(returnIndices), false);
+          }
+          when (DType.Float64) {
+             var e = toSymEntry(gEnt,real);
+             return addExtrema(st, e, k:int, stringtobool(returnIndices), false);
+          }
+          otherwise {
+             var errorMsg = notImplementedError("maxk",gEnt.dtype);
+             keLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+             return errorMsg;
+          }
+        }
+    }
 
-             var aV;
-             if !stringtobool(returnIndices) {
-               aV = computeExtremaValues(e.a, k:int, false);
-             } else {
-               aV = computeExtremaIndices(e.a, k:int, false);
-             }
-
-             st.addEntry(vname, new shared SymEntry(aV));
-
-             var s = try! "created " + st.attrib(vname);
-             return s;
-           }
-           when (DType.Float64) {
-             if !stringtobool(returnIndices) {
-               var e = toSymEntry(gEnt,real);
-
-               var aV = computeExtremaValues(e.a, k:int, false);
-
-               st.addEntry(vname, new shared SymEntry(aV));
-
-               var s = try! "created " + st.attrib(vname);
-               return s;
-             } else {
-               var e = toSymEntry(gEnt,real);
+    /*
+    Finds the k smallest or largest values of each segment of a grouping,
+    in ascending order within each segment.
 
-               var aV = computeExtremaIndices(e.a, k:int, false);
+    reqMsg: segmentedTopK <perm> <segments> <values> <k> <largest> <size>
+    'perm' is "None" if the values are already grouped.
 
-               st.addEntry(vname, new shared SymEntry(aV));
+    :returns: (string) the "created" messages of the segments of the result
+              and of the indices of the values, separated by " +"
+    */
+    proc segmentedTopKMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
+        param pn = Reflection.getRoutineName();
+        var (perm_name, segments_name, values_name, kStr, largestStr, sizeStr) =
+                                                payload.decode().splitMsgToTuple(6);
+        const k = kStr:int;
+        const size = sizeStr:int;
+        keLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                       "cmd: %s perm: %s segments: %s values: %s k: %i".format(
+                                      cmd,perm_name,segments_name,values_name,k));
+        if k < 1 {
+            var errorMsg = incompatibleArgumentsError(pn, "k must be 1 or greater");
+            keLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+        var (segments, perm, errorMsg) = lookupGrouping(pn, perm_name, segments_name,
+                                                        st.lookup(segments_name).size, size, st);
+        if !errorMsg.isEmpty() {
+            return errorMsg;
+        }
+        var gVal = st.lookup(values_name);
+        if gVal.size != size {
+            errorMsg = incompatibleArgumentsError(pn,
+                            "values of size %i do not match grouping of size %i".format(
+                                                                           gVal.size, size));
+            keLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
 
-               var s = try! "created " + st.attrib(vname);
-               return s;
-               
-             }
-           }
+        proc addTopK(const ref values: [] ?t): string throws {
+            var (pos, newSegments) = if stringtobool(largestStr)
+                                     then segTopK(values, segments.a, k, false)
+                                     else segTopK(values, segments.a, k, true);
+            // positions in grouped order are indices of the values once permuted
+            if perm != nil {
+                var idx: [pos.domain] int;
+                ref pa = perm!.a;
+                forall (i, p) in zip(idx, pos) with (var agg = newSrcAggregator(int)) {
+                    agg.copy(i, pa[p]);
+                }
+                pos = idx;
+            }
+            var sname = st.nextName();
+            st.addEntry(sname, new shared SymEntry(newSegments));
+            var iname = st.nextName();
+            st.addEntry(iname, new shared SymEntry(pos));
+            return "created " + st.attrib(sname) + " +created " + st.attrib(iname);
+        }
 
-           otherwise {
-               var errorMsg = notImplementedError("maxk",gEnt.dtype);
-               keLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
-               return errorMsg;
-           }
+        select gVal.dtype {
+            when DType.Int64 {
+                return addTopK(groupedValues(int, gVal, perm, perm_name, values_name, st));
+            }
+            when DType.Float64 {
+                return addTopK(groupedValues(real, gVal, perm, perm_name, values_name, st));
+            }
+            otherwise {
+                errorMsg = notImplementedError(pn, dtype2str(gVal.dtype));
+                keLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return errorMsg;
+            }
         }
     }
-
 }
@@ -0,0 +1,148 @@
+/*
+ * Structured request and reply messages exchanged with the client as a
+ * JSON header frame followed by binary payload frames
+ */
+module Message {
+    use IO;
+    use List;
+    use Reflection;
+    use Errors;
+    use Logging;
+    use ServerConfig;
+    use MultiTypeSymbolTable;
+    use MultiTypeSymEntry;
+    use NumPyDType;
+
+    const msgLogger = new Logger();
+    if v {
+        msgLogger.level = LogLevel.DEBUG;
+    } else {
+        msgLogger.level = LogLevel.INFO;
+    }
+
+    /*
+    Header of a structured request, which is followed by the given number
+    of binary payload frames. The fields are listed in the order the client
+    writes them.
+    */
+    record RequestMsg {
+        var user: string;
+        var token: string;
+        var cmd: string;
+        var args: string;
+        var frames: int;
+    }
+
+    /*
+    Returns true if the first frame of a request is the JSON header of a
+    structured request rather than a colon-delimited user:token:cmd string
+
+    :arg reqMsgRaw: first frame of the request
+    :type reqMsgRaw: bytes
+    */
+    proc isStructuredRequest(const ref reqMsgRaw: bytes): bool {
+        return !reqMsgRaw.isEmpty() && reqMsgRaw[0] == b"{"[0];
+    }
+
+    /*
+    Parses the JSON header of a structured request
+
+    :arg header: first frame of the request
+    :type header: bytes
+
+    :returns: RequestMsg
+    */
+    proc parseRequest(header: bytes): RequestMsg throws {
+        var msg: RequestMsg;
+        try {
+            var mem = openmem();
+            var w = mem.writer(kind=iokind.native);
+            w.write(header.decode());
+            w.close();
+            var r = mem.reader(kind=iokind.native, start=0);
+            r.readf("%jt", msg);
+            r.close();
+            mem.close();
+        } catch e {
+            throw getErrorWithContext(
+                          msg="could not parse request header: %s".format(e.message()),
+                          lineNumber=getLineNumber(),
+                          routineName=getRoutineName(),
+                          moduleName=getModuleName(),
+                          errorClass="ErrorWithContext");
+        }
+        return msg;
+    }
+
+    /*
+    Returns the JSON description of the arrays named in a reply made up of
+    "created <name> ..." messages, joined by "+" for arrays that make up a
+    single object such as Strings, and by " , " for separate objects. Each
+    object is a pdarray, or a list of the pdarrays that make it up. Replies
+    that are not made up of created arrays have no objects.
+
+    :arg repMsg: reply of a command
+    :type repMsg: string
+
+    :arg st: SymTab holding the arrays
+    :type st: borrowed SymTab
+
+    :returns: (string) JSON list of objects
+    */
+    proc replyObjects(repMsg: string, st: borrowed SymTab): string throws {
+        if !repMsg.startsWith("created ") {
+            return "[]";
+        }
+        var objects: list(string);
+        for objMsg in repMsg.split(" , ") {
+            var arrays: list(string);
+            for part in objMsg.split("+") {
+                var (created, name, _) = part.strip().splitMsgToTuple(3);
+                if created != "created" || !st.contains(name) {
+                    msgLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                                    "reply has no objects: %s".format(repMsg));
+                    return "[]";
+                }
+                var g = st.lookup(name);
+                arrays.append(('{"objType":"pdarray","name":%jt,"dtype":%jt,"size":%i,' +
+                                  '"ndim":%i,"shape":[%i],"itemsize":%i}').format(name,
+                                  dtype2str(g.dtype), g.size, g.ndim, g.shape[0], g.itemsize));
+            }
+            if arrays.size == 1 {
+                objects.append(arrays[0]);
+            } else {
+                objects.append("[" + ",".join(arrays.toArray()) + "]");
+            }
+        }
+        return "[" + ",".join(objects.toArray()) + "]";
+    }
+
+    /*
+    Returns the JSON header of the reply to a structured request
+
+    :arg repMsg: reply of the command, or an empty string if the reply is
+                 sent as a binary frame
+    :type repMsg: string
+
+    :arg frames: number of binary frames following the header
+    :type frames: int
+
+    :arg st: SymTab holding the arrays named in the reply
+    :type st: borrowed SymTab
+
+    :returns: (string) JSON header
+    */
+    proc replyHeader(repMsg: string, frames: int, st: borrowed SymTab): string throws {
+        var msgType = "NORMAL";
+        var objects = "[]";
+        if repMsg.startsWith("Error:") {
+            msgType = "ERROR";
+        } else if repMsg.startsWith("Warning:") {
+            msgType = "WARNING";
+        } else {
+            objects = replyObjects(repMsg, st);
+        }
+        return '{"msgType":%jt,"msg":%jt,"objects":%s,"frames":%i}'.format(msgType, repMsg,
+                                                                           objects, frames);
+    }
+}
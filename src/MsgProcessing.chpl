@@ -24,8 +24,12 @@ module MsgProcessing
     public use HistogramMsg;
     public use ArgSortMsg;
     public use SortMsg;
+    public use SortedSearchMsg;
     public use ReductionMsg;
     public use FindSegmentsMsg;
+    public use HashGroupMsg;
+    public use SketchMsg;
+    public use SegmentedScanMsg;
     public use EfuncMsg;
     public use ConcatenateMsg;
     public use SegmentedMsg;
@@ -34,6 +38,7 @@ module MsgProcessing
     public use ArraySetopsMsg;
     public use KExtremeMsg;
     public use CastMsg;
+    public use FusedMsg;
     
     const mpLogger = new Logger();
     
@@ -104,6 +109,28 @@ module MsgProcessing
         return try! "deleted %s".format(name);
     }
 
+    /* 
+    Deletes the named entries from the symbol table in one request, which
+    the client sends for the arrays it has deferred deleting
+
+    :arg reqMsg: request containing (cmd,name1 name2 ...)
+    :type reqMsg: string 
+
+    :arg st: SymTab to act on
+    :type st: borrowed SymTab 
+
+    :returns: (string) response message
+    */
+    proc deleteManyMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
+        var names = payload.decode().split();
+        mpLogger.debug(getModuleName(),getRoutineName(),getLineNumber(), 
+                                     "cmd: %s deleting %i names".format(cmd,names.size));
+        for name in names {
+            st.deleteEntry(name);
+        }
+        return "deleted %i".format(names.size);
+    }
+
     /* 
     Clear all unregistered symbols and associated data from sym table
     
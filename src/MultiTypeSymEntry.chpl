@@ -8,6 +8,14 @@ module MultiTypeSymEntry
     public use SymArrayDmap;
 
     use AryUtil;
+    use CountingSort only keyRange;
+
+    /*
+    Bytes held by the server's caches of arrays derived from others: the
+    sort permutations kept by arrays and the permuted copies cached by the
+    SymTab, which together are kept within maxPermutedCacheBytes
+    */
+    var cachedBytes: atomic int;
     
     /* Casts a GenSymEntry to the specified type and returns it.
        
@@ -33,6 +41,19 @@ module MultiTypeSymEntry
         
         // not sure yet how to implement numpy data() function
 
+        /*
+        What is known of the order and range of the values, computed when
+        first asked for and cleared when the array is written in place.
+        They are only changed while holding metaGuard$.
+        */
+        var sortedKnown: bool = false;
+        var sorted: bool = false;
+        var rangeKnown: bool = false;
+        var minVal: int;
+        var maxVal: int;
+        var sortPerm: shared GenSymEntry?;
+        var metaGuard$: sync bool = true;
+
         proc init(type etype, len: int = 0) {
             this.dtype = whichDtype(etype);
             this.itemsize = dtypeSize(this.dtype);
@@ -40,6 +61,35 @@ module MultiTypeSymEntry
             this.shape = (len,);
         }
 
+        /* Forgets what is known of the values, which have changed */
+        proc clearMetadata() {
+            metaGuard$.readFE();
+            sortedKnown = false;
+            rangeKnown = false;
+            dropSortPerm();
+            metaGuard$.writeEF(true);
+        }
+
+        /*
+        Drops the kept sort permutation, if any, releasing its bytes from
+        cachedBytes. Only called while holding metaGuard$, or once the entry
+        is no longer shared.
+        */
+        proc dropSortPerm() {
+            if sortPerm != nil {
+                cachedBytes.sub(sortPerm!.size * sortPerm!.itemsize);
+                sortPerm = nil;
+            }
+        }
+
+        /* Records that the values are sorted, as they are when created by a sort */
+        proc markSorted() {
+            metaGuard$.readFE();
+            sortedKnown = true;
+            sorted = true;
+            metaGuard$.writeEF(true);
+        }
+
         /* Cast this `GenSymEntry` to `borrowed SymEntry(etype)`
 
            This function will halt if the cast fails.
@@ -101,6 +151,70 @@ module MultiTypeSymEntry
             this.a = a;
         }
 
+        /*
+        Whether the values are sorted, checking them only the first time
+        */
+        proc isSorted(): bool {
+            metaGuard$.readFE();
+            if !sortedKnown {
+                sorted = AryUtil.isSorted(a);
+                sortedKnown = true;
+            }
+            const res = sorted;
+            metaGuard$.writeEF(true);
+            return res;
+        }
+
+        /*
+        The smallest and largest value, finding them only the first time
+
+        :returns: (int, int)
+        */
+        proc keyRange(): (int, int) where etype == int {
+            metaGuard$.readFE();
+            if !rangeKnown {
+                (minVal, maxVal) = CountingSort.keyRange(a);
+                rangeKnown = true;
+            }
+            const res = (minVal, maxVal);
+            metaGuard$.writeEF(true);
+            return res;
+        }
+
+        /*
+        The permutation that sorts the values, if one has been kept,
+        or nil
+        */
+        proc cachedSortPerm(): shared GenSymEntry? {
+            metaGuard$.readFE();
+            var perm = sortPerm;
+            metaGuard$.writeEF(true);
+            return perm;
+        }
+
+        /*
+        Keeps a copy of the permutation that sorts the values if
+        --cacheSortPerms is set and the copy fits in what is left of
+        maxPermutedCacheBytes. Kept permutations are not evicted; they are
+        dropped when the array changes or is removed.
+        */
+        proc cacheSortPerm(const ref perm: [] int) throws {
+            if !cacheSortPerms {
+                return;
+            }
+            const nbytes = perm.size * numBytes(int);
+            overMemLimit(nbytes);
+            if cachedBytes.fetchAdd(nbytes) + nbytes > maxPermutedCacheBytes {
+                cachedBytes.sub(nbytes);
+                return;
+            }
+            const kept = new shared SymEntry(perm);
+            metaGuard$.readFE();
+            dropSortPerm();
+            sortPerm = kept;
+            metaGuard$.writeEF(true);
+        }
+
         /*
         Verbose flag utility method
         */
@@ -111,6 +225,7 @@ module MultiTypeSymEntry
         Verbose flag utility method
         */
         proc deinit() {
+            dropSortPerm();
             if v {writeln("deinit SymEntry");try! stdout.flush();}
         }
         
@@ -17,6 +17,11 @@ module MultiTypeSymbolTable
         mtLogger.level = LogLevel.INFO;    
     }
 
+    /*
+    Name locked by requests that read or write all symbols
+    */
+    const allSymbolsName = "__AllSymbols__";
+
     /* symbol table */
     class SymTab
     {
@@ -26,17 +31,240 @@ module MultiTypeSymbolTable
         var registry: domain(string);
 
         /*
-        Map indexed by strings
+        Map indexed by strings, which concurrent requests may add to
         */
-        var tab: map(string, shared GenSymEntry);
+        var tab: map(string, shared GenSymEntry, parSafe=true);
 
-        var nid = 0;
+        var nid: atomic int;
         /*
         Gives out symbol names.
         */
         proc nextName():string {
-            nid += 1;
-            return "id_"+ nid:string;
+            return "id_"+ (nid.fetchAdd(1) + 1):string;
+        }
+
+        /*
+        Number of requests reading each symbol and the symbols a request is 
+        writing, which are only changed while holding lockGuard$
+        */
+        var readers: map(string, int);
+        var writers: domain(string, parSafe=false);
+        var lockGuard$: sync bool = true;
+
+        /*
+        Locks the symbols a request reads for reading, and those it writes 
+        for writing, if none of them is locked for writing by another request
+        and none of those it writes is locked for reading. Either all the 
+        locks are taken or none is. A request that locks allSymbolsName for
+        writing excludes all other requests, since every request locks it 
+        for reading.
+
+        :arg readNames: names of the symbols read
+        :type readNames: [] string
+
+        :arg writeNames: names of the symbols written, which are not also
+                         listed in readNames
+        :type writeNames: [] string
+
+        :returns: bool, true if the locks were taken
+        */
+        proc tryLockSymbols(const ref readNames: [] string, 
+                            const ref writeNames: [] string): bool {
+            lockGuard$.readFE();
+            var available = true;
+            for name in readNames {
+                if writers.contains(name) then available = false;
+            }
+            for name in writeNames {
+                if writers.contains(name) || readers.contains(name) then available = false;
+            }
+            if available {
+                for name in readNames {
+                    if readers.contains(name) {
+                        readers[name] += 1;
+                    } else {
+                        readers.add(name, 1);
+                    }
+                }
+                for name in writeNames do writers += name;
+            }
+            lockGuard$.writeEF(true);
+            return available;
+        }
+
+        /*
+        Releases the locks taken by tryLockSymbols
+
+        :arg readNames: names of the symbols read
+        :type readNames: [] string
+
+        :arg writeNames: names of the symbols written
+        :type writeNames: [] string
+        */
+        proc unlockSymbols(const ref readNames: [] string, 
+                           const ref writeNames: [] string) {
+            lockGuard$.readFE();
+            for name in readNames {
+                if readers.contains(name) {
+                    readers[name] -= 1;
+                    if readers[name] == 0 then readers.remove(name);
+                }
+            }
+            for name in writeNames do writers -= name;
+            lockGuard$.writeEF(true);
+        }
+
+        /*
+        Copies of value arrays permuted into the order of a permutation, 
+        keyed by the (permutation, values) names they were made from, with
+        their total size in bytes. They are only changed while holding 
+        cacheGuard$, and are dropped when either array changes.
+        */
+        var permutedCache: map((string, string), shared GenSymEntry);
+        var permutedCacheBytes: int;
+        var cacheGuard$: sync bool = true;
+
+        /*
+        Returns the cached copy of the values permuted by the permutation,
+        or nil if there is none
+
+        :arg permName: name of the permutation
+        :type permName: string
+
+        :arg valuesName: name of the values
+        :type valuesName: string
+
+        :returns: shared GenSymEntry?
+        */
+        proc cachedPermuted(permName: string, valuesName: string): shared GenSymEntry? throws {
+            var entry: shared GenSymEntry?;
+            cacheGuard$.readFE();
+            if permutedCache.contains((permName, valuesName)) {
+                entry = permutedCache.getValue((permName, valuesName));
+            }
+            cacheGuard$.writeEF(true);
+            return entry;
+        }
+
+        /*
+        Caches a copy of the values permuted by the permutation. The whole 
+        cache is dropped first if the copy would not fit in what the kept
+        sort permutations leave of maxPermutedCacheBytes, and copies that
+        still do not fit are not cached.
+
+        :arg permName: name of the permutation
+        :type permName: string
+
+        :arg valuesName: name of the values
+        :type valuesName: string
+
+        :arg entry: the permuted values
+        :type entry: shared GenSymEntry
+        */
+        proc cachePermuted(permName: string, valuesName: string, 
+                           entry: shared GenSymEntry) throws {
+            const nbytes = entry.size * entry.itemsize;
+            if nbytes > maxPermutedCacheBytes {
+                return;
+            }
+            cacheGuard$.readFE();
+            if cachedBytes.read() + nbytes > maxPermutedCacheBytes {
+                mtLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                               "dropping %i cached permuted arrays".format(permutedCache.size));
+                permutedCache.clear();
+                cachedBytes.sub(permutedCacheBytes);
+                permutedCacheBytes = 0;
+            }
+            if !permutedCache.contains((permName, valuesName)) {
+                if cachedBytes.fetchAdd(nbytes) + nbytes <= maxPermutedCacheBytes {
+                    permutedCache.add((permName, valuesName), entry);
+                    permutedCacheBytes += nbytes;
+                } else {
+                    cachedBytes.sub(nbytes);
+                }
+            }
+            cacheGuard$.writeEF(true);
+        }
+
+        /*
+        SipHash128 hashes of Strings, keyed by the (offsets, values) names 
+        of the Strings, so that the grouping and set operations on the same
+        Strings only hash them once. They are only changed while holding 
+        cacheGuard$, and are dropped when either array changes.
+        */
+        var hashCache: map((string, string), shared SymEntry(2*uint));
+
+        /*
+        Returns the cached hashes of the Strings, or nil if there are none
+
+        :arg offsetName: name of the offsets of the Strings
+        :type offsetName: string
+
+        :arg valueName: name of the values of the Strings
+        :type valueName: string
+
+        :returns: shared SymEntry(2*uint)?
+        */
+        proc cachedHashes(offsetName: string, valueName: string): shared SymEntry(2*uint)? throws {
+            var entry: shared SymEntry(2*uint)?;
+            cacheGuard$.readFE();
+            if hashCache.contains((offsetName, valueName)) {
+                entry = hashCache.getValue((offsetName, valueName));
+            }
+            cacheGuard$.writeEF(true);
+            return entry;
+        }
+
+        /*
+        Caches the hashes of the Strings
+
+        :arg offsetName: name of the offsets of the Strings
+        :type offsetName: string
+
+        :arg valueName: name of the values of the Strings
+        :type valueName: string
+
+        :arg entry: the hashes
+        :type entry: shared SymEntry(2*uint)
+        */
+        proc cacheHashes(offsetName: string, valueName: string, 
+                         entry: shared SymEntry(2*uint)) throws {
+            cacheGuard$.readFE();
+            hashCache.addOrSet((offsetName, valueName), entry);
+            cacheGuard$.writeEF(true);
+        }
+
+        /*
+        Drops the cached permuted arrays and hashes made from the named 
+        array, and what is known of its sort order, or all of them if name
+        is allSymbolsName
+
+        :arg name: name of an array that changed or was removed
+        :type name: string
+        */
+        proc invalidateCached(name: string) {
+            cacheGuard$.readFE();
+            for key in permutedCache.keysToArray() {
+                if name == allSymbolsName || key[0] == name || key[1] == name {
+                    const e = try! permutedCache.getValue(key);
+                    permutedCacheBytes -= e.size * e.itemsize;
+                    cachedBytes.sub(e.size * e.itemsize);
+                    permutedCache.remove(key);
+                }
+            }
+            for key in hashCache.keysToArray() {
+                if name == allSymbolsName || key[0] == name || key[1] == name {
+                    hashCache.remove(key);
+                }
+            }
+            cacheGuard$.writeEF(true);
+            if name == allSymbolsName {
+                for n in tab.keysToArray() {
+                    try! tab.getBorrowed(n).clearMetadata();
+                }
+            } else if tab.contains(name) {
+                try! tab.getBorrowed(name).clearMetadata();
+            }
         }
 
         proc regName(name: string, userDefinedName: string) throws {
@@ -61,6 +289,7 @@ module MultiTypeSymbolTable
             }
             
             registry += userDefinedName; // add user defined name to registry
+            invalidateCached(userDefinedName);
 
             // point at same shared table entry
             tab.addOrSet(userDefinedName, tab.getValue(name));
@@ -107,6 +336,7 @@ module MultiTypeSymbolTable
             if (tab.contains(name)) {
                 mtLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
                                                         "redefined symbol: %s ".format(name));
+                invalidateCached(name);
             }
 
             tab.addOrSet(name, entry);
@@ -131,6 +361,7 @@ module MultiTypeSymbolTable
             if (tab.contains(name)) {
                 mtLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
                                                         "redefined symbol: %s ".format(name));
+                invalidateCached(name);
             }
 
             tab.addOrSet(name, entry);
@@ -176,6 +407,7 @@ module MultiTypeSymbolTable
         proc deleteEntry(name: string) {
             if (tab.contains(name) && !registry.contains(name)) {
                 tab.remove(name);
+                invalidateCached(name);
             }
             else {
                 try! mtLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
@@ -183,6 +415,43 @@ module MultiTypeSymbolTable
             }
         }
 
+        /*
+        Moves an unregistered entry to a new name, replacing any entry
+        already stored under that name
+
+        :arg name: current name of the array
+        :type name: string
+
+        :arg newName: name to store the array under
+        :type newName: string
+        */
+        proc renameEntry(name: string, newName: string) throws {
+            check(name);
+            if registry.contains(name) || registry.contains(newName) {
+                throw getErrorWithContext(
+                                   msg="renameEntry: cannot rename registered symbol %s to %s".format(
+                                                                          name, newName),
+                                   lineNumber=getLineNumber(),
+                                   routineName=getRoutineName(),
+                                   moduleName=getModuleName(),
+                                   errorClass="ErrorWithContext");
+            }
+            tab.addOrSet(newName, tab.getValue(name));
+            tab.remove(name);
+            invalidateCached(name);
+            invalidateCached(newName);
+        }
+
+        /*
+        Returns true if the symTable holds an entry with the provided name
+
+        :arg name: name of the array
+        :type name: string
+        */
+        proc contains(name: string): bool {
+            return tab.contains(name);
+        }
+
         /*
         Clears all unregistered entries from the symTable
         */
@@ -281,11 +550,11 @@ module MultiTypeSymbolTable
         proc info(name:string): string throws {
             var s: string;
             if name == "__AllSymbols__" {
-                for n in tab {
+                // copy the entries under the table's own lock, since requests
+                // that do not lock all symbols may add or delete entries
+                for (n, e) in tab.toArray() {
                     try! s += "name:%t dtype:%t size:%t ndim:%t shape:%t itemsize:%t\n".format(n, 
-                              dtype2str(tab.getBorrowed(n).dtype), tab.getBorrowed(n).size, 
-                              tab.getBorrowed(n).ndim, tab.getBorrowed(n).shape, 
-                              tab.getBorrowed(n).itemsize);
+                              dtype2str(e.dtype), e.size, e.ndim, e.shape, e.itemsize);
                 }
             }
             else
@@ -48,6 +48,13 @@ module OperatorMsg
              "cmd: %t op: %t left pdarray: %t right pdarray: %t".format(
                                           cmd,op,st.attrib(aname),st.attrib(bname)));
 
+        // sizes are not checked by clients that batch commands
+        if left.size != right.size {
+            var errorMsg = "Error: %s: size mismatch %i %i".format(pn, left.size, right.size);
+            omLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+
         select (left.dtype, right.dtype) {
             when (DType.Int64, DType.Int64) {
                 var l = toSymEntry(left,int);
@@ -1357,6 +1364,13 @@ module OperatorMsg
         omLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
                     "cmd: %s op: %s left pdarray: %t right pdarray: %t".format(cmd,op,left,right));   
 
+        // sizes are not checked by clients that batch commands
+        if left.size != right.size {
+            var errorMsg = "Error: %s: size mismatch %i %i".format(pn, left.size, right.size);
+            omLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+
         select (left.dtype, right.dtype) {
             when (DType.Int64, DType.Int64) {
                 var l = toSymEntry(left,int);
@@ -33,9 +33,8 @@ module RadixSortLSD
         rsLogger.level = LogLevel.INFO;    
     }
 
-    inline proc getBitWidth(a: [?aD] int): (int, bool) {
-      var aMin = min reduce a;
-      var aMax = max reduce a;
+    // Bits to sort, and whether there are negatives, of ints between aMin and aMax
+    inline proc bitWidthOfRange(aMin: int, aMax: int): (int, bool) {
       var wPos = if aMax >= 0 then numBits(int) - clz(aMax) else 0;
       var wNeg = if aMin < 0 then numBits(int) - clz((-aMin)-1) + 1 else 0;
       const bitWidth = max(wPos, wNeg);
@@ -43,6 +42,12 @@ module RadixSortLSD
       return (bitWidth, negs);
     }
 
+    inline proc getBitWidth(a: [?aD] int): (int, bool) {
+      var aMin = min reduce a;
+      var aMax = max reduce a;
+      return bitWidthOfRange(aMin, aMax);
+    }
+
     inline proc getBitWidth(a: [?aD] real): (int, bool) {
       const bitWidth = numBits(real);
       const negs = signbit(min reduce a);
@@ -73,50 +78,62 @@ module RadixSortLSD
       return (t.size * bitsPerDigit, false);
     }
 
+    // Bits to flip in a digit so that its buckets come in ascending or
+    // descending order. Inverting every digit reverses the order of the
+    // keys, and since the passes stay stable, equal keys keep their order.
+    inline proc directionMask(ascending: bool): uint {
+      return if ascending then 0:uint else maskDigit:uint;
+    }
+
     // Get the digit for the current rshift. In order to correctly sort
     // negatives, we have to invert the signbit if we're looking at the last
     // digit and the array contained negative values.
-    inline proc getDigit(key: int, rshift: int, last: bool, negs: bool): int {
+    inline proc getDigit(key: int, rshift: int, last: bool, negs: bool,
+                         ascending: bool = true): int {
       const invertSignBit = last && negs;
-      const xor = (invertSignBit:uint << (RSLSD_bitsPerDigit-1));
+      const xor = (invertSignBit:uint << (RSLSD_bitsPerDigit-1)) ^ directionMask(ascending);
       const keyu = key:uint;
       return (((keyu >> rshift) & (maskDigit:uint)) ^ xor):int;
     }
 
-    inline proc getDigit(key: uint, rshift: int, last: bool, negs: bool): int {
-      return ((key >> rshift) & (maskDigit:uint)):int;
+    inline proc getDigit(key: uint, rshift: int, last: bool, negs: bool,
+                         ascending: bool = true): int {
+      return (((key >> rshift) & (maskDigit:uint)) ^ directionMask(ascending)):int;
     }
 
     // Get the digit for the current rshift. In order to correctly sort
     // negatives, we have to invert the entire key if it's negative, and invert
     // just the signbit for positive values when looking at the last digit.
-    inline proc getDigit(in key: real, rshift: int, last: bool, negs: bool): int {
+    inline proc getDigit(in key: real, rshift: int, last: bool, negs: bool,
+                         ascending: bool = true): int {
       const invertSignBit = last && negs;
       var keyu: uint;
       c_memcpy(c_ptrTo(keyu), c_ptrTo(key), numBytes(key.type));
       var signbitSet = keyu >> (numBits(keyu.type)-1) == 1;
-      var xor = 0:uint;
+      var xor = directionMask(ascending);
       if signbitSet {
         keyu = ~keyu;
       } else {
-        xor = (invertSignBit:uint << (RSLSD_bitsPerDigit-1));
+        xor ^= (invertSignBit:uint << (RSLSD_bitsPerDigit-1));
       }
       return (((keyu >> rshift) & (maskDigit:uint)) ^ xor):int;
     }
 
-    inline proc getDigit(key: 2*uint, rshift: int, last: bool, negs: bool): int {
+    inline proc getDigit(key: 2*uint, rshift: int, last: bool, negs: bool,
+                         ascending: bool = true): int {
       const (key0,key1) = key;
       if (rshift >= numBits(uint)) {
-        return getDigit(key0, rshift - numBits(uint), last, negs);
+        return getDigit(key0, rshift - numBits(uint), last, negs, ascending);
       } else {
-        return getDigit(key1, rshift, last, negs);
+        return getDigit(key1, rshift, last, negs, ascending);
       }
     }
 
-    inline proc getDigit(key: _tuple, rshift: int, last: bool, negs: bool): int
+    inline proc getDigit(key: _tuple, rshift: int, last: bool, negs: bool,
+                         ascending: bool = true): int
         where isHomogeneousTuple(key) && key.type == key.size*uint(bitsPerDigit) {
       const keyHigh = key.size - (1-RSLSD_tupleLow);
-      return key[keyHigh - rshift/bitsPerDigit]:int;
+      return (key[keyHigh - rshift/bitsPerDigit]:uint ^ directionMask(ascending)):int;
     }
 
     // calculate sub-domain for task
@@ -144,12 +161,13 @@ module RadixSortLSD
     }
 
     /* Radix Sort Least Significant Digit
-       radix sort a block distributed array
-       returning a permutation vector as a block distributed array */
-    proc radixSortLSD_ranks(a:[?aD] ?t, checkSorted: bool = true): [aD] int {
+       radix sort a block distributed array, in ascending or descending
+       order, returning a permutation vector as a block distributed array */
+    proc radixSortLSD_ranks(a:[?aD] ?t, checkSorted: bool = true,
+                            ascending: bool = true): [aD] int {
 
         // check to see if array is already sorted
-        if (checkSorted) {
+        if (checkSorted && ascending) {
             if (isSorted(a)) {
                 var ranks: [aD] int = [i in aD] i;
                 return ranks;
@@ -157,8 +175,22 @@ module RadixSortLSD
         }
         
         var (nBits, negs) = getBitWidth(a);
+        return radixSortLSD_ranks(a, nBits, negs, ascending);
+    }
+
+    /* Radix sort of the lowest nBits bits of the keys, from a bit width
+       already known, returning a permutation vector as a block distributed
+       array */
+    proc radixSortLSD_ranks(a:[?aD] ?t, nBits: int, negs: bool,
+                            ascending: bool = true): [aD] int {
         try! rsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
-                                       "type = %s nBits = %t".format(t:string,nBits));
+                                       "type = %s nBits = %t ascending = %t".format(
+                                                                 t:string,nBits,ascending));
+        // no bits to sort means that all keys are equal
+        if nBits == 0 {
+            var ranks: [aD] int = [i in aD] i;
+            return ranks;
+        }
         
         // form (key,rank) vector
         var kr0: [aD] (t,int) = [(key,rank) in zip(a,aD)] (key,rank);
@@ -191,7 +223,7 @@ module RadixSortLSD
                         // count digits in this task's part of the array
                         for i in tD {
                             const (key,_) = kr0[i];
-                            var bucket = getDigit(key, rshift, last, negs); // calc bucket from key
+                            var bucket = getDigit(key, rshift, last, negs, ascending); // calc bucket from key
                             taskBucketCounts[bucket] += 1;
                         }
                         // write counts in to global counts in transposed order
@@ -238,7 +270,7 @@ module RadixSortLSD
                             var aggregator = newDstAggregator((t,int));
                             for i in tD {
                                 const (key,_) = kr0[i];
-                                var bucket = getDigit(key, rshift, last, negs); // calc bucket from key
+                                var bucket = getDigit(key, rshift, last, negs, ascending); // calc bucket from key
                                 var pos = taskBucketPos[bucket];
                                 taskBucketPos[bucket] += 1;
                                 aggregator.copy(kr1[pos], kr0[i]);
@@ -263,12 +295,13 @@ module RadixSortLSD
     
 
     /* Radix Sort Least Significant Digit
-       radix sort a block distributed array
-       returning sorted keys as a block distributed array */
-    proc radixSortLSD_keys(a: [?aD] ?t, checkSorted: bool = true): [aD] t {
+       radix sort a block distributed array, in ascending or descending
+       order, returning sorted keys as a block distributed array */
+    proc radixSortLSD_keys(a: [?aD] ?t, checkSorted: bool = true,
+                           ascending: bool = true): [aD] t {
 
         // check to see if array is already sorted
-        if (checkSorted) {
+        if (checkSorted && ascending) {
             if (isSorted(a)) {
                 var sorted: [aD] t = a;
                 return sorted;
@@ -279,7 +312,8 @@ module RadixSortLSD
         var (nBits, negs) = getBitWidth(a);
 
         try! rsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
-                                       "type = %s nBits = %t".format(t:string,nBits));
+                                       "type = %s nBits = %t ascending = %t".format(
+                                                                 t:string,nBits,ascending));
         
         var k0: [aD] t = a;
         var k1: [aD] t;
@@ -310,7 +344,7 @@ module RadixSortLSD
                                                  "loc id: %t task: %t tD: %t".format(loc.id,task,tD));
                         // count digits in this task's part of the array
                         for i in tD {
-                            var bucket = getDigit(k0[i], rshift, last, negs); // calc bucket from key
+                            var bucket = getDigit(k0[i], rshift, last, negs, ascending); // calc bucket from key
                             taskBucketCounts[bucket] += 1;
                         }
                         // write counts in to global counts in transposed order
@@ -356,7 +390,7 @@ module RadixSortLSD
                         {
                             var aggregator = newDstAggregator(t);
                             for i in tD {
-                                var bucket = getDigit(k0[i], rshift, last, negs); // calc bucket from key
+                                var bucket = getDigit(k0[i], rshift, last, negs, ascending); // calc bucket from key
                                 var pos = taskBucketPos[bucket];
                                 taskBucketPos[bucket] += 1;
                                 aggregator.copy(k1[pos], k0[i]);
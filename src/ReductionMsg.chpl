@@ -17,6 +17,8 @@ module ReductionMsg
     use AryUtil;
     use PrivateDist;
     use RadixSortLSD;
+    use Map;
+    use SymArrayDmap;
 
     private config const lBins = 2**25 * numLocales;
 
@@ -90,8 +92,7 @@ module ReductionMsg
                         return try! "int64 %i".format(maxLoc);
                     }
                     when "is_sorted" {
-                        ref ea = e.a;
-                        var sorted = isSorted(ea);
+                        var sorted = e.isSorted();
                         var val: string;
                         if sorted {val = "True";} else {val = "False";}
                         return try! "bool %s".format(val);
@@ -156,7 +157,7 @@ module ReductionMsg
                         return try! "int64 %i".format(maxLoc);
                     }
                     when "is_sorted" {
-                        var sorted = isSorted(e.a);
+                        var sorted = e.isSorted();
                         var val:string;
                         if sorted {val = "True";} else {val = "False";}
                         return try! "bool %s".format(val);
@@ -271,10 +272,48 @@ module ReductionMsg
             rmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg); 
             return errorMsg;        
         }
+        var errorMsg = segReduceEntry(pn, rname, gVal, segments, operator, skipNan, st);
+        if !errorMsg.isEmpty() {
+            return errorMsg;
+        }
+        return try! "created " + st.attrib(rname);
+    }
+
+    /* Delta degrees of freedom of a var or std operator, 0 if not given */
+    proc ddofArg(opArg: string): int throws {
+        return if opArg.isEmpty() then 0 else opArg:int;
+    }
+
+    /* Quantile of a quantile operator, the median if not given */
+    proc quantileArg(opArg: string): real throws {
+        return if opArg.isEmpty() then 0.5 else opArg:real;
+    }
+
+    /*
+    Reduces each segment of the values with the operator and stores the 
+    result under rname.
+
+    :arg pn: name of the calling routine, for error messages
+    :arg rname: name to store the result under
+    :arg gVal: the grouped values
+    :arg segments: the segment offsets
+    :arg operator: the reduction operator
+    :arg skipNan: whether to skip NaN values of float64 arrays
+    :arg st: SymTab to store the result in
+
+    :returns: (string) an empty string, or an error message if the operator
+              is not implemented for the dtype of the values
+    */
+    proc segReduceEntry(pn: string, rname: string, gVal: borrowed GenSymEntry, 
+                        segments: borrowed SymEntry(int), operator: string, 
+                        skipNan: bool, st: borrowed SymTab): string throws {
+        // operators that take a parameter carry it after a colon, as in
+        // var:1 (ddof) or quantile:0.9
+        var (op, opArg) = operator.splitMsgToTuple(":", 2);
         select (gVal.dtype) {
             when (DType.Int64) {
                 var values = toSymEntry(gVal, int);
-                select operator {
+                select op {
                     when "sum" {
                         var res = segSum(values.a, segments.a);
                         st.addEntry(rname, new shared SymEntry(res));
@@ -307,6 +346,34 @@ module ReductionMsg
                         var res = segNumUnique(values.a, segments.a);
                         st.addEntry(rname, new shared SymEntry(res));
                     }
+                    when "var" {
+                        var res = segVar(values.a, segments.a, ddofArg(opArg));
+                        st.addEntry(rname, new shared SymEntry(res));
+                    }
+                    when "std" {
+                        var res = Math.sqrt(segVar(values.a, segments.a, ddofArg(opArg)));
+                        st.addEntry(rname, new shared SymEntry(res));
+                    }
+                    when "first" {
+                        var res = segFirst(values.a, segments.a);
+                        st.addEntry(rname, new shared SymEntry(res));
+                    }
+                    when "last" {
+                        var res = segLast(values.a, segments.a);
+                        st.addEntry(rname, new shared SymEntry(res));
+                    }
+                    when "mode" {
+                        var res = segMode(values.a, segments.a);
+                        st.addEntry(rname, new shared SymEntry(res));
+                    }
+                    when "median" {
+                        var res = segQuantile(values.a, segments.a, 0.5);
+                        st.addEntry(rname, new shared SymEntry(res));
+                    }
+                    when "quantile" {
+                        var res = segQuantile(values.a, segments.a, quantileArg(opArg));
+                        st.addEntry(rname, new shared SymEntry(res));
+                    }
                     otherwise {
                         var errorMsg = notImplementedError(pn,operator,gVal.dtype);
                         rmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
@@ -316,7 +383,7 @@ module ReductionMsg
             }
             when (DType.Float64) {
                 var values = toSymEntry(gVal, real);
-                select operator {
+                select op {
                     when "sum" {
                         var res = segSum(values.a, segments.a, skipNan);
                         st.addEntry(rname, new shared SymEntry(res));
@@ -345,6 +412,34 @@ module ReductionMsg
                         var (vals, locs) = segArgmax(values.a, segments.a);
                         st.addEntry(rname, new shared SymEntry(locs));
                     }
+                    when "var" {
+                        var res = segVar(values.a, segments.a, ddofArg(opArg), skipNan);
+                        st.addEntry(rname, new shared SymEntry(res));
+                    }
+                    when "std" {
+                        var res = Math.sqrt(segVar(values.a, segments.a, ddofArg(opArg), skipNan));
+                        st.addEntry(rname, new shared SymEntry(res));
+                    }
+                    when "first" {
+                        var res = segFirst(values.a, segments.a);
+                        st.addEntry(rname, new shared SymEntry(res));
+                    }
+                    when "last" {
+                        var res = segLast(values.a, segments.a);
+                        st.addEntry(rname, new shared SymEntry(res));
+                    }
+                    when "mode" {
+                        var res = segMode(values.a, segments.a);
+                        st.addEntry(rname, new shared SymEntry(res));
+                    }
+                    when "median" {
+                        var res = segQuantile(values.a, segments.a, 0.5, skipNan);
+                        st.addEntry(rname, new shared SymEntry(res));
+                    }
+                    when "quantile" {
+                        var res = segQuantile(values.a, segments.a, quantileArg(opArg), skipNan);
+                        st.addEntry(rname, new shared SymEntry(res));
+                    }
                     otherwise {
                         var errorMsg = notImplementedError(pn,operator,gVal.dtype);
                         rmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);         
@@ -354,7 +449,7 @@ module ReductionMsg
            }
            when (DType.Bool) {
                var values = toSymEntry(gVal, bool);
-               select operator {
+               select op {
                    when "sum" {
                       var res = segSum(values.a, segments.a);
                       st.addEntry(rname, new shared SymEntry(res));
@@ -371,6 +466,14 @@ module ReductionMsg
                       var res = segMean(values.a, segments.a);
                       st.addEntry(rname, new shared SymEntry(res));
                    }
+                   when "first" {
+                      var res = segFirst(values.a, segments.a);
+                      st.addEntry(rname, new shared SymEntry(res));
+                   }
+                   when "last" {
+                      var res = segLast(values.a, segments.a);
+                      st.addEntry(rname, new shared SymEntry(res));
+                   }
                    otherwise {
                        var errorMsg = notImplementedError(pn,operator,gVal.dtype);
                        rmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
@@ -384,7 +487,348 @@ module ReductionMsg
                return errorMsg;
            }
        }
-       return try! "created " + st.attrib(rname);
+       return "";
+    }
+
+    /*
+    Computes several segmented reductions over the same grouping in one 
+    request. Each array of values is permuted into grouped order once, 
+    however many reductions of it are requested, and the argmin and argmax
+    locations are mapped back through the permutation to indices of the 
+    original values.
+
+    reqMsg: segmentedMultiReduction <perm> <segments> <skipNan> <cache> <n> 
+                                    <values_1> <op_1> ... <values_n> <op_n>
+    'perm' is the permutation that groups the values, or "None" if the 
+    values are already grouped. If 'cache' is true, the permuted values are
+    looked up in and added to the symbol table's cache of permuted arrays.
+
+    :returns: (string) the "created" messages of the n results, in order, 
+              separated by " , "
+    */
+    proc segmentedMultiReductionMsg(cmd: string, payload: bytes, 
+                                    st: borrowed SymTab): string throws {
+        param pn = Reflection.getRoutineName();
+        var (perm_name, segments_name, skip_nan, use_cache, nstr, rest) = 
+                                                payload.decode().splitMsgToTuple(6);
+        var skipNan = stringtobool(skip_nan);
+        var useCache = stringtobool(use_cache);
+        var n = try! nstr:int;
+        var fields = rest.split();
+        rmLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                      "cmd: %s perm: %s segments: %s n: %i fields: %t".format(
+                                       cmd,perm_name,segments_name,n,fields));
+        if fields.size != 2*n {
+            var errorMsg = incompatibleArgumentsError(pn, 
+                        "Expected %i (values, operator) pairs but got %i fields".format(
+                                                                      n, fields.size));
+            rmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+        var gSeg: borrowed GenSymEntry = st.lookup(segments_name);
+        var segments = toSymEntry(gSeg, int);
+        if (segments == nil) {
+            var errorMsg = "Error: array of segment offsets must be int dtype";
+            rmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg); 
+            return errorMsg;        
+        }
+        const hasPerm = perm_name != "None";
+        var permEntry: borrowed SymEntry(int)?;
+        if hasPerm {
+            permEntry = toSymEntry(st.lookup(perm_name), int);
+        }
+
+        // the values of each array in grouped order, permuted once each
+        var grouped: map(string, shared GenSymEntry);
+        proc groupedValues(name: string): borrowed GenSymEntry throws {
+            var gVal = st.lookup(name);
+            if !hasPerm {
+                return gVal;
+            }
+            if !grouped.contains(name) && useCache {
+                var cached = st.cachedPermuted(perm_name, name);
+                if cached != nil {
+                    rmLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                                   "using cached permutation of %s".format(name));
+                    grouped.add(name, cached: shared GenSymEntry);
+                }
+            }
+            if !grouped.contains(name) {
+                const perm = permEntry!;
+                if gVal.size != perm.size {
+                    throw getErrorWithContext(
+                        msg="values %s of size %i do not match grouping of size %i".format(
+                                                                name, gVal.size, perm.size),
+                        lineNumber=getLineNumber(),
+                        routineName=getRoutineName(),
+                        moduleName=getModuleName(),
+                        errorClass="ErrorWithContext");
+                }
+                proc permute(type t): shared GenSymEntry throws {
+                    var e = toSymEntry(gVal, t);
+                    var p = new shared SymEntry(e.size, t);
+                    ref ea = e.a;
+                    forall (pi, idx) in zip(p.a, perm.a) with (var agg = newSrcAggregator(t)) {
+                        agg.copy(pi, ea[idx]);
+                    }
+                    return p;
+                }
+                select gVal.dtype {
+                    when DType.Int64 { grouped.add(name, permute(int)); }
+                    when DType.Float64 { grouped.add(name, permute(real)); }
+                    when DType.Bool { grouped.add(name, permute(bool)); }
+                    otherwise {
+                        throw getErrorWithContext(
+                            msg=unrecognizedTypeError(pn, dtype2str(gVal.dtype)),
+                            lineNumber=getLineNumber(),
+                            routineName=getRoutineName(),
+                            moduleName=getModuleName(),
+                            errorClass="ErrorWithContext");
+                    }
+                }
+                if useCache {
+                    st.cachePermuted(perm_name, name, grouped.getValue(name));
+                }
+            }
+            return grouped.getBorrowed(name);
+        }
+
+        const low = fields.domain.low;
+        var rnames: [0..#n] string;
+        for i in 0..#n {
+            const values_name = fields[low + 2*i];
+            const operator = fields[low + 2*i + 1];
+            var rname = st.nextName();
+            var errorMsg: string;
+            try {
+                errorMsg = segReduceEntry(pn, rname, groupedValues(values_name), segments, 
+                                          operator, skipNan, st);
+            } catch e: ErrorWithContext {
+                rmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),e.message());
+                errorMsg = e.publish();
+            }
+            if !errorMsg.isEmpty() {
+                // drop the results computed so far
+                for j in 0..#i {
+                    st.deleteEntry(rnames[j]);
+                }
+                return errorMsg;
+            }
+            if hasPerm && operator.startsWith("arg") {
+                // map locations in grouped order back to the original values
+                var locs = toSymEntry(st.lookup(rname), int);
+                const perm = permEntry!;
+                ref pa = perm.a;
+                var oname = st.nextName();
+                var orig = st.addEntry(oname, locs.size, int);
+                forall (o, l) in zip(orig.a, locs.a) with (var agg = newSrcAggregator(int)) {
+                    agg.copy(o, pa[l]);
+                }
+                st.deleteEntry(rname);
+                rname = oname;
+            }
+            rnames[i] = rname;
+        }
+        var replies: [0..#n] string;
+        for (reply, rname) in zip(replies, rnames) {
+            reply = "created " + st.attrib(rname);
+        }
+        return " , ".join(replies);
+    }
+
+    /*
+    Returns an array of the given size holding each segment's value at each
+    position of the segment, in grouped order, or, if a permutation is 
+    given, at the original position perm[i] of each grouped position i.
+
+    :arg segs: the segment offsets
+    :arg vals: one value per segment
+    :arg size: the total size of the segments
+    :arg perm: the permutation that groups the original positions, or nil
+
+    :returns: [] t
+    */
+    proc broadcastSegments(const ref segs: [?sD] int, const ref vals: [sD] ?t, size: int,
+                           perm: borrowed SymEntry(int)?) throws {
+        var res = makeDistArray(size, t);
+        if size == 0 {
+            return res;
+        }
+        // mark the start of each nonempty segment with its index, then carry 
+        // the index forward to the other positions of the segment
+        var segIds = makeDistArray(size, int);
+        const high = sD.high;
+        forall (s, start) in zip(sD, segs) with (var agg = newDstAggregator(int)) {
+            const end = if s == high then size else segs[s+1];
+            if end > start {
+                agg.copy(segIds[start], s);
+            }
+        }
+        segIds = max scan segIds;
+        // consecutive positions mostly share a segment, so each task only 
+        // reads the value of a segment when it reaches a new one
+        if perm == nil {
+            forall (r, s) in zip(res, segIds) with (var lastSeg = -1, var lastVal: t) {
+                if s != lastSeg {
+                    lastVal = vals[s];
+                    lastSeg = s;
+                }
+                r = lastVal;
+            }
+        } else {
+            ref pa = perm!.a;
+            forall (p, s) in zip(pa, segIds) with (var agg = newDstAggregator(t),
+                                                   var lastSeg = -1, var lastVal: t) {
+                if s != lastSeg {
+                    lastVal = vals[s];
+                    lastSeg = s;
+                }
+                agg.copy(res[p], lastVal);
+            }
+        }
+        return res;
+    }
+
+    /*
+    Stores the values of the segments broadcast by broadcastSegments under 
+    rname
+
+    :returns: (string) an empty string, or an error message if the dtype 
+              of the values is not supported
+    */
+    proc broadcastEntry(pn: string, rname: string, gVal: borrowed GenSymEntry,
+                        segments: borrowed SymEntry(int), perm: borrowed SymEntry(int)?, 
+                        size: int, st: borrowed SymTab): string throws {
+        select gVal.dtype {
+            when DType.Int64 {
+                var values = toSymEntry(gVal, int);
+                st.addEntry(rname, new shared SymEntry(broadcastSegments(segments.a, 
+                                                               values.a, size, perm)));
+            }
+            when DType.Float64 {
+                var values = toSymEntry(gVal, real);
+                st.addEntry(rname, new shared SymEntry(broadcastSegments(segments.a, 
+                                                               values.a, size, perm)));
+            }
+            when DType.Bool {
+                var values = toSymEntry(gVal, bool);
+                st.addEntry(rname, new shared SymEntry(broadcastSegments(segments.a, 
+                                                               values.a, size, perm)));
+            }
+            otherwise {
+                var errorMsg = unrecognizedTypeError(pn, dtype2str(gVal.dtype));
+                rmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return errorMsg;
+            }
+        }
+        return "";
+    }
+
+    /*
+    Looks up the permutation and segments of a grouping and checks that 
+    they and the values of each segment fit together
+
+    :returns: (segments, perm, errorMsg), where perm is nil if permName is
+              "None" and errorMsg is empty unless the arrays do not fit
+    */
+    proc lookupGrouping(pn: string, permName: string, segName: string, nvals: int, 
+                        size: int, st: borrowed SymTab) throws {
+        var segments = toSymEntry(st.lookup(segName), int);
+        var perm: borrowed SymEntry(int)?;
+        var errorMsg: string;
+        if (segments == nil) {
+            errorMsg = "Error: array of segment offsets must be int dtype";
+        } else if segments.size != nvals {
+            errorMsg = incompatibleArgumentsError(pn, 
+                            "Expected one value per segment, got %i values for %i segments"
+                                                                .format(nvals, segments.size));
+        } else if permName != "None" {
+            perm = toSymEntry(st.lookup(permName), int);
+            if perm == nil {
+                errorMsg = "Error: permutation must be int dtype";
+            } else if perm!.size != size {
+                errorMsg = incompatibleArgumentsError(pn, 
+                            "Permutation of size %i does not match size %i".format(perm!.size, size));
+            }
+        }
+        if !errorMsg.isEmpty() {
+            rmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+        }
+        return (segments, perm, errorMsg);
+    }
+
+    /*
+    Fills each segment with its value, either in grouped order or, given 
+    the permutation of the grouping, straight at the original positions of 
+    the segment's elements.
+
+    reqMsg: broadcast <perm> <segments> <values> <size>
+    'perm' is "None" to return the values in grouped order
+
+    :returns: (string) the "created" message of the result
+    */
+    proc broadcastMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
+        param pn = Reflection.getRoutineName();
+        var (perm_name, segments_name, values_name, sizeStr) = 
+                                                payload.decode().splitMsgToTuple(4);
+        const size = sizeStr: int;
+        rmLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                      "cmd: %s perm: %s segments: %s values: %s size: %i".format(
+                                    cmd,perm_name,segments_name,values_name,size));
+        var gVal = st.lookup(values_name);
+        var (segments, perm, errorMsg) = lookupGrouping(pn, perm_name, segments_name,
+                                                        gVal.size, size, st);
+        if !errorMsg.isEmpty() {
+            return errorMsg;
+        }
+        var rname = st.nextName();
+        errorMsg = broadcastEntry(pn, rname, gVal, segments, perm, size, st);
+        if !errorMsg.isEmpty() {
+            return errorMsg;
+        }
+        return "created " + st.attrib(rname);
+    }
+
+    /*
+    Reduces each segment of the values and fills the segment with the 
+    result, at the original positions of the values, in one request.
+
+    reqMsg: segmentedTransform <perm> <segments> <values> <op> <skipNan>
+    'perm' is "None" if the values are already grouped
+
+    :returns: (string) the "created" message of the result
+    */
+    proc segmentedTransformMsg(cmd: string, payload: bytes, 
+                               st: borrowed SymTab): string throws {
+        param pn = Reflection.getRoutineName();
+        var (perm_name, segments_name, values_name, operator, skip_nan) = 
+                                                payload.decode().splitMsgToTuple(5);
+        rmLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                      "cmd: %s perm: %s segments: %s values: %s op: %s".format(
+                                    cmd,perm_name,segments_name,values_name,operator));
+        const size = st.lookup(values_name).size;
+        // reduce as segmentedMultiReduction does, which maps argmin and 
+        // argmax back to the original positions
+        var repMsg = segmentedMultiReductionMsg("segmentedMultiReduction",
+                            "%s %s %s False 1 %s %s".format(perm_name, segments_name, 
+                                        skip_nan, values_name, operator).encode(), st);
+        if repMsg.startsWith("Error:") {
+            return repMsg;
+        }
+        var (_, redName, _) = repMsg.splitMsgToTuple(3);
+        var gRed = st.lookup(redName);
+        var (segments, perm, errorMsg) = lookupGrouping(pn, perm_name, segments_name, 
+                                                        gRed.size, size, st);
+        if errorMsg.isEmpty() {
+            var rname = st.nextName();
+            errorMsg = broadcastEntry(pn, rname, gRed, segments, perm, size, st);
+            repMsg = "created " + st.attrib(rname);
+        }
+        st.deleteEntry(redName);
+        if !errorMsg.isEmpty() {
+            return errorMsg;
+        }
+        return repMsg;
     }
 
           
@@ -759,6 +1203,161 @@ module ReductionMsg
       return res;
     }
 
+    /*
+    Returns the permutation that sorts the values within each segment, by
+    sorting all the values and then stably sorting the result by segment,
+    as segNumUnique does. Equal values of a segment keep their order.
+    */
+    proc segSortPerm(values: [?vD] ?t, segments: [?sD] int): [vD] int throws {
+      var keys = expandKeys(vD, segments);
+      var firstIV = radixSortLSD_ranks(values);
+      var intermediate: [vD] int;
+      forall (ii, idx) in zip(intermediate, firstIV) with (var agg = newSrcAggregator(int)) {
+          agg.copy(ii, keys[idx]);
+      }
+      var deltaIV = radixSortLSD_ranks(intermediate);
+      var perm: [vD] int;
+      forall (p, idx) in zip(perm, deltaIV) with (var agg = newSrcAggregator(int)) {
+          agg.copy(p, firstIV[idx]);
+      }
+      return perm;
+    }
+
+    /* Returns the values sorted within each segment */
+    proc segSortValues(values: [?vD] ?t, segments: [?sD] int): [vD] t throws {
+      var perm = segSortPerm(values, segments);
+      var sorted: [vD] t;
+      forall (s, idx) in zip(sorted, perm) with (var agg = newSrcAggregator(t)) {
+          agg.copy(s, values[idx]);
+      }
+      return sorted;
+    }
+
+    /*
+    Variance of each segment with ddof delta degrees of freedom, computed
+    from the squared deviations from the segment means. Segments with no
+    more than ddof values are NaN.
+    */
+    proc segVar(values:[?vD] ?t, segments:[?D] int, ddof: int, skipNan=false): [D] real throws {
+      var res: [D] real = NAN;
+      if (D.size == 0) { return res; }
+      var means = segMean(values, segments, skipNan);
+      var meanAt = broadcastSegments(segments, means, vD.size, nil);
+      var sqdevs: [vD] real;
+      var counts = segCount(segments, values.size);
+      if (isFloatType(t) && skipNan) {
+        forall (d, v, m) in zip(sqdevs, values, meanAt) {
+          d = if isnan(v) then 0.0 else (v - m)**2;
+        }
+        var nans: [vD] bool = isnan(values);
+        counts -= segSum(nans, segments);
+      } else {
+        forall (d, v, m) in zip(sqdevs, values, meanAt) {
+          d = (v:real - m)**2;
+        }
+      }
+      forall (r, s, c) in zip(res, segSum(sqdevs, segments), counts) {
+        if (c > ddof) {
+          r = s / (c - ddof):real;
+        }
+      }
+      return res;
+    }
+
+    /* First value of each segment, or the default value of t if it is empty */
+    proc segFirst(values:[?vD] ?t, segments:[?D] int): [D] t {
+      var res: [D] t;
+      if (D.size == 0) { return res; }
+      forall (i, r, low) in zip(D, res, segments) with (var agg = newSrcAggregator(t)) {
+        const high = if i < D.high then segments[i+1] else vD.size;
+        if (high > low) {
+          agg.copy(r, values[low]);
+        }
+      }
+      return res;
+    }
+
+    /* Last value of each segment, or the default value of t if it is empty */
+    proc segLast(values:[?vD] ?t, segments:[?D] int): [D] t {
+      var res: [D] t;
+      if (D.size == 0) { return res; }
+      forall (i, r, low) in zip(D, res, segments) with (var agg = newSrcAggregator(t)) {
+        const high = if i < D.high then segments[i+1] else vD.size;
+        if (high > low) {
+          agg.copy(r, values[high-1]);
+        }
+      }
+      return res;
+    }
+
+    /*
+    Most frequent value of each segment, the smallest one in case of a tie.
+    With the values sorted within segments, the length of the run of equal
+    values ending at each position is reduced with segArgmax, whose first
+    maximum falls on the smallest of the most frequent values.
+    */
+    proc segMode(values:[?vD] ?t, segments:[?D] int): [D] t throws {
+      var res: [D] t;
+      if (D.size == 0) { return res; }
+      var sorted = segSortValues(values, segments);
+      // position where the run of each value starts, carried forward
+      var runStarts: [vD] int;
+      forall (r, i) in zip(runStarts, vD) {
+        r = if i == vD.low || sorted[i] != sorted[i-1] then i else -1;
+      }
+      forall s in segments with (var agg = newDstAggregator(int)) {
+        if (s <= vD.high) {
+          agg.copy(runStarts[s], s);
+        }
+      }
+      runStarts = max scan runStarts;
+      var runLengths = [(s, i) in zip(runStarts, vD)] i - s + 1;
+      var (_, locs) = segArgmax(runLengths, segments);
+      forall (i, r, low, l) in zip(D, res, segments, locs) with (var agg = newSrcAggregator(t)) {
+        const high = if i < D.high then segments[i+1] else vD.size;
+        if (high > low) {
+          agg.copy(r, sorted[l]);
+        }
+      }
+      return res;
+    }
+
+    /*
+    q'th quantile of each segment, interpolated linearly between the two
+    nearest values as numpy.quantile does by default. Segments with no 
+    values, or with NaN values unless skipNan is set, are NaN.
+    */
+    proc segQuantile(values:[?vD] ?t, segments:[?D] int, q: real, 
+                     skipNan=false): [D] real throws {
+      var res: [D] real = NAN;
+      if (D.size == 0) { return res; }
+      var counts = segCount(segments, values.size);
+      var sorted: [vD] t;
+      if isFloatType(t) {
+        var nans: [vD] bool = isnan(values);
+        forall (c, n) in zip(counts, segSum(nans, segments)) {
+          c = if skipNan then c - n else (if n > 0 then 0 else c);
+        }
+        // sort NaNs to the end of each segment, past the values to use
+        var noNans = [v in values] if isnan(v) then INFINITY else v;
+        sorted = segSortValues(noNans, segments);
+      } else {
+        sorted = segSortValues(values, segments);
+      }
+      forall (r, low, c) in zip(res, segments, counts) {
+        if (c > 0) {
+          const pos = q * (c - 1);
+          const lo = Math.floor(pos):int;
+          const hi = min(lo + 1, c - 1);
+          const frac = pos - lo;
+          const vlo = sorted[low + lo]:real;
+          const vhi = sorted[low + hi]:real;
+          r = if frac == 0.0 then vlo else vlo + (vhi - vlo) * frac;
+        }
+      }
+      return res;
+    }
+
     proc stringtobool(str: string): bool throws {
       if str == "True" then return true;
       else if str == "False" then return false;
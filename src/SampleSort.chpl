@@ -0,0 +1,228 @@
+/* Sample sort of a block distributed array
+
+ splitters chosen from a sorted random sample divide the keys into one
+ bucket per locale. One all-to-all exchange moves every key, with its
+ index, into the range of the result that its bucket covers, and each
+ locale then sorts its bucket on its own. Unlike the LSD radix sort,
+ whose number of exchanges grows with the width of the keys, this takes
+ a single exchange however wide or skewed the keys are. Keys are sorted
+ together with their indices, so equal keys keep their order, as in a
+ stable sort.
+
+ */
+module SampleSort
+{
+    use ServerConfig;
+
+    use BlockDist;
+    use SymArrayDmap;
+    use CommAggregation;
+    use CPtr;
+    use Sort only;
+    use Random;
+    use RadixSortLSD only numTasks, Tasks, calcBlock, calcGlobalIndex, RSLSD_bitsPerDigit;
+    use Reflection;
+    use Logging;
+
+    // number of keys sampled per bucket to choose the splitters
+    config const SS_oversample = 2**8;
+
+    // smallest number of radix digits in the keys for which argsort and
+    // coargsort use sample sort when left to choose
+    config const SS_minDigits = 5;
+
+    // seed of the sample, which only affects the sizes of the buckets
+    config const SS_seed = 241;
+
+    const sampleLogger = new Logger();
+    if v {
+        sampleLogger.level = LogLevel.DEBUG;
+    } else {
+        sampleLogger.level = LogLevel.INFO;
+    }
+
+    /*
+    Whether to sort keys of nBits bits by sample sort, given the algorithm
+    asked for: "sample", "radix", or "auto" to sample sort keys of at least
+    SS_minDigits radix digits
+    */
+    proc useSampleSort(algorithm: string, nBits: int): bool {
+        const nDigits = (nBits + RSLSD_bitsPerDigit - 1) / RSLSD_bitsPerDigit;
+        return algorithm == "sample" || (algorithm == "auto" && nDigits >= SS_minDigits);
+    }
+
+    // Keys that order as the values do, ordering reals by their bits as
+    // the radix sort does, with negatives inverted
+    inline proc sampleKey(key: int): int {
+      return key;
+    }
+
+    inline proc sampleKey(in key: real): uint {
+      var keyu: uint;
+      c_memcpy(c_ptrTo(keyu), c_ptrTo(key), numBytes(key.type));
+      if keyu >> (numBits(keyu.type)-1) == 1 {
+        return ~keyu;
+      } else {
+        return keyu | (1:uint << (numBits(keyu.type)-1));
+      }
+    }
+
+    inline proc sampleKey(key) where isTuple(key) {
+      return key;
+    }
+
+    // Key in the order asked for, inverting its bits to reverse the order
+    inline proc directedKey(key, ascending: bool) {
+      const k = sampleKey(key);
+      return if ascending then k else ~k;
+    }
+
+    /* Number of splitters below the key, which is the bucket of the key */
+    inline proc bucketOf(const ref splitters: [?D] ?st, key: st): int {
+        var l = D.low;
+        var h = D.high + 1;
+        while l < h {
+            const mid = l + (h - l) / 2;
+            if splitters[mid] < key {
+                l = mid + 1;
+            } else {
+                h = mid;
+            }
+        }
+        return l - D.low;
+    }
+
+    /*
+    Sample sort of a block distributed array, in ascending or descending
+    order, returning the stable sorting permutation as a block distributed
+    array
+
+    :arg a: keys to sort
+    :type a: [] t
+
+    :arg ascending: whether to sort in ascending order
+    :type ascending: bool
+
+    :returns: [] int
+    */
+    proc sampleSortRanks(a: [?aD] ?t, ascending: bool = true): [aD] int throws {
+        const n = aD.size;
+        var dummy: t;
+        type kt = sampleKey(dummy).type;
+        const pairBytes = c_sizeof((kt, int)):int;
+
+        // check and throw if the ranks, the bucket of each key and the
+        // exchanged (key, index) pairs would exceed the memory limit
+        overMemLimit(n * (2 * numBytes(int) + pairBytes));
+        var ranks: [aD] int;
+        if n == 0 {
+            return ranks;
+        }
+        const nBuckets = numLocales;
+
+        // choose the splitters from a sorted sample of (key, index) pairs, so
+        // that runs of equal keys can be split between buckets
+        const s = min(n, SS_oversample * nBuckets);
+        var u: [0..#s] real;
+        fillRandom(u, SS_seed);
+        const sampleIdx: [0..#s] int = [r in u] aD.low + min((r * n):int, n - 1);
+        var sampleVals: [0..#s] t;
+        forall (x, i) in zip(sampleVals, sampleIdx) with (var agg = newSrcAggregator(t)) {
+            agg.copy(x, a[i]);
+        }
+        var sample: [0..#s] (kt, int) = [(x, i) in zip(sampleVals, sampleIdx)] (directedKey(x, ascending), i);
+        Sort.sort(sample);
+        var splitters: [0..#(nBuckets-1)] (kt, int);
+        for (sp, b) in zip(splitters, 1..) {
+            sp = sample[b * s / nBuckets];
+        }
+        try! sampleLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                                "%i splitters from %i samples".format(nBuckets-1, s));
+
+        // count the keys of each task's part of the array in each bucket, in
+        // the transposed (bucket, locale, task) order of calcGlobalIndex
+        var gD = newBlockDom({0..#(nBuckets * numLocales * numTasks)});
+        var globalCounts: [gD] int;
+        var buckets: [aD] int;
+        coforall loc in Locales {
+            on loc {
+                const mySplitters = splitters;
+                coforall task in Tasks {
+                    var taskBucketCounts: [0..#nBuckets] int;
+                    var lD = a.localSubdomain();
+                    var tD = calcBlock(task, lD.low, lD.high);
+                    for i in tD {
+                        const b = bucketOf(mySplitters, (directedKey(a[i], ascending), i));
+                        buckets[i] = b;
+                        taskBucketCounts[b] += 1;
+                    }
+                    var aggregator = newDstAggregator(int);
+                    for b in 0..#nBuckets {
+                        aggregator.copy(globalCounts[calcGlobalIndex(b, loc.id, task)],
+                                        taskBucketCounts[b]);
+                    }
+                    aggregator.flush();
+                }
+            }
+        }
+        var globalStarts = + scan globalCounts;
+        globalStarts -= globalCounts;
+
+        // each bucket is copied to one locale and sorted there, so check the
+        // largest copy against the memory of a single locale
+        var maxBucket = 0;
+        for b in 0..#nBuckets {
+            const bStart = globalStarts[calcGlobalIndex(b, 0, 0)];
+            const bEnd = if b == nBuckets-1 then n
+                         else globalStarts[calcGlobalIndex(b+1, 0, 0)];
+            maxBucket = max(maxBucket, bEnd - bStart);
+        }
+        overMemLimit(numLocales * maxBucket * (pairBytes + numBytes(int)));
+
+        // the one exchange: each (key, index) pair moves to its bucket's range
+        var pairs: [aD] (kt, int);
+        coforall loc in Locales {
+            on loc {
+                coforall task in Tasks {
+                    var taskBucketPos: [0..#nBuckets] int;
+                    var lD = a.localSubdomain();
+                    var tD = calcBlock(task, lD.low, lD.high);
+                    {
+                        var aggregator = newSrcAggregator(int);
+                        for b in 0..#nBuckets {
+                            aggregator.copy(taskBucketPos[b],
+                                            globalStarts[calcGlobalIndex(b, loc.id, task)]);
+                        }
+                        aggregator.flush();
+                    }
+                    {
+                        var aggregator = newDstAggregator((kt, int));
+                        for i in tD {
+                            const b = buckets[i];
+                            aggregator.copy(pairs[taskBucketPos[b]], (directedKey(a[i], ascending), i));
+                            taskBucketPos[b] += 1;
+                        }
+                        aggregator.flush();
+                    }
+                }
+            }
+        }
+
+        // each locale sorts one bucket, which lies mostly in its own block
+        coforall loc in Locales {
+            on loc {
+                const b = loc.id;
+                const bStart = globalStarts[calcGlobalIndex(b, 0, 0)];
+                const bEnd = if b == nBuckets-1 then n
+                             else globalStarts[calcGlobalIndex(b+1, 0, 0)];
+                if bEnd > bStart {
+                    var bucket: [0..#(bEnd - bStart)] (kt, int) = pairs[bStart..bEnd-1];
+                    Sort.sort(bucket);
+                    const bucketRanks: [bucket.domain] int = [(_, i) in bucket] i;
+                    ranks[bStart..bEnd-1] = bucketRanks;
+                }
+            }
+        }
+        return ranks;
+    }
+}
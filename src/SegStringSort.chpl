@@ -33,7 +33,7 @@ module SegStringSort {
     }
   }
   
-  proc twoPhaseStringSort(ss: SegString): [ss.offsets.aD] int throws {
+  proc twoPhaseStringSort(ss: SegString, ascending: bool = true): [ss.offsets.aD] int throws {
     var t = getCurrentTime();
     const lengths = ss.getLengths();
     ssLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
@@ -74,7 +74,11 @@ module SegStringSort {
       if v { tl = getCurrentTime(); }
       // Sort the strings, but bring the inds along for the ride
       const myComparator = new StringIntComparator();
-      sort(stringsWithInds, comparator=myComparator);
+      if ascending {
+        sort(stringsWithInds, comparator=myComparator);
+      } else {
+        sort(stringsWithInds, comparator=new ReverseComparator(myComparator));
+      }
 
       ssLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
                              "Sorted long strings in %t seconds".format(getCurrentTime() - tl));
@@ -88,7 +92,7 @@ module SegStringSort {
                               "Permuted long inds in %t seconds".format(getCurrentTime() - tl));
     }
     if v { t = getCurrentTime(); }
-    const ranks = radixSortLSD_raw(ss.offsets.a, lengths, ss.values.a, gatherInds, pivot);
+    const ranks = radixSortLSD_raw(ss.offsets.a, lengths, ss.values.a, gatherInds, pivot, ascending);
     ssLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
                                           "Sorted ranks in %t seconds".format(getCurrentTime() - t));
     return ranks;
@@ -180,8 +184,10 @@ module SegStringSort {
     return ((bucket * numLocales * numTasks) + (loc * numTasks) + task);
   }
   
-  proc radixSortLSD_raw(const ref offsets: [?aD] int, const ref lengths: [aD] int, const ref values: [] uint(8), const ref inds: [aD] int, const pivot: int): [aD] int throws {
+  proc radixSortLSD_raw(const ref offsets: [?aD] int, const ref lengths: [aD] int, const ref values: [] uint(8), const ref inds: [aD] int, const pivot: int, ascending: bool = true): [aD] int throws {
     const numBuckets = 2**16;
+    // inverting every digit reverses the order of the buckets
+    const dirMask = if ascending then 0 else numBuckets-1;
     type state = (uint(8), uint(8), int, int, int);
     inline proc copyDigit(ref k: state, const off: int, const len: int, const rank: int, const right: int) {
       // TODO can we only use the aggregated version?
@@ -252,7 +258,7 @@ module SegStringSort {
             for i in tD {
               var kr0i0, kr0i1: int;
               (kr0i0, kr0i1 , _, _, _) = kr0[i];
-              var bucket = (kr0i0 << 8) | (kr0i1); // calc bucket from key
+              var bucket = ((kr0i0 << 8) | (kr0i1)) ^ dirMask; // calc bucket from key
               taskBucketCounts[bucket] += 1;
             }
             // write counts in to global counts in transposed order
@@ -295,7 +301,7 @@ module SegStringSort {
               for i in tD {
                 var kr0i0, kr0i1: int;
                 (kr0i0, kr0i1, _, _, _) = kr0[i];
-                var bucket = (kr0i0:int << 8) | (kr0i1:int); // calc bucket from key
+                var bucket = ((kr0i0:int << 8) | (kr0i1:int)) ^ dirMask; // calc bucket from key
                 var pos = taskBucketPos[bucket];
                 taskBucketPos[bucket] += 1;
                 copyDigit(kr1[pos], kr0[i], pivot - rshift, aggregator);
@@ -76,6 +76,12 @@ module SegmentedArray {
      */ 
     var nBytes: int;
 
+    /**
+     * The symbol table holding the offsets and values, which caches the
+     * hashes of the strings
+     */
+    var symTab: unmanaged SymTab;
+
     /* 
      * This version of the init method is the most common and is only used 
      * when the names of the segments (offsets) and values SymEntries are known.
@@ -94,6 +100,7 @@ module SegmentedArray {
       values = vals;
       size = segs.size;
       nBytes = vals.size;
+      symTab = st: unmanaged SymTab;
     }
 
     /*
@@ -339,7 +346,9 @@ module SegmentedArray {
     }
 
     /* Apply a hash function to all strings. This is useful for grouping
-       and set membership. The hash used is SipHash128.*/
+       and set membership. The hash used is SipHash128. The hashes are 
+       cached in the symbol table, and reused until the offsets or values
+       of the strings change or are deleted.*/
     proc hash() throws {
       // 128-bit hash values represented as 2-tuples of uint(64)
       var hashes: [offsets.aD] 2*uint(64);
@@ -347,6 +356,13 @@ module SegmentedArray {
       if (size == 0) {
         return hashes;
       }
+      var cached = symTab.cachedHashes(offsetName, valueName);
+      if cached != nil {
+        saLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                       "using cached hashes of %s".format(offsetName));
+        hashes = cached!.a;
+        return hashes;
+      }
       ref oa = offsets.a;
       ref va = values.a;
       // Compute lengths of strings
@@ -362,6 +378,7 @@ module SegmentedArray {
         /* // Perf Note: localizing string bytes is ~3x faster on IB multilocale than this: */
         /* // h = sipHash128(va[{o..#l}]); */
       }
+      symTab.cacheHashes(offsetName, valueName, new shared SymEntry(hashes));
       return hashes;
     }
 
@@ -725,16 +742,16 @@ module SegmentedArray {
       return (&& reduce (ediff() >= 0));
     }
 
-    proc argsort(checkSorted:bool=true): [offsets.aD] int throws {
+    proc argsort(checkSorted:bool=true, ascending:bool=true): [offsets.aD] int throws {
       const ref D = offsets.aD;
       const ref va = values.a;
-      if checkSorted && isSorted() {
+      if checkSorted && ascending && isSorted() {
           saLogger.warn(getModuleName(),getRoutineName(),getLineNumber(),
                                                    "argsort called on already sorted array");
           var ranks: [D] int = [i in D] i;
           return ranks;
       }
-      var ranks = twoPhaseStringSort(this);
+      var ranks = twoPhaseStringSort(this, ascending);
       return ranks;
     }
 
@@ -1609,12 +1626,15 @@ module SegmentedArray {
     // On each locale, make an associative domain with the hashes of the second array
     // parSafe=false because we are adding in serial and it's faster
     var localTestHashes: [PrivateSpace] domain(2*uint(64), parSafe=false);
+    // hash the second array once (or reuse its cached hashes) and copy the
+    // hashes to each locale
+    const allTestHashes = testStr.hash();
     coforall loc in Locales {
       on loc {
         // Local hashes of second array
         ref mySet = localTestHashes[here.id];
         mySet.requestCapacity(testStr.size);
-        const testHashes = testStr.hash();
+        const testHashes: [0..#testStr.size] 2*uint(64) = allTestHashes;
         for h in testHashes {
           mySet += h;
         }
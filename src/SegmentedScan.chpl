@@ -0,0 +1,341 @@
+/* Scans and windows within the segments of grouped values
+
+ a segmented scan takes one pass over the grouped values: each task scans
+ its block of the array, restarting at every segment start, and the
+ running value at the end of each block is then carried into the
+ following blocks up to their first segment start. Shifts and windows
+ compare positions with the start of their segment.
+
+ */
+module SegmentedScan
+{
+    use ServerConfig;
+
+    use BlockDist;
+    use SymArrayDmap;
+    use CommAggregation;
+    use RadixSortLSD only numTasks, Tasks, calcBlock;
+    use Reflection;
+    use Errors;
+    use Logging;
+
+    const ssLogger = new Logger();
+    if v {
+        ssLogger.level = LogLevel.DEBUG;
+    } else {
+        ssLogger.level = LogLevel.INFO;
+    }
+
+    /* Marks the first position of each nonempty segment */
+    proc segmentStarts(segments: [?sD] int, size: int) {
+        var isStart = makeDistArray(size, bool);
+        forall (s, start) in zip(sD, segments) with (var agg = newDstAggregator(bool)) {
+            const end = if s == sD.high then size else segments[s+1];
+            if end > start {
+                agg.copy(isStart[start], true);
+            }
+        }
+        return isStart;
+    }
+
+    /* Start of the segment of each position */
+    proc startOfSegment(isStart: [?vD] bool): [vD] int {
+        var starts: [vD] int = max scan [(s, i) in zip(isStart, vD)] if s then i else vD.low;
+        return starts;
+    }
+
+    inline proc scanOp(param op: string, x: ?t, y: t): t {
+        if op == "+" {
+            return x + y;
+        } else if op == "*" {
+            return x * y;
+        } else if op == "min" {
+            return min(x, y);
+        } else {
+            return max(x, y);
+        }
+    }
+
+    /* The value that leaves a scan unchanged, which skipped NaNs take */
+    proc scanIdentity(param op: string): real {
+        if op == "+" {
+            return 0.0;
+        } else if op == "*" {
+            return 1.0;
+        } else if op == "min" {
+            return INFINITY;
+        } else {
+            return -INFINITY;
+        }
+    }
+
+    /*
+    Inclusive scan of the values with op ("+", "*", "min" or "max"),
+    restarting at the start of each segment. If skipNan, NaN values do not
+    change the running value and are NaN in the result.
+
+    :arg values: values in grouped order
+    :arg isStart: the segment starts, from segmentStarts
+
+    :returns: [] t
+    */
+    proc segScan(const ref values: [?vD] ?t, const ref isStart: [vD] bool, param op: string,
+                 skipNan: bool = false): [vD] t {
+        if isRealType(t) {
+            if skipNan {
+                const identity = scanIdentity(op);
+                const noNans: [vD] real = [v in values] if isnan(v) then identity else v;
+                var res = scanBlocks(noNans, isStart, op);
+                [(r, v) in zip(res, values)] if isnan(v) then r = NAN;
+                return res;
+            }
+        }
+        return scanBlocks(values, isStart, op);
+    }
+
+    private proc scanBlocks(const ref values: [?vD] ?t, const ref isStart: [vD] bool,
+                            param op: string): [vD] t {
+        var res: [vD] t;
+        if vD.size == 0 {
+            return res;
+        }
+        // one chunk per task, in the order of the array
+        const cD = newBlockDom({0..#(numLocales * numTasks)});
+        var chunkLast: [cD] t;
+        var chunkFirstStart: [cD] int;
+        var chunkHasStart: [cD] bool;
+        var chunkNonEmpty: [cD] bool;
+
+        // scan each task's block on its own
+        coforall loc in Locales {
+            on loc {
+                coforall task in Tasks {
+                    const c = loc.id * numTasks + task;
+                    var lD = res.localSubdomain();
+                    var tD = calcBlock(task, lD.low, lD.high);
+                    var acc: t;
+                    var firstStart = tD.high + 1;
+                    for i in tD {
+                        if isStart[i] {
+                            acc = values[i];
+                            if firstStart > tD.high {
+                                firstStart = i;
+                            }
+                        } else if i == tD.low {
+                            acc = values[i];
+                        } else {
+                            acc = scanOp(op, acc, values[i]);
+                        }
+                        res[i] = acc;
+                    }
+                    chunkLast[c] = acc;
+                    chunkFirstStart[c] = firstStart;
+                    chunkHasStart[c] = firstStart <= tD.high;
+                    chunkNonEmpty[c] = tD.size > 0;
+                }
+            }
+        }
+
+        // carry the running value of each segment across the chunks it spans
+        var chunkCarry: [cD] t;
+        var chunkHasCarry: [cD] bool;
+        {
+            const lasts: [0..#cD.size] t = chunkLast;
+            const hasStarts: [0..#cD.size] bool = chunkHasStart;
+            const nonEmpty: [0..#cD.size] bool = chunkNonEmpty;
+            var carries: [0..#cD.size] t;
+            var hasCarries: [0..#cD.size] bool;
+            var running: t;
+            var haveRunning = false;
+            for c in 0..#cD.size {
+                if !nonEmpty[c] {
+                    continue;
+                }
+                carries[c] = running;
+                hasCarries[c] = haveRunning;
+                if hasStarts[c] || !haveRunning {
+                    running = lasts[c];
+                } else {
+                    running = scanOp(op, running, lasts[c]);
+                }
+                haveRunning = true;
+            }
+            chunkCarry = carries;
+            chunkHasCarry = hasCarries;
+        }
+
+        coforall loc in Locales {
+            on loc {
+                coforall task in Tasks {
+                    const c = loc.id * numTasks + task;
+                    if chunkHasCarry[c] {
+                        const carry = chunkCarry[c];
+                        var lD = res.localSubdomain();
+                        var tD = calcBlock(task, lD.low, lD.high);
+                        for i in tD.low..min(tD.high, chunkFirstStart[c]-1) {
+                            res[i] = scanOp(op, carry, res[i]);
+                        }
+                    }
+                }
+            }
+        }
+        return res;
+    }
+
+    /*
+    Number of the position within its segment, starting from 0
+
+    :arg starts: the start of the segment of each position, from startOfSegment
+    */
+    proc segCumcount(const ref starts: [?vD] int): [vD] int {
+        var res: [vD] int = [(s, i) in zip(starts, vD)] i - s;
+        return res;
+    }
+
+    /*
+    Value n positions before each position of the same segment, or fill
+    if there is none; n may be negative to look forward
+    */
+    proc segShift(const ref values: [?vD] ?t, const ref starts: [vD] int, n: int, fill: t): [vD] t {
+        var res: [vD] t;
+        forall (r, i, s) in zip(res, vD, starts) {
+            const j = i - n;
+            if vD.contains(j) && starts[j] == s {
+                r = values[j];
+            } else {
+                r = fill;
+            }
+        }
+        return res;
+    }
+
+    /*
+    Difference of each value and the value n positions before it in the
+    same segment, or NaN if there is none
+    */
+    proc segDiff(const ref values: [?vD] ?t, const ref starts: [vD] int, n: int): [vD] real {
+        var res: [vD] real;
+        forall (r, i, s, v) in zip(res, vD, starts, values) {
+            const j = i - n;
+            if vD.contains(j) && starts[j] == s {
+                r = (v - values[j]):real;
+            } else {
+                r = NAN;
+            }
+        }
+        return res;
+    }
+
+    /*
+    Number of the positions of the rolling window ending at i that are
+    counted by the segmented prefix counts, from the position j just before
+    the window and the start s of the segment
+    */
+    inline proc windowCount(const ref cumcounts: [?D] int, i: int, j: int, s: int): int {
+        return if j >= s then cumcounts[i] - cumcounts[j] else cumcounts[i];
+    }
+
+    /*
+    Sum and number of the values in the rolling window of each position,
+    which holds the position and the window-1 positions before it in the
+    same segment, from the differences of segmented sums. NaN values are
+    left out of both if skipNan. NaN and infinite values are counted rather
+    than summed, so they only affect the windows that hold them.
+
+    :returns: ([] t, [] int)
+    */
+    proc segRolling(const ref values: [?vD] ?t, const ref isStart: [vD] bool,
+                    const ref starts: [vD] int, window: int, skipNan: bool) {
+        var kept: [vD] int = 1;
+        var cumsums: [vD] t;
+        var cumNans, cumPosInfs, cumNegInfs: [vD] int;
+        if isRealType(t) {
+            const finite: [vD] t = [v in values] if isnan(v) || isinf(v) then 0.0 else v;
+            cumsums = segScan(finite, isStart, "+");
+            const nans: [vD] int = [v in values] isnan(v):int;
+            const posInfs: [vD] int = [v in values] (isinf(v) && v > 0):int;
+            const negInfs: [vD] int = [v in values] (isinf(v) && v < 0):int;
+            cumNans = segScan(nans, isStart, "+");
+            cumPosInfs = segScan(posInfs, isStart, "+");
+            cumNegInfs = segScan(negInfs, isStart, "+");
+            if skipNan {
+                kept = 1 - nans;
+            }
+        } else {
+            cumsums = segScan(values, isStart, "+");
+        }
+        const cumcounts = segScan(kept, isStart, "+");
+        var sums: [vD] t;
+        var counts: [vD] int;
+        forall (sm, c, i, s, cs) in zip(sums, counts, vD, starts, cumsums) {
+            const j = i - window;
+            sm = if j >= s then cs - cumsums[j] else cs;
+            c = windowCount(cumcounts, i, j, s);
+            if isRealType(t) {
+                const hasPosInf = windowCount(cumPosInfs, i, j, s) > 0;
+                const hasNegInf = windowCount(cumNegInfs, i, j, s) > 0;
+                if (!skipNan && windowCount(cumNans, i, j, s) > 0) || (hasPosInf && hasNegInf) {
+                    sm = NAN;
+                } else if hasPosInf {
+                    sm = INFINITY;
+                } else if hasNegInf {
+                    sm = -INFINITY;
+                }
+            }
+        }
+        return (sums, counts);
+    }
+
+    /*
+    1-based rank of each value within its segment
+
+    :arg values: values in grouped order
+    :arg starts: the start of the segment of each position
+    :arg perm: the permutation that sorts the values within each segment
+    :arg method: "first" ranks equal values in order of appearance, "min"
+                 gives them their lowest rank, and "dense" ranks them as
+                 "min" does, but without gaps between distinct values
+
+    :returns: [] int
+    */
+    proc segRank(const ref values: [?vD] ?t, const ref starts: [vD] int,
+                 const ref perm: [vD] int, method: string): [vD] int throws {
+        var sortedRanks: [vD] int;
+        select method {
+            when "first" {
+                sortedRanks = [(i, s) in zip(vD, starts)] i - s + 1;
+            }
+            when "min", "dense" {
+                var sorted: [vD] t;
+                forall (x, idx) in zip(sorted, perm) with (var agg = newSrcAggregator(t)) {
+                    agg.copy(x, values[idx]);
+                }
+                // positions where a new value starts within the segment
+                var isNew: [vD] bool = [(i, s, x) in zip(vD, starts, sorted)]
+                                            i == s || sorted[i-1] != x;
+                if method == "min" {
+                    var runStarts: [vD] int = max scan [(n, i) in zip(isNew, vD)]
+                                                            if n then i else vD.low;
+                    sortedRanks = runStarts - starts + 1;
+                } else {
+                    const isStart: [vD] bool = [(i, s) in zip(vD, starts)] i == s;
+                    const newCounts: [vD] int = isNew:int;
+                    sortedRanks = segScan(newCounts, isStart, "+");
+                }
+            }
+            otherwise {
+                throw getErrorWithContext(
+                    msg="unknown rank method: %s".format(method),
+                    lineNumber=getLineNumber(),
+                    routineName=getRoutineName(),
+                    moduleName=getModuleName(),
+                    errorClass="ErrorWithContext");
+            }
+        }
+        var res: [vD] int;
+        forall (r, p) in zip(sortedRanks, perm) with (var agg = newDstAggregator(int)) {
+            agg.copy(res[p], r);
+        }
+        return res;
+    }
+}
@@ -0,0 +1,188 @@
+module SegmentedScanMsg
+{
+    use ServerConfig;
+
+    use Reflection;
+    use Errors;
+    use Logging;
+
+    use MultiTypeSymbolTable;
+    use MultiTypeSymEntry;
+    use ServerErrorStrings;
+    use CommAggregation;
+
+    use ReductionMsg only lookupGrouping, segSortPerm, stringtobool;
+    use SegmentedScan;
+
+    const ssmLogger = new Logger();
+    if v {
+        ssmLogger.level = LogLevel.DEBUG;
+    } else {
+        ssmLogger.level = LogLevel.INFO;
+    }
+
+    /*
+    Returns the values of gVal in grouped order, from the symbol table's
+    cache of permuted arrays if it holds them
+    */
+    proc groupedValues(type t, gVal: borrowed GenSymEntry, perm: borrowed SymEntry(int)?,
+                       permName: string, valuesName: string, st: borrowed SymTab) throws {
+        var e = toSymEntry(gVal, t);
+        var values: [e.aD] t;
+        if perm == nil {
+            values = e.a;
+            return values;
+        }
+        var cached = st.cachedPermuted(permName, valuesName);
+        if cached != nil {
+            ssmLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                            "using cached permutation of %s".format(valuesName));
+            values = toSymEntry(cached!, t).a;
+        } else {
+            ref ea = e.a;
+            forall (x, idx) in zip(values, perm!.a) with (var agg = newSrcAggregator(t)) {
+                agg.copy(x, ea[idx]);
+            }
+        }
+        return values;
+    }
+
+    /* Returns results in grouped order at the original positions of the values */
+    proc ungroup(const ref grouped: [?D] ?t, perm: borrowed SymEntry(int)?): [D] t {
+        var res: [D] t;
+        if perm == nil {
+            res = grouped;
+        } else {
+            forall (g, p) in zip(grouped, perm!.a) with (var agg = newDstAggregator(t)) {
+                agg.copy(res[p], g);
+            }
+        }
+        return res;
+    }
+
+    /*
+    Scans, shifts or rolls a window over the values within each segment of
+    a grouping, returning the result at the original positions of the
+    values. Bool values are treated as int64.
+
+    reqMsg: segmentedScan <perm> <segments> <values> <op> <skipNan> <size>
+    'perm' is "None" if the values are already grouped, and 'values' is
+    "None" for cumcount. 'op' is one of cumsum, cumprod, cummin, cummax,
+    cumcount, rank:<method>, shift:<n>[:<fill>], diff:<n>, rolling_sum:<window>
+    or rolling_mean:<window>.
+
+    :returns: (string) the "created" message of the result
+    */
+    proc segmentedScanMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
+        param pn = Reflection.getRoutineName();
+        var (perm_name, segments_name, values_name, operator, skip_nan, sizeStr) =
+                                                payload.decode().splitMsgToTuple(6);
+        const skipNan = stringtobool(skip_nan);
+        const size = sizeStr:int;
+        ssmLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                        "cmd: %s perm: %s segments: %s values: %s op: %s".format(
+                                      cmd,perm_name,segments_name,values_name,operator));
+        // operators that take a parameter carry it after a colon
+        var (op, opArg) = operator.splitMsgToTuple(":", 2);
+        var (segments, perm, errorMsg) = lookupGrouping(pn, perm_name, segments_name,
+                                                        st.lookup(segments_name).size, size, st);
+        if !errorMsg.isEmpty() {
+            return errorMsg;
+        }
+        const isStart = segmentStarts(segments.a, size);
+        var rname = st.nextName();
+        if op == "cumcount" {
+            st.addEntry(rname, new shared SymEntry(ungroup(segCumcount(startOfSegment(isStart)),
+                                                           perm)));
+            return "created " + st.attrib(rname);
+        }
+
+        var gVal = st.lookup(values_name);
+        if gVal.size != size {
+            errorMsg = incompatibleArgumentsError(pn,
+                            "values of size %i do not match grouping of size %i".format(
+                                                                           gVal.size, size));
+            ssmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+
+        proc addResult(const ref grouped: [] ?r) throws {
+            st.addEntry(rname, new shared SymEntry(ungroup(grouped, perm)));
+        }
+
+        proc scanEntry(const ref values: [?vD] ?t): string throws {
+            select op {
+                when "cumsum" {
+                    addResult(segScan(values, isStart, "+", skipNan));
+                }
+                when "cumprod" {
+                    addResult(segScan(values, isStart, "*", skipNan));
+                }
+                when "cummin" {
+                    addResult(segScan(values, isStart, "min", skipNan));
+                }
+                when "cummax" {
+                    addResult(segScan(values, isStart, "max", skipNan));
+                }
+                when "rank" {
+                    const method = if opArg.isEmpty() then "first" else opArg;
+                    var sortPerm = segSortPerm(values, segments.a);
+                    addResult(segRank(values, startOfSegment(isStart), sortPerm, method));
+                }
+                when "shift" {
+                    var (nStr, fillStr) = opArg.splitMsgToTuple(":", 2);
+                    var fill: t;
+                    if isRealType(t) then fill = NAN;
+                    if !fillStr.isEmpty() then fill = fillStr:t;
+                    addResult(segShift(values, startOfSegment(isStart), nStr:int, fill));
+                }
+                when "diff" {
+                    const n = if opArg.isEmpty() then 1 else opArg:int;
+                    addResult(segDiff(values, startOfSegment(isStart), n));
+                }
+                when "rolling_sum", "rolling_mean" {
+                    const window = opArg:int;
+                    if window < 1 {
+                        errorMsg = incompatibleArgumentsError(pn, "window must be positive");
+                        ssmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                        return errorMsg;
+                    }
+                    var (sums, counts) = segRolling(values, isStart, startOfSegment(isStart),
+                                                    window, skipNan);
+                    if op == "rolling_sum" {
+                        addResult(sums);
+                    } else {
+                        var means: [vD] real = [(s, c) in zip(sums, counts)]
+                                                    if c > 0 then s:real / c else NAN;
+                        addResult(means);
+                    }
+                }
+                otherwise {
+                    errorMsg = notImplementedError(pn, op);
+                    ssmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                    return errorMsg;
+                }
+            }
+            return "created " + st.attrib(rname);
+        }
+
+        select gVal.dtype {
+            when DType.Int64 {
+                return scanEntry(groupedValues(int, gVal, perm, perm_name, values_name, st));
+            }
+            when DType.Float64 {
+                return scanEntry(groupedValues(real, gVal, perm, perm_name, values_name, st));
+            }
+            when DType.Bool {
+                var grouped = groupedValues(bool, gVal, perm, perm_name, values_name, st);
+                const values: [grouped.domain] int = grouped:int;
+                return scanEntry(values);
+            }
+            otherwise {
+                var errorMsg = notImplementedError(pn, dtype2str(gVal.dtype));
+                ssmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return errorMsg;
+            }
+        }
+    }
+}
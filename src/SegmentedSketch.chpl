@@ -0,0 +1,412 @@
+/* Approximate per-segment statistics with mergeable sketches
+
+ the grouped values are split into one block per task, as in the radix
+ sorts, and each task sketches the segments of its block. Segments that
+ lie in a single block are written straight to the result, while the
+ partial sketches of segments shared by neighbouring tasks are merged
+ afterwards. A sketch of every segment has a fixed size, so the sketches
+ of different arrays grouped by the same keys can be merged later.
+
+ HyperLogLog sketches estimate the number of distinct values of each
+ segment, and SpaceSaving sketches its most frequent values.
+
+ */
+module SegmentedSketch
+{
+    use ServerConfig;
+
+    use BitOps;
+    use CommAggregation;
+    use Map;
+    use Sort;
+    use Reflection;
+    use Logging;
+    use SymArrayDmap;
+    use RadixSortLSD only numTasks, Tasks, calcBlock;
+    use HashGroup only mix64;
+
+    const sskLogger = new Logger();
+    if v {
+        sskLogger.level = LogLevel.DEBUG;
+    } else {
+        sskLogger.level = LogLevel.INFO;
+    }
+
+    /* Smallest and largest precision of HyperLogLog sketches */
+    param minPrecision = 4;
+    param maxPrecision = 16;
+
+    /* Index of the last segment starting at or before position i */
+    proc segmentOf(const ref segs: [?sD] int, i: int): int {
+        var lo = sD.low, hi = sD.high;
+        while lo < hi {
+            const mid = (lo + hi + 1) / 2;
+            if segs[mid] <= i {
+                lo = mid;
+            } else {
+                hi = mid - 1;
+            }
+        }
+        return lo;
+    }
+
+    /*
+    Yields (segment, positions, whole) for each nonempty segment of the
+    grouped values that overlaps the positions in r, where whole is true if
+    the segment lies entirely within r
+
+    :arg segs: the segment offsets
+    :arg size: the number of grouped values
+    :arg r: the positions of a block of the grouped values
+    */
+    iter segmentsIn(const ref segs: [?sD] int, size: int, r: range) {
+        if r.size > 0 {
+            var s = segmentOf(segs, r.low);
+            var start = r.low;
+            while start <= r.high {
+                const segStart = segs[s];
+                const segEnd = if s == sD.high then size else segs[s+1];
+                if segEnd > start {
+                    const end = min(segEnd, r.high + 1);
+                    yield (s, start..end-1, segStart >= r.low && segEnd <= r.high + 1);
+                    start = end;
+                }
+                s += 1;
+            }
+        }
+    }
+
+    /* Adds a value to the m = 2**p HyperLogLog registers */
+    inline proc hllAdd(ref regs: [] int, value: int, p: int) {
+        const h = mix64(value:uint);
+        const j = (h >> (64 - p)):int;
+        // position of the first set bit of the rest of the hash
+        const rank = min(clz(h << p):int + 1, 64 - p + 1);
+        if rank > regs[j] {
+            regs[j] = rank;
+        }
+    }
+
+    /*
+    Returns the HyperLogLog registers of each segment of the grouped
+    values, with 2**p registers per segment, one row after another
+
+    :arg values: the grouped values
+    :arg segs: the segment offsets
+    :arg p: the precision of the sketches
+
+    :returns: [] int
+    */
+    proc segHLL(const ref values: [?vD] int, const ref segs: [?sD] int, p: int) throws {
+        const m = 1 << p;
+        var regs = makeDistArray(sD.size * m, int);
+        if vD.size == 0 {
+            return regs;
+        }
+        // each task's partial registers of the (at most two) segments it
+        // shares with other tasks, stored on the task's locale
+        const nParts = numLocales * numTasks;
+        var partSegs = makeDistArray(2 * nParts, int);
+        partSegs = -1;
+        var partRegs = makeDistArray(2 * nParts * m, int);
+
+        coforall loc in Locales {
+            on loc {
+                coforall task in Tasks {
+                    const lD = values.localSubdomain();
+                    const tD = calcBlock(task, lD.low, lD.high);
+                    const part = loc.id * numTasks + task;
+                    var slot = 0;
+                    var taskRegs: [0..#m] int;
+                    var agg = newDstAggregator(int);
+                    for (s, r, whole) in segmentsIn(segs, vD.size, tD.low..tD.high) {
+                        taskRegs = 0;
+                        for i in r {
+                            hllAdd(taskRegs, values[i], p);
+                        }
+                        if whole {
+                            for j in 0..#m {
+                                if taskRegs[j] > 0 {
+                                    agg.copy(regs[s*m + j], taskRegs[j]);
+                                }
+                            }
+                        } else {
+                            const ps = 2*part + slot;
+                            partSegs[ps] = s;
+                            partRegs[ps*m..#m] = taskRegs;
+                            slot += 1;
+                        }
+                    }
+                    agg.flush();
+                }
+            }
+        }
+
+        // merge the partial registers of the shared segments
+        for ps in 0..#(2 * nParts) {
+            const s = partSegs[ps];
+            if s >= 0 {
+                regs[s*m..#m] = max(regs[s*m..#m], partRegs[ps*m..#m]);
+            }
+        }
+        return regs;
+    }
+
+    /*
+    Returns the HyperLogLog estimate of the number of distinct values of
+    each segment from its 2**p registers, using linear counting for small
+    estimates
+
+    :arg regs: the registers of the segments, one row after another
+    :arg p: the precision of the sketches
+
+    :returns: [] real
+    */
+    proc hllEstimate(const ref regs: [?rD] int, p: int) throws {
+        const m = 1 << p;
+        const alpha = if m == 16 then 0.673
+                      else if m == 32 then 0.697
+                      else if m == 64 then 0.709
+                      else 0.7213 / (1.0 + 1.079 / m);
+        var est = makeDistArray(rD.size / m, real);
+        forall (g, e) in zip(est.domain, est) {
+            const row: [0..#m] int = regs[g*m..#m];
+            var sum = 0.0;
+            var zeros = 0;
+            for r in row {
+                sum += 2.0 ** (-r);
+                if r == 0 {
+                    zeros += 1;
+                }
+            }
+            e = alpha * m * m / sum;
+            if e <= 2.5 * m && zeros > 0 {
+                e = m * Math.log(m:real / zeros);
+            }
+        }
+        return est;
+    }
+
+    /*
+    Merges the registers of two sets of sketches into one sketch per row of
+    the result. Row g of the result merges row rowsA[g] of regsA and row
+    rowsB[g] of regsB, where a row of -1 stands for an empty sketch.
+
+    :returns: [] int
+    */
+    proc hllMerge(const ref rowsA: [?gD] int, const ref regsA: [] int,
+                  const ref rowsB: [gD] int, const ref regsB: [] int, p: int) throws {
+        const m = 1 << p;
+        var regs = makeDistArray(gD.size * m, int);
+        proc gatherRows(const ref rows: [] int, const ref from: [] int) throws {
+            var res = makeDistArray(gD.size * m, int);
+            forall (i, x) in zip(res.domain, res) with (var agg = newSrcAggregator(int)) {
+                const row = rows[i / m];
+                if row >= 0 {
+                    agg.copy(x, from[row*m + i % m]);
+                }
+            }
+            return res;
+        }
+        regs = max(gatherRows(rowsA, regsA), gatherRows(rowsB, regsB));
+        return regs;
+    }
+
+    /*
+    SpaceSaving counters of the most frequent of the items added, keeping
+    at most m items. An item that is not counted replaces the item with the
+    smallest count, and inherits its count, so counts are overestimates by
+    at most the smallest count.
+    */
+    record spaceSaver {
+        var m: int;
+        var D: domain(1);
+        var items: [D] int;
+        var counts: [D] int;
+        var n: int;
+        var slots: map(int, int);
+
+        proc init(m: int) {
+            this.m = m;
+            this.D = {0..#m};
+        }
+
+        proc ref clear() {
+            n = 0;
+            slots.clear();
+        }
+
+        proc ref add(item: int, count: int = 1) throws {
+            if slots.contains(item) {
+                counts[slots.getValue(item)] += count;
+            } else if n < m {
+                items[n] = item;
+                counts[n] = count;
+                slots.add(item, n);
+                n += 1;
+            } else {
+                var j = 0;
+                for k in 1..#(m-1) {
+                    if counts[k] < counts[j] {
+                        j = k;
+                    }
+                }
+                slots.remove(items[j]);
+                items[j] = item;
+                counts[j] += count;
+                slots.add(item, j);
+            }
+        }
+
+        /* (count, item) pairs of the counted items, most frequent first */
+        proc sorted() {
+            var pairs: [0..#n] (int, int);
+            for (pr, it, c) in zip(pairs, items[0..#n], counts[0..#n]) {
+                pr = (-c, it);
+            }
+            sort(pairs);
+            return pairs;
+        }
+    }
+
+    /* Writes the m most frequent items of a sketch to row s */
+    proc writeTopRow(ref ss: spaceSaver, s: int, m: int, ref items: [] int,
+                     ref counts: [] int, ref agg) {
+        for ((negc, it), j) in zip(ss.sorted(), 0..) {
+            if j >= m {
+                break;
+            }
+            agg.copy(items[s*m + j], it);
+            agg.copy(counts[s*m + j], -negc);
+        }
+    }
+
+    /*
+    Returns the SpaceSaving sketch of each segment of the grouped values,
+    as m items and their counts per segment, one row after another, most
+    frequent first. Rows of segments with fewer than m distinct values are
+    padded with zero counts.
+
+    :arg values: the grouped values
+    :arg segs: the segment offsets
+    :arg m: the number of items counted per segment
+
+    :returns: ([] int, [] int)
+    */
+    proc segSpaceSaving(const ref values: [?vD] int, const ref segs: [?sD] int,
+                        m: int) throws {
+        var items = makeDistArray(sD.size * m, int);
+        var counts = makeDistArray(sD.size * m, int);
+        if vD.size == 0 {
+            return (items, counts);
+        }
+        // each task's partial counters of the (at most two) segments it
+        // shares with other tasks, stored on the task's locale
+        const nParts = numLocales * numTasks;
+        var partSegs = makeDistArray(2 * nParts, int);
+        partSegs = -1;
+        var partItems = makeDistArray(2 * nParts * m, int);
+        var partCounts = makeDistArray(2 * nParts * m, int);
+
+        coforall loc in Locales {
+            on loc {
+                coforall task in Tasks {
+                    const lD = values.localSubdomain();
+                    const tD = calcBlock(task, lD.low, lD.high);
+                    const part = loc.id * numTasks + task;
+                    var slot = 0;
+                    var ss = new spaceSaver(m);
+                    var agg = newDstAggregator(int);
+                    for (s, r, whole) in segmentsIn(segs, vD.size, tD.low..tD.high) {
+                        ss.clear();
+                        for i in r {
+                            ss.add(values[i]);
+                        }
+                        if whole {
+                            writeTopRow(ss, s, m, items, counts, agg);
+                        } else {
+                            const ps = 2*part + slot;
+                            partSegs[ps] = s;
+                            writeTopRow(ss, ps, m, partItems, partCounts, agg);
+                            slot += 1;
+                        }
+                    }
+                    agg.flush();
+                }
+            }
+        }
+
+        // merge the partial counters of each shared segment, which come
+        // from consecutive tasks, by adding the counts of each item
+        var merged = new spaceSaver(2 * m * nParts);
+        var mergedSeg = -1;
+        var agg = newDstAggregator(int);
+        for ps in 0..#(2 * nParts) {
+            const s = partSegs[ps];
+            if s < 0 {
+                continue;
+            }
+            if s != mergedSeg {
+                if mergedSeg >= 0 {
+                    writeTopRow(merged, mergedSeg, m, items, counts, agg);
+                }
+                merged.clear();
+                mergedSeg = s;
+            }
+            const rowItems: [0..#m] int = partItems[ps*m..#m];
+            const rowCounts: [0..#m] int = partCounts[ps*m..#m];
+            for (it, c) in zip(rowItems, rowCounts) {
+                if c > 0 {
+                    merged.add(it, c);
+                }
+            }
+        }
+        if mergedSeg >= 0 {
+            writeTopRow(merged, mergedSeg, m, items, counts, agg);
+        }
+        agg.flush();
+        sskLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                        "sketched %i segments of %i values".format(sD.size, vD.size));
+        return (items, counts);
+    }
+
+    /*
+    Merges the counters of two sets of sketches into one sketch per row of
+    the result, keeping the m most frequent items. Row g of the result
+    merges row rowsA[g] of itemsA and countsA with row rowsB[g] of itemsB
+    and countsB, where a row of -1 stands for an empty sketch.
+
+    :returns: ([] int, [] int)
+    */
+    proc spaceSavingMerge(const ref rowsA: [?gD] int, const ref itemsA: [] int,
+                          const ref countsA: [] int, const ref rowsB: [gD] int,
+                          const ref itemsB: [] int, const ref countsB: [] int,
+                          m: int) throws {
+        var items = makeDistArray(gD.size * m, int);
+        var counts = makeDistArray(gD.size * m, int);
+        forall (g, a, b) in zip(gD, rowsA, rowsB) with (var ss = new spaceSaver(2 * m),
+                                                        var agg = newDstAggregator(int)) {
+            ss.clear();
+            if a >= 0 {
+                const rowItems: [0..#m] int = itemsA[a*m..#m];
+                const rowCounts: [0..#m] int = countsA[a*m..#m];
+                for (it, c) in zip(rowItems, rowCounts) {
+                    if c > 0 {
+                        ss.add(it, c);
+                    }
+                }
+            }
+            if b >= 0 {
+                const rowItems: [0..#m] int = itemsB[b*m..#m];
+                const rowCounts: [0..#m] int = countsB[b*m..#m];
+                for (it, c) in zip(rowItems, rowCounts) {
+                    if c > 0 {
+                        ss.add(it, c);
+                    }
+                }
+            }
+            writeTopRow(ss, g, m, items, counts, agg);
+        }
+        return (items, counts);
+    }
+}
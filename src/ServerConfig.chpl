@@ -30,6 +30,32 @@ module ServerConfig
     */
     config const ServerPort = 5555;
 
+    /*
+    Maximum number of requests, other than fast metadata requests, that the
+    server executes concurrently
+    */
+    config const maxConcurrentRequests = 4;
+
+    /*
+    Seconds the server waits between checks for new requests and finished
+    requests while it is idle
+    */
+    config const requestPollInterval = 0.0001;
+
+    /*
+    Maximum number of bytes of value arrays, permuted into the grouped order
+    of a GroupBy, that the server keeps cached for reductions that ask for it,
+    together with the sort permutations kept by arrays
+    */
+    config const maxPermutedCacheBytes = 2**30;
+
+    /*
+    Whether each array keeps the permutation that sorts it, so that sorting
+    it again until it is written in place costs a copy. Kept permutations
+    count against maxPermutedCacheBytes and are not kept once it is full.
+    */
+    config const cacheSortPerms = true;
+
     /*
     Memory usage limit -- percentage of physical memory
     */
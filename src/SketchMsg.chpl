@@ -0,0 +1,237 @@
+module SketchMsg
+{
+    use ServerConfig;
+
+    use Reflection;
+    use Errors;
+    use Logging;
+
+    use MultiTypeSymbolTable;
+    use MultiTypeSymEntry;
+    use ServerErrorStrings;
+
+    use SegmentedSketch;
+
+    const skmLogger = new Logger();
+    if v {
+        skmLogger.level = LogLevel.DEBUG;
+    } else {
+        skmLogger.level = LogLevel.INFO;
+    }
+
+    /*
+    Looks up an int64 array, throwing an error if it has another dtype
+    */
+    proc lookupIntEntry(pn: string, name: string,
+                        st: borrowed SymTab): borrowed SymEntry(int) throws {
+        var g = st.lookup(name);
+        if g.dtype != DType.Int64 {
+            throw getErrorWithContext(
+                msg=notImplementedError(pn,"(array dtype "+dtype2str(g.dtype)+")"),
+                lineNumber=getLineNumber(),
+                routineName=getRoutineName(),
+                moduleName=getModuleName(),
+                errorClass="ErrorWithContext");
+        }
+        return toSymEntry(g, int);
+    }
+
+    /*
+    Returns an error message if a set of sketches does not hold a whole
+    number of sketches of the given size, or if its rows to merge are not
+    -1 or the row of one of its sketches, and an empty string otherwise.
+    */
+    proc checkSketchRows(pn: string, rows: borrowed SymEntry(int), sketchesSize: int,
+                         sketchSize: int): string throws {
+        var errorMsg: string;
+        if sketchesSize % sketchSize != 0 {
+            errorMsg = incompatibleArgumentsError(pn,
+                    "%i entries do not make sketches of size %i".format(sketchesSize, sketchSize));
+        } else if rows.size > 0 {
+            const nSketches = sketchesSize / sketchSize;
+            const (lo, hi) = (min reduce rows.a, max reduce rows.a);
+            if lo < -1 || hi >= nSketches {
+                errorMsg = incompatibleArgumentsError(pn,
+                    "rows %i..%i are out of bounds for %i sketches".format(lo, hi, nSketches));
+            }
+        }
+        if !errorMsg.isEmpty() {
+            skmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+        }
+        return errorMsg;
+    }
+
+    /*
+    Builds a HyperLogLog sketch with 2**p registers of each segment of the
+    grouped values.
+
+    reqMsg: segmentedHLL <values> <segments> <p>
+
+    :returns: (string) the "created" message of the registers
+    */
+    proc segmentedHLLMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
+        param pn = Reflection.getRoutineName();
+        var (values_name, segments_name, pstr) = payload.decode().splitMsgToTuple(3);
+        const p = pstr:int;
+        skmLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                        "cmd: %s values: %s segments: %s p: %i".format(cmd,values_name,
+                                                                       segments_name,p));
+        if p < minPrecision || p > maxPrecision {
+            var errorMsg = incompatibleArgumentsError(pn,
+                        "precision must be between %i and %i".format(minPrecision, maxPrecision));
+            skmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+        var values = lookupIntEntry(pn, values_name, st);
+        var segments = lookupIntEntry(pn, segments_name, st);
+        var rname = st.nextName();
+        st.addEntry(rname, new shared SymEntry(segHLL(values.a, segments.a, p)));
+        return "created " + st.attrib(rname);
+    }
+
+    /*
+    Estimates the number of distinct values of each segment from its
+    HyperLogLog registers.
+
+    reqMsg: hllEstimate <registers> <p>
+
+    :returns: (string) the "created" message of the float64 estimates
+    */
+    proc hllEstimateMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
+        param pn = Reflection.getRoutineName();
+        var (regs_name, pstr) = payload.decode().splitMsgToTuple(2);
+        const p = pstr:int;
+        var regs = lookupIntEntry(pn, regs_name, st);
+        if p < minPrecision || p > maxPrecision || regs.size % (1 << p) != 0 {
+            var errorMsg = incompatibleArgumentsError(pn,
+                        "%i registers do not make sketches of precision %i".format(regs.size, p));
+            skmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+        var rname = st.nextName();
+        st.addEntry(rname, new shared SymEntry(hllEstimate(regs.a, p)));
+        return "created " + st.attrib(rname);
+    }
+
+    /*
+    Merges two sets of HyperLogLog sketches into one sketch per row of
+    rowsA and rowsB, which give the row of each set to merge, or -1.
+
+    reqMsg: hllMerge <p> <rowsA> <regsA> <rowsB> <regsB>
+
+    :returns: (string) the "created" message of the merged registers
+    */
+    proc hllMergeMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
+        param pn = Reflection.getRoutineName();
+        var (pstr, rowsA_name, regsA_name, rowsB_name, regsB_name) =
+                                                payload.decode().splitMsgToTuple(5);
+        const p = pstr:int;
+        var rowsA = lookupIntEntry(pn, rowsA_name, st);
+        var rowsB = lookupIntEntry(pn, rowsB_name, st);
+        if rowsA.size != rowsB.size {
+            var errorMsg = incompatibleArgumentsError(pn, "row arrays must be the same size");
+            skmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+        if p < minPrecision || p > maxPrecision {
+            var errorMsg = incompatibleArgumentsError(pn,
+                        "precision must be between %i and %i".format(minPrecision, maxPrecision));
+            skmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+        var regsA = lookupIntEntry(pn, regsA_name, st);
+        var regsB = lookupIntEntry(pn, regsB_name, st);
+        for (rows, regs) in ((rowsA, regsA), (rowsB, regsB)) {
+            var errorMsg = checkSketchRows(pn, rows, regs.size, 1 << p);
+            if !errorMsg.isEmpty() {
+                return errorMsg;
+            }
+        }
+        var rname = st.nextName();
+        st.addEntry(rname, new shared SymEntry(hllMerge(rowsA.a, regsA.a, rowsB.a, regsB.a, p)));
+        return "created " + st.attrib(rname);
+    }
+
+    /*
+    Builds a SpaceSaving sketch counting m items of each segment of the
+    grouped values.
+
+    reqMsg: segmentedSpaceSaving <values> <segments> <m>
+
+    :returns: (string) the "created" messages of the items and their counts,
+              separated by " , "
+    */
+    proc segmentedSpaceSavingMsg(cmd: string, payload: bytes,
+                                 st: borrowed SymTab): string throws {
+        param pn = Reflection.getRoutineName();
+        var (values_name, segments_name, mstr) = payload.decode().splitMsgToTuple(3);
+        const m = mstr:int;
+        skmLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                        "cmd: %s values: %s segments: %s m: %i".format(cmd,values_name,
+                                                                       segments_name,m));
+        if m < 1 {
+            var errorMsg = incompatibleArgumentsError(pn, "sketch size must be positive");
+            skmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+        var values = lookupIntEntry(pn, values_name, st);
+        var segments = lookupIntEntry(pn, segments_name, st);
+        var (items, counts) = segSpaceSaving(values.a, segments.a, m);
+        var iname = st.nextName();
+        st.addEntry(iname, new shared SymEntry(items));
+        var cname = st.nextName();
+        st.addEntry(cname, new shared SymEntry(counts));
+        return "created " + st.attrib(iname) + " , " + "created " + st.attrib(cname);
+    }
+
+    /*
+    Merges two sets of SpaceSaving sketches into one sketch per row of
+    rowsA and rowsB, which give the row of each set to merge, or -1.
+
+    reqMsg: spaceSavingMerge <m> <rowsA> <itemsA> <countsA> <rowsB> <itemsB> <countsB>
+
+    :returns: (string) the "created" messages of the merged items and their
+              counts, separated by " , "
+    */
+    proc spaceSavingMergeMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
+        param pn = Reflection.getRoutineName();
+        var (mstr, rowsA_name, itemsA_name, countsA_name, rowsB_name, itemsB_name,
+             countsB_name) = payload.decode().splitMsgToTuple(7);
+        const m = mstr:int;
+        var rowsA = lookupIntEntry(pn, rowsA_name, st);
+        var rowsB = lookupIntEntry(pn, rowsB_name, st);
+        if rowsA.size != rowsB.size {
+            var errorMsg = incompatibleArgumentsError(pn, "row arrays must be the same size");
+            skmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+        if m < 1 {
+            var errorMsg = incompatibleArgumentsError(pn, "sketch size must be positive");
+            skmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+        var itemsA = lookupIntEntry(pn, itemsA_name, st);
+        var countsA = lookupIntEntry(pn, countsA_name, st);
+        var itemsB = lookupIntEntry(pn, itemsB_name, st);
+        var countsB = lookupIntEntry(pn, countsB_name, st);
+        if itemsA.size != countsA.size || itemsB.size != countsB.size {
+            var errorMsg = incompatibleArgumentsError(pn,
+                        "items and counts of sketches must be the same size");
+            skmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+        for (rows, items) in ((rowsA, itemsA), (rowsB, itemsB)) {
+            var errorMsg = checkSketchRows(pn, rows, items.size, m);
+            if !errorMsg.isEmpty() {
+                return errorMsg;
+            }
+        }
+        var (items, counts) = spaceSavingMerge(rowsA.a, itemsA.a, countsA.a,
+                                               rowsB.a, itemsB.a, countsB.a, m);
+        var iname = st.nextName();
+        st.addEntry(iname, new shared SymEntry(items));
+        var cname = st.nextName();
+        st.addEntry(cname, new shared SymEntry(counts));
+        return "created " + st.attrib(iname) + " , " + "created " + st.attrib(cname);
+    }
+}
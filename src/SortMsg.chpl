@@ -22,10 +22,10 @@ module SortMsg
         sortLogger.level = LogLevel.INFO;
     }
   
-    /* Sort the given pdarray using Radix Sort and
-       return sorted keys as a block distributed array */
-    proc sort(a: [?aD] ?t): [aD] t {
-      var sorted: [aD] t = radixSortLSD_keys(a);
+    /* Sort the given pdarray using Radix Sort, in ascending or descending
+       order, and return sorted keys as a block distributed array */
+    proc sort(a: [?aD] ?t, ascending: bool = true): [aD] t {
+      var sorted: [aD] t = radixSortLSD_keys(a, ascending=ascending);
       return sorted;
     }
 
@@ -33,12 +33,14 @@ module SortMsg
     proc sortMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
       param pn = Reflection.getRoutineName();
       var repMsg: string; // response message
-      var (name) = payload.decode().splitMsgToTuple(1);
+      var (name, ascStr) = payload.decode().splitMsgToTuple(2);
+      const ascending = ascStr == "True";
 
       // get next symbol name
       var sortedName = st.nextName();
       sortLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
-                "cmd: %s name: %s sortedName: %s".format(cmd, name, sortedName));
+                "cmd: %s name: %s ascending: %t sortedName: %s".format(
+                                                    cmd, name, ascending, sortedName));
 
       var gEnt: borrowed GenSymEntry = st.lookup(name);
 
@@ -51,13 +53,15 @@ module SortMsg
       select (gEnt.dtype) {
           when (DType.Int64) {
               var e = toSymEntry(gEnt, int);
-              var sorted = sort(e.a);
-              st.addEntry(sortedName, new shared SymEntry(sorted));
+              var sorted = sort(e.a, ascending);
+              var sEnt = st.addEntry(sortedName, new shared SymEntry(sorted));
+              if ascending then sEnt.markSorted();
           }// end when(DType.Int64)
           when (DType.Float64) {
               var e = toSymEntry(gEnt, real);
-              var sorted = sort(e.a);
-              st.addEntry(sortedName, new shared SymEntry(sorted));
+              var sorted = sort(e.a, ascending);
+              var sEnt = st.addEntry(sortedName, new shared SymEntry(sorted));
+              if ascending then sEnt.markSorted();
           }// end when(DType.Float64)
           otherwise {
               var errorMsg = notImplementedError(pn,gEnt.dtype);
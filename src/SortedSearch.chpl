@@ -0,0 +1,204 @@
+/* Bulk binary search of sorted arrays, and joins by merging sorted arrays
+
+ the values to search for are taken in sorted order, so the values whose
+ positions fall in the block of the sorted array held by one locale form
+ a contiguous range of them. Each locale finds its range with two binary
+ searches, copies those values in one bulk transfer and searches its own
+ block locally, without remote reads of the sorted array.
+
+ */
+module SortedSearch
+{
+    use ServerConfig;
+
+    use SymArrayDmap;
+    use CommAggregation;
+    use Reflection;
+    use Logging;
+
+    const ssLogger = new Logger();
+    if v {
+        ssLogger.level = LogLevel.DEBUG;
+    } else {
+        ssLogger.level = LogLevel.INFO;
+    }
+
+    /*
+    Whether an element y of the sorted array comes before the position of x,
+    which is before the elements equal to x on the left side and after them
+    on the right side
+    */
+    inline proc isBefore(y: ?t, x: t, param right: bool): bool {
+        if right {
+            return y <= x;
+        } else {
+            return y < x;
+        }
+    }
+
+    /* Position of x in the sorted array a, from a binary search of a */
+    proc positionOf(const ref a: [?D] ?t, x: t, param right: bool): int {
+        var l = D.low;
+        var h = D.high + 1;
+        while l < h {
+            const mid = l + (h - l) / 2;
+            if isBefore(a[mid], x, right) {
+                l = mid + 1;
+            } else {
+                h = mid;
+            }
+        }
+        return l;
+    }
+
+    /* First of the sorted values whose position is after the element y */
+    proc firstAfter(const ref sortedV: [?D] ?t, y: t, param right: bool): int {
+        var l = D.low;
+        var h = D.high + 1;
+        while l < h {
+            const mid = l + (h - l) / 2;
+            if isBefore(y, sortedV[mid], right) {
+                h = mid;
+            } else {
+                l = mid + 1;
+            }
+        }
+        return l;
+    }
+
+    /*
+    Positions in the sorted array a at which the sorted values would be
+    inserted to keep it sorted, as numpy.searchsorted finds them
+
+    :arg a: sorted array to search
+    :type a: [] t
+
+    :arg sortedV: sorted values to search for
+    :type sortedV: [] t
+
+    :arg right: whether to give the position after the elements equal to
+                each value, instead of before them
+
+    :returns: [] int
+    */
+    proc searchSortedValues(const ref a: [?aD] ?t, const ref sortedV: [?vD] t,
+                            param right: bool): [vD] int {
+        var pos: [vD] int;
+        if aD.size == 0 || vD.size == 0 {
+            return pos;
+        }
+        coforall loc in Locales {
+            on loc {
+                const lD = a.localSubdomain();
+                if lD.size > 0 {
+                    // the values after the first element of this block, and not
+                    // after the first element of the next block, fall in this block
+                    const lo = if lD.low == aD.low then vD.low
+                               else firstAfter(sortedV, a[lD.low], right);
+                    const hi = if lD.high == aD.high then vD.high + 1
+                               else firstAfter(sortedV, a[lD.high + 1], right);
+                    if hi > lo {
+                        ref myA = a[lD];
+                        const myV: [lo..#(hi - lo)] t = sortedV[lo..#(hi - lo)];
+                        var myPos: [myV.domain] int;
+                        forall (p, x) in zip(myPos, myV) {
+                            p = positionOf(myA, x, right);
+                        }
+                        pos[lo..#(hi - lo)] = myPos;
+                    }
+                }
+            }
+        }
+        return pos;
+    }
+
+    /*
+    Positions in the sorted array a at which the values would be inserted
+    to keep it sorted
+
+    :arg a: sorted array to search
+    :type a: [] t
+
+    :arg v: values to search for
+    :type v: [] t
+
+    :arg perm: permutation that sorts v
+    :type perm: [] int
+
+    :returns: [] int
+    */
+    proc searchSorted(const ref a: [?aD] ?t, const ref v: [?vD] t, const ref perm: [vD] int,
+                      param right: bool): [vD] int {
+        var sortedV: [vD] t;
+        forall (s, p) in zip(sortedV, perm) with (var agg = newSrcAggregator(t)) {
+            agg.copy(s, v[p]);
+        }
+        const sortedPos = searchSortedValues(a, sortedV, right);
+        var pos: [vD] int;
+        forall (sp, p) in zip(sortedPos, perm) with (var agg = newDstAggregator(int)) {
+            agg.copy(pos[p], sp);
+        }
+        return pos;
+    }
+
+    /*
+    Expands ranges of indices, given by their first indices and lengths,
+    into the index of the range of each output position and the index
+    within the range that it takes, in order of the ranges
+
+    :arg firsts: first index of each range
+    :type firsts: [] int
+
+    :arg counts: length of each range
+    :type counts: [] int
+
+    :returns: ([] int, [] int)
+    */
+    proc expandRanges(const ref firsts: [?D] int, const ref counts: [D] int) throws {
+        const total = + reduce counts;
+        ssLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                       "expanding to %i indices".format(total));
+        overMemLimit(3 * total * numBytes(int));
+        var owners = makeDistArray(total, int);
+        var positions = makeDistArray(total, int);
+        if total == 0 {
+            return (owners, positions);
+        }
+        const outStarts = (+ scan counts) - counts;
+        // mark the first output of each range, and carry it forward
+        forall (i, c, o) in zip(D, counts, outStarts) with (var agg = newDstAggregator(int)) {
+            if c > 0 {
+                agg.copy(owners[o], i);
+            }
+        }
+        owners = max scan owners;
+        // the outputs of a range take its indices in turn
+        const offsets = firsts - outStarts;
+        forall (p, i) in zip(positions, owners) with (var agg = newSrcAggregator(int)) {
+            agg.copy(p, offsets[i]);
+        }
+        forall (p, j) in zip(positions, positions.domain) {
+            p += j;
+        }
+        return (owners, positions);
+    }
+
+    /*
+    Indices of the pairs of equal elements of two sorted arrays, in order
+    of the index in left and then the index in right
+
+    :arg left: sorted array
+    :type left: [] t
+
+    :arg right: sorted array
+    :type right: [] t
+
+    :returns: ([] int, [] int)
+    */
+    proc mergeJoin(const ref left: [?lD] ?t, const ref right: [?rD] t) throws {
+        // the elements of right equal to each element of left
+        const lo = searchSortedValues(right, left, false);
+        const counts = searchSortedValues(right, left, true) - lo;
+        return expandRanges(lo, counts);
+    }
+}
@@ -0,0 +1,152 @@
+module SortedSearchMsg
+{
+    use ServerConfig;
+
+    use Reflection;
+    use Errors;
+    use Logging;
+
+    use MultiTypeSymbolTable;
+    use MultiTypeSymEntry;
+    use ServerErrorStrings;
+
+    use ArgSortMsg only argsortEntry;
+    use SortedSearch;
+
+    const sortedSearchLogger = new Logger();
+    if v {
+        sortedSearchLogger.level = LogLevel.DEBUG;
+    } else {
+        sortedSearchLogger.level = LogLevel.INFO;
+    }
+
+    /*
+    Returns the error message for an array that has to be sorted, or an
+    empty string if it is sorted
+    */
+    proc checkSorted(pn: string, e: borrowed SymEntry(?t), name: string): string throws {
+        if e.isSorted() {
+            return "";
+        }
+        var errorMsg = incompatibleArgumentsError(pn, "%s is not sorted".format(name));
+        sortedSearchLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+        return errorMsg;
+    }
+
+    /*
+    Finds the positions in a sorted array at which values would be inserted
+    to keep it sorted. The values are searched for in sorted order, from the
+    permutation that argsort keeps for them.
+
+    reqMsg: searchsorted <a> <v> <side>
+    'side' is "left" for the position before the elements equal to each
+    value, or "right" for the position after them.
+
+    :returns: (string) the "created" message of the int64 positions
+    */
+    proc searchsortedMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
+        param pn = Reflection.getRoutineName();
+        var (a_name, v_name, side) = payload.decode().splitMsgToTuple(3);
+        sortedSearchLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                                 "cmd: %s a: %s v: %s side: %s".format(cmd,a_name,v_name,side));
+        if side != "left" && side != "right" {
+            var errorMsg = incompatibleArgumentsError(pn, "side must be left or right");
+            sortedSearchLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+        var gA = st.lookup(a_name);
+        var gV = st.lookup(v_name);
+        if gA.dtype != gV.dtype {
+            var errorMsg = notImplementedError(pn, gA.dtype, "in", gV.dtype);
+            sortedSearchLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+        var rname = st.nextName();
+
+        proc searchEntries(type t): string throws {
+            var a = toSymEntry(gA, t);
+            var values = toSymEntry(gV, t);
+            var errorMsg = checkSorted(pn, a, a_name);
+            if !errorMsg.isEmpty() {
+                return errorMsg;
+            }
+            overMemLimit(3 * values.size * numBytes(int));
+            const perm = argsortEntry(values);
+            if side == "left" {
+                st.addEntry(rname, new shared SymEntry(searchSorted(a.a, values.a, perm, false)));
+            } else {
+                st.addEntry(rname, new shared SymEntry(searchSorted(a.a, values.a, perm, true)));
+            }
+            return "created " + st.attrib(rname);
+        }
+
+        select gA.dtype {
+            when DType.Int64 {
+                return searchEntries(int);
+            }
+            when DType.Float64 {
+                return searchEntries(real);
+            }
+            otherwise {
+                var errorMsg = notImplementedError(pn, dtype2str(gA.dtype));
+                sortedSearchLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return errorMsg;
+            }
+        }
+    }
+
+    /*
+    Joins two sorted arrays on equality by merging them, giving the indices
+    of every pair of equal elements.
+
+    reqMsg: mergeJoin <left> <right>
+
+    :returns: (string) the "created" messages of the indices in left and the
+              indices in right, separated by " +"
+    */
+    proc mergeJoinMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
+        param pn = Reflection.getRoutineName();
+        var (left_name, right_name) = payload.decode().splitMsgToTuple(2);
+        sortedSearchLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                                 "cmd: %s left: %s right: %s".format(cmd,left_name,right_name));
+        var gLeft = st.lookup(left_name);
+        var gRight = st.lookup(right_name);
+        if gLeft.dtype != gRight.dtype {
+            var errorMsg = notImplementedError(pn, gLeft.dtype, "==", gRight.dtype);
+            sortedSearchLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return errorMsg;
+        }
+
+        proc joinEntries(type t): string throws {
+            var left = toSymEntry(gLeft, t);
+            var right = toSymEntry(gRight, t);
+            var errorMsg = checkSorted(pn, left, left_name);
+            if errorMsg.isEmpty() {
+                errorMsg = checkSorted(pn, right, right_name);
+            }
+            if !errorMsg.isEmpty() {
+                return errorMsg;
+            }
+            var (leftIdx, rightIdx) = mergeJoin(left.a, right.a);
+            var lname = st.nextName();
+            st.addEntry(lname, new shared SymEntry(leftIdx)).markSorted();
+            var rname = st.nextName();
+            st.addEntry(rname, new shared SymEntry(rightIdx));
+            return "created " + st.attrib(lname) + " +created " + st.attrib(rname);
+        }
+
+        select gLeft.dtype {
+            when DType.Int64 {
+                return joinEntries(int);
+            }
+            when DType.Float64 {
+                return joinEntries(real);
+            }
+            otherwise {
+                var errorMsg = notImplementedError(pn, dtype2str(gLeft.dtype));
+                sortedSearchLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return errorMsg;
+            }
+        }
+    }
+}
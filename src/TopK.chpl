@@ -0,0 +1,173 @@
+/* Selection of the k smallest or largest values of an array
+
+ a sorted random sample of the values gives a threshold that about
+ k(1+e) of the values fall on the selected side of. One pass over the
+ array counts them to check that there are at least k, a second moves
+ them into a new array, and only those candidates are sorted. The
+ candidates keep the order of their indices, so the stable sort breaks
+ ties by index and the result is that of slicing a full argsort.
+
+ */
+module TopK
+{
+    use ServerConfig;
+
+    use Sort only;
+    use Random;
+    use SymArrayDmap;
+    use CommAggregation;
+    use CountingSort only sortRanks;
+    use SortedSearch only expandRanges;
+    use ReductionMsg only segSortPerm;
+    use Reflection;
+    use Logging;
+
+    // number of values sampled to choose the threshold
+    config const TK_sampleSize = 2**16;
+
+    // seed of the sample, which only affects the time taken
+    config const TK_seed = 241;
+
+    const tkLogger = new Logger();
+    if v {
+        tkLogger.level = LogLevel.DEBUG;
+    } else {
+        tkLogger.level = LogLevel.INFO;
+    }
+
+    /* Whether x is on the selected side of the threshold */
+    inline proc isCandidate(x: ?t, threshold: t, param isMin: bool): bool {
+        if isMin {
+            return x <= threshold;
+        } else {
+            return x >= threshold;
+        }
+    }
+
+    /*
+    Chooses a threshold with at least k values of a on its selected side,
+    from a sorted sample of a, widening the margin over the expected rank
+    of the k-th value when too few values turn out to be candidates
+
+    :returns: (bool, t, int) whether a threshold was found, the threshold
+              and the number of candidates
+    */
+    private proc chooseThreshold(const ref a: [?aD] ?t, k: int, param isMin: bool) {
+        const n = aD.size;
+        const s = min(n, TK_sampleSize);
+        var u: [0..#s] real;
+        fillRandom(u, TK_seed);
+        var sample: [0..#s] t;
+        forall (x, r) in zip(sample, u) with (var agg = newSrcAggregator(t)) {
+            agg.copy(x, a[aD.low + min((r * n):int, n - 1)]);
+        }
+        Sort.sort(sample);
+        var margin = 3.0 * sqrt(s:real) + 1.0;
+        for attempt in 1..3 {
+            const rank = (k:real / n * s + margin):int;
+            if rank >= s {
+                break;
+            }
+            const threshold = if isMin then sample[rank] else sample[s-1-rank];
+            const nCandidates = + reduce [x in a] isCandidate(x, threshold, isMin):int;
+            try! tkLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                                "threshold %t has %i candidates for k = %i".format(
+                                                             threshold, nCandidates, k));
+            if nCandidates >= k {
+                return (true, threshold, nCandidates);
+            }
+            margin *= 4;
+        }
+        var threshold: t;
+        return (false, threshold, n);
+    }
+
+    /*
+    Indices of the k smallest or largest values of a, in ascending order
+    of the values and of the indices of equal values, as argsort(a)[:k] or
+    argsort(a)[-k:] gives them
+
+    :arg a: values to select from
+    :type a: [] t
+
+    :arg k: number of values to select, which is at most the size of a
+    :type k: int
+
+    :arg isMin: whether to select the smallest values
+    :type isMin: bool
+
+    :returns: [] int
+    */
+    proc topKIndices(const ref a: [?aD] ?t, k: int, param isMin: bool) throws {
+        var res = makeDistArray(k, int);
+        if k == 0 {
+            return res;
+        }
+        const (found, threshold, nCandidates) = chooseThreshold(a, k, isMin);
+        overMemLimit(4 * nCandidates * numBytes(int));
+
+        // move the candidates into an array of their own, in order
+        var candIdx = makeDistArray(nCandidates, int);
+        if found {
+            const isCand: [aD] int = [x in a] isCandidate(x, threshold, isMin):int;
+            const pos = (+ scan isCand) - isCand;
+            forall (i, c, p) in zip(aD, isCand, pos) with (var agg = newDstAggregator(int)) {
+                if c == 1 {
+                    agg.copy(candIdx[p], i);
+                }
+            }
+        } else {
+            candIdx = aD;
+        }
+        var candVals: [candIdx.domain] t;
+        forall (x, i) in zip(candVals, candIdx) with (var agg = newSrcAggregator(t)) {
+            agg.copy(x, a[i]);
+        }
+
+        // the selected values are the first or last k candidates in sorted order
+        const perm = sortRanks(candVals);
+        const first = if isMin then 0 else nCandidates - k;
+        var sel: [res.domain] int;
+        forall (x, j) in zip(sel, res.domain) with (var agg = newSrcAggregator(int)) {
+            agg.copy(x, perm[first + j]);
+        }
+        forall (r, x) in zip(res, sel) with (var agg = newSrcAggregator(int)) {
+            agg.copy(r, candIdx[x]);
+        }
+        return res;
+    }
+
+    /*
+    Positions of the k smallest or largest values of each segment, in
+    ascending order of the values and of the positions of equal values,
+    and the segments of the positions
+
+    :arg values: values in grouped order
+    :type values: [] t
+
+    :arg segments: start of each segment of the values
+    :type segments: [] int
+
+    :returns: ([] int, [] int)
+    */
+    proc segTopK(const ref values: [?vD] ?t, const ref segments: [?sD] int, k: int,
+                 param isMin: bool) throws {
+        const sortPerm = segSortPerm(values, segments);
+        // the selected values are at the start or the end of each sorted segment
+        var firsts: [sD] int;
+        var counts: [sD] int;
+        forall (s, f, c) in zip(sD, firsts, counts) {
+            const start = segments[s];
+            const end = if s == sD.high then vD.high + 1 else segments[s+1];
+            c = min(k, end - start);
+            f = if isMin then start else end - c;
+        }
+        const (_, sortedPos) = expandRanges(firsts, counts);
+        var pos: [sortedPos.domain] int;
+        forall (p, sp) in zip(pos, sortedPos) with (var agg = newSrcAggregator(int)) {
+            agg.copy(p, sortPerm[sp]);
+        }
+        const newSegments: [sD] int = (+ scan counts) - counts;
+        return (pos, newSegments);
+    }
+}
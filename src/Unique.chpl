@@ -23,6 +23,7 @@ module Unique
 
     use CommAggregation;
     use RadixSortLSD;
+    use CountingSort;
     use SegmentedArray;
     use AryUtil;
     use Reflection;
@@ -445,6 +446,14 @@ module Unique
             }
         } 
 
+        // count the values instead of sorting them if there are few enough
+        const (aMin, aMax) = keyRange(a);
+        if isDenseRange(aMin, aMax) {
+            try! uLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                               "bins = %t".format(aMax - aMin + 1));
+            return uniqueHist(a, aMin, aMax, needCounts);
+        }
+
         var sorted: [aD] int;
         if (AryUtil.isSorted(a)) {
             sorted = a; 
@@ -462,6 +471,50 @@ module Unique
         }
     }
 
+    /*
+    histogram based unique finding procedure, for keys between aMin and aMax
+    when that range is small enough to count every value
+
+    Returns a tuple: (UniqueValArray,UniqueValCountsArray)
+    which contains the unique values of a, along with the number of times each unique value appears in a
+
+    :arg a: Array of data to be processed
+    :type a: [] int
+
+    :arg aMin: smallest value of a
+    :type aMin: int
+
+    :arg aMax: largest value of a
+    :type aMax: int
+
+    :returns: ([] int, [] int)
+    */
+    proc uniqueHist(a: [?aD] int, aMin: int, aMax: int, param needCounts = true) {
+        var hist = countingHist(a, aMin, aMax);
+        // +scan to compute the position of each value present... 1-based because of inclusive-scan
+        var iv: [hist.domain] int = + scan [h in hist] (h != 0):int;
+        var pop = iv[iv.domain.high];
+        try! uLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),"pop = %t".format(pop));
+
+        var ukeys = makeDistArray(pop, int);
+        forall (bin, h, i) in zip(hist.domain, hist, iv) with (var agg = newDstAggregator(int)) {
+            if h != 0 {
+                agg.copy(ukeys[i-1], aMin + bin);
+            }
+        }
+        if (needCounts) {
+            var counts = makeDistArray(pop, int);
+            forall (h, i) in zip(hist, iv) with (var agg = newDstAggregator(int)) {
+                if h != 0 {
+                    agg.copy(counts[i-1], h);
+                }
+            }
+            return (ukeys,counts);
+        } else {
+            return ukeys;
+        }
+    }
+
     proc uniqueSortWithInverse(a: [?aD] int) {
         if (aD.size == 0) {
             try! uLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),"zero size");
@@ -477,7 +530,7 @@ module Unique
             sorted = a; 
         }
         else {
-            perm = radixSortLSD_ranks(a);
+            perm = sortRanks(a, checkSorted=false);
             forall (p, s) in zip(perm, sorted) with (var agg = newSrcAggregator(int)) {
                 agg.copy(s, a[p]);
             }
@@ -24,6 +24,9 @@ module UniqueMsg
     use ServerErrorStrings;
 
     use Unique;
+    use CountingSort only isDenseRange;
+    use RadixSortLSD only radixSortLSD_keys;
+    use CommAggregation;
     
     const umLogger = new Logger();
   
@@ -33,6 +36,41 @@ module UniqueMsg
         umLogger.level = LogLevel.INFO;
     }
     
+    /*
+    Returns the unique values of an entry and their counts, from what the
+    entry knows of itself: counting its known range of values if it is
+    small, reading them off if it is sorted or the permutation that sorts
+    it is kept, and sorting it otherwise
+
+    :returns: ([] int, [] int)
+    */
+    proc uniqueEntry(e: borrowed SymEntry(int)) throws {
+        if e.size == 0 {
+            return uniqueSort(e.a);
+        }
+        const (aMin, aMax) = e.keyRange();
+        if isDenseRange(aMin, aMax) {
+            return uniqueHist(e.a, aMin, aMax);
+        }
+        if e.isSorted() {
+            return uniqueFromSorted(e.a);
+        }
+        var sorted: [e.aD] int;
+        var perm = e.cachedSortPerm();
+        if perm != nil {
+            umLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                           "using kept sort permutation");
+            ref ea = e.a;
+            forall (s, idx) in zip(sorted, toSymEntry(perm!, int).a)
+                                  with (var agg = newSrcAggregator(int)) {
+                agg.copy(s, ea[idx]);
+            }
+        } else {
+            sorted = radixSortLSD_keys(e.a, checkSorted=false);
+        }
+        return uniqueFromSorted(sorted);
+    }
+
     /* unique take a pdarray and returns a pdarray with the unique values */
     proc uniqueMsg(cmd: string, payload: bytes, st: borrowed SymTab): string throws {
         param pn = Reflection.getRoutineName();
@@ -92,8 +130,8 @@ module UniqueMsg
                     /*     if returnCounts {st.addEntry(cname, new shared SymEntry(aC));} */
                     /* } */
 
-                    var (aV,aC) = uniqueSort(e.a);
-                    st.addEntry(vname, new shared SymEntry(aV));
+                    var (aV,aC) = uniqueEntry(e);
+                    st.addEntry(vname, new shared SymEntry(aV)).markSorted();
                     if returnCounts {st.addEntry(cname, new shared SymEntry(aC));}
                     
                 }
@@ -188,8 +226,8 @@ module UniqueMsg
                 /*     st.addEntry(cname, new shared SymEntry(aC)); */
                 /* } */
 
-                var (aV,aC) = uniqueSort(e.a);
-                st.addEntry(vname, new shared SymEntry(aV));
+                var (aV,aC) = uniqueEntry(e);
+                st.addEntry(vname, new shared SymEntry(aV)).markSorted();
                 st.addEntry(cname, new shared SymEntry(aC));
             }
             otherwise {
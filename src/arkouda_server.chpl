@@ -16,9 +16,12 @@ use MultiTypeSymbolTable;
 use MultiTypeSymEntry;
 use MsgProcessing;
 use GenSymIO;
+use Message;
 use Reflection;
 use SymArrayDmap;
 use ServerErrorStrings;
+use Errors;
+use List;
 
 const asLogger = new Logger();
 
@@ -28,6 +31,35 @@ if v {
     asLogger.level = LogLevel.INFO;
 }
 
+/*
+A request received from a client, with the identity of the client's socket
+the reply is routed to and the symbols the request locks
+*/
+record ClientRequest {
+    var identity: bytes;
+    var structured: bool;
+    var user: string;
+    var token: string;
+    var cmd: string;
+    var payload: bytes;
+    var frames: list(bytes);
+    var error: string;
+    var readNames: list(string);
+    var writeNames: list(string);
+    var received: real;
+}
+
+/*
+The reply to a request, sent as a string or binary message, or as the JSON
+header of a structured reply followed by a binary frame if hasBinary is set
+*/
+record ClientReply {
+    var identity: bytes;
+    var message: bytes;
+    var binary: bytes;
+    var hasBinary: bool;
+}
+
 proc initArkoudaDirectory() {
     var arkDirectory = '%s%s%s'.format(here.cwd(), pathSep,'.arkouda');
     initDirectory(arkDirectory);
@@ -51,13 +83,31 @@ proc main() {
     }
 
     var st = new owned SymTab();
+    // commands with binary payloads or replies, or that change the connection
+    const batchExcludedCommands: domain(string) = {"batch", "array", "arraySlice", 
+                                                   "tondarray", "tondarraySlice", 
+                                                   "connect", "disconnect"};
+    // commands that only read metadata, which run as soon as they are received 
+    // instead of on a task of their own
+    const fastCommands: domain(string) = {"noop", "ruok", "connect", "disconnect", 
+                                          "getconfig", "getmemused", "info", "str",
+                                          "repr"};
+    // commands that modify the arrays they name, or remove them
+    const writeCommands: domain(string) = {"set", "opeqvv", "opeqvs", "[int]=val", 
+                                           "[pdarray]=val", "[pdarray]=pdarray", 
+                                           "[slice]=val", "[slice]=pdarray", "delete", 
+                                           "deleteMany", "register", "unregister",
+                                           "arraySlice"};
+    // commands that may read or write any array, which run on their own
+    const exclusiveCommands: domain(string) = {"batch", "clear", "shutdown"};
     var shutdownServer = false;
     var serverToken : string;
     var serverMessage : string;
 
-    // create and connect ZMQ socket
+    // create and connect ZMQ socket; a ROUTER socket routes each reply to the
+    // client that sent the request, so that requests may finish in any order
     var context: ZMQ.Context;
-    var socket : ZMQ.Socket = context.socket(ZMQ.REP);
+    var socket : ZMQ.Socket = context.socket(ZMQ.ROUTER);
 
     // configure token authentication and server startup message accordingly
     if authenticate {
@@ -76,18 +126,26 @@ proc main() {
 
     var reqCount: int = 0;
     var repCount: int = 0;
+    // requests waiting for the symbols they lock or for a free task
+    var waiting: list(ClientRequest);
+    // replies of the requests executed on tasks, and the number running
+    var replies: list(ClientReply, parSafe=true);
+    var running: atomic int;
 
     var t1 = new Time.Timer();
     t1.clear();
     t1.start();
 
     /*
-    Following processing of incoming message, sends a message back to the client.
+    Formats the reply to a request.
 
-    :arg repMsg: either a string or bytes to be sent
+    :arg req: the request replied to
+    :arg repMsg: either a string or bytes reply
+    :returns: ClientReply
     */
-    proc sendRepMsg(repMsg: ?t) where t==string || t==bytes {
-        repCount += 1;
+    proc makeReply(const ref req: ClientRequest, repMsg: ?t): ClientReply 
+                                                     where t==string || t==bytes {
+        var reply = new ClientReply(identity=req.identity);
         if logging {
           if t==bytes {
               asLogger.info(getModuleName(),getRoutineName(),getLineNumber(),
@@ -97,7 +155,40 @@ proc main() {
                                                         "repMsg: %s".format(repMsg));
           }
         }
-        socket.send(repMsg);
+        if !req.structured {
+            reply.message = if t==bytes then repMsg else repMsg.encode();
+        } else if t==bytes && repMsg.startsWith(b"Error:") {
+            // errors of commands with binary replies are sent in the header, 
+            // without a binary frame, so the client raises them
+            reply.message = (try! replyHeader(repMsg.decode(decodePolicy.replace), 
+                                              0, st)).encode();
+        } else if t==bytes {
+            // the JSON header is followed by a frame holding the binary reply
+            reply.message = (try! replyHeader("", 1, st)).encode();
+            reply.binary = repMsg;
+            reply.hasBinary = true;
+        } else {
+            reply.message = (try! replyHeader(repMsg, 0, st)).encode();
+        }
+        return reply;
+    }
+
+    /*
+    Sends a reply to the client it is routed to, following the identity of
+    the client's socket and an empty delimiter frame.
+
+    :arg reply: the reply to send
+    */
+    proc sendReply(const ref reply: ClientReply) throws {
+        repCount += 1;
+        socket.send(reply.identity, ZMQ.SNDMORE);
+        socket.send(b"", ZMQ.SNDMORE);
+        if reply.hasBinary {
+            socket.send(reply.message, ZMQ.SNDMORE);
+            socket.send(reply.binary);
+        } else {
+            socket.send(reply.message);
+        }
     }
 
     /*
@@ -130,51 +221,281 @@ proc main() {
     /*
     Sets the shutdownServer boolean to true and sends the shutdown command to socket,
     which stops the arkouda_server listener thread and closes socket.
+
+    :arg req: the shutdown request
     */
-    proc shutdown() {
+    proc shutdown(const ref req: ClientRequest) throws {
         shutdownServer = true;
-        repCount += 1;
-        socket.send("shutdown server (%i req)".format(repCount));
+        sendReply(makeReply(req, "shutdown server (%i req)".format(repCount + 1)));
     }
     
-    while !shutdownServer {
-        // receive message on the zmq socket
-        var reqMsgRaw = socket.recv(bytes);
+    /*
+    Executes a single command, returning either a string (repMsg) or bytes 
+    (binaryRepMsg) reply; the other element of the returned tuple is empty.
+
+    :arg cmd: the command to execute
+    :arg payload: the arguments of the command
+    :arg user: the user submitting the command
+    :arg token: the token submitted with the command
+    :arg frames: the binary payload frames of a structured request
+    :returns: (string,bytes)
+    */
+    proc processCommand(cmd: string, payload: bytes, user: string, token: string,
+                        const frames: list(bytes) = new list(bytes)): (string, bytes) throws {
+        /*
+         * Declare the repMsg and binaryRepMsg variables, one of which is sent to the client
+         * depending upon whether a string (repMsg) or bytes (binarRepMsg) is to be returned.
+         */
+        var binaryRepMsg: bytes;
+        var repMsg: string;
+
+        select cmd
+        {
+            when "array"             {repMsg = arrayMsg(cmd, payload, st, frames);}
+            when "arraySlice"        {repMsg = arraySliceMsg(cmd, payload, st, frames);}
+            when "tondarray"         {binaryRepMsg = tondarrayMsg(cmd, payload,st);}
+            when "tondarraySlice"    {binaryRepMsg = tondarraySliceMsg(cmd, payload,st);}
+            when "cast"              {repMsg = castMsg(cmd, payload, st);}
+            when "mink"              {repMsg = minkMsg(cmd, payload, st);}
+            when "maxk"              {repMsg = maxkMsg(cmd, payload, st);}
+            when "segmentedTopK"     {repMsg = segmentedTopKMsg(cmd, payload, st);}
+            when "intersect1d"       {repMsg = intersect1dMsg(cmd, payload, st);}
+            when "setdiff1d"         {repMsg = setdiff1dMsg(cmd, payload, st);}
+            when "setxor1d"          {repMsg = setxor1dMsg(cmd, payload, st);}
+            when "union1d"           {repMsg = union1dMsg(cmd, payload, st);}
+            when "segmentLengths"    {repMsg = segmentLengthsMsg(cmd, payload, st);}
+            when "segmentedHash"     {repMsg = segmentedHashMsg(cmd, payload, st);}
+            when "segmentedEfunc"    {repMsg = segmentedEfuncMsg(cmd, payload, st);}
+            when "segmentedPeel"     {repMsg = segmentedPeelMsg(cmd, payload, st);}
+            when "segmentedIndex"    {repMsg = segmentedIndexMsg(cmd, payload, st);}
+            when "segmentedBinopvv"  {repMsg = segBinopvvMsg(cmd, payload, st);}
+            when "segmentedBinopvs"  {repMsg = segBinopvsMsg(cmd, payload, st);}
+            when "segmentedBinopvvInt"  {repMsg = segBinopvvIntMsg(cmd, payload, st);}
+            when "segmentedBinopvsInt"  {repMsg = segBinopvsIntMsg(cmd, payload, st);}
+            when "segmentedGroup"    {repMsg = segGroupMsg(cmd, payload, st);}
+            when "segmentedSuffixAry"{repMsg = segSuffixArrayMsg(cmd, payload, st);}
+            when "segmentedSAFile"   {repMsg = segSAFileMsg(cmd, payload, st);}
+            when "segmentedIn1d"     {repMsg = segIn1dMsg(cmd, payload, st);}
+            when "segmentedIn1dInt"     {repMsg = segIn1dIntMsg(cmd, payload, st);}
+            when "lshdf"             {repMsg = lshdfMsg(cmd, payload, st);}
+            when "readhdf"           {repMsg = readhdfMsg(cmd, payload, st);}
+            when "readAllHdf"        {repMsg = readAllHdfMsg(cmd, payload, st);}
+            when "tohdf"             {repMsg = tohdfMsg(cmd, payload, st);}
+            when "create"            {repMsg = createMsg(cmd, payload, st);}
+            when "delete"            {repMsg = deleteMsg(cmd, payload, st);}
+            when "deleteMany"        {repMsg = deleteManyMsg(cmd, payload, st);}
+            when "binopvv"           {repMsg = binopvvMsg(cmd, payload, st);}
+            when "binopvs"           {repMsg = binopvsMsg(cmd, payload, st);}
+            when "binopsv"           {repMsg = binopsvMsg(cmd, payload, st);}
+            when "opeqvv"            {repMsg = opeqvvMsg(cmd, payload, st);}
+            when "opeqvs"            {repMsg = opeqvsMsg(cmd, payload, st);}
+            when "efunc"             {repMsg = efuncMsg(cmd, payload, st);}
+            when "efunc3vv"          {repMsg = efunc3vvMsg(cmd, payload, st);}
+            when "efunc3vs"          {repMsg = efunc3vsMsg(cmd, payload, st);}
+            when "efunc3sv"          {repMsg = efunc3svMsg(cmd, payload, st);}
+            when "efunc3ss"          {repMsg = efunc3ssMsg(cmd, payload, st);}
+            when "fused"             {repMsg = fusedMsg(cmd, payload, st);}
+            when "reduction"         {repMsg = reductionMsg(cmd, payload, st);}
+            when "countReduction"    {repMsg = countReductionMsg(cmd, payload, st);}
+            when "findSegments"      {repMsg = findSegmentsMsg(cmd, payload, st);}
+            when "hashGroup"         {repMsg = hashGroupMsg(cmd, payload, st);}
+            when "segmentedHLL"      {repMsg = segmentedHLLMsg(cmd, payload, st);}
+            when "hllEstimate"       {repMsg = hllEstimateMsg(cmd, payload, st);}
+            when "hllMerge"          {repMsg = hllMergeMsg(cmd, payload, st);}
+            when "segmentedSpaceSaving" {repMsg = segmentedSpaceSavingMsg(cmd, payload, st);}
+            when "spaceSavingMerge"  {repMsg = spaceSavingMergeMsg(cmd, payload, st);}
+            when "segmentedReduction"{repMsg = segmentedReductionMsg(cmd, payload, st);}
+            when "segmentedMultiReduction" {repMsg = segmentedMultiReductionMsg(cmd, payload, st);}
+            when "segmentedTransform" {repMsg = segmentedTransformMsg(cmd, payload, st);}
+            when "segmentedScan"     {repMsg = segmentedScanMsg(cmd, payload, st);}
+            when "broadcast"         {repMsg = broadcastMsg(cmd, payload, st);}
+            when "arange"            {repMsg = arangeMsg(cmd, payload, st);}
+            when "linspace"          {repMsg = linspaceMsg(cmd, payload, st);}
+            when "randint"           {repMsg = randintMsg(cmd, payload, st);}
+            when "randomNormal"      {repMsg = randomNormalMsg(cmd, payload, st);}
+            when "randomStrings"     {repMsg = randomStringsMsg(cmd, payload, st);}
+            when "histogram"         {repMsg = histogramMsg(cmd, payload, st);}
+            when "in1d"              {repMsg = in1dMsg(cmd, payload, st);}
+            when "unique"            {repMsg = uniqueMsg(cmd, payload, st);}
+            when "value_counts"      {repMsg = value_countsMsg(cmd, payload, st);}
+            when "set"               {repMsg = setMsg(cmd, payload, st);}
+            when "info"              {repMsg = infoMsg(cmd, payload, st);}
+            when "str"               {repMsg = strMsg(cmd, payload, st);}
+            when "repr"              {repMsg = reprMsg(cmd, payload, st);}
+            when "[int]"             {repMsg = intIndexMsg(cmd, payload, st);}
+            when "[slice]"           {repMsg = sliceIndexMsg(cmd, payload, st);}
+            when "[pdarray]"         {repMsg = pdarrayIndexMsg(cmd, payload, st);}
+            when "[int]=val"         {repMsg = setIntIndexToValueMsg(cmd, payload, st);}
+            when "[pdarray]=val"     {repMsg = setPdarrayIndexToValueMsg(cmd, payload, st);}
+            when "[pdarray]=pdarray" {repMsg = setPdarrayIndexToPdarrayMsg(cmd, payload, st);}
+            when "[slice]=val"       {repMsg = setSliceIndexToValueMsg(cmd, payload, st);}
+            when "[slice]=pdarray"   {repMsg = setSliceIndexToPdarrayMsg(cmd, payload, st);}
+            when "argsort"           {repMsg = argsortMsg(cmd, payload, st);}
+            when "coargsort"         {repMsg = coargsortMsg(cmd, payload, st);}
+            when "concatenate"       {repMsg = concatenateMsg(cmd, payload, st);}
+            when "sort"              {repMsg = sortMsg(cmd, payload, st);}
+            when "joinEqWithDT"      {repMsg = joinEqWithDTMsg(cmd, payload, st);}
+            when "searchsorted"      {repMsg = searchsortedMsg(cmd, payload, st);}
+            when "mergeJoin"         {repMsg = mergeJoinMsg(cmd, payload, st);}
+            when "getconfig"         {repMsg = getconfigMsg(cmd, payload, st);}
+            when "getmemused"        {repMsg = getmemusedMsg(cmd, payload, st);}
+            when "register"          {repMsg = registerMsg(cmd, payload, st);}
+            when "attach"            {repMsg = attachMsg(cmd, payload, st);}
+            when "unregister"        {repMsg = unregisterMsg(cmd, payload, st);}
+            when "clear"             {repMsg = clearMsg(cmd, payload, st);}
+            when "connect" {
+                if authenticate {
+                    repMsg = "connected to arkouda server tcp://*:%t as user %s with token %s".format(
+                                                      ServerPort,user,token);
+                } else {
+                    repMsg = "connected to arkouda server tcp://*:%t".format(ServerPort);
+                }
+                
+            }
+            when "disconnect" {
+                repMsg = "disconnected from arkouda server tcp://*:%t".format(ServerPort);
+            }
+            when "noop" {
+                repMsg = "noop";
+                asLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),"no-op");
+            }
+            when "ruok" {
+                repMsg = "imok";
+            }
+            otherwise {
+                repMsg = "Error: unrecognized command: %s".format(cmd);
+                asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),repMsg);
+            }
+        }
+        return (repMsg, binaryRepMsg);
+    }
 
-        reqCount += 1;
+    /*
+    Executes the commands of a batch request in order, so that a client can 
+    send a sequence of commands in one round trip. The array created by each
+    command is stored under the name the client assigned to it, which later
+    commands in the batch may refer to. Execution stops at the first error.
+
+    :arg payload: the number of commands, a JSON list of the names assigned to
+                  their results (empty for commands whose result is not an 
+                  array), and a JSON list of the "cmd args" command strings
+    :arg user: the user submitting the batch
+    :arg token: the token submitted with the batch
+    :returns: JSON list of the replies of the executed commands
+    */
+    proc batchMsg(payload: bytes, user: string, token: string): string throws {
+        var (sizeStr, namesJson, cmdsJson) = payload.decode().splitMsgToTuple(3);
+        var size = try! sizeStr:int;
+        var names = jsonToPdArray(namesJson, size);
+        var cmds = jsonToPdArray(cmdsJson, size);
+        var replies: [0..#size] string;
+        var executed = 0;
+
+        for i in 0..#size {
+            var (subCmd, subPayload) = cmds[i].splitMsgToTuple(2);
+            var subRepMsg: string;
+            try {
+                if batchExcludedCommands.contains(subCmd) {
+                    subRepMsg = "Error: command %s cannot be batched".format(subCmd);
+                } else {
+                    // arrays cached from the arrays the command writes become stale
+                    if writeCommands.contains(subCmd) {
+                        for name in argNames(subCmd, subPayload:bytes) do st.invalidateCached(name);
+                    }
+                    var (rep, binaryRep) = processCommand(subCmd, subPayload:bytes, user, token);
+                    subRepMsg = rep;
+                    if subRepMsg.isEmpty() {
+                        subRepMsg = "Error: command %s cannot be batched".format(subCmd);
+                    } else if !names[i].isEmpty() && !subRepMsg.startsWith("Error:") {
+                        // store the created array under the client's name for it
+                        var (created, createdName, attribs) = subRepMsg.splitMsgToTuple(3);
+                        if created != "created" {
+                            subRepMsg = "Error: batched command %s did not create an array".format(
+                                                                                        subCmd);
+                        } else {
+                            st.renameEntry(createdName, names[i]);
+                            subRepMsg = "created " + st.attrib(names[i]);
+                        }
+                    }
+                }
+            } catch (e: ErrorWithMsg) {
+                subRepMsg = e.msg;
+            } catch (e: ErrorWithContext) {
+                subRepMsg = e.publish();
+            } catch (e: Error) {
+                subRepMsg = unknownError(e.message());
+            }
+            asLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                                   "batch command %i: %s -> %s".format(i, subCmd, subRepMsg));
+            replies[i] = subRepMsg;
+            executed += 1;
+            if subRepMsg.startsWith("Error:") {
+                break;
+            }
+        }
+        const executedReplies = replies[0..#executed];
+        return "%jt".format(executedReplies);
+    }
 
-        var s0 = t1.elapsed();
-        
-        /*
-        Separate the first tuple, which is a string binary 
-        containing the message's user, token, and cmd from
-        the remaining payload. Depending upon the message type 
-        (string or binary) the payload is either a space-delimited
-        string or bytes
-        */
-        const (cmdRaw, payload) = reqMsgRaw.splitMsgToTuple(2);
+    /*
+    Receives the next request if one is waiting. A request that cannot be
+    parsed or authenticated is received with its error set.
 
-        var user, token, cmd: string;
+    :arg req: set to the request received
+    :returns: bool, false if no request is waiting
+    */
+    proc receiveRequest(ref req: ClientRequest): bool throws {
+        try {
+            req.identity = socket.recv(bytes, ZMQ.DONTWAIT);
+        } catch {
+            // no request is waiting
+            return false;
+        }
+        reqCount += 1;
+        req.received = t1.elapsed();
+
+        // the identity is followed by an empty delimiter and the request
+        socket.recv(bytes);
+        var reqMsgRaw = socket.recv(bytes);
+        req.structured = isStructuredRequest(reqMsgRaw);
 
-        // parse requests, execute requests, format responses
         try {
-            /*
-            decode the string binary containing the user, token, and cmd. 
-            If there is an error, discontinue processing message and send 
-            an error message back to the client.
-            */
             var cmdStr : string;
 
-            try! {
-                 cmdStr = cmdRaw.decode();
-            } catch e: DecodeError {
-               asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),
-                       "illegal byte sequence in command: %t".format(cmdRaw.decode(decodePolicy.replace)));
-               sendRepMsg(unknownError(e.message()));
+            if req.structured {
+                /*
+                 * The arguments of a structured request are followed by its 
+                 * binary payload frames, which are kept as received and 
+                 * handed to the command apart from its arguments
+                 */
+                var request = parseRequest(reqMsgRaw);
+                req.payload = request.args.encode();
+                for 1..request.frames {
+                    req.frames.append(socket.recv(bytes));
+                }
+                cmdStr = "%s:%s:%s".format(request.user, request.token, request.cmd);
+            } else {
+                /*
+                Separate the first tuple, which is a string binary 
+                containing the message's user, token, and cmd from
+                the remaining payload. Depending upon the message type 
+                (string or binary) the payload is either a space-delimited
+                string or bytes
+                */
+                var (cmdRaw, payload) = reqMsgRaw.splitMsgToTuple(2);
+                req.payload = payload;
+                try {
+                    cmdStr = cmdRaw.decode();
+                } catch e: DecodeError {
+                    asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),
+                           "illegal byte sequence in command: %t".format(
+                                                 cmdRaw.decode(decodePolicy.replace)));
+                    throw e;
+                }
             }
 
             //parse the decoded cmdString to retrieve user,token,cmd
-            var (user,token,cmd) = getCommandStrings(cmdStr);
+            (req.user, req.token, req.cmd) = getCommandStrings(cmdStr);
 
             /*
              * If authentication is enabled with --authenticate flag, authenticate
@@ -182,15 +503,87 @@ proc main() {
              * with the token generated by the arkouda server
             */ 
             if authenticate {
-                authenticateUser(token);
+                authenticateUser(req.token);
             }
+        } catch (e: ErrorWithMsg) {
+            req.error = e.msg;
+        } catch (e: Error) {
+            req.error = unknownError(e.message());
+        }
+        return true;
+    }
 
+    /*
+    Returns the names of the symbols, and allSymbolsName, that appear in the
+    arguments of a command
+
+    :arg cmd: the command
+    :arg payload: the arguments of the command
+    :returns: domain(string)
+    */
+    proc argNames(cmd: string, payload: bytes): domain(string, parSafe=false) {
+        var args: string;
+        if cmd != "array" {
+            // the payload of an array request is its binary data
+            args = payload.decode(decodePolicy.replace);
+            // names may also appear in JSON lists of arguments, and the 
+            // components of a Strings are joined by +
+            for c in ["[", "]", "\"", ",", "|", "+"] {
+                args = args.replace(c, " ");
+            }
+        }
+        var names: domain(string, parSafe=false);
+        for arg in args.split() {
+            if arg == allSymbolsName || st.contains(arg) then names += arg;
+        }
+        return names;
+    }
+
+    /*
+    Lists the symbols a request locks: the arrays named in its arguments, 
+    for writing if the command modifies them and for reading otherwise, and
+    allSymbolsName, for writing if the command may use any array or modify
+    all of them, and for reading otherwise. A request that reads all 
+    symbols, such as info, reads the table under its own guard, so it only
+    locks allSymbolsName for reading.
+
+    :arg req: the request
+    */
+    proc setLockNames(ref req: ClientRequest) {
+        var names = argNames(req.cmd, req.payload);
+        if exclusiveCommands.contains(req.cmd) || 
+           (names.contains(allSymbolsName) && writeCommands.contains(req.cmd)) {
+            req.writeNames.append(allSymbolsName);
+            return;
+        }
+        req.readNames.append(allSymbolsName);
+        if names.contains(allSymbolsName) {
+            return;
+        }
+        for name in names {
+            if writeCommands.contains(req.cmd) {
+                req.writeNames.append(name);
+            } else {
+                req.readNames.append(name);
+            }
+        }
+    }
+
+    /*
+    Executes a request, logging it, and returns its reply.
+
+    :arg req: the request
+    :returns: ClientReply
+    */
+    proc executeRequest(const ref req: ClientRequest): ClientReply {
+        const cmd = req.cmd;
+        try {
             if (logging) {
               try {
                 if (cmd != "array") {
                   asLogger.info(getModuleName(), getRoutineName(), getLineNumber(),
                                                      ">>> %t %t".format(cmd, 
-                                                    payload.decode(decodePolicy.replace)));
+                                                    req.payload.decode(decodePolicy.replace)));
                 } else {
                   asLogger.info(getModuleName(), getRoutineName(), getLineNumber(),
                                                      ">>> %s [binary data]".format(cmd));
@@ -200,156 +593,165 @@ proc main() {
               }
             }
 
-            // If cmd is shutdown, don't bother generating a repMsg
-            if cmd == "shutdown" {
-                shutdown();
-                if (logging) {
-                    asLogger.info(getModuleName(),getRoutineName(),getLineNumber(),
-                                         "<<< shutdown took %.17r sec".format(t1.elapsed() - s0));
-                }
-                break;
+            // arrays cached from the arrays the request writes become stale;
+            // exclusive commands, which lock all symbols, invalidate only the
+            // arrays they write as they run
+            if !exclusiveCommands.contains(cmd) {
+                for name in req.writeNames do st.invalidateCached(name);
             }
 
-            /*
-             * Declare the repMsg and binaryRepMsg variables, one of which is sent to sendRepMsg
-             * depending upon whether a string (repMsg) or bytes (binarRepMsg) is to be returned.
-             */
-            var binaryRepMsg: bytes;
-            var repMsg: string;
-
-            select cmd
-            {
-                when "array"             {repMsg = arrayMsg(cmd, payload, st);}
-                when "tondarray"         {binaryRepMsg = tondarrayMsg(cmd, payload,st);}
-                when "cast"              {repMsg = castMsg(cmd, payload, st);}
-                when "mink"              {repMsg = minkMsg(cmd, payload, st);}
-                when "maxk"              {repMsg = maxkMsg(cmd, payload, st);}
-                when "intersect1d"       {repMsg = intersect1dMsg(cmd, payload, st);}
-                when "setdiff1d"         {repMsg = setdiff1dMsg(cmd, payload, st);}
-                when "setxor1d"          {repMsg = setxor1dMsg(cmd, payload, st);}
-                when "union1d"           {repMsg = union1dMsg(cmd, payload, st);}
-                when "segmentLengths"    {repMsg = segmentLengthsMsg(cmd, payload, st);}
-                when "segmentedHash"     {repMsg = segmentedHashMsg(cmd, payload, st);}
-                when "segmentedEfunc"    {repMsg = segmentedEfuncMsg(cmd, payload, st);}
-                when "segmentedPeel"     {repMsg = segmentedPeelMsg(cmd, payload, st);}
-                when "segmentedIndex"    {repMsg = segmentedIndexMsg(cmd, payload, st);}
-                when "segmentedBinopvv"  {repMsg = segBinopvvMsg(cmd, payload, st);}
-                when "segmentedBinopvs"  {repMsg = segBinopvsMsg(cmd, payload, st);}
-                when "segmentedBinopvvInt"  {repMsg = segBinopvvIntMsg(cmd, payload, st);}
-                when "segmentedBinopvsInt"  {repMsg = segBinopvsIntMsg(cmd, payload, st);}
-                when "segmentedGroup"    {repMsg = segGroupMsg(cmd, payload, st);}
-                when "segmentedSuffixAry"{repMsg = segSuffixArrayMsg(cmd, payload, st);}
-                when "segmentedSAFile"   {repMsg = segSAFileMsg(cmd, payload, st);}
-                when "segmentedIn1d"     {repMsg = segIn1dMsg(cmd, payload, st);}
-                when "segmentedIn1dInt"     {repMsg = segIn1dIntMsg(cmd, payload, st);}
-                when "lshdf"             {repMsg = lshdfMsg(cmd, payload, st);}
-                when "readhdf"           {repMsg = readhdfMsg(cmd, payload, st);}
-                when "readAllHdf"        {repMsg = readAllHdfMsg(cmd, payload, st);}
-                when "tohdf"             {repMsg = tohdfMsg(cmd, payload, st);}
-                when "create"            {repMsg = createMsg(cmd, payload, st);}
-                when "delete"            {repMsg = deleteMsg(cmd, payload, st);}
-                when "binopvv"           {repMsg = binopvvMsg(cmd, payload, st);}
-                when "binopvs"           {repMsg = binopvsMsg(cmd, payload, st);}
-                when "binopsv"           {repMsg = binopsvMsg(cmd, payload, st);}
-                when "opeqvv"            {repMsg = opeqvvMsg(cmd, payload, st);}
-                when "opeqvs"            {repMsg = opeqvsMsg(cmd, payload, st);}
-                when "efunc"             {repMsg = efuncMsg(cmd, payload, st);}
-                when "efunc3vv"          {repMsg = efunc3vvMsg(cmd, payload, st);}
-                when "efunc3vs"          {repMsg = efunc3vsMsg(cmd, payload, st);}
-                when "efunc3sv"          {repMsg = efunc3svMsg(cmd, payload, st);}
-                when "efunc3ss"          {repMsg = efunc3ssMsg(cmd, payload, st);}
-                when "reduction"         {repMsg = reductionMsg(cmd, payload, st);}
-                when "countReduction"    {repMsg = countReductionMsg(cmd, payload, st);}
-                when "findSegments"      {repMsg = findSegmentsMsg(cmd, payload, st);}
-                when "segmentedReduction"{repMsg = segmentedReductionMsg(cmd, payload, st);}
-                when "arange"            {repMsg = arangeMsg(cmd, payload, st);}
-                when "linspace"          {repMsg = linspaceMsg(cmd, payload, st);}
-                when "randint"           {repMsg = randintMsg(cmd, payload, st);}
-                when "randomNormal"      {repMsg = randomNormalMsg(cmd, payload, st);}
-                when "randomStrings"     {repMsg = randomStringsMsg(cmd, payload, st);}
-                when "histogram"         {repMsg = histogramMsg(cmd, payload, st);}
-                when "in1d"              {repMsg = in1dMsg(cmd, payload, st);}
-                when "unique"            {repMsg = uniqueMsg(cmd, payload, st);}
-                when "value_counts"      {repMsg = value_countsMsg(cmd, payload, st);}
-                when "set"               {repMsg = setMsg(cmd, payload, st);}
-                when "info"              {repMsg = infoMsg(cmd, payload, st);}
-                when "str"               {repMsg = strMsg(cmd, payload, st);}
-                when "repr"              {repMsg = reprMsg(cmd, payload, st);}
-                when "[int]"             {repMsg = intIndexMsg(cmd, payload, st);}
-                when "[slice]"           {repMsg = sliceIndexMsg(cmd, payload, st);}
-                when "[pdarray]"         {repMsg = pdarrayIndexMsg(cmd, payload, st);}
-                when "[int]=val"         {repMsg = setIntIndexToValueMsg(cmd, payload, st);}
-                when "[pdarray]=val"     {repMsg = setPdarrayIndexToValueMsg(cmd, payload, st);}
-                when "[pdarray]=pdarray" {repMsg = setPdarrayIndexToPdarrayMsg(cmd, payload, st);}
-                when "[slice]=val"       {repMsg = setSliceIndexToValueMsg(cmd, payload, st);}
-                when "[slice]=pdarray"   {repMsg = setSliceIndexToPdarrayMsg(cmd, payload, st);}
-                when "argsort"           {repMsg = argsortMsg(cmd, payload, st);}
-                when "coargsort"         {repMsg = coargsortMsg(cmd, payload, st);}
-                when "concatenate"       {repMsg = concatenateMsg(cmd, payload, st);}
-                when "sort"              {repMsg = sortMsg(cmd, payload, st);}
-                when "joinEqWithDT"      {repMsg = joinEqWithDTMsg(cmd, payload, st);}
-                when "getconfig"         {repMsg = getconfigMsg(cmd, payload, st);}
-                when "getmemused"        {repMsg = getmemusedMsg(cmd, payload, st);}
-                when "register"          {repMsg = registerMsg(cmd, payload, st);}
-                when "attach"            {repMsg = attachMsg(cmd, payload, st);}
-                when "unregister"        {repMsg = unregisterMsg(cmd, payload, st);}
-                when "clear"             {repMsg = clearMsg(cmd, payload, st);}
-                when "connect" {
-                    if authenticate {
-                        repMsg = "connected to arkouda server tcp://*:%t as user %s with token %s".format(
-                                                          ServerPort,user,token);
-                    } else {
-                        repMsg = "connected to arkouda server tcp://*:%t".format(ServerPort);
-                    }
-                    
-                }
-                when "disconnect" {
-                    repMsg = "disconnected from arkouda server tcp://*:%t".format(ServerPort);
-                }
-                when "noop" {
-                    repMsg = "noop";
-                    asLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),"no-op");
-                }
-                when "ruok" {
-                    repMsg = "imok";
-                }
-                otherwise {
-                    repMsg = "Error: unrecognized command: %s".format(cmd);
-                    asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),repMsg);
-                }
-            }
+            var (repMsg, binaryRepMsg) = processCommand(cmd, req.payload, req.user, req.token,
+                                                        req.frames);
 
-            //Determine if a string (repMsg) or binary (binaryRepMsg) is to be returned and send response           
-            if repMsg.isEmpty() {
-                sendRepMsg(binaryRepMsg);
-            } else {
-                sendRepMsg(repMsg);
-            }
+            //Determine if a string (repMsg) or binary (binaryRepMsg) is to be returned
+            var reply = if repMsg.isEmpty() then makeReply(req, binaryRepMsg) 
+                                            else makeReply(req, repMsg);
 
             /*
-             * log that the request message has been handled and reply message has been sent along with 
-             * the time to do so
+             * log that the request message has been handled along with the 
+             * time to do so, including the time it waited to start
              */
             if logging {
                 asLogger.info(getModuleName(),getRoutineName(),getLineNumber(), 
-                                                  "<<< %s took %.17r sec".format(cmd, t1.elapsed() - s0));
+                                  "<<< %s took %.17r sec".format(cmd, t1.elapsed() - req.received));
             }
             if (logging && memTrack) {
                 asLogger.info(getModuleName(),getRoutineName(),getLineNumber(),
                        "bytes of memory used after command %t".format(memoryUsed():uint * numLocales:uint));
             }
+            return reply;
         } catch (e: ErrorWithMsg) {
-            sendRepMsg(e.msg);
             if logging {
                 asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),
-                    "<<< %s resulted in error %s in  %.17r sec".format(cmd, e.msg, t1.elapsed() - s0));
+                    "<<< %s resulted in error %s in  %.17r sec".format(cmd, e.msg, 
+                                                                 t1.elapsed() - req.received));
             }
+            return makeReply(req, e.msg);
         } catch (e: Error) {
-            sendRepMsg(unknownError(e.message()));
             if logging {
                 asLogger.error(getModuleName(), getRoutineName(), getLineNumber(), 
-                    "<<< %s resulted in error: %s in %.17r sec".format(cmd, e.message(),t1.elapsed() - s0));
+                    "<<< %s resulted in error: %s in %.17r sec".format(cmd, e.message(),
+                                                                 t1.elapsed() - req.received));
             }
+            return makeReply(req, unknownError(e.message()));
+        }
+    }
+
+    /*
+    Returns true if the request locks any of the names, for reading or writing
+
+    :arg req: the request
+
+    :arg names: the names of symbols
+    :type names: domain(string)
+
+    :returns: bool
+    */
+    proc locksAny(const ref req: ClientRequest, const ref names): bool {
+        for name in req.readNames {
+            if names.contains(name) then return true;
+        }
+        for name in req.writeNames {
+            if names.contains(name) then return true;
+        }
+        return false;
+    }
+
+    /*
+    Starts a request if the symbols it locks are free and, unless it is a 
+    fast metadata command, fewer than maxConcurrentRequests requests are 
+    running. Fast commands and shutdown run on the calling task; other 
+    requests run on a task of their own, which queues the reply.
+
+    :arg req: the request
+    :returns: bool, true if the request was started
+    */
+    proc tryStart(const ref req: ClientRequest): bool throws {
+        const fast = fastCommands.contains(req.cmd);
+        if !fast && running.read() >= maxConcurrentRequests {
+            return false;
+        }
+        if !st.tryLockSymbols(req.readNames.toArray(), req.writeNames.toArray()) {
+            return false;
+        }
+        if req.cmd == "shutdown" {
+            // every other request has finished, since shutdown locks all symbols
+            while !replies.isEmpty() {
+                sendReply(replies.pop(0));
+            }
+            shutdown(req);
+            if (logging) {
+                asLogger.info(getModuleName(),getRoutineName(),getLineNumber(),
+                              "<<< shutdown took %.17r sec".format(t1.elapsed() - req.received));
+            }
+        } else if fast {
+            sendReply(executeRequest(req));
+            st.unlockSymbols(req.readNames.toArray(), req.writeNames.toArray());
+        } else {
+            running.add(1);
+            begin with (ref replies) {
+                var reply = executeRequest(req);
+                st.unlockSymbols(req.readNames.toArray(), req.writeNames.toArray());
+                replies.append(reply);
+                running.sub(1);
+            }
+        }
+        return true;
+    }
+
+    while !shutdownServer {
+        var idle = true;
+        try {
+            // send the replies of the requests that finished on their own tasks
+            while !replies.isEmpty() {
+                sendReply(replies.pop(0));
+                idle = false;
+            }
+
+            /*
+             * start waiting requests in the order they were received, except
+             * that a request waits behind the earlier waiting requests that
+             * write any symbol it locks, so that requests received later 
+             * cannot keep a symbol locked for reading while a write waits
+             */
+            var waitingWrites: domain(string, parSafe=false);
+            var i = 0;
+            while i < waiting.size && !shutdownServer {
+                if !locksAny(waiting[i], waitingWrites) && tryStart(waiting[i]) {
+                    waiting.pop(i);
+                    idle = false;
+                } else {
+                    for name in waiting[i].writeNames do waitingWrites += name;
+                    i += 1;
+                }
+            }
+            if shutdownServer {
+                break;
+            }
+
+            // receive message on the zmq socket
+            var req: ClientRequest;
+            if receiveRequest(req) {
+                idle = false;
+                if !req.error.isEmpty() {
+                    sendReply(makeReply(req, req.error));
+                } else {
+                    setLockNames(req);
+                    var waitingWrites: domain(string, parSafe=false);
+                    for w in waiting {
+                        for name in w.writeNames do waitingWrites += name;
+                    }
+                    if locksAny(req, waitingWrites) || !tryStart(req) {
+                        waiting.append(req);
+                    }
+                }
+            }
+        } catch (e: Error) {
+            asLogger.error(getModuleName(), getRoutineName(), getLineNumber(), 
+                           "error handling requests: %s".format(e.message()));
+        }
+        if idle {
+            Time.sleep(requestPollInterval);
         }
     }
 
@@ -1,3 +1,4 @@
+import numpy as np
 from base_test import ArkoudaTest
 from context import arkouda as ak
 
@@ -107,4 +108,150 @@ class ClientTest(ArkoudaTest):
         ak.client.set_defaults()
         self.assertEqual(100, ak.client.pdarrayIterThresh)
         self.assertEqual(1073741824, ak.client.maxTransferBytes)
-        self.assertFalse(ak.client.verbose)        
\ No newline at end of file
+        self.assertFalse(ak.client.verbose)        
+
+    def test_batch(self):
+        '''
+        Tests the ak.batch() context manager, checking that batched commands
+        give the same results as unbatched ones, that pdarray attributes are 
+        resolved on access, and that errors in the batch are raised.
+        '''
+        a = ak.arange(0, 10, 1)
+        expected = ak.where((a * 2 + 1) > 10, a, -1).to_ndarray()
+        with ak.batch():
+            b = a * 2 + 1
+            c = ak.where(b > 10, a, -1)
+            del b
+            self.assertTrue(c._is_pending())
+        self.assertFalse(c._is_pending())
+        self.assertEqual(10, c.size)
+        self.assertEqual(ak.int64, c.dtype)
+        self.assertListEqual(expected.tolist(), c.to_ndarray().tolist())
+
+        # Accessing an attribute sends the queued commands
+        with ak.batch():
+            d = ak.zeros(5)
+            self.assertEqual(5, d.size)
+            self.assertFalse(d._is_pending())
+
+        # Size mismatches are detected by the server
+        with self.assertRaises(RuntimeError):
+            with ak.batch():
+                e = ak.arange(0, 5, 1) + a
+                f = e + 1
+        with self.assertRaises(RuntimeError):
+            f.size
+
+        # An error in the body is raised as it is, without sending the queue
+        with self.assertRaises(ValueError):
+            with ak.batch():
+                e = ak.arange(0, 5, 1) + a
+                raise ValueError("body failed")
+
+        ak.client.maxBatchCommands = 2
+        try:
+            with ak.batch():
+                g = a + 1
+                g += 1
+                g = g * 2
+        finally:
+            ak.client.set_defaults()
+        self.assertListEqual([(i + 2) * 2 for i in range(10)], g.to_ndarray().tolist())
+
+    def test_structured_reply(self):
+        '''
+        Tests that replies describe the arrays created by a command, and that
+        binary frames are sent and received intact.
+        '''
+        reply = ak.client.generic_msg("create int64 10")
+        self.assertIsInstance(reply, ak.client.Reply)
+        self.assertEqual(1, len(reply.objects))
+        obj = reply.objects[0]
+        self.assertEqual('pdarray', obj['objType'])
+        self.assertEqual('int64', obj['dtype'])
+        self.assertEqual(10, obj['size'])
+        self.assertListEqual([10], obj['shape'])
+        self.assertEqual(8, obj['itemsize'])
+
+        # Non-create replies describe no objects
+        self.assertListEqual([], ak.client.generic_msg("noop").objects)
+
+        with self.assertRaises(RuntimeError):
+            ak.client.generic_msg("binopvv + no_such_array no_such_array")
+
+        # Errors of commands with binary replies are raised, not returned
+        with self.assertRaises(RuntimeError):
+            ak.client.generic_msg("tondarray no_such_array", recv_bytes=True)
+
+        a = np.arange(1000, dtype=np.float64) / 7
+        self.assertListEqual(a.tolist(), ak.array(a).to_ndarray().tolist())
+
+        # Float scalars are sent exactly, however small or large
+        for x in (1e-20, 1/3, 1e300):
+            self.assertEqual(x, (ak.zeros(1) + x)[0])
+
+    def test_submit(self):
+        '''
+        Tests that calls submitted with ak.submit() and awaited with ak.aio 
+        run on their own sockets and return the results of the calls.
+        '''
+        import asyncio
+        a = ak.randint(0, 100, 1000)
+        futures = [ak.submit(ak.argsort, a), ak.submit(lambda x: (x * 2).sum(), a)]
+        b = ak.arange(0, 10, 1)
+        perm = futures[0].result()
+        self.assertTrue(a[perm].is_sorted())
+        self.assertEqual(2 * a.sum(), futures[1].result())
+        self.assertEqual(45, b.sum())
+
+        with self.assertRaises(RuntimeError):
+            ak.submit(ak.client.generic_msg, "binopvv + no_such_array no_such_array").result()
+
+        async def sort_and_sum(x):
+            return await asyncio.gather(ak.aio.argsort(x), ak.aio.run(x.sum))
+        perm, total = asyncio.run(sort_and_sum(a))
+        self.assertTrue(a[perm].is_sorted())
+        self.assertEqual(a.sum(), total)
+
+    def test_concurrent_strings_delete(self):
+        '''
+        Tests that a Strings groupby, which names its arrays as offsets+bytes,
+        keeps them locked against a concurrent delete: the groupby either
+        finishes before the delete or fails to find the deleted array.
+        '''
+        values = ['key{}'.format(i % 7) for i in range(10000)]
+        for _ in range(5):
+            s = ak.array(values)
+            future = ak.submit(ak.GroupBy, s, hash_strings=False)
+            ak.client.generic_msg("delete {}".format(s.bytes.name))
+            try:
+                g = future.result()
+            except RuntimeError as e:
+                self.assertIn('unknown symbol', str(e))
+                continue
+            keys, counts = g.count()
+            self.assertDictEqual({v: values.count(v) for v in set(values)},
+                                 dict(zip(keys.to_ndarray().tolist(),
+                                          counts.to_ndarray().tolist())))
+
+    def test_deferred_deletes(self):
+        '''
+        Tests that pdarray deletions are deferred until the next command that
+        depends on them or until client.maxPendingDeletes are queued.
+        '''
+        a = ak.arange(0, 10, 1)
+        name = a.name
+        del a
+        self.assertIn(name, ak.client._pendingDeletes)
+        self.assertNotIn(name, ak.info(ak.AllSymbols))
+        self.assertListEqual([], ak.client._pendingDeletes)
+
+        ak.client.maxPendingDeletes = 2
+        try:
+            b, c = ak.ones(10), ak.zeros(10)
+            del b, c
+            self.assertEqual(2, len(ak.client._pendingDeletes))
+            d = ak.ones(10)
+            self.assertListEqual([], ak.client._pendingDeletes)
+        finally:
+            ak.client.set_defaults()
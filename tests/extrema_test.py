@@ -192,3 +192,17 @@ class ArgMaxKTest(ArkoudaTest):
             ak.argmaxk(ak.array([]), 1)
         self.assertEqual("must be a non-empty pdarray of type int or float", 
                          cm.exception.args[0])           
+
+class LargeKTest(ArkoudaTest):
+    def test_large_k(self):
+        '''
+        Selects more values than the heaps are used for, with many ties
+        '''
+        aka = ak.randint(0, 1000, 100000)
+        npa = aka.to_ndarray()
+        order = np.argsort(npa, kind='stable')
+        for k in (1, 10000, 99999, 200000):
+            self.assertListEqual(order[:k].tolist(), ak.argmink(aka, k).to_ndarray().tolist())
+            self.assertListEqual(order[-k:].tolist(), ak.argmaxk(aka, k).to_ndarray().tolist())
+            self.assertListEqual(npa[order[:k]].tolist(), ak.mink(aka, k).to_ndarray().tolist())
+            self.assertListEqual(npa[order[-k:]].tolist(), ak.maxk(aka, k).to_ndarray().tolist())
@@ -9,7 +9,11 @@ verbose = True
 
 def groupby_to_arrays(df : pd.DataFrame, kname, vname, op, levels):
     g = df.groupby(kname)[vname]
-    agg = g.aggregate(op.replace('arg', 'idx'))
+    if op in ('var', 'std'):
+        # ak.GroupBy uses ddof=0 by default, as pdarray.var does
+        agg = g.aggregate(op, ddof=0)
+    else:
+        agg = g.aggregate(op.replace('arg', 'idx'))
     if op == 'prod':
         # There appears to be a bug in pandas where it sometimes
         # reports the product of a segment as NaN when it should be 0
@@ -176,6 +180,158 @@ class GroupByTest(ArkoudaTest):
         results = gb.broadcast(counts < 4)
         self.assertTrue((np.array([1,0,0,0,0,1,1,1,1,1]),results.to_ndarray()))    
         
+    def test_broadcast_permute(self):
+        keys = ak.array([4, 1, 3, 2, 2, 2, 5, 5, 2, 3])
+        gb = ak.GroupBy(keys)
+        _, counts = gb.count()
+        results = gb.broadcast(counts, permute=True)
+        self.assertListEqual([1, 1, 2, 4, 4, 4, 2, 2, 4, 2], results.to_ndarray().tolist())
+        expected = ak.zeros_like(keys)
+        expected[gb.permutation] = gb.broadcast(counts)
+        self.assertTrue((expected.to_ndarray() == results.to_ndarray()).all())
+        results = gb.broadcast(gb.unique_keys * 0.5, permute=True)
+        self.assertTrue(np.allclose(keys.to_ndarray() * 0.5, results.to_ndarray()))
+
+        with self.assertRaises(ValueError):
+            gb.broadcast(ak.arange(3), permute=True)
+
+    def test_transform(self):
+        d = make_arrays()
+        akdf = {k:ak.array(v) for k, v in d.items()}
+        gb = ak.GroupBy(akdf['keys'])
+        for op in ('sum', 'max', 'mean', 'argmin', 'nunique'):
+            _, aggs = gb.aggregate(akdf['int64'], op)
+            expected = gb.broadcast(aggs, permute=True)
+            results = gb.transform(akdf['int64'], op)
+            self.assertTrue(np.allclose(expected.to_ndarray(), results.to_ndarray()))
+
+        gs = ak.GroupBy(ak.array([0, 0, 1, 1, 1]), assume_sorted=True)
+        results = gs.transform(ak.array([3, 1, 2, 5, 4]), 'sum')
+        self.assertListEqual([4, 4, 11, 11, 11], results.to_ndarray().tolist())
+
+        with self.assertRaises(ValueError):
+            gb.transform(akdf['int64'], 'median_of_medians')
+
+    def test_segmented_scans(self):
+        d = make_arrays()
+        df = pd.DataFrame(d)
+        akdf = {k:ak.array(v) for k, v in d.items()}
+        gb = ak.GroupBy(akdf['keys'])
+        pdg = df.groupby('keys')
+
+        def check(expected, results):
+            self.assertTrue(np.allclose(np.asarray(expected, dtype=np.float64),
+                                        results.to_ndarray(), equal_nan=True))
+
+        check(pdg['int64'].cumsum(), gb.cumsum(akdf['int64']))
+        check(pdg['float64'].cumsum(), gb.cumsum(akdf['float64']))
+        check(pdg['float64'].cummin(), gb.cummin(akdf['float64']))
+        check(pdg['int64'].cummax(), gb.cummax(akdf['int64']))
+        check(pdg.cumcount(), gb.cumcount())
+        for method in ('first', 'min', 'dense'):
+            check(pdg['int64'].rank(method=method), gb.rank(akdf['int64'], method=method))
+        check(pdg['float64'].shift(2), gb.shift(akdf['float64'], 2))
+        check(pdg['int64'].shift(-1, fill_value=-1), gb.shift(akdf['int64'], -1, fill_value=-1))
+        check(pdg['int64'].diff(), gb.diff(akdf['int64']))
+        rolling = pdg['float64'].rolling(3, min_periods=1)
+        check(rolling.sum().reset_index(level=0, drop=True).sort_index(),
+              gb.rolling_sum(akdf['float64'], 3))
+        check(rolling.mean().reset_index(level=0, drop=True).sort_index(),
+              gb.rolling_mean(akdf['float64'], 3))
+
+        # NaN and infinite values only affect the windows that hold them
+        gl = ak.GroupBy(ak.zeros(20, dtype=ak.int64))
+        for bad in ([np.nan], [np.inf], [np.inf, -np.inf]):
+            x = np.arange(20, dtype=np.float64)
+            x[8:8+len(bad)] = bad
+            expected = [sum(x[max(0, i-2):i+1]) for i in range(20)]
+            check(expected, gl.rolling_sum(ak.array(x), 3, skipna=False))
+
+        gs = ak.GroupBy(ak.array([0, 0, 1, 1, 1]), assume_sorted=True)
+        results = gs.cumsum(ak.array([3, 1, 2, 5, 4]))
+        self.assertListEqual([3, 4, 2, 7, 11], results.to_ndarray().tolist())
+
+        with self.assertRaises(ValueError):
+            gb.rank(akdf['int64'], method='average')
+        with self.assertRaises(ValueError):
+            gb.rolling_sum(akdf['int64'], 0)
+
+    def test_topk(self):
+        keys = np.random.randint(0, 10, SIZE)
+        vals = np.random.randint(0, 20, SIZE)
+        g = ak.GroupBy(ak.array(keys))
+        ukeys = g.unique_keys.to_ndarray()
+        for largest in (True, False):
+            segments, indices = g.topk(ak.array(vals), 3, largest=largest)
+            bounds = np.append(segments.to_ndarray(), indices.size)
+            idx = indices.to_ndarray()
+            for i, key in enumerate(ukeys):
+                members = np.flatnonzero(keys == key)
+                order = members[np.argsort(vals[members], kind='stable')]
+                expected = order[-3:] if largest else order[:3]
+                self.assertListEqual(expected.tolist(), idx[bounds[i]:bounds[i+1]].tolist())
+        with self.assertRaises(ValueError):
+            g.topk(ak.array(vals), 0)
+
+    def test_segmented_statistics(self):
+        # group sizes from 1 to about SIZE/2, so that a few groups hold most values
+        keys = np.minimum(np.random.geometric(0.5, SIZE), 20)
+        i = np.random.randint(0, 10, SIZE)
+        f = np.random.randn(SIZE)
+        g = ak.GroupBy(ak.array(keys))
+        ukeys = g.unique_keys.to_ndarray()
+        groups = [np.flatnonzero(keys == k) for k in ukeys]
+
+        for values in (i, f):
+            akvalues = ak.array(values)
+            for ddof in (0, 1):
+                _, var = g.var(akvalues, ddof=ddof)
+                _, std = g.std(akvalues, ddof=ddof)
+                expected = [np.var(values[idx], ddof=ddof) if idx.size > ddof else np.nan
+                            for idx in groups]
+                self.assertTrue(np.allclose(expected, var.to_ndarray(), equal_nan=True))
+                self.assertTrue(np.allclose(np.sqrt(expected), std.to_ndarray(), 
+                                            equal_nan=True))
+            _, first = g.first(akvalues)
+            self.assertTrue(np.allclose([values[idx[0]] for idx in groups], first.to_ndarray()))
+            _, last = g.last(akvalues)
+            self.assertTrue(np.allclose([values[idx[-1]] for idx in groups], last.to_ndarray()))
+            _, median = g.median(akvalues)
+            self.assertTrue(np.allclose([np.median(values[idx]) for idx in groups], 
+                                        median.to_ndarray()))
+            for q in (0, 0.1, 0.5, 0.99, 1):
+                _, quantile = g.quantile(akvalues, q)
+                self.assertTrue(np.allclose([np.quantile(values[idx], q) for idx in groups], 
+                                            quantile.to_ndarray()))
+
+        _, mode = g.mode(ak.array(i))
+        expected = []
+        for idx in groups:
+            uniques, counts = np.unique(i[idx], return_counts=True)
+            expected.append(uniques[np.argmax(counts)])
+        self.assertListEqual(expected, mode.to_ndarray().tolist())
+
+        gs = ak.GroupBy(ak.array([0, 0, 0, 1, 1, 1]), assume_sorted=True)
+        fnan = ak.array([1.0, np.nan, 3.0, np.nan, np.nan, 2.0])
+        _, median = gs.median(fnan)
+        self.assertListEqual([2.0, 2.0], median.to_ndarray().tolist())
+        _, median = gs.median(fnan, skipna=False)
+        self.assertTrue(np.isnan(median.to_ndarray()).all())
+        _, var = gs.var(fnan, ddof=1)
+        self.assertEqual(2.0, var[0])
+        self.assertTrue(np.isnan(var[1]))
+        _, mode = gs.mode(ak.array([5, 3, 5, 2, 1, 2]))
+        self.assertListEqual([5, 2], mode.to_ndarray().tolist())
+
+        keys, aggs = gs.agg({'v':(ak.array([3, 1, 2, 4, 8, 6]), ['quantile:0.5', 'var:1'])})
+        self.assertListEqual([2.0, 6.0], aggs['v']['quantile:0.5'].to_ndarray().tolist())
+        self.assertListEqual([1.0, 4.0], aggs['v']['var:1'].to_ndarray().tolist())
+
+        with self.assertRaises(ValueError):
+            gs.quantile(fnan, 1.5)
+        with self.assertRaises(ValueError):
+            gs.var(fnan, ddof=-1)
+
     def test_count(self):   
         values = ak.array([4, 1, 3, 2, 2, 2, 5, 5, 2, 3])
         gb = ak.GroupBy(values)
@@ -184,6 +340,202 @@ class GroupByTest(ArkoudaTest):
         self.assertTrue((np.array([1,2,3,4,5]) == keys.to_ndarray()).all())
         self.assertTrue((np.array([1,4,2,1,2]) == counts.to_ndarray()).all())
         
+    def test_agg(self):
+        d = make_arrays()
+        akdf = {k:ak.array(v) for k, v in d.items()}
+        g = ak.GroupBy(akdf['keys'])
+        ops = ['sum', 'min', 'max', 'argmin', 'argmax', 'nunique']
+        keys, aggs = g.agg({'int64':(akdf['int64'], ops),
+                            'float64':(akdf['float64'], ['mean', 'max'])})
+        self.assertEqual(set(aggs.keys()), {'int64', 'float64'})
+        for col, colops in (('int64', ops), ('float64', ['mean', 'max'])):
+            for op in colops:
+                akkeys, akvals = g.aggregate(akdf[col], op)
+                self.assertTrue((keys.to_ndarray() == akkeys.to_ndarray()).all())
+                self.assertTrue(np.allclose(aggs[col][op].to_ndarray(), akvals.to_ndarray()))
+
+        gs = ak.GroupBy(ak.array([0, 0, 1, 1, 1]), assume_sorted=True)
+        _, aggs = gs.agg({'v':(ak.array([3, 1, 2, 5, 4]), ['sum', 'argmax'])})
+        self.assertListEqual([4, 11], aggs['v']['sum'].to_ndarray().tolist())
+        self.assertListEqual([0, 3], aggs['v']['argmax'].to_ndarray().tolist())
+
+        with self.assertRaises(ValueError):
+            g.agg({'int64':(akdf['int64'], ['sum', 'median_of_medians'])})
+        with self.assertRaises(ValueError):
+            g.agg({'short':(ak.arange(10), 'sum')})
+
+    def test_register_attach(self):
+        d = make_arrays()
+        akdf = {k:ak.array(v) for k, v in d.items()}
+        g = ak.GroupBy([akdf['keys'], akdf['keys2']])
+        r = g.register('test_groupby')
+        self.assertEqual('test_groupby', r.registered_name)
+        h = ak.GroupBy.attach('test_groupby')
+        self.assertIsNone(h.keys)
+        self.assertEqual(g.size, h.size)
+        self.assertEqual(g.nkeys, h.nkeys)
+        for gk, hk in zip(g.unique_keys, h.unique_keys):
+            self.assertTrue((gk.to_ndarray() == hk.to_ndarray()).all())
+        _, gsum = g.sum(akdf['int64'])
+        _, hsum = h.sum(akdf['int64'])
+        self.assertTrue((gsum.to_ndarray() == hsum.to_ndarray()).all())
+        h.unregister()
+        self.assertIsNone(h.registered_name)
+        with self.assertRaises(RuntimeError):
+            h.unregister()
+
+        s = ak.GroupBy(ak.array(['a', 'b', 'a'])).register('test_groupby_strings')
+        t = ak.GroupBy.attach('test_groupby_strings')
+        self.assertListEqual(['a', 'b'], t.unique_keys.to_ndarray().tolist())
+        t.unregister()
+
+    def test_cache_values(self):
+        d = make_arrays()
+        akdf = {k:ak.array(v) for k, v in d.items()}
+        g = ak.GroupBy(akdf['keys'])
+        _, expected = g.aggregate(akdf['int64'], 'max')
+        for _ in range(2):
+            _, cached = g.aggregate(akdf['int64'], 'max', cache_values=True)
+            self.assertTrue((expected.to_ndarray() == cached.to_ndarray()).all())
+        # Changing the values drops the cached permutation of them
+        akdf['int64'][:] = 0
+        _, cached = g.aggregate(akdf['int64'], 'max', cache_values=True)
+        self.assertTrue((cached.to_ndarray() == 0).all())
+        # as does a write run by a batch, while info on all symbols does not
+        ak.info(ak.AllSymbols)
+        with ak.batch():
+            akdf['int64'] += 1
+        _, cached = g.aggregate(akdf['int64'], 'max', cache_values=True)
+        self.assertTrue((cached.to_ndarray() == 1).all())
+
+    def test_hash_method(self):
+        d = make_arrays()
+        akdf = {k:ak.array(v) for k, v in d.items()}
+        for keys in (akdf['keys'], [akdf['keys'], akdf['keys2']],
+                     ak.array(['k{}'.format(k) for k in d['keys'][:100]])):
+            sg = ak.GroupBy(keys)
+            hg = ak.GroupBy(keys, method='hash')
+            self.assertEqual(sg.segments.size, hg.segments.size)
+            _, scounts = sg.count()
+            hkeys, hcounts = hg.count()
+            # The hashed groups are in no particular order, so sort them by key
+            if isinstance(hkeys, list):
+                order = ak.coargsort(hkeys)
+            else:
+                order = ak.argsort(hkeys)
+            self.assertTrue((scounts.to_ndarray() == hcounts[order].to_ndarray()).all())
+            if keys is akdf['keys']:
+                _, ssum = sg.sum(akdf['int64'])
+                _, hsum = hg.sum(akdf['int64'])
+                self.assertTrue((ssum.to_ndarray() == hsum[order].to_ndarray()).all())
+
+        with self.assertRaises(ValueError):
+            ak.GroupBy(akdf['keys'], method='tree')
+
+    def test_incremental_groupby(self):
+        d = make_arrays()
+        akdf = {k:ak.array(v) for k, v in d.items()}
+        ig = ak.IncrementalGroupBy({'int64':['count', 'sum', 'min', 'max', 'mean', 'nunique'],
+                                    'float64':'max'})
+        half = SIZE // 2
+        for batch in (slice(0, half), slice(half, SIZE)):
+            ig.update([akdf['keys'][batch], akdf['keys2'][batch]],
+                      {'int64':akdf['int64'][batch], 'float64':akdf['float64'][batch]})
+        self.assertEqual(SIZE, ig.size)
+
+        g = ak.GroupBy([akdf['keys'], akdf['keys2']])
+        keys, aggs = ig.agg()
+        for k, gk in zip(keys, g.unique_keys):
+            self.assertTrue((k.to_ndarray() == gk.to_ndarray()).all())
+        _, counts = g.count()
+        self.assertTrue((aggs['int64']['count'].to_ndarray() == counts.to_ndarray()).all())
+        for op in ('sum', 'min', 'max', 'mean', 'nunique'):
+            _, expected = g.aggregate(akdf['int64'], op)
+            self.assertTrue(np.allclose(aggs['int64'][op].to_ndarray(), expected.to_ndarray()))
+        _, expected = g.max(akdf['float64'])
+        self.assertTrue(np.allclose(aggs['float64']['max'].to_ndarray(), expected.to_ndarray()))
+
+        # Estimates of nunique from the sketch are close for many distinct values
+        ig = ak.IncrementalGroupBy({'v':'nunique'}, sketch_size=64)
+        for i in range(2):
+            ig.update(ak.zeros(SIZE, dtype=ak.int64), {'v':ak.arange(i*SIZE, (i+1)*SIZE)})
+        _, nunique = ig.aggregate('v', 'nunique')
+        self.assertTrue(abs(nunique[0] - 2*SIZE) < 0.5 * 2*SIZE)
+
+        with self.assertRaises(ValueError):
+            ak.IncrementalGroupBy({'v':'median_of_medians'})
+        with self.assertRaises(ValueError):
+            ig.update(ak.zeros(10, dtype=ak.int64), {'w':ak.arange(10)})
+        with self.assertRaises(RuntimeError):
+            ak.IncrementalGroupBy({'v':'sum'}).count()
+
+    def test_sketches(self):
+        keys = ak.randint(0, 4, 10**5)
+        values = ak.randint(0, 10**4, 10**5)
+        g = ak.GroupBy(keys)
+        _, exact = g.nunique(values)
+        _, approx = g.nunique_approx(values, precision=14)
+        self.assertTrue((ak.abs(approx - exact) < 0.05 * exact).all())
+        # small distinct counts are nearly exact
+        small = ak.GroupBy(ak.array([0, 0, 0, 1, 1]))
+        _, approx = small.nunique_approx(ak.array([3, 4, 3, 5, 5]))
+        self.assertListEqual([2, 1], approx.to_ndarray().tolist())
+
+        # sketches with room for every distinct value count exactly
+        skewed = ak.randint(0, 3, 10**5) * ak.randint(0, 3, 10**5)
+        _, top, counts = g.topk_approx(skewed, 2, sketch_size=9)
+        npkeys, npskewed = keys.to_ndarray(), skewed.to_ndarray()
+        for i, key in enumerate(g.unique_keys.to_ndarray()):
+            uniques, ucounts = np.unique(npskewed[npkeys == key], return_counts=True)
+            order = np.argsort(-ucounts, kind='stable')[:2]
+            self.assertListEqual(ucounts[order].tolist(), counts[2*i:2*i+2].to_ndarray().tolist())
+            self.assertListEqual(uniques[order].tolist(), top[2*i:2*i+2].to_ndarray().tolist())
+
+        # merging the sketches of two halves gives the sketches of the whole
+        half = keys.size // 2
+        first = ak.GroupBy(keys[:half]).hll(values[:half])
+        second = ak.GroupBy(keys[half:]).hll(values[half:])
+        whole = g.hll(values)
+        mkeys, merged = first.merge(second).estimate()
+        wkeys, expected = whole.estimate()
+        self.assertListEqual(wkeys.to_ndarray().tolist(), mkeys.to_ndarray().tolist())
+        self.assertListEqual(expected.to_ndarray().tolist(), merged.to_ndarray().tolist())
+        first = ak.GroupBy(keys[:half]).spacesaving(skewed[:half], 9)
+        second = ak.GroupBy(keys[half:]).spacesaving(skewed[half:], 9)
+        _, mtop, mcounts = first.merge(second).topk(2)
+        self.assertListEqual(counts.to_ndarray().tolist(), mcounts.to_ndarray().tolist())
+        self.assertListEqual(top.to_ndarray().tolist(), mtop.to_ndarray().tolist())
+
+        # registered sketches can be attached and merged later
+        first.register('test_sketch')
+        attached = ak.SpaceSavingSketch.attach('test_sketch')
+        self.assertEqual(9, attached.param)
+        _, mtop, _ = attached.merge(second).topk(2)
+        self.assertListEqual(top.to_ndarray().tolist(), mtop.to_ndarray().tolist())
+        with self.assertRaises(TypeError):
+            ak.HLLSketch.attach('test_sketch')
+        with self.assertRaises(TypeError):
+            attached.merge(whole)
+        attached.unregister()
+
+        # the server checks that the sketches match their size and rows
+        rows = ak.arange(whole.size)
+        with self.assertRaises(RuntimeError):
+            ak.client.generic_msg("hllMerge {} {} {} {} {}".format(whole.param,
+                                  (rows + 1).name, whole.arrays[0].name, rows.name, 
+                                  whole.arrays[0].name))
+        with self.assertRaises(RuntimeError):
+            ak.client.generic_msg("spaceSavingMerge {} {} {} {} {} {} {}".format(9,
+                                  (rows + 1).name, second.arrays[0].name, second.arrays[1].name,
+                                  rows.name, second.arrays[0].name, second.arrays[1].name))
+
+        with self.assertRaises(ValueError):
+            g.nunique_approx(values, precision=20)
+        with self.assertRaises(ValueError):
+            g.topk_approx(values, 5, sketch_size=4)
+        with self.assertRaises(TypeError):
+            g.nunique_approx(ak.randint(0, 1, keys.size, dtype=ak.float64))
+
     def test_error_handling(self):
         d = make_arrays()
         akdf = {k:ak.array(v) for k, v in d.items()}        
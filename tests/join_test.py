@@ -48,6 +48,22 @@ class JoinTest(ArkoudaTest):
         self.assertEqual(self.N//nl, I.size)
         self.assertEqual(self.N//nl, J.size)
 
+    def test_merge_join(self):
+        left = ak.sort(ak.randint(0, 100, self.N))
+        right = ak.sort(ak.randint(50, 150, self.N))
+        I,J = ak.merge_join(left, right)
+        nl, nr = left.to_ndarray(), right.to_ndarray()
+        pairs = [(i, j) for i in range(self.N) for j in 
+                 np.flatnonzero(nr == nl[i])]
+        self.assertEqual(pairs, list(zip(I.to_ndarray(), J.to_ndarray())))
+
+        I,J = ak.merge_join(self.a2, self.a2 + self.N)
+        self.assertEqual(0, I.size)
+        self.assertEqual(0, J.size)
+
+        with self.assertRaises(RuntimeError):
+            ak.merge_join(self.a2 * -1, self.a2)
+
     def test_join_on_eq_with_abs_dt_outside_window(self):
         '''
         Should get 0 answers because N^2 matches but 0 within dt window 
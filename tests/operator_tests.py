@@ -292,8 +292,64 @@ class OperatorsTest(ArkoudaTest):
 
         self.assertEqual('Error: concatenateMsg: Incompatible arguments: ' +
                          'Expected float64 dtype but got bool dtype', 
-                         cm.exception.args[0])     
-        
+                         cm.exception.args[0])
+
+    def testLazy(self):
+        a = ak.arange(0, SIZE, 1)
+        b = ak.linspace(0, 2, SIZE)
+        c = (a % 3) == 0
+        expressions = [lambda a, b, c: (a * 2 + b) / 3,
+                       lambda a, b, c: (a - 1) * (a + 1) // 2,
+                       lambda a, b, c: ((a > 4) & c) | (b < 0.5),
+                       lambda a, b, c: 2 ** b - a ** 0.5,
+                       lambda a, b, c: ak.where(c, a * 3, -a),
+                       lambda a, b, c: ak.where(b > 1, ak.exp(b), 0.5),
+                       lambda a, b, c: ak.abs(a - 5) + ak.sin(b) * ak.cos(a)]
+        for expr in expressions:
+            eager = expr(a, b, c)
+            with ak.lazy():
+                deferred = expr(a, b, c)
+            self.assertTrue(deferred._is_fused())
+            self.assertEqual(eager.dtype, deferred.dtype)
+            self.assertTrue(np.allclose(eager.to_ndarray(), deferred.to_ndarray()))
+            self.assertFalse(deferred._is_fused())
+
+        # Ops that cannot be fused run eagerly within lazy()
+        with ak.lazy():
+            d = a ** 2
+        self.assertFalse(d._is_fused())
+        self.assertEqual((a * a).to_ndarray().tolist(), d.to_ndarray().tolist())
+
+        # Long expressions are split into fused commands of bounded size
+        maxFusedNodes = ak.client.maxFusedNodes
+        try:
+            ak.client.maxFusedNodes = 4
+            with ak.lazy():
+                d = a
+                for i in range(10):
+                    d = d + i
+            self.assertEqual((a + 45).to_ndarray().tolist(), d.to_ndarray().tolist())
+        finally:
+            ak.client.maxFusedNodes = maxFusedNodes
+
+        # Writing to an array in place computes the expressions that read it first
+        for write in (lambda x: x.__iadd__(5), lambda x: x.__setitem__(slice(None), 7),
+                      lambda x: x.fill(3)):
+            e = ak.arange(0, SIZE, 1)
+            with ak.lazy():
+                d = e + 1
+                f = d * 2
+            self.assertTrue(d._is_fused() and f._is_fused())
+            write(e)
+            self.assertFalse(d._is_fused() or f._is_fused())
+            self.assertEqual((a + 1).to_ndarray().tolist(), d.to_ndarray().tolist())
+            self.assertEqual(((a + 1) * 2).to_ndarray().tolist(), f.to_ndarray().tolist())
+        e = ak.arange(0, SIZE, 1)
+        with ak.lazy():
+            d = e + 1
+            e += 5
+        self.assertEqual((a + 1).sum(), d.sum())
+
 if __name__ == '__main__':
     '''
     Enables invocation of operator tests outside of pytest test harness
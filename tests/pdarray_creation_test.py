@@ -51,6 +51,67 @@ class PdarrayCreationTest(ArkoudaTest):
         self.assertEqual("'int' object is not iterable", 
                          cm.exception.args[0])       
 
+    def testToNdarray(self):
+        for npa in (np.arange(-50, 50), np.linspace(-1.0, 1.0, 100),
+                    np.arange(100) % 3 == 0, np.arange(100, dtype=np.uint8)):
+            nda = ak.array(npa).to_ndarray()
+            self.assertEqual(npa.dtype, nda.dtype)
+            self.assertTrue(nda.dtype.isnative)
+            self.assertTrue((npa == nda).all())
+            # the result does not share the read-only reply buffer
+            self.assertTrue(nda.flags.writeable)
+            nda[0] = nda[1]
+
+        nda = ak.zeros(0, dtype=ak.int64).to_ndarray()
+        self.assertEqual(0, nda.size)
+        self.assertEqual(np.int64, nda.dtype)
+
+        with self.assertRaises(RuntimeError) as cm:
+            ak.client.maxTransferBytes = 8
+            ak.arange(0, 2, 1).to_ndarray()
+        ak.client.set_defaults()
+        self.assertEqual(('Array exceeds allowed size for transfer. Increase ' +
+                          'client.maxTransferBytes to allow'), cm.exception.args[0])
+
+    def testToNdarrayChunks(self):
+        npa = np.arange(-50, 51)
+        pda = ak.array(npa)
+        for chunk_bytes in (8, 24, 800, 2**20):
+            chunks = list(pda.to_ndarray_chunks(chunk_bytes=chunk_bytes))
+            self.assertTrue(all(c.size <= max(chunk_bytes // 8, 1) for c in chunks))
+            self.assertTrue((npa == np.concatenate(chunks)).all())
+        self.assertListEqual([], list(ak.zeros(0).to_ndarray_chunks()))
+
+        # Streaming into a destination array bypasses maxTransferBytes
+        ak.client.maxTransferBytes = 8
+        ak.client.chunkTransferBytes = 64
+        out = np.empty(npa.size, dtype=np.int64)
+        try:
+            self.assertIs(out, pda.to_ndarray(out=out))
+        finally:
+            ak.client.set_defaults()
+        self.assertTrue((npa == out).all())
+
+        # Chunked uploads also bypass maxTransferBytes
+        ak.client.maxTransferBytes = 8
+        ak.client.chunkTransferBytes = 24
+        try:
+            for up in (npa, np.linspace(-1.0, 1.0, 101), npa % 3 == 0):
+                self.assertTrue((up == ak.array(up, chunked=True).to_ndarray(out=
+                                 np.empty(up.size, dtype=up.dtype))).all())
+            words = np.array(['chunk {}'.format(i) for i in range(20)])
+            strings = ak.array(words, chunked=True)
+            with self.assertRaises(RuntimeError):
+                ak.array(npa)
+        finally:
+            ak.client.set_defaults()
+        self.assertTrue((words == strings.to_ndarray()).all())
+
+        with self.assertRaises(ValueError):
+            pda.to_ndarray(out=np.empty(npa.size, dtype=np.float64))
+        with self.assertRaises(ValueError):
+            list(pda.to_ndarray_chunks(chunk_bytes=0))
+
     def testRandint(self):
         testArray = ak.randint(0, 10, 5)
         self.assertIsInstance(testArray, ak.pdarray)
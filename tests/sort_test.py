@@ -1,3 +1,4 @@
+import numpy as np
 from context import arkouda as ak 
 from base_test import ArkoudaTest
 
@@ -12,7 +13,121 @@ class SortTest(ArkoudaTest):
         spda = ak.sort(pda)
         maxIndex = spda.argmax()
         self.assertTrue(maxIndex > 0)
-   
+
+    def testDenseKeys(self):
+        # keys of small range are sorted and counted by counting sort
+        for low, high in ((0, 16), (-2**10, 2**10), (2**40, 2**40 + 2**16)):
+            pda = ak.randint(low, high, 1000)
+            nda = pda.to_ndarray()
+            perm = ak.argsort(pda)
+            self.assertTrue((perm.to_ndarray() == np.argsort(nda, kind='stable')).all())
+            u, c = ak.unique(pda, return_counts=True)
+            nu, nc = np.unique(nda, return_counts=True)
+            self.assertTrue((u.to_ndarray() == nu).all())
+            self.assertTrue((c.to_ndarray() == nc).all())
+
+        a = ak.randint(-5, 5, 1000)
+        b = ak.randint(0, 100, 1000)
+        perm = ak.coargsort([a, b])
+        self.assertTrue((perm.to_ndarray() ==
+                         np.lexsort([b.to_ndarray(), a.to_ndarray()])).all())
+
+    def testKeptSortOrder(self):
+        # sorting again uses what the array knows of its order until it is written
+        pda = ak.randint(-2**40, 2**40, 1000)
+        first = ak.argsort(pda)
+        self.assertTrue((ak.argsort(pda) == first).all())
+        self.assertFalse(ak.is_sorted(pda))
+
+        pda[first[0]] = 2**41
+        nda = pda.to_ndarray()
+        self.assertTrue((ak.argsort(pda).to_ndarray() == np.argsort(nda, kind='stable')).all())
+        self.assertTrue((ak.unique(pda).to_ndarray() == np.unique(nda)).all())
+
+        pda[:] = ak.arange(1000)
+        self.assertTrue(ak.is_sorted(pda))
+        self.assertTrue((ak.argsort(pda) == ak.arange(1000)).all())
+        pda += ak.randint(-5, 5, 1000)
+        self.assertEqual(ak.is_sorted(pda), bool(np.all(np.diff(pda.to_ndarray()) >= 0)))
+        self.assertTrue((ak.in1d(ak.arange(-10, 1010), pda).to_ndarray() ==
+                         np.in1d(np.arange(-10, 1010), pda.to_ndarray())).all())
+
+    def testSampleSort(self):
+        # wide and skewed keys, with many repeats, sort stably either way
+        skewed = ak.randint(0, 2**62, 1000) >> ak.randint(0, 62, 1000)
+        for pda in (skewed, skewed - 2**40, ak.randint(0, 10, 1000),
+                    ak.randint(-1, 1, 1000, dtype=ak.float64)):
+            expected = np.argsort(pda.to_ndarray(), kind='stable')
+            for algorithm in ('radix', 'sample'):
+                # a copy of the array, so no kept permutation is reused
+                perm = ak.argsort(pda + 0, algorithm=algorithm)
+                self.assertTrue((perm.to_ndarray() == expected).all())
+
+        a = ak.randint(-2**40, 2**40, 1000)
+        b = ak.randint(0, 2**62, 1000) >> ak.randint(0, 62, 1000)
+        c = ak.randint(0, 1, 1000, dtype=ak.float64)
+        expected = np.lexsort([c.to_ndarray(), b.to_ndarray(), a.to_ndarray() % 5])
+        for algorithm in ('auto', 'radix', 'sample'):
+            perm = ak.coargsort([a % 5, b, c], algorithm=algorithm)
+            self.assertTrue((perm.to_ndarray() == expected).all())
+
+        with self.assertRaises(ValueError):
+            ak.argsort(a, algorithm='merge')
+        with self.assertRaises(ValueError):
+            ak.coargsort([a, b], algorithm='merge')
+
+    def testDescending(self):
+        # descending sorts keep equal values in their original order
+        for pda in (ak.randint(0, 10, 1000), ak.randint(-2**40, 2**40, 1000),
+                    ak.randint(-1, 1, 1000, dtype=ak.float64)):
+            nda = pda.to_ndarray()
+            expected = np.argsort(-nda, kind='stable')
+            for algorithm in ('auto', 'sample'):
+                perm = ak.argsort(pda, algorithm=algorithm, ascending=False)
+                self.assertTrue((perm.to_ndarray() == expected).all())
+            self.assertTrue((ak.sort(pda, ascending=False).to_ndarray() == nda[expected]).all())
+        self.assertTrue((ak.argsort(ak.zeros(10, dtype=ak.int64), ascending=False) ==
+                         ak.arange(10)).all())
+        # argsort takes ascending by its truth value
+        pda = ak.randint(0, 10, 1000)
+        self.assertTrue((ak.argsort(pda, ascending=1) == ak.argsort(pda)).all())
+        self.assertTrue((ak.argsort(pda, ascending=0) ==
+                         ak.argsort(pda, ascending=False)).all())
+
+        a = ak.randint(-5, 5, 1000)
+        b = ak.randint(-2**40, 2**40, 1000)
+        c = ak.randint(0, 1, 1000, dtype=ak.float64)
+        d = ak.randint(0, 5, 1000)
+        na, nb, nc, nd = a.to_ndarray(), b.to_ndarray(), c.to_ndarray(), d.to_ndarray()
+        for arrays, ascending, keys in (([a, b], [False, True], [nb, -na]),
+                                        ([a, c], False, [-nc, -na]),
+                                        ([a, d], [True, False], [-nd, na]),
+                                        ([b, a, c], [True, False, True], [nc, -na, nb])):
+            perm = ak.coargsort(arrays, ascending=ascending)
+            self.assertTrue((perm.to_ndarray() == np.lexsort(keys)).all())
+        with self.assertRaises(ValueError):
+            ak.coargsort([a, b], ascending=[True])
+
+        strings = ak.random_strings_uniform(1, 16, 1000)
+        words = strings.to_ndarray()
+        perm = ak.argsort(strings, ascending=False)
+        self.assertTrue((words[perm.to_ndarray()] == np.sort(words)[::-1]).all())
+        cat = ak.Categorical(strings)
+        perm = ak.argsort(cat, ascending=False)
+        self.assertTrue((words[perm.to_ndarray()] == np.sort(words)[::-1]).all())
+
+    def testSearchSorted(self):
+        for dtype in (ak.int64, ak.float64):
+            a = ak.sort(ak.randint(0, 100, 1000, dtype=dtype))
+            v = ak.randint(-10, 110, 1000, dtype=dtype)
+            for side in ('left', 'right'):
+                self.assertTrue((ak.searchsorted(a, v, side).to_ndarray() ==
+                                 np.searchsorted(a.to_ndarray(), v.to_ndarray(), side)).all())
+        with self.assertRaises(ValueError):
+            ak.searchsorted(a, v, 'middle')
+        with self.assertRaises(RuntimeError):
+            ak.searchsorted(v, a)
+
     def testErrorHandling(self):
         
         # Test RuntimeError from bool NotImplementedError
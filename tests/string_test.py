@@ -381,6 +381,18 @@ class StringTest(ArkoudaTest):
         run_test_groupby(self.strings, self.cat, self.akset)
         print('passed test_groupby')
 
+    def test_hash_reuse(self):
+        # the second hash and grouping reuse the hashes cached by the server
+        h1, h2 = self.strings.hash()
+        c1, c2 = self.strings.hash()
+        self.assertTrue((h1 == c1).all() and (h2 == c2).all())
+        g = ak.GroupBy(self.strings)
+        self.assertTrue((g.permutation == ak.GroupBy(self.strings).permutation).all())
+        # a copy of the strings is hashed again, to the same values
+        copy = self.strings[ak.arange(self.strings.size)]
+        n1, n2 = copy.hash()
+        self.assertTrue((h1 == n1).all() and (h2 == n2).all())
+
     def test_index(self):
         print('starting test_index')
         print("")
@@ -494,3 +506,51 @@ class StringTest(ArkoudaTest):
         print(str(strings))
         self.assertEqual("['string 0', 'string 1', 'string 2', ... , 'string 98', 'string 99', 'string 100']",
                          str(strings))
+
+    def test_array_roundtrip(self):
+        test_strings = np.array(['', 'one', 'twenty-two', '', 'ünïcödé', '한국어', 'x'])
+        strings = ak.array(test_strings)
+        self.assertIsInstance(strings, ak.Strings)
+        self.assertEqual(test_strings.size, strings.size)
+        self.assertEqual([len(s.encode()) for s in test_strings], 
+                         strings.get_lengths().to_ndarray().tolist())
+        self.assertTrue((strings.to_ndarray() == test_strings).all())
+
+        # a single long string does not inflate the others
+        test_strings = np.array(['a', 'bc', 'ü' * 10**5, '', 'def'])
+        strings = ak.array(test_strings)
+        self.assertEqual([len(s.encode()) for s in test_strings], 
+                         strings.get_lengths().to_ndarray().tolist())
+        self.assertTrue((strings.to_ndarray() == test_strings).all())
+
+    def test_to_ndarray(self):
+        test_strings = np.array(['', 'one', 'twenty-two', '', 'ünïcödé', '한국어', 'x'])
+        strings = ak.array(test_strings)
+        self.assertTrue((test_strings == strings.to_ndarray()).all())
+        self.assertEqual(test_strings.dtype, strings.to_ndarray().dtype)
+
+        objs = strings.to_ndarray(dtype='O')
+        self.assertEqual(object, objs.dtype)
+        self.assertListEqual(test_strings.tolist(), objs.tolist())
+
+        # Decoding in blocks gives the same result as decoding in one pass
+        strings.DecodeBlockBytes = 16
+        self.assertTrue((test_strings == strings.to_ndarray()).all())
+
+        offsets, data = strings.to_buffers()
+        self.assertListEqual([s.encode() for s in test_strings],
+                             [data[o:e].tobytes() for o, e in zip(offsets[:-1], offsets[1:])])
+
+        with self.assertRaises(ValueError):
+            strings.to_ndarray(dtype='S')
+
+    def test_to_ndarray_chunks(self):
+        test_strings = np.array(['', 'one', 'twenty-two', '', 'ünïcödé', '한국어', 'x'])
+        strings = ak.array(test_strings)
+        # Chunk sizes smaller than a single string still transfer whole strings
+        for chunk_bytes in (1, 8, 20, 2**20):
+            chunks = list(strings.to_ndarray_chunks(chunk_bytes=chunk_bytes))
+            self.assertTrue((test_strings == np.concatenate(chunks)).all())
+            objs = list(strings.to_ndarray_chunks(chunk_bytes=chunk_bytes, dtype='O'))
+            self.assertListEqual(test_strings.tolist(), np.concatenate(objs).tolist())
+        self.assertListEqual([], list(ak.array(np.array([], dtype=str)).to_ndarray_chunks()))